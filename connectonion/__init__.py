@@ -91,6 +91,7 @@ _FROM = {
     )},
     **{name: ".network" for name in (
         "connect", "RemoteAgent", "Response", "ExecResult", "PermissionModeError",
+        "connect_many", "AgentGroup",
         "host", "create_app",
         "IO", "relay", "announce", "HTTPRequest", "HTTPResponse", "HTTPRoute",
         "HTTPRouter",
@@ -200,6 +201,8 @@ __all__ = [
     "write",
     # Networking
     "connect",
+    "connect_many",
+    "AgentGroup",
     "RemoteAgent",
     "Response",
     "ExecResult",
@@ -5,7 +5,8 @@ These commands manage conversation session persistence, allowing users to
 save, list, and resume previous conversations.
 
 Key functions:
-- cmd_sessions(): Lists recent saved sessions (last 10)
+- cmd_sessions(): Lists recent saved sessions (last 10), or with a query
+  (`/sessions <words>`) the messages in any session containing them
 - cmd_new(): Creates new session and clears current conversation
 - cmd_resume(): Loads saved session and restores messages
 - set_agent(): Injects agent reference for message manipulation
@@ -24,7 +25,7 @@ Architecture:
 - Integration with co ai CLI for seamless persistence
 
 Used by:
-- CLI: `oo /sessions`, `/new`, `/resume <id>` in interactive mode
+- CLI: `oo /sessions [query]`, `/new`, `/resume <id>` in interactive mode
 - Automatic session saving after each exchange
 - Session recovery after disconnection or restart
 """
@@ -41,6 +42,8 @@ def set_agent(agent):
 
 def cmd_sessions(args: str = "") -> str:
     manager = get_session_manager()
+    if args.strip():
+        return _search(manager, args.strip())
     sessions = manager.list_sessions(limit=10)
     
     if not sessions:
@@ -56,6 +59,22 @@ def cmd_sessions(args: str = "") -> str:
     return "\n".join(lines)
 
 
+def _search(manager, query: str) -> str:
+    hits = manager.search(query, limit=10)
+    if not hits:
+        return f"No messages match `{query}`."
+
+    lines = [f"**Messages matching `{query}`:**\n"]
+    for hit in hits:
+        date = hit["timestamp"][:10] if hit.get("timestamp") else "unknown"
+        title = (hit.get("title") or "Untitled")[:40]
+        snippet = " ".join((hit.get("snippet") or "").split())
+        lines.append(f"- `{hit['session_id']}` - {title} ({date}, {hit['role']}): {snippet}")
+
+    lines.append("\n*Use `/resume <id>` to continue a session*")
+    return "\n".join(lines)
+
+
 def cmd_new(args: str = "") -> str:
     manager = get_session_manager()
     model = _agent.llm.model if _agent and hasattr(_agent, 'llm') else ""
@@ -2,10 +2,14 @@
 LLM-Note: SQLite-backed session persistence for co ai conversations.
 
 Key classes:
-- SessionManager: CRUD operations for chat sessions
+- SessionManager: CRUD operations for chat sessions, plus full-text search
 
 Database schema:
-- sessions table: id (TEXT PK), title, model, created_at, updated_at, messages (JSON)
+- sessions table: id (TEXT PK), title, model, created_at, updated_at, message_count
+- messages table: one row per message (session_id, seq, role, content, timestamp),
+  append-only, unique on (session_id, seq)
+- messages_fts: FTS5 index over messages.content, kept in step by triggers
+  (absent when the local SQLite has no FTS5; search then falls back to LIKE)
 
 Database location:
 - ~/.co-ai/sessions.db
@@ -13,18 +17,25 @@ Database location:
 Features:
 - Create/load/update/delete sessions
 - List all sessions with metadata
-- Update session title and messages
+- Page through a session's messages (load_session limit/before)
+- Search every session's messages (search), newest first
 - Automatic timestamps (created_at, updated_at)
 
 Architecture:
-- SQLite for simple, local persistence
-- Messages stored as JSON array
+- SQLite in WAL mode, so a reader never waits on the writer
+- save_message() inserts one row and bumps one counter: constant cost per
+  message, where the old JSON column was read, decoded and rewritten whole
+- Databases from before the messages table are migrated on open
+  (PRAGMA user_version 0 → 1), and the JSON column is emptied
 - Session IDs use timestamp format: YYYYMMDD_HHMMSS
 - Connection per SessionManager instance
 
 Used by:
-- co ai commands for session management
+- co ai commands for session management (/sessions [query], /new, /resume)
 - Web interface for chat history
+
+Tested by:
+- tests/unit/test_co_ai_sessions.py
 """
 
 import json
@@ -33,6 +44,44 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+SCHEMA_VERSION = 1
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        id TEXT PRIMARY KEY,
+        title TEXT,
+        model TEXT,
+        created_at TEXT,
+        updated_at TEXT,
+        message_count INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS messages (
+        id INTEGER PRIMARY KEY,
+        session_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        role TEXT,
+        content TEXT,
+        timestamp TEXT
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS messages_session_seq ON messages(session_id, seq)",
+    "CREATE INDEX IF NOT EXISTS sessions_updated ON sessions(updated_at)",
+)
+
+# External-content FTS: the index holds only tokens; the text stays in
+# messages, and the triggers keep the two in step.
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5("
+    "content, content='messages', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN "
+    "INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN "
+    "INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content); END",
+)
+
 
 def get_db_path() -> Path:
     db_dir = Path.home() / ".co-ai"
@@ -40,93 +89,189 @@ def get_db_path() -> Path:
     return db_dir / "sessions.db"
 
 
-def init_db(conn: sqlite3.Connection) -> None:
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS sessions (
-            id TEXT PRIMARY KEY,
-            title TEXT,
-            model TEXT,
-            created_at TEXT,
-            updated_at TEXT,
-            messages TEXT
-        )
-    """)
-    conn.commit()
+def init_db(conn: sqlite3.Connection) -> bool:
+    """Create or upgrade the schema. Returns whether full-text search is available."""
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    with conn:
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+        if "message_count" not in columns:
+            conn.execute("ALTER TABLE sessions ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0")
+    had_fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'messages_fts'").fetchone() is not None
+    try:
+        with conn:
+            for statement in _FTS_SCHEMA:
+                conn.execute(statement)
+            if not had_fts:
+                # Rows written by a SQLite without FTS5 were never indexed.
+                conn.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+        fts = True
+    except sqlite3.OperationalError:
+        # A SQLite built without FTS5; search() falls back to LIKE.
+        fts = False
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        _migrate_json_messages(conn)
+        with conn:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return fts
+
+
+def _migrate_json_messages(conn: sqlite3.Connection) -> None:
+    """Move messages out of the old per-session JSON column into rows, one session at a time."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+    if "messages" not in columns:
+        return
+    ids = [row[0] for row in conn.execute("SELECT id FROM sessions WHERE messages IS NOT NULL")]
+    for session_id in ids:
+        row = conn.execute("SELECT messages FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        try:
+            messages = json.loads(row[0] or "[]")
+        except ValueError:
+            messages = []
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO messages (session_id, seq, role, content, timestamp) VALUES (?, ?, ?, ?, ?)",
+                [(session_id, seq, m.get("role"), m.get("content"), m.get("timestamp"))
+                 for seq, m in enumerate(messages)],
+            )
+            conn.execute("UPDATE sessions SET messages = NULL, message_count = ? WHERE id = ?",
+                         (len(messages), session_id))
 
 
 def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(get_db_path())
+    conn = sqlite3.connect(get_db_path(), timeout=30.0)
     conn.row_factory = sqlite3.Row
-    init_db(conn)
     return conn
 
 
+def _match(query: str) -> str:
+    """A user's words as an FTS5 query: every word must appear, operators taken literally."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
 class SessionManager:
     def __init__(self):
         self.conn = get_connection()
+        self._fts = init_db(self.conn)
         self.current_id: Optional[str] = None
-    
+
     def create_session(self, model: str = "") -> str:
         session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         now = datetime.now().isoformat()
         self.conn.execute(
-            "INSERT INTO sessions (id, title, model, created_at, updated_at, messages) VALUES (?, ?, ?, ?, ?, ?)",
-            (session_id, "New Session", model, now, now, "[]")
+            "INSERT INTO sessions (id, title, model, created_at, updated_at, message_count) VALUES (?, ?, ?, ?, ?, 0)",
+            (session_id, "New Session", model, now, now)
         )
         self.conn.commit()
         self.current_id = session_id
         return session_id
-    
+
     def save_message(self, role: str, content: str) -> None:
         if not self.current_id:
             return
-        
-        row = self.conn.execute(
-            "SELECT messages FROM sessions WHERE id = ?", (self.current_id,)
-        ).fetchone()
-        
-        if row:
-            messages = json.loads(row["messages"])
-            messages.append({"role": role, "content": content, "timestamp": datetime.now().isoformat()})
-            
-            title = content[:50] + "..." if len(content) > 50 else content
-            if len(messages) == 1:
+
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT message_count FROM sessions WHERE id = ?", (self.current_id,)
+            ).fetchone()
+            if not row:
+                return
+            seq = row["message_count"]
+            now = datetime.now().isoformat()
+            self.conn.execute(
+                "INSERT INTO messages (session_id, seq, role, content, timestamp) VALUES (?, ?, ?, ?, ?)",
+                (self.current_id, seq, role, content, now)
+            )
+            if seq == 0:
+                title = content[:50] + "..." if len(content) > 50 else content
                 self.conn.execute(
-                    "UPDATE sessions SET messages = ?, title = ?, updated_at = ? WHERE id = ?",
-                    (json.dumps(messages), title, datetime.now().isoformat(), self.current_id)
+                    "UPDATE sessions SET message_count = ?, title = ?, updated_at = ? WHERE id = ?",
+                    (seq + 1, title, now, self.current_id)
                 )
             else:
                 self.conn.execute(
-                    "UPDATE sessions SET messages = ?, updated_at = ? WHERE id = ?",
-                    (json.dumps(messages), datetime.now().isoformat(), self.current_id)
+                    "UPDATE sessions SET message_count = ?, updated_at = ? WHERE id = ?",
+                    (seq + 1, now, self.current_id)
                 )
-            self.conn.commit()
-    
+
     def list_sessions(self, limit: int = 20) -> list[dict]:
         rows = self.conn.execute(
-            "SELECT id, title, model, created_at, updated_at FROM sessions ORDER BY updated_at DESC LIMIT ?",
+            "SELECT id, title, model, created_at, updated_at, message_count FROM sessions "
+            "ORDER BY updated_at DESC LIMIT ?",
             (limit,)
         ).fetchall()
         return [dict(row) for row in rows]
-    
-    def load_session(self, session_id: str) -> Optional[list[dict]]:
-        row = self.conn.execute(
-            "SELECT messages FROM sessions WHERE id = ?", (session_id,)
-        ).fetchone()
-        
-        if row:
-            self.current_id = session_id
-            return json.loads(row["messages"])
-        return None
-    
+
+    def load_session(self, session_id: str, limit: Optional[int] = None,
+                     before: Optional[int] = None) -> Optional[list[dict]]:
+        """A session's messages in order, or None if there is no such session.
+
+        With `limit`, only the newest `limit` of them; with `before`, only
+        those earlier than that seq -- pass the first message's seq to get
+        the page before it.
+        """
+        if not self.conn.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone():
+            return None
+
+        query = "SELECT seq, role, content, timestamp FROM messages WHERE session_id = ?"
+        params: list = [session_id]
+        if before is not None:
+            query += " AND seq < ?"
+            params.append(before)
+        if limit is None:
+            rows = self.conn.execute(query + " ORDER BY seq", params).fetchall()
+        else:
+            rows = self.conn.execute(query + " ORDER BY seq DESC LIMIT ?", [*params, limit]).fetchall()
+            rows.reverse()
+
+        self.current_id = session_id
+        return [dict(row) for row in rows]
+
+    def search(self, query: str, limit: int = 20) -> list[dict]:
+        """Messages in any session containing every word of `query`, newest first.
+
+        Each hit: session_id, title, seq, role, timestamp and a snippet with
+        the matches in **bold**.
+        """
+        if not query.strip():
+            return []
+        if self._fts:
+            rows = self.conn.execute(
+                "SELECT m.session_id, s.title, m.seq, m.role, m.timestamp,"
+                " snippet(messages_fts, 0, '**', '**', '...', 12) AS snippet"
+                " FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid"
+                " JOIN sessions s ON s.id = m.session_id"
+                " WHERE messages_fts MATCH ? ORDER BY m.id DESC LIMIT ?",
+                (_match(query), limit)
+            ).fetchall()
+        else:
+            words = query.split()
+            rows = self.conn.execute(
+                "SELECT m.session_id, s.title, m.seq, m.role, m.timestamp, substr(m.content, 1, 80) AS snippet"
+                " FROM messages m JOIN sessions s ON s.id = m.session_id WHERE "
+                + " AND ".join("m.content LIKE ? ESCAPE '\\'" for _ in words)
+                + " ORDER BY m.id DESC LIMIT ?",
+                [*(_like(word) for word in words), limit]
+            ).fetchall()
+        return [dict(row) for row in rows]
+
     def delete_session(self, session_id: str) -> bool:
-        self.conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
-        self.conn.commit()
+        with self.conn:
+            self.conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+            self.conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
         if self.current_id == session_id:
             self.current_id = None
         return True
 
 
+def _like(word: str) -> str:
+    escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
 _manager: Optional[SessionManager] = None
 
 
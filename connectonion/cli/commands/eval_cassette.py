@@ -0,0 +1,158 @@
+"""
+Purpose: Record an eval's LLM responses once and replay them offline, so `co eval` can run without a model
+LLM-Note:
+  Dependencies: imports from [hashlib, json, pathlib, typing, pydantic, core/llm (LLM, LLMResponse, ToolCall), core/usage (TokenUsage)] | imported by [cli/commands/eval_commands.py] | tested by [tests/unit/test_co_eval_runs_in_parallel_and_offline.py]
+  Data flow: eval_commands wraps the agent's llm (and the judge's) in CassetteLLM → every complete()/structured_complete() is keyed by request_key(model, messages, tools, schema) → record: calls the real LLM and appends the answer under its key | replay: returns the next answer recorded under that key, never calling a provider → Cassette.save() writes `.co/evals/cassettes/<eval>.json`
+  State/Effects: one JSON file per eval file, so parallel workers never write the same cassette | a key seen twice in one run (the same question asked again) replays its answers in the order they were recorded
+  Integration: exposes MODES, Cassette (for_eval, load, save, take, put), CassetteLLM, CassetteMiss, request_key()
+  Performance: a replayed call is a dict lookup instead of a model round trip -- an eval suite replays in seconds
+  Errors: replay of a request the cassette never saw raises CassetteMiss (a LookupError) naming the eval and saying how to re-record | a missing cassette in replay mode is the same miss, on the first call | record mode lets provider errors through unchanged and records nothing for them
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+from ...core.llm import LLM, LLMResponse, ToolCall
+from ...core.usage import TokenUsage
+
+MODES = ("off", "record", "replay")
+
+
+class CassetteMiss(LookupError):
+    """Replay was asked for a response the cassette does not hold."""
+
+
+def request_key(model: str, messages: List[Dict[str, Any]], tools=None, schema: Optional[str] = None) -> str:
+    """A stable hash of everything that decides what the model answers.
+
+    Sorted keys and `default=str` make it independent of dict order and of
+    values json cannot spell, so the same request hashes the same in the
+    recording process and in a replay on another machine.
+    """
+    request = {"model": model, "messages": messages, "tools": list(tools or []), "schema": schema}
+    encoded = json.dumps(request, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """The LLM responses one eval file got, keyed by request."""
+
+    def __init__(self, path: Path, mode: str):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"cassette mode must be 'record' or 'replay', not {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.entries: Dict[str, List[Dict[str, Any]]] = {}
+        # Answers already handed out per key during this run, so a repeated
+        # question gets the second answer the second time, as it did live.
+        self._used: Dict[str, int] = {}
+
+    @classmethod
+    def for_eval(cls, eval_file: Path, mode: str) -> "Cassette":
+        """The cassette beside an eval file: .co/evals/cassettes/<stem>.json."""
+        eval_file = Path(eval_file)
+        cassette = cls(eval_file.parent / "cassettes" / f"{eval_file.stem}.json", mode)
+        if mode == "replay":
+            cassette.load()
+        return cassette
+
+    def load(self) -> None:
+        if self.path.exists():
+            self.entries = json.loads(self.path.read_text(encoding="utf-8")).get("entries", {})
+
+    def save(self) -> None:
+        """Write what was recorded. Replay never writes -- it only reads."""
+        if self.mode != "record":
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        body = {"version": 1, "entries": self.entries}
+        self.path.write_text(json.dumps(body, indent=1, ensure_ascii=False, sort_keys=True),
+                             encoding="utf-8")
+
+    def take(self, key: str) -> Dict[str, Any]:
+        """The next recorded answer for `key`."""
+        answers = self.entries.get(key, [])
+        index = self._used.get(key, 0)
+        if index >= len(answers):
+            raise CassetteMiss(
+                f"No recorded LLM response for this request in {self.path} "
+                f"(eval '{self.path.stem}'). The eval or the agent changed since "
+                f"it was recorded -- run `co eval {self.path.stem} --cassette record`."
+            )
+        self._used[key] = index + 1
+        return answers[index]
+
+    def put(self, key: str, answer: Dict[str, Any]) -> None:
+        # A fresh recording replaces the old one key by key as it is asked,
+        # rather than appending to answers from a previous recording.
+        if key not in self._used:
+            self.entries[key] = []
+            self._used[key] = 0
+        self.entries[key].append(answer)
+        self._used[key] += 1
+
+
+class CassetteLLM(LLM):
+    """An LLM that records another LLM's answers to a Cassette, or replays them.
+
+    In replay `inner` may be None: nothing is ever sent, so no provider, key or
+    network is needed. `model` then names the model the answers came from.
+    """
+
+    def __init__(self, inner: Optional[LLM], cassette: Cassette, model: Optional[str] = None):
+        if inner is None and cassette.mode == "record":
+            raise ValueError("recording needs the LLM whose answers it records")
+        self.inner = inner
+        self.cassette = cassette
+        self.model = model or getattr(inner, "model", "unknown")
+
+    def complete(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, **kwargs) -> LLMResponse:
+        key = request_key(self.model, messages, tools)
+        if self.cassette.mode == "replay":
+            return _response_from(self.cassette.take(key))
+        response = self.inner.complete(messages, tools=tools, **kwargs)
+        self.cassette.put(key, _response_to(response))
+        return response
+
+    def structured_complete(self, messages: List[Dict], output_schema: Type[BaseModel], **kwargs) -> BaseModel:
+        key = request_key(self.model, messages, schema=output_schema.__name__)
+        if self.cassette.mode == "replay":
+            return output_schema.model_validate(self.cassette.take(key)["structured"])
+        result = self.inner.structured_complete(messages, output_schema, **kwargs)
+        self.cassette.put(key, {"structured": result.model_dump(mode="json")})
+        return result
+
+    def __getattr__(self, name):
+        # Anything else the agent reads off its llm (context window, provider
+        # quirks) is the recorded model's. Only reached for missing attributes.
+        inner = self.__dict__.get("inner")
+        if inner is None:
+            raise AttributeError(name)
+        return getattr(inner, name)
+
+
+def _response_to(response: LLMResponse) -> Dict[str, Any]:
+    return {
+        "content": response.content,
+        "tool_calls": [
+            {"name": c.name, "arguments": c.arguments, "id": c.id, "extra_content": c.extra_content}
+            for c in response.tool_calls
+        ],
+        "usage": response.usage.model_dump() if response.usage else None,
+    }
+
+
+def _response_from(answer: Dict[str, Any]) -> LLMResponse:
+    usage = answer.get("usage")
+    return LLMResponse(
+        content=answer.get("content"),
+        tool_calls=[ToolCall(**call) for call in answer.get("tool_calls", [])],
+        raw_response=None,
+        # What the call cost when it was recorded, so a replayed run reports
+        # the same tokens as the live one it stands in for.
+        usage=TokenUsage(**usage) if usage else None,
+    )
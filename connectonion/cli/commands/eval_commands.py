@@ -1,9 +1,12 @@
 """
 Purpose: CLI command for running and managing evals
 LLM-Note:
-  Dependencies: imports from [pathlib, yaml, json, rich, importlib] | imported by [cli/main.py]
-  Data flow: handle_eval() → reads .co/evals/*.yaml → imports agent → runs with stored input → compares expected vs output
-  Integration: exposes handle_eval(name, run) for CLI
+  Dependencies: imports from [pathlib, contextlib, yaml, json, rich, importlib, concurrent.futures, core/stats.py, .eval_cassette] | imported by [cli/main.py] | tested by [tests/unit/test_co_eval_reports_what_it_did.py, tests/unit/test_co_eval_runs_in_parallel_and_offline.py]
+  Data flow: handle_eval() → reads .co/evals/*.yaml → _run_evals() runs each file via _run_eval_file() (in this process, or in a ProcessPoolExecutor with --jobs N) → imports agent → runs with stored input → compares expected vs output → one report per file → _show_run_report() then _show_eval_status()
+  State/Effects: rewrites each eval's YAML with its outputs | --cassette record writes .co/evals/cassettes/<eval>.json; replay only reads it
+  Integration: exposes handle_eval(name, agent_file, jobs, cassette) for CLI
+  Performance: --jobs N runs N eval files at once, each worker with its own agents | --cassette replay answers every agent and judge call from disk: no model, no network, no API key (the agent file is loaded with placeholder provider keys), same result every run
+  Errors: an eval that raises (agent, judge, or a cassette miss) is reported as an error and makes the exit code 1; the other evals still run
 
 Eval YAML format:
   - `turns`: List of inputs to send to agent sequentially (like a conversation).
@@ -12,10 +15,13 @@ Eval YAML format:
     or multiple turns to test conversation flow.
 """
 
+import contextlib
 import importlib.util
 import json
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -23,8 +29,12 @@ from typing import Optional
 import yaml
 from pydantic import BaseModel
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
 
+from ...core.stats import percentile
+from .eval_cassette import MODES, Cassette, CassetteLLM
+
 console = Console()
 
 
@@ -105,13 +115,25 @@ def is_run_record(data) -> bool:
     return "agent" not in data and "expected" not in data
 
 
-def handle_eval(name: Optional[str] = None, agent_file: Optional[str] = None):
+def handle_eval(name: Optional[str] = None, agent_file: Optional[str] = None,
+                jobs: int = 1, cassette: str = "off"):
     """Run evals and show results.
 
     Args:
         name: Optional specific eval name to run
         agent_file: Optional agent file path (overrides YAML setting)
+        jobs: Eval files to run at once, each in its own process (1 = in this one)
+        cassette: "off" calls the model; "record" calls it and saves its answers
+            to .co/evals/cassettes/; "replay" answers from those, offline
     """
+    if cassette not in MODES:
+        console.print(f"[red]Unknown cassette mode: {cassette}[/red] "
+                      f"[dim](one of: {', '.join(MODES)})[/dim]")
+        return 1
+    if jobs < 1:
+        console.print(f"[red]--jobs must be at least 1, not {jobs}[/red]")
+        return 1
+
     evals_dir = Path(".co/evals")
 
     if not evals_dir.exists():
@@ -151,8 +173,10 @@ def handle_eval(name: Optional[str] = None, agent_file: Optional[str] = None):
         console.print("[dim]An eval needs 'agent:' and 'expected:' — see docs/debug/eval.md[/dim]")
         return 1
 
-    eval_files = authored
-    _run_evals(eval_files, agent_file)
+    eval_files = sorted(authored)
+    start = time.monotonic()
+    reports = _run_evals(eval_files, agent_file, jobs=jobs, cassette=cassette)
+    _show_run_report(reports, int((time.monotonic() - start) * 1000), jobs, cassette)
 
     # Reload and show status
     if name:
@@ -160,123 +184,299 @@ def handle_eval(name: Optional[str] = None, agent_file: Optional[str] = None):
     else:
         eval_files = list(evals_dir.glob("*.yaml"))
 
-    return _show_eval_status(eval_files)
+    code = _show_eval_status(eval_files)
+    # An eval that crashed left its YAML as the previous run wrote it, so the
+    # table above can still show that run's pass. It did not pass this time.
+    if any(report['error'] for report in reports):
+        return 1
+    return code
+
 
+def _run_evals(eval_files: list, agent_override: Optional[str] = None,
+               jobs: int = 1, cassette: str = "off") -> list:
+    """Run agents for each eval and capture output; one report per eval file.
 
-def _run_evals(eval_files: list, agent_override: Optional[str] = None):
-    """Run agents for each eval and capture output."""
+    With jobs > 1 the files run in a process pool. Each worker loads its own
+    agents, so no two evals share an Agent, its session, or its tools' state.
+    Files are independent -- each writes only its own YAML and its own
+    cassette -- so they can finish in any order; the reports come back in the
+    order the files were given.
+    """
     cwd = os.getcwd()
-    agents_cache = {}  # Cache agents by file path
+    jobs = min(jobs, len(eval_files))
 
-    for eval_file in eval_files:
-        with open(eval_file, encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+    if jobs <= 1:
+        agents_cache = {}  # Cache agents by file path
+        reports = [_run_eval_file(eval_file, agent_override, cwd, cassette, agents_cache)
+                   for eval_file in eval_files]
+        console.print()
+        return reports
+
+    console.print(f"[cyan]Running {len(eval_files)} evals, {jobs} at a time[/cyan]")
+    reports = {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_start_worker) as pool:
+        futures = {
+            pool.submit(_run_eval_in_worker, str(eval_file), agent_override, cwd, cassette): eval_file
+            for eval_file in eval_files
+        }
+        for future in as_completed(futures):
+            eval_file = futures[future]
+            try:
+                report = future.result()
+            except Exception as e:
+                # The worker itself died (a segfault in a tool, an agent file
+                # that calls exit()). Only this eval is lost, not the run.
+                report = _new_report(eval_file)
+                report['error'] = f"{type(e).__name__}: {e}"
+            reports[eval_file] = report
+            _print_report_line(report)
+    console.print()
+    return [reports[eval_file] for eval_file in eval_files]
 
-        # Get agent file: CLI override > YAML > error
-        agent_file = agent_override or data.get('agent')
-        if not agent_file:
-            console.print(f"[red]No agent specified for {eval_file.stem}[/red]")
-            console.print(f"[dim]Add 'agent: agent.py' to the YAML or use --agent flag[/dim]")
-            continue
 
-        # A named agent file that is not there. This used to raise
-        # FileNotFoundError out of get_agent_from_file and end the run with a
-        # traceback -- worse than the exit-0 this issue is about, because it
-        # takes the other evals with it (#682).
-        if not (Path(cwd) / agent_file).exists() and not Path(agent_file).exists():
-            console.print(f"[red]Agent file not found for {eval_file.stem}: {agent_file}[/red]")
-            continue
+# One set of loaded agents per worker process, reused by every eval it runs.
+_worker_agents: dict = {}
+
+
+def _start_worker():
+    """Pool initializer: workers report through their result, not the terminal.
+
+    Twelve evals printing turn by turn into one terminal interleave into
+    nothing readable; the parent prints a line per eval as each one lands.
+    """
+    global console
+    console = Console(quiet=True)
+
+
+def _run_eval_in_worker(eval_file: str, agent_override: Optional[str], cwd: str, cassette: str) -> dict:
+    return _run_eval_file(Path(eval_file), agent_override, cwd, cassette, _worker_agents)
+
+
+def _new_report(eval_file: Path) -> dict:
+    return {
+        'eval': Path(eval_file).stem,
+        'turns': 0,
+        'passed': 0,
+        'failed': 0,
+        'tokens': 0,
+        'cost': 0.0,
+        'duration_ms': 0,
+        'skipped': None,
+        'error': None,
+    }
+
+
+def _run_eval_file(eval_file: Path, agent_override: Optional[str], cwd: str,
+                   cassette: str, agents_cache: dict) -> dict:
+    """Run one eval file's turns, write the results back to it, and report.
 
-        # Load agent (cached)
-        if agent_file not in agents_cache:
-            console.print(f"[cyan]Loading:[/cyan] {agent_file}")
+    An exception from the agent or the judge ends this eval, not the run: it
+    is the report's `error`, and the YAML keeps what the previous run wrote.
+    """
+    report = _new_report(eval_file)
+    start = time.monotonic()
+    try:
+        _run_turns(eval_file, agent_override, cwd, cassette, agents_cache, report)
+    except Exception as e:
+        report['error'] = f"{type(e).__name__}: {e}"
+        console.print(f"[red]✗ {eval_file.stem} failed: {escape(report['error'])}[/red]")
+        console.print()
+    report['duration_ms'] = int((time.monotonic() - start) * 1000)
+    return report
+
+
+def _run_turns(eval_file: Path, agent_override: Optional[str], cwd: str,
+               cassette: str, agents_cache: dict, report: dict):
+    with open(eval_file, encoding="utf-8") as f:
+        data = yaml.safe_load(f)
+
+    # Get agent file: CLI override > YAML > error
+    agent_file = agent_override or data.get('agent')
+    if not agent_file:
+        console.print(f"[red]No agent specified for {eval_file.stem}[/red]")
+        console.print(f"[dim]Add 'agent: agent.py' to the YAML or use --agent flag[/dim]")
+        report['skipped'] = "no agent specified"
+        return
+
+    # A named agent file that is not there. This used to raise
+    # FileNotFoundError out of get_agent_from_file and end the run with a
+    # traceback -- worse than the exit-0 this issue is about, because it
+    # takes the other evals with it (#682).
+    if not (Path(cwd) / agent_file).exists() and not Path(agent_file).exists():
+        console.print(f"[red]Agent file not found for {eval_file.stem}: {agent_file}[/red]")
+        report['skipped'] = f"agent file not found: {agent_file}"
+        return
+
+    # Load agent (cached). Replay builds it with stand-in provider keys: the
+    # file's Agent(model=...) constructs its provider, which refuses to exist
+    # without a key, yet replay never lets it send a request.
+    if agent_file not in agents_cache:
+        console.print(f"[cyan]Loading:[/cyan] {agent_file}")
+        keys = _placeholder_provider_keys() if cassette == "replay" else contextlib.nullcontext()
+        with keys:
             agents_cache[agent_file] = get_agent_from_file(agent_file, cwd)
-        agent = agents_cache[agent_file]
+    agent = agents_cache[agent_file]
+
+    turns = data.get('turns', [])
+    if not turns:
+        console.print(f"[yellow]No turns found in {eval_file.stem}[/yellow]")
+        report['skipped'] = "no turns"
+        return
+
+    console.print(f"[cyan]Running:[/cyan] {eval_file.stem}")
+
+    # Reset agent session for fresh state each eval
+    agent.reset_conversation()
+
+    # The agent's llm is swapped for the length of this eval only: the agent
+    # is cached and the next eval has its own cassette.
+    tape = Cassette.for_eval(eval_file, cassette) if cassette != "off" else None
+    agent_llm = agent.llm
+    judge_llm = None
+    if tape is not None:
+        agent.llm = CassetteLLM(agent_llm, tape)
+        judge_llm = _judge_llm(tape)
+
+    try:
+        file_modified = _run_turn_list(agent, data, turns, judge_llm, report)
+    finally:
+        agent.llm = agent_llm
+
+    # Saved only once every turn got its answer: a recording cut short by an
+    # error would replace a good cassette with half of one.
+    if tape is not None:
+        tape.save()
+
+    if file_modified:
+        # Update runs count and save
+        data['runs'] = data.get('runs', 0) + 1
+        data['updated'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(eval_file, 'w', encoding="utf-8") as f:
+            yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+
+    console.print(f"[green]✓[/green] {eval_file.stem} completed")
+    console.print()
+
 
-        turns = data.get('turns', [])
-        if not turns:
-            console.print(f"[yellow]No turns found in {eval_file.stem}[/yellow]")
+def _run_turn_list(agent, data: dict, turns: list, judge_llm, report: dict) -> bool:
+    """Send each turn's input to the agent and record what came back."""
+    file_modified = False
+    for turn in turns:
+        input_text = turn.get('input', '')
+        if not input_text:
             continue
 
-        console.print(f"[cyan]Running:[/cyan] {eval_file.stem}")
-
-        # Reset agent session for fresh state each eval
-        agent.reset_conversation()
-
-        file_modified = False
-        for turn in turns:
-            input_text = turn.get('input', '')
-            if not input_text:
-                continue
-
-            # Show input (truncated)
-            display_input = input_text[:60] + "..." if len(input_text) > 60 else input_text
-            console.print(f"  [dim]input:[/dim] {display_input}")
-
-            # Run agent and capture result
-            result = agent.input(input_text)
-
-            # Extract tools_called and metrics from agent session
-            summary = summarise_run(agent.current_session.get('trace', []),
-                                    agent.logger._format_tool_call)
-            tools_called = summary['tools_called']
-            total_tokens = summary['tokens']
-            total_cost = summary['cost']
-
-            # Build history as JSON array string (compact, easy to scan)
-            history_str = turn.get('history', '[]')
-            history = json.loads(history_str) if isinstance(history_str, str) else []
-            if turn.get('output'):
-                history.insert(0, {
-                    "ts": turn.get('ts', ''),
-                    "pass": turn.get('pass'),
-                    "tokens": turn.get('tokens', 0),
-                    "cost": turn.get('cost', 0)
-                })
-
-            # Store result in turn
-            turn['output'] = result
-            turn['tools_called'] = tools_called
-            turn['tokens'] = total_tokens
-            turn['cost'] = round(total_cost, 4)
-            turn['ts'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            turn['run'] = data.get('runs', 0) + 1
-            # Format history as multi-line JSON for readability
-            if history:
-                lines = [json.dumps(h) for h in history]
-                turn['history'] = "[\n" + ",\n".join(lines) + "]"
-            else:
-                turn['history'] = "[]"
-            file_modified = True
+        # Show input (truncated)
+        display_input = input_text[:60] + "..." if len(input_text) > 60 else input_text
+        console.print(f"  [dim]input:[/dim] {display_input}")
+
+        # Run agent and capture result
+        result = agent.input(input_text)
+
+        # Extract tools_called and metrics from agent session
+        summary = summarise_run(agent.current_session.get('trace', []),
+                                agent.logger._format_tool_call)
+        tools_called = summary['tools_called']
+        total_tokens = summary['tokens']
+        total_cost = summary['cost']
+
+        # Build history as JSON array string (compact, easy to scan)
+        history_str = turn.get('history', '[]')
+        history = json.loads(history_str) if isinstance(history_str, str) else []
+        if turn.get('output'):
+            history.insert(0, {
+                "ts": turn.get('ts', ''),
+                "pass": turn.get('pass'),
+                "tokens": turn.get('tokens', 0),
+                "cost": turn.get('cost', 0)
+            })
+
+        # Store result in turn
+        turn['output'] = result
+        turn['tools_called'] = tools_called
+        turn['tokens'] = total_tokens
+        turn['cost'] = round(total_cost, 4)
+        turn['ts'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        turn['run'] = data.get('runs', 0) + 1
+        # Format history as multi-line JSON for readability
+        if history:
+            lines = [json.dumps(h) for h in history]
+            turn['history'] = "[\n" + ",\n".join(lines) + "]"
+        else:
+            turn['history'] = "[]"
+        file_modified = True
+
+        # The trace totals are the session's so far, so the last turn's are
+        # the eval's.
+        report['turns'] += 1
+        report['tokens'] = total_tokens
+        report['cost'] = round(total_cost, 4)
+
+        # Judge immediately if expected exists
+        expected = turn.get('expected', '')
+        if expected:
+            judge = _judge_with_llm(expected, result, input_text, llm=judge_llm)
+            turn['pass'] = judge.passed
+            turn['analysis'] = judge.analysis
+            report['passed' if judge.passed else 'failed'] += 1
+            status = "[green]✓[/green]" if judge.passed else "[red]✗[/red]"
+            console.print(f"  {status} {judge.analysis[:60]}...")
+        else:
+            # Show output (truncated)
+            display_output = result[:60] + "..." if len(result) > 60 else result
+            console.print(f"  [green]output:[/green] {display_output}")
+
+    return file_modified
+
+
+# Every variable a provider in core/llm.py reads its key from.
+_PROVIDER_KEY_ENV_VARS = (
+    "OPENONION_API_KEY", "OPENAI_API_KEY", "ANTHROPIC_API_KEY", "GEMINI_API_KEY",
+    "GROQ_API_KEY", "XAI_API_KEY", "OPENROUTER_API_KEY", "MISTRAL_API_KEY",
+)
+_PLACEHOLDER_KEY = "co-eval-replay"
+
+
+@contextlib.contextmanager
+def _placeholder_provider_keys():
+    """Set every unset provider key to a placeholder, then unset them again.
+
+    Only for loading an agent file under replay, where the provider it builds
+    is wrapped in a replaying CassetteLLM before it is asked anything. Keys
+    that are set are left alone, and only the ones set here are removed.
+    """
+    added = [name for name in _PROVIDER_KEY_ENV_VARS if not os.environ.get(name)]
+    for name in added:
+        os.environ[name] = _PLACEHOLDER_KEY
+    try:
+        yield
+    finally:
+        for name in added:
+            os.environ.pop(name, None)
 
-            # Judge immediately if expected exists
-            expected = turn.get('expected', '')
-            if expected:
-                judge = _judge_with_llm(expected, result, input_text)
-                turn['pass'] = judge.passed
-                turn['analysis'] = judge.analysis
-                status = "[green]✓[/green]" if judge.passed else "[red]✗[/red]"
-                console.print(f"  {status} {judge.analysis[:60]}...")
-            else:
-                # Show output (truncated)
-                display_output = result[:60] + "..." if len(result) > 60 else result
-                console.print(f"  [green]output:[/green] {display_output}")
-
-        if file_modified:
-            # Update runs count and save
-            data['runs'] = data.get('runs', 0) + 1
-            data['updated'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(eval_file, 'w', encoding="utf-8") as f:
-                yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
-
-        console.print(f"[green]✓[/green] {eval_file.stem} completed")
-        console.print()
 
-    console.print()
+def _judge_llm(tape: Cassette) -> CassetteLLM:
+    """The judge's model behind the eval's cassette.
+
+    Replay builds no provider at all -- that is what lets it run where there is
+    no key and no network.
+    """
+    from ...core.llm import create_llm
+    from ...core.usage import DEFAULT_MODEL
+
+    # Keyed by the name llm_do is given, not the provider's own spelling of it
+    # ("co/" is stripped), so recording and replay agree on the key.
+    if tape.mode == "replay":
+        return CassetteLLM(None, tape, model=DEFAULT_MODEL)
+    return CassetteLLM(create_llm(DEFAULT_MODEL), tape, model=DEFAULT_MODEL)
 
 
-def _judge_with_llm(expected: str, output: str, input_text: str) -> JudgeResult:
-    """Use LLM to judge if output matches expected."""
+def _judge_with_llm(expected: str, output: str, input_text: str, llm=None) -> JudgeResult:
+    """Use LLM to judge if output matches expected.
+
+    `llm` is the cassette's judge when one is in use; otherwise llm_do picks
+    the default model.
+    """
     from connectonion import llm_do
 
     prompt = f"""You are an eval judge. Determine if the agent's output satisfies the expected criteria.
@@ -290,7 +490,84 @@ Does the output satisfy the expected criteria? Consider:
 - Key information presence
 - Intent fulfillment
 """
-    return llm_do(prompt, output=JudgeResult)
+    if llm is None:
+        return llm_do(prompt, output=JudgeResult)
+    # The messages llm_do would have sent, so a recorded judge and a live one
+    # are asked exactly the same thing.
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": prompt},
+    ]
+    return llm.structured_complete(messages, JudgeResult)
+
+
+def _print_report_line(report: dict):
+    """One line per eval as it lands, for runs whose workers cannot print."""
+    seconds = report['duration_ms'] / 1000
+    if report['error']:
+        console.print(f"[red]✗[/red] {report['eval']} [red]{escape(report['error'])}[/red]")
+    elif report['skipped']:
+        console.print(f"[yellow]–[/yellow] {report['eval']} [dim]skipped: {report['skipped']}[/dim]")
+    else:
+        console.print(f"[green]✓[/green] {report['eval']} [dim]{report['turns']} turn(s), "
+                      f"{seconds:.1f}s, {report['tokens']} tokens[/dim]")
+
+
+def _show_run_report(reports: list, wall_ms: int, jobs: int, cassette: str = "off"):
+    """Per-eval latency, tokens and pass rate, and the run's totals.
+
+    Pass rate is over judged turns only: a turn with no `expected` was run but
+    not checked, and counting it either way would misstate the suite.
+    """
+    table = Table(title="Eval Run", show_header=True)
+    table.add_column("Eval", style="cyan")
+    table.add_column("Turns", justify="right")
+    table.add_column("Pass rate", justify="right")
+    table.add_column("Latency", justify="right")
+    table.add_column("Tokens", justify="right")
+    table.add_column("Cost", justify="right")
+
+    for report in reports:
+        judged = report['passed'] + report['failed']
+        if report['error']:
+            rate = "[red]error[/red]"
+        elif report['skipped']:
+            rate = "[yellow]skipped[/yellow]"
+        elif judged:
+            rate = f"{report['passed']}/{judged}"
+        else:
+            rate = "[dim]—[/dim]"
+        table.add_row(
+            report['eval'],
+            str(report['turns']),
+            rate,
+            f"{report['duration_ms'] / 1000:.1f}s",
+            str(report['tokens']),
+            f"${report['cost']:.4f}",
+        )
+
+    console.print(table)
+
+    ran = [r for r in reports if not r['error'] and not r['skipped']]
+    latencies = sorted(r['duration_ms'] for r in ran)
+    passed = sum(r['passed'] for r in reports)
+    judged = passed + sum(r['failed'] for r in reports)
+    parts = [f"{len(reports)} eval(s) in {wall_ms / 1000:.1f}s, {min(jobs, max(len(reports), 1))} at a time"]
+    if latencies:
+        parts.append(f"p50 {percentile(latencies, 50) / 1000:.1f}s, "
+                     f"p95 {percentile(latencies, 95) / 1000:.1f}s per eval")
+    parts.append(f"{sum(r['tokens'] for r in reports)} tokens")
+    if judged:
+        parts.append(f"{passed}/{judged} passed ({passed * 100 // judged}%)")
+    errors = sum(1 for r in reports if r['error'])
+    if errors:
+        parts.append(f"[red]{errors} error(s)[/red]")
+    if cassette == "replay":
+        parts.append("replayed from cassettes")
+    elif cassette == "record":
+        parts.append("recorded to .co/evals/cassettes/")
+    console.print("[dim]" + " · ".join(parts) + "[/dim]", soft_wrap=True)
+    console.print()
 
 
 def _show_eval_status(eval_files: list) -> int:
@@ -401,6 +401,8 @@ def copy(
 def eval(
     name: Optional[str] = typer.Argument(None, help="Specific eval name"),
     agent: Optional[str] = typer.Option(None, "--agent", "-a", help="Agent file (overrides YAML)"),
+    jobs: int = typer.Option(1, "--jobs", "-j", min=1, help="Eval files to run at once, each in its own process"),
+    cassette: str = typer.Option("off", "--cassette", help="off | record (save LLM answers) | replay (offline, from saved answers)"),
 ):
     """Run evals and show results."""
     from .commands.eval_commands import handle_eval
@@ -408,7 +410,7 @@ def eval(
     # The exit code is the point of #682: `co eval` returned 0 after a run
     # where nothing executed. Discarding it here would leave that fix
     # unreachable from a shell, which is where CI reads it.
-    raise typer.Exit(code=handle_eval(name=name, agent_file=agent) or 0)
+    raise typer.Exit(code=handle_eval(name=name, agent_file=agent, jobs=jobs, cassette=cassette) or 0)
 
 
 @app.command()
@@ -35,7 +35,7 @@ from .events import (
     on_complete,
     on_stop_signal,
 )
-from .tool_factory import create_tool_from_function, extract_methods_from_instance, is_class_instance
+from .tool_factory import create_tool_from_function, extract_methods_from_instance, is_class_instance, parallel_safe
 from .tool_registry import ToolRegistry
 from .tool_executor import execute_and_record_tools, execute_single_tool
 from .usage import TokenUsage, calculate_cost, get_context_limit
@@ -62,6 +62,7 @@ __all__ = [
     "create_tool_from_function",
     "extract_methods_from_instance",
     "is_class_instance",
+    "parallel_safe",
     "ToolRegistry",
     "execute_and_record_tools",
     "execute_single_tool",
@@ -2,15 +2,17 @@
 Purpose: Orchestrate AI agent execution with LLM calls, tool execution, and automatic logging
 LLM-Note:
   Dependencies: imports from [llm.py, tool_factory.py, prompts.py, decorators.py, logger.py, tool_executor.py, tool_registry.py, wire_events.py] | imported by [__init__.py, debug_agent/__init__.py] | tested by [tests/unit/test_agent.py, tests/test_agent_prompts.py, tests/test_agent_workflows.py, tests/unit/test_wire_events.py]
-  Data flow: receives user prompt: str from Agent.input() → creates/extends current_session with messages → calls llm.complete() with tool schemas → receives LLMResponse with tool_calls → executes tools via tool_executor.execute_and_record_tools() → appends tool results to messages → repeats loop until no tool_calls or max_iterations → logger logs to .co/logs/{name}.log and .co/evals/{name}.yaml → returns final response: str
+  Data flow: receives user prompt: str from Agent.input() → creates/extends current_session with messages → calls llm.complete() with tool schemas (llm.stream() when io is connected, forwarding llm_delta events) → receives LLMResponse with tool_calls → executes tools via tool_executor.execute_and_record_tools() → appends tool results to messages → repeats loop until no tool_calls or max_iterations → logger logs to .co/logs/{name}.log and .co/evals/{name}.yaml → returns final response: str
   State/Effects: modifies self.current_session['messages', 'trace', 'turn', 'iteration'] | writes to .co/logs/{name}.log and .co/evals/ via logger.py | streams a detached OIP-normalized copy without changing canonical trace statuses
-  Integration: exposes Agent(name, tools, system_prompt, model, log, quiet), .input(prompt), .execute_tool(name, args), .add_tool(func), .remove_tool(name), .list_tools(), .reset_conversation() | tools stored in ToolRegistry with attribute access (agent.tools.tool_name) and instance storage (agent.tools.gmail) | tool execution delegates to tool_executor module | log defaults to .co/logs/ (None), can be True (current dir), False (disabled), or custom path | quiet=True suppresses console but keeps eval logging | trust enforcement moved to host() for network access control
-  Performance: max_iterations=100 default (configurable per-input) | session state persists across turns for multi-turn conversations | ToolRegistry provides O(1) tool lookup via .get() or attribute access
+  Integration: exposes Agent(name, tools, system_prompt, model, max_parallel_tools, prompt_caching, log, quiet), .input(prompt), await .input_async(prompt), .execute_tool(name, args), .add_tool(func), .remove_tool(name), .list_tools(), .reset_conversation() | tools stored in ToolRegistry with attribute access (agent.tools.tool_name) and instance storage (agent.tools.gmail) | tool execution delegates to tool_executor module | log defaults to .co/logs/ (None), can be True (current dir), False (disabled), or custom path | quiet=True suppresses console but keeps eval logging | trust enforcement moved to host() for network access control
+  Performance: max_iterations=100 default (configurable per-input) | input_async() awaits LLM.acomplete and coroutine tools on the caller's loop, so concurrent io-less sessions share one thread (plain tools go to worker threads) | session state persists across turns for multi-turn conversations | ToolRegistry provides O(1) tool lookup via .get() or attribute access | provider copies of messages (and the Anthropic conversion) are cached per message id, or per history position for messages without one, so an iteration converts only the new tail
   Errors: LLM errors bubble up | tool execution errors captured in trace and returned to LLM for retry
 """
 
+import asyncio
 import base64
 import os
+import threading
 import time
 from contextlib import suppress
 from pathlib import Path
@@ -23,14 +25,78 @@ from .approval_modes import normalize_runtime_approval_session
 from .events import EventHandler
 from .interrupt import run_interruptible
 from .llm import LLM, TokenUsage, create_llm
-from .provider_messages import messages_for_provider
-from .tool_executor import execute_and_record_tools, execute_single_tool
+from .provider_messages import ProviderMessageCache, messages_for_provider
+from .tool_executor import execute_and_record_tools, execute_and_record_tools_async, execute_single_tool
 from .tool_factory import create_tool_from_function, extract_methods_from_instance, is_class_instance
 from .tool_registry import ToolRegistry
-from .usage import DEFAULT_MODEL, get_context_limit, turn_usage_from_trace
+from .usage import DEFAULT_MODEL, cache_hit_ratio, get_context_limit, turn_usage_from_trace
 from .wire_events import normalize_wire_event
 
 
+# _end_iteration's answer when a plugin accepted follow-up work after the
+# final response: the turn continues with one more iteration of budget.
+_ONE_MORE_ITERATION = object()
+
+# How much streamed output one llm_delta event carries. Every event io.send()s
+# is kept in WebSocketIO's replay log for the session, so a long answer sent
+# token by token would leave thousands of entries to hold and replay on
+# reconnect; batching keeps it to a few per second at the cost of that much
+# latency on screen.
+_DELTA_FLUSH_SECONDS = 0.1
+_DELTA_FLUSH_CHARS = 2048
+
+
+class _DeltaBuffer:
+    """Coalesces consecutive stream chunks into fewer llm_delta events.
+
+    Text joins text; tool-call chunks join while they are for the same call
+    index, keeping the first id and name seen. A chunk of another kind or
+    call, a full buffer, or enough time since the last send flushes what is
+    held, so the deltas still arrive in stream order and concatenate to
+    exactly what the provider streamed.
+    """
+
+    def __init__(self, send: Callable[[dict], None], llm_id: str):
+        self._send = send
+        self._llm_id = llm_id
+        self._key = None
+        self._parts: list[str] = []
+        self._size = 0
+        self._call: dict | None = None
+        self._last_flush = time.monotonic()
+
+    def add(self, chunk) -> None:
+        key = 'text' if chunk.kind == 'text' else ('tool_call', chunk.index)
+        if key != self._key:
+            self.flush()
+            self._key = key
+            if chunk.kind == 'tool_call':
+                self._call = {'index': chunk.index, 'id': chunk.id, 'name': chunk.name}
+        elif self._call is not None:
+            self._call['id'] = self._call['id'] or chunk.id
+            self._call['name'] = self._call['name'] or chunk.name
+        piece = (chunk.text if chunk.kind == 'text' else chunk.arguments) or ''
+        self._parts.append(piece)
+        self._size += len(piece)
+        if (self._size >= _DELTA_FLUSH_CHARS
+                or time.monotonic() - self._last_flush >= _DELTA_FLUSH_SECONDS):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._key is None:
+            return
+        joined = ''.join(self._parts)
+        if self._call is not None:
+            self._send({'type': 'llm_delta', 'llm_id': self._llm_id,
+                        'tool_call': {**self._call, 'arguments': joined}})
+            # Later chunks of this call carry only arguments, as streamed.
+            self._call = {'index': self._call['index'], 'id': None, 'name': None}
+        elif joined:
+            self._send({'type': 'llm_delta', 'llm_id': self._llm_id, 'text': joined})
+        self._parts, self._size = [], 0
+        self._last_flush = time.monotonic()
+
+
 def _normalized_plan(entries: Any) -> list[dict[str, str]]:
     if not isinstance(entries, list):
         raise ValueError("Plan entries must be a list")
@@ -75,15 +141,24 @@ class Agent:
         on_events: Optional[List[EventHandler]] = None,
         co_dir: Optional[Union[str, Path]] = None,
         state_dir: Optional[Union[str, Path]] = None,
+        max_parallel_tools: int = 1,
+        prompt_caching: bool = False,
     ):
         self.name = name
         self.co_dir = Path(co_dir) if co_dir else Path(".co")
         self.system_prompt = load_system_prompt(system_prompt)
         self.max_iterations = max_iterations
+        # Worker count for tools marked @parallel_safe within one LLM response.
+        # 1 (the default) keeps every batch strictly sequential.
+        self.max_parallel_tools = max_parallel_tools
 
         # Current session context (runtime only)
         self.current_session = None
 
+        # Provider copies of session messages, reused across iterations until
+        # a message changes or leaves the history.
+        self._message_cache = ProviderMessageCache()
+
         # I/O to client (None locally, injected by host() for WebSocket)
         self.io = None
 
@@ -177,7 +252,11 @@ class Agent:
             # - Anthropic models check ANTHROPIC_API_KEY
             # - Google models check GOOGLE_API_KEY
             # - co/ models check OPENONION_API_KEY
-            self.llm = create_llm(model=model, api_key=api_key)
+            # prompt_caching marks the system prompt, tools and settled history
+            # as cacheable (Anthropic) or keys the prefix cache (OpenAI); other
+            # providers ignore it. Only passed when asked for.
+            extra = {"prompt_caching": True} if prompt_caching else {}
+            self.llm = create_llm(model=model, api_key=api_key, **extra)
 
         # Fire on_agent_ready event (agent is fully initialized and ready to use)
         # Plugins can: add tools, modify system_prompt, initialize state
@@ -305,6 +384,57 @@ class Agent:
         Returns:
             The agent's response after processing the input
         """
+        turn = self._begin_turn(prompt, session)
+        try:
+            self._open_turn(turn, prompt, images, files, _upload_reservation)
+
+            # Process
+            result, reason = self._run_iteration_loop(
+                max_iterations or self.max_iterations
+            )
+            self._close_turn(result, reason)
+        except BaseException as error:
+            self._fail_turn(turn, error)
+            raise
+
+        return self._end_turn(turn, prompt, result, reason)
+
+    async def input_async(self, prompt: str, max_iterations: Optional[int] = None,
+                          session: Optional[Dict] = None, images: list[str] | None = None,
+                          files: list[dict] | None = None) -> str:
+        """input() for callers on an asyncio event loop.
+
+        The turn is the same turn -- session, trace, hooks and logs are
+        identical -- but the provider call is awaited (LLM.acomplete) and
+        coroutine tools run on this loop rather than on a thread of their
+        own, so one process can hold many mostly-waiting sessions without an
+        OS thread each. Plain-function tools still run on a worker thread and
+        event handlers run inline.
+
+        Use one Agent per concurrent session; an Agent holds one
+        current_session. An agent with io attached (hosted) runs input() on a
+        worker thread, since its approval gates and interrupt mailbox block.
+        """
+        if self.io is not None:
+            return await asyncio.to_thread(
+                self.input, prompt, max_iterations, session, images, files
+            )
+
+        turn = self._begin_turn(prompt, session)
+        try:
+            self._open_turn(turn, prompt, images, files, None)
+            result, reason = await self._run_iteration_loop_async(
+                max_iterations or self.max_iterations
+            )
+            self._close_turn(result, reason)
+        except BaseException as error:
+            self._fail_turn(turn, error)
+            raise
+
+        return self._end_turn(turn, prompt, result, reason)
+
+    def _begin_turn(self, prompt: str, session: Optional[Dict]) -> Dict[str, Any]:
+        """Restore or start the session and count the turn."""
         if self.logger.console:
             self.logger.console.print_task(prompt)
 
@@ -342,134 +472,138 @@ class Agent:
         # work, hooks, and their failures all receive one terminal outcome.
         self.current_session['turn'] += 1
         self.current_session['user_prompt'] = prompt  # Store user prompt for xray/debugging
-        turn_start = time.time()
-        turn_trace_start = len(self.current_session['trace'])
+        return {
+            'start': time.time(),
+            'trace_start': len(self.current_session['trace']),
+            'start_logger_session': start_logger_session,
+            'logger_session_id': logger_session_id,
+        }
+
+    def _open_turn(self, turn: Dict[str, Any], prompt: str, images: list[str] | None,
+                   files: list[dict] | None, _upload_reservation: Any) -> None:
+        """Record the user's input and staged files, then fire after_user_input."""
+        if turn['start_logger_session']:
+            self.logger.start_session(
+                self.system_prompt,
+                session_id=turn['logger_session_id'],
+            )
+
+        # Add user message to conversation (multimodal if images provided)
+        if images:
+            content = [{"type": "text", "text": prompt}]
+            for img in images:
+                content.append({"type": "image_url", "image_url": {"url": img}})
+            self.current_session['messages'].append({"role": "user", "content": content})
+        else:
+            self.current_session['messages'].append({"role": "user", "content": prompt})
+
+        # Record only after messages contains this turn. The following
+        # session_sync must never expose a trace ahead of its source state.
+        self._record_trace({
+            'type': 'user_input',
+            'content': prompt,
+            'turn': self.current_session['turn'],
+            'ts': turn['start'],
+        })
 
+        # Save uploaded files to .co/uploads/ and build file path references.
+        saved_files = []
         try:
-            if start_logger_session:
-                self.logger.start_session(
-                    self.system_prompt,
-                    session_id=logger_session_id,
+            if files:
+                # A hosted OIP session can bind this private staging root to the
+                # authenticated principal that owns the session. Other Agent
+                # entry points retain the historical project/global .co root.
+                uploads_dir = Path(
+                    getattr(self, "_upload_dir", self.logger.co_dir / "uploads")
                 )
-
-            # Add user message to conversation (multimodal if images provided)
-            if images:
-                content = [{"type": "text", "text": prompt}]
-                for img in images:
-                    content.append({"type": "image_url", "image_url": {"url": img}})
-                self.current_session['messages'].append({"role": "user", "content": content})
-            else:
-                self.current_session['messages'].append({"role": "user", "content": prompt})
-
-            # Record only after messages contains this turn. The following
-            # session_sync must never expose a trace ahead of its source state.
+                uploads_dir.mkdir(parents=True, exist_ok=True)
+                pending_files = []
+                for f in files:
+                    safe_name = Path(f["name"]).name
+                    file_path = uploads_dir / f"{uuid4().hex}_{safe_name}"
+                    data_url = f["data"]
+                    if "," in data_url:
+                        raw_data = base64.b64decode(data_url.split(",", 1)[1])
+                    else:
+                        raw_data = base64.b64decode(data_url)
+                    pending_files.append((file_path, raw_data))
+
+                written_files = []
+                try:
+                    for file_path, raw_data in pending_files:
+                        file_path.write_bytes(raw_data)
+                        written_files.append(file_path)
+                except BaseException:
+                    # write_bytes can create a partial file before raising.
+                    # UUID paths are owned by this turn, so clean every target,
+                    # not only calls that returned successfully.
+                    for file_path, _raw_data in pending_files:
+                        with suppress(Exception):
+                            file_path.unlink(missing_ok=True)
+                    raise
+                saved_files = [str(path.resolve()) for path in written_files]
+
+        finally:
+            # Hosted input holds a principal quota lock only while files are
+            # staged. Model work, approvals, and commits must remain concurrent.
+            if _upload_reservation is not None:
+                _upload_reservation.release()
+
+        if saved_files:
             self._record_trace({
-                'type': 'user_input',
-                'content': prompt,
+                'type': 'files_received',
+                'files': [{'name': Path(p).name, 'path': p} for p in saved_files],
                 'turn': self.current_session['turn'],
-                'ts': turn_start,
+                'ts': time.time(),
             })
-
-            # Save uploaded files to .co/uploads/ and build file path references.
-            saved_files = []
-            try:
-                if files:
-                    # A hosted OIP session can bind this private staging root to the
-                    # authenticated principal that owns the session. Other Agent
-                    # entry points retain the historical project/global .co root.
-                    uploads_dir = Path(
-                        getattr(self, "_upload_dir", self.logger.co_dir / "uploads")
-                    )
-                    uploads_dir.mkdir(parents=True, exist_ok=True)
-                    pending_files = []
-                    for f in files:
-                        safe_name = Path(f["name"]).name
-                        file_path = uploads_dir / f"{uuid4().hex}_{safe_name}"
-                        data_url = f["data"]
-                        if "," in data_url:
-                            raw_data = base64.b64decode(data_url.split(",", 1)[1])
-                        else:
-                            raw_data = base64.b64decode(data_url)
-                        pending_files.append((file_path, raw_data))
-
-                    written_files = []
-                    try:
-                        for file_path, raw_data in pending_files:
-                            file_path.write_bytes(raw_data)
-                            written_files.append(file_path)
-                    except BaseException:
-                        # write_bytes can create a partial file before raising.
-                        # UUID paths are owned by this turn, so clean every target,
-                        # not only calls that returned successfully.
-                        for file_path, _raw_data in pending_files:
-                            with suppress(Exception):
-                                file_path.unlink(missing_ok=True)
-                        raise
-                    saved_files = [str(path.resolve()) for path in written_files]
-
-            finally:
-                # Hosted input holds a principal quota lock only while files are
-                # staged. Model work, approvals, and commits must remain concurrent.
-                if _upload_reservation is not None:
-                    _upload_reservation.release()
-
-            if saved_files:
-                self._record_trace({
-                    'type': 'files_received',
-                    'files': [{'name': Path(p).name, 'path': p} for p in saved_files],
-                    'turn': self.current_session['turn'],
-                    'ts': time.time(),
-                })
-                if self.logger.console:
-                    names = [Path(path).name for path in saved_files]
-                    self.logger.console.print(
-                        f"  [dim]↑ {len(saved_files)} file(s): {', '.join(names)}[/dim]"
-                    )
-                # File paths are internal context, not part of the user's text.
-                from ..useful_plugins.system_reminder import reminder_message
-
-                file_list = "\n".join(f"- {path}" for path in saved_files)
-                upload_notice = (
-                    f"The user uploaded the following files:\n{file_list}\n"
-                    "Use your read_file tool or other available tools to read the file "
-                    "contents before responding. Do not assume or guess the contents."
-                )
-                self.current_session['messages'].append(
-                    reminder_message(upload_notice)
+            if self.logger.console:
+                names = [Path(path).name for path in saved_files]
+                self.logger.console.print(
+                    f"  [dim]↑ {len(saved_files)} file(s): {', '.join(names)}[/dim]"
                 )
-
-            # Invoke after_user_input events
-            self._invoke_events('after_user_input')
-
-            # Process
-            self.current_session['iteration'] = 0  # Reset iteration for this turn
-            result, reason = self._run_iteration_loop(
-                max_iterations or self.max_iterations
+            # File paths are internal context, not part of the user's text.
+            from ..useful_plugins.system_reminder import reminder_message
+
+            file_list = "\n".join(f"- {path}" for path in saved_files)
+            upload_notice = (
+                f"The user uploaded the following files:\n{file_list}\n"
+                "Use your read_file tool or other available tools to read the file "
+                "contents before responding. Do not assume or guess the contents."
+            )
+            self.current_session['messages'].append(
+                reminder_message(upload_notice)
             )
 
-            self.current_session['result'] = result
-
-            self._invoke_events('on_complete')
-            # A broken adapter must not turn completed work into a retryable
-            # failure merely because best-effort stale-signal cleanup failed.
-            with suppress(Exception):
-                self._drain_completed_turn_interrupt(reason)
-        except BaseException as error:
-            # Outcome streaming must not replace the exception that ended the
-            # turn. _record_trace appends before sending, so a failing adapter
-            # still leaves the local terminal entry available.
-            with suppress(Exception):
-                self._record_turn_result(
-                    reason='error',
-                    trace_start=turn_trace_start,
-                    error_type=type(error).__name__,
-                )
-            raise
+        # Invoke after_user_input events
+        self._invoke_events('after_user_input')
+
+        self.current_session['iteration'] = 0  # Reset iteration for this turn
+
+    def _close_turn(self, result: str, reason: str) -> None:
+        self.current_session['result'] = result
+
+        self._invoke_events('on_complete')
+        # A broken adapter must not turn completed work into a retryable
+        # failure merely because best-effort stale-signal cleanup failed.
+        with suppress(Exception):
+            self._drain_completed_turn_interrupt(reason)
+
+    def _fail_turn(self, turn: Dict[str, Any], error: BaseException) -> None:
+        # Outcome streaming must not replace the exception that ended the
+        # turn. _record_trace appends before sending, so a failing adapter
+        # still leaves the local terminal entry available.
+        with suppress(Exception):
+            self._record_turn_result(
+                reason='error',
+                trace_start=turn['trace_start'],
+                error_type=type(error).__name__,
+            )
 
-        self._record_turn_result(reason=reason, trace_start=turn_trace_start)
+    def _end_turn(self, turn: Dict[str, Any], prompt: str, result: str, reason: str) -> str:
+        self._record_turn_result(reason=reason, trace_start=turn['trace_start'])
 
         # Calculate duration
-        duration = time.time() - turn_start
+        duration = time.time() - turn['start']
 
         # Log turn to YAML eval (after on_complete so handlers can modify state)
         self.logger.log_turn(prompt, result, duration * 1000, self.current_session, self.llm.model)
@@ -498,13 +632,13 @@ class Agent:
         error_type: str | None = None,
     ) -> None:
         """Write one structured terminal event without changing input()'s API."""
+        usage = turn_usage_from_trace(self.current_session['trace'][trace_start:])
         entry = {
             'type': 'turn_result',
             'turn': self.current_session['turn'],
             'reason': reason,
-            'usage': turn_usage_from_trace(
-                self.current_session['trace'][trace_start:]
-            ),
+            'usage': usage,
+            'cache_hit_ratio': cache_hit_ratio(usage),
         }
         if error_type is not None:
             entry['error_type'] = error_type
@@ -607,52 +741,91 @@ class Agent:
             # Get LLM response
             response = self._get_llm_decision()
 
-            if response is not None:
-                if not response.tool_calls:
-                    content = response.content or ""
-                    self.current_session['messages'].append({
-                        "role": "assistant",
-                        "content": content,
-                        "id": self._next_trace_id(),
-                    })
-                else:
-                    # Process tool calls
-                    self._execute_and_record_tools(response.tool_calls)
-
-            # Fire after_iteration
-            self._invoke_events('after_iteration')
-
-            continuing = self.current_session.get('_continue_iteration', False)
-            if response is not None and not response.tool_calls and not continuing:
-                # Ignore Stop frames that raced a completed terminal answer,
-                # including frames received while after_iteration ran.
-                if self.io and hasattr(self.io, 'receive_all'):
-                    self.io.receive_all('INTERRUPT')
-                if self.current_session.get('stop_signal') == 'user_interrupt':
-                    self.current_session.pop('stop_signal', None)
-
-            # Check if plugin set stop_signal (stop loop, wait for user input)
-            stop_signal = self.current_session.pop('stop_signal', None)
-            if stop_signal:
-                self._invoke_events('on_stop_signal')
-                reason = (
-                    'interrupted'
-                    if stop_signal in ('user_interrupt', 'Interrupted by user')
-                    else 'stopped'
+            if response is not None and response.tool_calls:
+                # Process tool calls
+                self._execute_and_record_tools(response.tool_calls)
+
+            outcome = self._end_iteration(response)
+            if outcome is _ONE_MORE_ITERATION:
+                max_iterations += 1
+            elif outcome is not None:
+                return outcome
+
+        return self._max_iterations_result(max_iterations)
+
+    async def _run_iteration_loop_async(self, max_iterations: int) -> tuple[str, str]:
+        """_run_iteration_loop() with the provider and tools awaited."""
+        while self.current_session['iteration'] < max_iterations:
+            self.current_session['iteration'] += 1
+            self._invoke_events('before_iteration')
+
+            response = await self._get_llm_decision_async()
+
+            if response is not None and response.tool_calls:
+                await execute_and_record_tools_async(
+                    tool_calls=response.tool_calls,
+                    tools=self.tools,
+                    agent=self,
+                    logger=self.logger
                 )
-                return "What would you like me to do?", reason
 
-            if response is None:
-                raise RuntimeError("LLM returned no response without an interrupt")
+            outcome = self._end_iteration(response)
+            if outcome is _ONE_MORE_ITERATION:
+                max_iterations += 1
+            elif outcome is not None:
+                return outcome
+
+        return self._max_iterations_result(max_iterations)
+
+    def _end_iteration(self, response):
+        """Record a final answer, fire after_iteration, and decide what happens next.
+
+        Returns (result, reason) when the turn ends here, _ONE_MORE_ITERATION
+        when a plugin accepted follow-up work, and None to keep looping.
+        """
+        if response is not None and not response.tool_calls:
+            content = response.content or ""
+            self.current_session['messages'].append({
+                "role": "assistant",
+                "content": content,
+                "id": self._next_trace_id(),
+            })
+
+        # Fire after_iteration
+        self._invoke_events('after_iteration')
+
+        continuing = self.current_session.get('_continue_iteration', False)
+        if response is not None and not response.tool_calls and not continuing:
+            # Ignore Stop frames that raced a completed terminal answer,
+            # including frames received while after_iteration ran.
+            if self.io and hasattr(self.io, 'receive_all'):
+                self.io.receive_all('INTERRUPT')
+            if self.current_session.get('stop_signal') == 'user_interrupt':
+                self.current_session.pop('stop_signal', None)
+
+        # Check if plugin set stop_signal (stop loop, wait for user input)
+        stop_signal = self.current_session.pop('stop_signal', None)
+        if stop_signal:
+            self._invoke_events('on_stop_signal')
+            reason = (
+                'interrupted'
+                if stop_signal in ('user_interrupt', 'Interrupted by user')
+                else 'stopped'
+            )
+            return "What would you like me to do?", reason
 
-            if not response.tool_calls:
-                if self.current_session.pop('_continue_iteration', False):
-                    # An accepted follow-up is new work. Give it the LLM call it
-                    # needs even when the original request used its full budget.
-                    max_iterations += 1
-                    continue
-                return content, 'natural'
+        if response is None:
+            raise RuntimeError("LLM returned no response without an interrupt")
 
+        if not response.tool_calls:
+            if self.current_session.pop('_continue_iteration', False):
+                # An accepted follow-up is new work. Give it the LLM call it
+                # needs even when the original request used its full budget.
+                return _ONE_MORE_ITERATION
+            return content, 'natural'
+        return None
+
+    def _max_iterations_result(self, max_iterations: int) -> tuple[str, str]:
         # Hit max iterations
         return (
             f"Task incomplete: Maximum iterations ({max_iterations}) reached.",
@@ -661,8 +834,44 @@ class Agent:
 
     def _get_llm_decision(self):
         """Get the next action/decision from the LLM."""
-        # Get tool schemas
-        tool_schemas = [tool.to_function_schema() for tool in self.tools] if self.tools else None
+        llm_id, messages, tool_schemas = self._begin_llm_call()
+
+        start = time.time()
+        if self.io is not None and isinstance(self.llm, LLM):
+            # Connected clients see tokens as they arrive; an interrupt also
+            # closes the provider stream instead of leaving it to finish.
+            cancelled = threading.Event()
+            response, interrupted = run_interruptible(
+                lambda: self._stream_llm(messages, tool_schemas, llm_id, cancelled),
+                self.io,
+                on_interrupt=cancelled.set,
+            )
+        else:
+            response, interrupted = run_interruptible(
+                lambda: self.llm.complete(messages, tools=tool_schemas),
+                self.io,
+            )
+        duration = (time.time() - start) * 1000  # milliseconds
+
+        return self._end_llm_call(llm_id, response, interrupted, duration)
+
+    async def _get_llm_decision_async(self):
+        """_get_llm_decision() awaiting LLM.acomplete (input_async runs without io)."""
+        llm_id, messages, tool_schemas = self._begin_llm_call()
+
+        start = time.time()
+        if isinstance(self.llm, LLM):
+            response = await self.llm.acomplete(messages, tools=tool_schemas)
+        else:
+            response = await asyncio.to_thread(self.llm.complete, messages, tools=tool_schemas)
+        duration = (time.time() - start) * 1000  # milliseconds
+
+        return self._end_llm_call(llm_id, response, False, duration)
+
+    def _begin_llm_call(self):
+        """Fire before_llm and record llm_call; return its id and the provider input."""
+        # Get tool schemas (cached on the registry until a tool is added or removed)
+        tool_schemas = self.tools.schemas() if self.tools else None
 
         # Show request info
         if self.logger.console:
@@ -681,16 +890,15 @@ class Agent:
             'model': self.llm.model,
             'iteration': self.current_session['iteration'],
             'status': 'running',
+            'tool_schema_cache': self.tools.schema_cache_stats(),
+            'message_cache': self._message_cache.stats(),
         })
 
-        start = time.time()
-        messages = messages_for_provider(self.current_session['messages'])
-        response, interrupted = run_interruptible(
-            lambda: self.llm.complete(messages, tools=tool_schemas),
-            self.io,
-        )
-        duration = (time.time() - start) * 1000  # milliseconds
+        messages = messages_for_provider(self.current_session['messages'], self._message_cache)
+        return llm_id, messages, tool_schemas
 
+    def _end_llm_call(self, llm_id: str, response, interrupted: bool, duration: float):
+        """Record llm_result and fire after_llm; None when the call was interrupted."""
         if interrupted:
             self._record_trace({
                 'type': 'llm_result',
@@ -730,6 +938,30 @@ class Agent:
 
         return response
 
+    def _stream_llm(self, messages, tool_schemas, llm_id, cancelled):
+        """Consume llm.stream(), forwarding its deltas to io as llm_delta events.
+
+        Deltas are presentation only: they are not recorded in the trace, and
+        the llm_result entry still carries the assembled response. Chunks are
+        coalesced by _DeltaBuffer, so an event holds up to ~0.1s of output
+        rather than one token. Returns the final LLMResponse, or None once
+        cancelled is set.
+        """
+        chunks = self.llm.stream(messages, tools=tool_schemas)
+        deltas = _DeltaBuffer(self.io.send, llm_id)
+        try:
+            for chunk in chunks:
+                if cancelled.is_set():
+                    return None
+                if chunk.kind == 'response':
+                    deltas.flush()
+                    return chunk.response
+                if chunk.kind in ('text', 'tool_call'):
+                    deltas.add(chunk)
+        finally:
+            chunks.close()
+        raise RuntimeError(f"{type(self.llm).__name__}.stream() ended without a response")
+
     def _execute_and_record_tools(self, tool_calls):
         """Execute requested tools and update conversation messages."""
         execute_and_record_tools(
@@ -0,0 +1,170 @@
+"""
+Purpose: Process-wide registry of provider SDK clients, so every LLM instance talking to the same endpoint with the same key shares one connection pool
+LLM-Note:
+  Dependencies: imports from [asyncio, hashlib, importlib.util, threading, weakref, typing] | provider SDK (openai/anthropic) and httpx imported lazily by the caller's factory | imported by [llm.py] | tested by [tests/unit/test_http_clients.py]
+  Data flow: provider __init__ calls shared_client(provider, factory, api_key=..., base_url=..., ...) → key = (provider, factory, options with the api_key hashed) → existing client returned, or factory(**options, http_client=<pooled httpx client>) built once under a lock and stored
+  State/Effects: module-level registry and request/connection counters | clients live for the process; reset_shared_clients() closes and forgets them (tests) | asyncio clients (AsyncOpenAI, AsyncAnthropic) are kept per event loop, because an httpx AsyncClient's pooled connections belong to the loop that opened them; they are released with the loop
+  Integration: exposes shared_client(), http_client_stats(), reset_shared_clients(), HTTP2 | factory is keyed by identity, so a test that patches openai.OpenAI gets its own mock, never a cached real client
+  Performance: llm_do() and sub-agents build a provider per call; without sharing, each built a fresh httpx pool and paid TCP+TLS again. Clients use keep-alive pooling, and HTTP/2 when the optional `h2` package is installed
+  Errors: whatever the factory raises propagates and nothing is stored
+
+Connection reuse is counted with httpcore's request trace: every request is
+counted, and so is every `connection.connect_tcp` it triggers. A request that
+opened no connection rode an existing one, so
+
+    reused = requests - new_connections
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+import threading
+import weakref
+from typing import Any, Callable, Dict, Tuple
+
+# httpx negotiates HTTP/2 only with `h2` installed; asking for it without
+# raises ImportError when the client is built.
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+_lock = threading.Lock()
+_clients: Dict[Tuple, Any] = {}
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+_stats = {"clients": 0, "requests": 0, "new_connections": 0}
+
+
+def shared_client(provider: str, factory: Callable[..., Any], **options: Any) -> Any:
+    """factory(**options), built once per (provider, factory, options) for the process.
+
+    `factory` is an SDK client class such as openai.OpenAI. When its SDK
+    exposes DefaultHttpxClient, the client gets a pooled, instrumented httpx
+    client; otherwise the SDK's own default is used and only reuse of the
+    client object is gained.
+    """
+    key = (provider, factory, _freeze(options))
+    is_async = _is_async(factory)
+    with _lock:
+        clients = _clients
+        if is_async:
+            loop = _running_loop()
+            if loop is not None:
+                clients = _loop_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            http_client = _http_client(factory, is_async)
+            if http_client is not None:
+                options = {**options, "http_client": http_client}
+            client = clients[key] = factory(**options)
+            _stats["clients"] += 1
+        return client
+
+
+def http_client_stats() -> Dict[str, int]:
+    """Clients built, requests sent, and how many of those opened or reused a connection."""
+    with _lock:
+        stats = dict(_stats)
+    stats["reused_connections"] = max(0, stats["requests"] - stats["new_connections"])
+    return stats
+
+
+def reset_shared_clients() -> None:
+    """Close and forget every shared client, and zero the counters."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        # Async clients can only be closed on their own loop; dropping them is
+        # enough, their connections go when the loop does.
+        _loop_clients.clear()
+        for name in _stats:
+            _stats[name] = 0
+    for client in clients:
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+
+def _freeze(options: Dict[str, Any]) -> Tuple:
+    frozen = []
+    for name, value in sorted(options.items()):
+        if name == "api_key" and isinstance(value, str):
+            # The registry key outlives the request that needed it; keep a
+            # digest rather than a second copy of the secret.
+            value = hashlib.sha256(value.encode()).hexdigest()
+        elif isinstance(value, dict):
+            value = tuple(sorted(value.items()))
+        else:
+            try:
+                hash(value)
+            except TypeError:
+                # openai.Timeout defines __eq__ without __hash__.
+                value = repr(value)
+        frozen.append((name, value))
+    return tuple(frozen)
+
+
+def _is_async(factory: Callable[..., Any]) -> bool:
+    return getattr(factory, "__name__", "").startswith("Async")
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _http_client(factory: Callable[..., Any], is_async: bool = False) -> Any:
+    """A pooled httpx client from the factory's SDK, or None if it has none."""
+    module = getattr(factory, "__module__", "") or ""
+    sdk = importlib.import_module(module.split(".")[0]) if module else None
+    name = "DefaultAsyncHttpxClient" if is_async else "DefaultHttpxClient"
+    default_client = getattr(sdk, name, None)
+    if default_client is None:
+        return None
+    # DefaultHttpxClient carries the SDK's own timeout, connection limits and
+    # redirect defaults; only the protocol and the instrumentation are added.
+    # An AsyncClient awaits its hooks, so it gets the coroutine form.
+    hook = _count_request_async if is_async else _count_request
+    return default_client(http2=HTTP2, event_hooks={"request": [hook]})
+
+
+def _count_request(request) -> None:
+    _counted(request)
+    outer = request.extensions.get("trace")
+
+    def trace(event: str, info: Dict[str, Any]) -> None:
+        _count_event(event)
+        if outer is not None:
+            outer(event, info)
+
+    request.extensions["trace"] = trace
+
+
+async def _count_request_async(request) -> None:
+    # httpcore awaits the trace callback of an async request.
+    _counted(request)
+    outer = request.extensions.get("trace")
+
+    async def trace(event: str, info: Dict[str, Any]) -> None:
+        _count_event(event)
+        if outer is not None:
+            await outer(event, info)
+
+    request.extensions["trace"] = trace
+
+
+def _counted(request) -> None:
+    with _lock:
+        _stats["requests"] += 1
+
+
+def _count_event(event: str) -> None:
+    if event == "connection.connect_tcp.complete":
+        with _lock:
+            _stats["new_connections"] += 1
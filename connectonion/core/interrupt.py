@@ -1,6 +1,9 @@
 """Run blocking agent steps while keeping the interrupt mailbox responsive."""
 
+import contextvars
 import copy
+import os
+import queue
 import threading
 from typing import Any, Callable, Optional, Tuple
 
@@ -15,6 +18,79 @@ class UserInterrupt(Exception):
     """Internal control flow for an interrupt consumed by a blocking gate."""
 
 
+class CancellationToken:
+    """Cooperative cancellation for one interruptible step.
+
+    run_interruptible() cancels the step's token when the user interrupts it.
+    Code running inside the step finds the token with current_cancellation()
+    and either checks it between units of work or registers on_cancel()
+    callbacks that unblock it, such as closing an HTTP response stream.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                # A callback only unblocks abandoned work; its failure must
+                # not turn an interrupt into an error on the agent thread.
+                pass
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run ``callback`` on cancellation (now, if already cancelled); return its remover."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+
+                def remove() -> None:
+                    with self._lock:
+                        if callback in self._callbacks:
+                            self._callbacks.remove(callback)
+
+                return remove
+        callback()
+        return lambda: None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise UserInterrupt()
+
+
+_current_token: contextvars.ContextVar[Optional[CancellationToken]] = contextvars.ContextVar(
+    "connectonion_cancellation", default=None
+)
+
+
+def current_cancellation() -> Optional[CancellationToken]:
+    """The token of the interruptible step this code runs in, if any."""
+    return _current_token.get()
+
+
+def on_cancel(callback: Callable[[], None]) -> Callable[[], None]:
+    """Register ``callback`` with the current step's token; a no-op outside one."""
+    token = _current_token.get()
+    if token is None:
+        return lambda: None
+    return token.on_cancel(callback)
+
+
 class InterruptibleIO:
     """Revocable IO view held by one agent-injected tool invocation."""
 
@@ -198,6 +274,102 @@ def _take_interrupt(io: Any, on_interrupt: Optional[Callable[[], None]] = None)
     return interrupted
 
 
+MAX_STEP_WORKERS = 32
+_WORKER_IDLE_SECONDS = 60.0
+# With an IO that signals new mail, the wait below only wakes on its own as a
+# backstop; the signal or the step's completion ends it first.
+_WATCHED_BACKSTOP_SECONDS = 1.0
+
+
+class _StepWorkers:
+    """Reusable daemon threads for interruptible steps.
+
+    Up to MAX_STEP_WORKERS threads stay alive between steps, and an idle one
+    exits after _WORKER_IDLE_SECONDS. An abandoned step keeps its thread until
+    it returns, so when every pooled thread is busy the step gets a one-off
+    thread instead of a queue slot: a tool that starts a nested agent must
+    never wait for a worker its own caller is holding.
+    """
+
+    def __init__(self, max_workers: int = MAX_STEP_WORKERS,
+                 idle_seconds: float = _WORKER_IDLE_SECONDS):
+        self.max_workers = max_workers
+        self.idle_seconds = idle_seconds
+        self._reset()
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._jobs: queue.SimpleQueue = queue.SimpleQueue()
+        self._workers = 0
+        # Idle workers not yet promised a job. Kept in step with _jobs under
+        # _lock, so a submit never hands work to a worker that is exiting.
+        self._idle = 0
+        self._stats = {"reused": 0, "started": 0, "overflow": 0}
+
+    def submit(self, job: Callable[[], None]) -> None:
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+                self._stats["reused"] += 1
+                self._jobs.put(job)
+                return
+            pooled = self._workers < self.max_workers
+            if pooled:
+                self._workers += 1
+                self._stats["started"] += 1
+            else:
+                self._stats["overflow"] += 1
+        threading.Thread(
+            target=self._work if pooled else job,
+            args=(job,) if pooled else (),
+            name="connectonion-interruptible-step",
+            daemon=True,
+        ).start()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "workers": self._workers, "idle": self._idle}
+
+    def _work(self, job: Callable[[], None]) -> None:
+        while True:
+            job()
+            with self._lock:
+                self._idle += 1
+            try:
+                job = self._jobs.get(timeout=self.idle_seconds)
+                continue
+            except queue.Empty:
+                pass
+            with self._lock:
+                try:
+                    # A submit may have claimed this worker just as it timed out.
+                    job = self._jobs.get_nowait()
+                    continue
+                except queue.Empty:
+                    self._idle -= 1
+                    self._workers -= 1
+                    return
+
+
+_step_workers = _StepWorkers()
+if hasattr(os, "register_at_fork"):
+    # Worker threads do not survive fork; their counts must not either.
+    os.register_at_fork(after_in_child=_step_workers._reset)
+
+
+def step_worker_stats() -> dict:
+    """How interruptible steps were placed: reused, started and overflow threads."""
+    return _step_workers.stats()
+
+
+def _watch_mailbox(io: Any, wakeup: threading.Event) -> Optional[Callable[[], None]]:
+    """Have the IO set ``wakeup`` when client mail arrives, if it supports that."""
+    watch = getattr(type(io), "watch_mailbox", None)
+    if watch is None:
+        return None
+    return watch(io, wakeup)
+
+
 def run_interruptible(
     fn: Callable[[], Any],
     io: Any,
@@ -207,9 +379,13 @@ def run_interruptible(
     """Return ``(result, False)`` or abandon ``fn`` on user interrupt.
 
     Python cannot safely kill arbitrary running code. In hosted mode the call
-    therefore runs on a disposable daemon thread while the agent thread polls
-    the selective INTERRUPT mailbox. The abandoned callable may keep running,
-    but its late return value is never committed by the caller.
+    therefore runs on a pooled worker thread while the agent thread waits for
+    either the step to finish or new mail in the selective INTERRUPT mailbox.
+    An IO with ``watch_mailbox`` wakes that wait the moment mail arrives;
+    others are polled every ``poll_seconds``. On interrupt the step's
+    CancellationToken is cancelled, so cooperative code stops and registered
+    callbacks close what it was blocked on. The abandoned callable may keep
+    running, but its late return value is never committed by the caller.
     """
     if io is None or not hasattr(io, "receive_all"):
         return fn(), False
@@ -217,29 +393,39 @@ def run_interruptible(
     if _take_interrupt(io, on_interrupt):
         return None, True
 
+    token = CancellationToken()
+    wakeup = threading.Event()
+    context = contextvars.copy_context()
     box = {}
 
     def run() -> None:
+        _current_token.set(token)
         try:
             box["result"] = fn()
         except BaseException as error:
             box["error"] = error
-
-    worker = threading.Thread(
-        target=run,
-        name="connectonion-interruptible-step",
-        daemon=True,
-    )
-    worker.start()
-
-    while worker.is_alive():
-        worker.join(timeout=poll_seconds)
-        # Completed work wins the race. Leave a simultaneous interrupt queued
-        # for the next step or the existing iteration-boundary backstop.
-        if not worker.is_alive():
-            break
-        if _take_interrupt(io, on_interrupt):
-            return None, True
+        box["done"] = True
+        wakeup.set()
+
+    stop_watching = _watch_mailbox(io, wakeup)
+    wait_seconds = _WATCHED_BACKSTOP_SECONDS if stop_watching else poll_seconds
+    try:
+        _step_workers.submit(lambda: context.run(run))
+        while True:
+            wakeup.wait(wait_seconds)
+            # Cleared before the checks, so mail or completion arriving after
+            # them sets it again and the next wait returns at once.
+            wakeup.clear()
+            # Completed work wins the race. Leave a simultaneous interrupt
+            # queued for the next step or the iteration-boundary backstop.
+            if "done" in box:
+                break
+            if _take_interrupt(io, on_interrupt):
+                token.cancel()
+                return None, True
+    finally:
+        if stop_watching is not None:
+            stop_watching()
 
     if "error" in box:
         raise box["error"]
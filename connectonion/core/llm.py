@@ -1,11 +1,11 @@
 """
 Purpose: Unified LLM provider abstraction with factory pattern for OpenAI, Anthropic, Gemini, Groq, Grok, Mistral, OpenRouter, and OpenOnion
 LLM-Note:
-  Dependencies: imports from [abc, typing, dataclasses, json, os, base64, openai, anthropic, requests, pathlib, yaml, pydantic, .usage, .exceptions] | imported by [agent.py, llm_do.py, conftest.py] | tested by [tests/unit/test_llm.py, tests/test_llm_do.py, tests/test_real_*.py, tests/unit/test_exceptions.py, tests/unit/test_uniform_provider_errors.py]
+  Dependencies: imports from [abc, typing, dataclasses, json, os, base64, openai, anthropic, requests, pathlib, yaml, pydantic, .usage, .http_clients, .interrupt, .exceptions] | imported by [agent.py, llm_do.py, conftest.py] | tested by [tests/unit/test_llm.py, tests/test_llm_do.py, tests/test_real_*.py, tests/unit/test_exceptions.py, tests/unit/test_uniform_provider_errors.py]
   Data flow: Agent/llm_do calls create_llm(model, api_key) → factory routes to provider class → Provider.__init__() validates API key → Agent calls complete(messages, tools) OR structured_complete(messages, output_schema) → provider converts to native format → calls API → parses response → returns LLMResponse(content, tool_calls, raw_response) OR Pydantic model instance
-  State/Effects: reads environment variables (OPENAI_API_KEY, ANTHROPIC_API_KEY, GEMINI_API_KEY/GOOGLE_API_KEY, GROQ_API_KEY, OPENROUTER_API_KEY, XAI_API_KEY, OPENONION_API_KEY) | reads OPENONION_API_KEY from env / .env / ~/.co/keys.env | makes HTTP requests to LLM APIs | no caching or persistence
-  Integration: exposes create_llm(model, api_key), LLM abstract base class, OpenAILLM, AnthropicLLM, GeminiLLM, GroqLLM, GrokLLM, OpenRouterLLM, OpenOnionLLM, LLMResponse, ToolCall dataclasses | providers implement complete() and structured_complete() | OpenAI message format is lingua franca | tool calling uses OpenAI schema converted per-provider
-  Performance: openai/anthropic are imported inside the functions that use them, so importing this module does not pay for either SDK | stateless (no caching) | synchronous (no streaming) | default max_tokens=8192 for Anthropic (required) | each call hits API
+  State/Effects: reads environment variables (OPENAI_API_KEY, ANTHROPIC_API_KEY, GEMINI_API_KEY/GOOGLE_API_KEY, GROQ_API_KEY, OPENROUTER_API_KEY, XAI_API_KEY, OPENONION_API_KEY) | reads OPENONION_API_KEY from env / .env / ~/.co/keys.env | makes HTTP requests to LLM APIs | SDK clients are shared process-wide per (provider, base_url, api_key) via http_clients.shared_client | no persistence
+  Integration: exposes create_llm(model, api_key), LLM abstract base class, OpenAILLM, AnthropicLLM, GeminiLLM, GroqLLM, GrokLLM, OpenRouterLLM, OpenOnionLLM, LLMResponse, ToolCall, StreamChunk dataclasses | providers implement complete() and structured_complete(), and may override stream() | OpenAI message format is lingua franca | tool calling uses OpenAI schema converted per-provider
+  Performance: openai/anthropic are imported inside the functions that use them, so importing this module does not pay for either SDK | providers built with the same endpoint and key (llm_do calls, sub-agents) reuse one pooled SDK client and its warm connections, HTTP/2 when `h2` is installed | tool envelopes are cached per ToolSchemas version (see tool_registry.py), otherwise stateless | prompt_caching=True marks Anthropic cache breakpoints (tools, system, last two user turns) and sends an OpenAI prompt_cache_key | complete() is blocking; stream() yields text and tool-call deltas (native for OpenAI-compatible and Anthropic, complete() fallback elsewhere), and a native stream is closed by the enclosing interruptible step's CancellationToken when the user interrupts | default max_tokens=8192 for Anthropic (required) | each call hits API
   Errors: raises ValueError for missing API keys, unknown models, invalid parameters | provider-specific errors bubble up (openai.APIError, anthropic.APIError, etc.) | OpenOnionLLM transforms 402 errors to InsufficientCreditsError with formatted message and typed attributes | Pydantic ValidationError for invalid structured output
 
 Unified LLM provider abstraction layer for ConnectOnion framework.
@@ -125,7 +125,9 @@ Performance Considerations
 -------------------------
 - Default max_tokens: 8192 for Anthropic (required), configurable for others
 - No caching: Each call is stateless (Agent maintains conversation history)
-- No streaming: Currently synchronous only (streaming planned for future)
+- Streaming: stream() yields StreamChunk deltas and ends with the assembled
+  LLMResponse. OpenAI-compatible providers and Anthropic stream natively; the
+  base class falls back to one complete() call
 
 Example Usage
 ------------
@@ -154,8 +156,11 @@ With tools:
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Type
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterator, Optional, Type
 from dataclasses import dataclass
+import asyncio
+import hashlib
 import json
 import os
 import base64
@@ -188,6 +193,8 @@ class ToolCall:
 
 # Import TokenUsage from usage module
 from .usage import DEFAULT_MODEL, TokenUsage, calculate_cost
+from .http_clients import shared_client
+from .interrupt import on_cancel
 from ..backend import backend_url
 from .exceptions import (
     InsufficientCreditsError,
@@ -207,6 +214,20 @@ def _is_paid_account_required(error) -> bool:
     return isinstance(detail, dict) and detail.get('error') == 'paid_account_required'
 
 
+def _openai_tools(tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Wrap function schemas in the OpenAI chat-completions tool envelope.
+
+    Cached per tool set when the schemas come from a ToolRegistry.
+    """
+    def wrap(schemas):
+        return [{"type": "function", "function": tool} for tool in schemas]
+
+    converted = getattr(tools, "converted", None)
+    if converted is not None:
+        return converted("openai", wrap)
+    return wrap(tools)
+
+
 @dataclass
 class LLMResponse:
     """Response from LLM including content and tool calls."""
@@ -216,11 +237,41 @@ class LLMResponse:
     usage: Optional[TokenUsage] = None
 
 
+@dataclass
+class StreamChunk:
+    """One increment of a streamed completion from LLM.stream().
+
+    kind is one of:
+        "text":      text holds the newly generated characters
+        "tool_call": a fragment of the tool call at index; id and name arrive
+                     with its first fragment, arguments is a piece of the JSON
+        "response":  always last; response is the assembled LLMResponse
+    """
+    kind: str
+    text: str = ""
+    index: int = 0
+    id: Optional[str] = None
+    name: Optional[str] = None
+    arguments: str = ""
+    response: Optional[LLMResponse] = None
+
+
 class LLM(ABC):
     """Abstract base class for LLM providers."""
 
     def _call_provider(self, send, base_url: str = ""):
-        """Run one provider request and translate its failure to a shared type.
+        """Run one provider request and translate its failure to a shared type."""
+        with self._provider_errors(base_url):
+            return send()
+
+    async def _acall_provider(self, send, base_url: str = ""):
+        """_call_provider() for an asyncio client: send() returns an awaitable."""
+        with self._provider_errors(base_url):
+            return await send()
+
+    @contextmanager
+    def _provider_errors(self, base_url: str = ""):
+        """Translate a provider SDK failure raised inside the block to a shared type.
 
         The same auth failure used to surface three different ways depending on
         the model prefix — openai.AuthenticationError on gpt-*,
@@ -238,7 +289,7 @@ class LLM(ABC):
         import openai
         model = getattr(self, "model", "unknown")
         try:
-            return send()
+            yield
         except LLMProviderError:
             # Already translated, and by something that knew more than we do
             # here — OpenOnionLLM maps 402 to InsufficientCreditsError. Wrapping
@@ -268,6 +319,101 @@ class LLM(ABC):
         """Complete a conversation with optional tool support."""
         pass
 
+    async def acomplete(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, **kwargs) -> LLMResponse:
+        """complete() for callers on an event loop.
+
+        Providers with an asyncio SDK client await it directly. This fallback
+        runs complete() on a worker thread, so the loop stays free either way.
+        """
+        return await asyncio.to_thread(self.complete, messages, tools=tools, **kwargs)
+
+    def stream(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None) -> Iterator[StreamChunk]:
+        """Yield the completion as it is generated, ending with the full response.
+
+        Providers without native streaming get this fallback: one complete()
+        call, replayed as a single text chunk and one chunk per tool call.
+        Closing the iterator early closes the underlying HTTP stream.
+        """
+        response = self.complete(messages, tools=tools)
+        if response.content:
+            yield StreamChunk("text", text=response.content)
+        for index, tool_call in enumerate(response.tool_calls):
+            yield StreamChunk(
+                "tool_call",
+                index=index,
+                id=tool_call.id,
+                name=tool_call.name,
+                arguments=json.dumps(tool_call.arguments),
+            )
+        yield StreamChunk("response", response=response)
+
+    def _stream_chat_completions(self, api_kwargs: Dict[str, Any], call, build_usage) -> Iterator[StreamChunk]:
+        """Stream an OpenAI-compatible chat completion and assemble its LLMResponse.
+
+        call wraps the request with the provider's error translation;
+        build_usage turns the final usage chunk into a TokenUsage.
+        """
+        stream = call(lambda: self.client.chat.completions.create(
+            **api_kwargs,
+            stream=True,
+            stream_options={"include_usage": True},
+        ))
+        # An interrupt closes the response from the agent thread, so this
+        # read fails now instead of holding the connection to the last token.
+        stop_watching = on_cancel(getattr(stream, "close", lambda: None))
+        content = []
+        calls: Dict[int, Dict[str, Any]] = {}
+        usage = None
+        try:
+            for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = build_usage(chunk.usage)
+                for choice in chunk.choices or []:
+                    delta = choice.delta
+                    if delta is None:
+                        continue
+                    if delta.content:
+                        content.append(delta.content)
+                        yield StreamChunk("text", text=delta.content)
+                    for tc in getattr(delta, "tool_calls", None) or []:
+                        entry = calls.setdefault(tc.index, {
+                            "id": None, "name": None, "arguments": [], "extra_content": None,
+                        })
+                        name = tc.function.name if tc.function else None
+                        fragment = (tc.function.arguments if tc.function else None) or ""
+                        if tc.id:
+                            entry["id"] = tc.id
+                        if name:
+                            entry["name"] = name
+                        entry["arguments"].append(fragment)
+                        extra = getattr(tc, "extra_content", None)
+                        if extra:
+                            entry["extra_content"] = extra
+                        yield StreamChunk(
+                            "tool_call", index=tc.index, id=tc.id, name=name, arguments=fragment,
+                        )
+        finally:
+            stop_watching()
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+
+        tool_calls = [
+            ToolCall(
+                name=entry["name"],
+                arguments=json.loads("".join(entry["arguments"]) or "{}"),
+                id=entry["id"],
+                extra_content=entry["extra_content"],
+            )
+            for _index, entry in sorted(calls.items())
+        ]
+        yield StreamChunk("response", response=LLMResponse(
+            content="".join(content) or None,
+            tool_calls=tool_calls,
+            raw_response=None,
+            usage=usage,
+        ))
+
     @abstractmethod
     def structured_complete(self, messages: List[Dict], output_schema: Type[BaseModel]) -> BaseModel:
         """Get structured Pydantic output matching the schema.
@@ -288,17 +434,38 @@ class LLM(ABC):
 class OpenAILLM(LLM):
     """OpenAI LLM implementation."""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "o4-mini", **kwargs):
+    def __init__(self, api_key: Optional[str] = None, model: str = "o4-mini", prompt_caching: bool = False, **kwargs):
         import openai
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key required. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
         
-        self.client = openai.OpenAI(api_key=self.api_key)
+        self.client = shared_client("openai", openai.OpenAI, api_key=self.api_key)
         self.model = model
+        self.prompt_caching = prompt_caching
+
+    @property
+    def async_client(self):
+        """openai.AsyncOpenAI for the same key, shared per event loop."""
+        import openai
+        return shared_client("openai", openai.AsyncOpenAI, api_key=self.api_key)
     
     def complete(self, messages: List[Dict[str, str]], tools: Optional[List[Dict[str, Any]]] = None, **kwargs) -> LLMResponse:
         """Complete a conversation with optional tool support."""
+        api_kwargs = self._request(messages, tools, kwargs)
+        response = self._call_provider(
+            lambda: self.client.chat.completions.create(**api_kwargs))
+        return self._response(response)
+
+    async def acomplete(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, **kwargs) -> LLMResponse:
+        """complete() through the asyncio client."""
+        api_kwargs = self._request(messages, tools, kwargs)
+        response = await self._acall_provider(
+            lambda: self.async_client.chat.completions.create(**api_kwargs))
+        return self._response(response)
+
+    def _request(self, messages, tools, kwargs) -> Dict[str, Any]:
+        """The chat.completions.create() arguments shared by complete() and stream()."""
         api_kwargs = {
             "model": self.model,
             "messages": messages,
@@ -306,11 +473,13 @@ class OpenAILLM(LLM):
         }
 
         if tools:
-            api_kwargs["tools"] = [{"type": "function", "function": tool} for tool in tools]
+            api_kwargs["tools"] = _openai_tools(tools)
             api_kwargs["tool_choice"] = "auto"
+        if self.prompt_caching:
+            _add_prompt_cache_key(api_kwargs, messages, tools)
+        return api_kwargs
 
-        response = self._call_provider(
-            lambda: self.client.chat.completions.create(**api_kwargs))
+    def _response(self, response) -> LLMResponse:
         message = response.choices[0].message
 
         # Parse tool calls if present
@@ -323,22 +492,29 @@ class OpenAILLM(LLM):
                     id=tc.id
                 ))
 
-        # Extract token usage
-        input_tokens = response.usage.prompt_tokens
-        output_tokens = response.usage.completion_tokens
-        cached_tokens = response.usage.prompt_tokens_details.cached_tokens if response.usage.prompt_tokens_details else 0
-        cost = calculate_cost(self.model, input_tokens, output_tokens, cached_tokens)
-
         return LLMResponse(
             content=message.content,
             tool_calls=tool_calls,
             raw_response=response,
-            usage=TokenUsage(
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                cached_tokens=cached_tokens,
-                cost=cost,
-            ),
+            usage=self._usage(response.usage),
+        )
+
+    def stream(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, **kwargs) -> Iterator[StreamChunk]:
+        """Stream a conversation with optional tool support."""
+        api_kwargs = self._request(messages, tools, kwargs)
+        return self._stream_chat_completions(api_kwargs, self._call_provider, self._usage)
+
+    def _usage(self, usage) -> TokenUsage:
+        """Extract token usage from a chat-completions usage object."""
+        input_tokens = usage.prompt_tokens
+        output_tokens = usage.completion_tokens
+        cached_tokens = usage.prompt_tokens_details.cached_tokens if usage.prompt_tokens_details else 0
+        cost = calculate_cost(self.model, input_tokens, output_tokens, cached_tokens)
+        return TokenUsage(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cached_tokens=cached_tokens,
+            cost=cost,
         )
 
     def structured_complete(self, messages: List[Dict], output_schema: Type[BaseModel], **kwargs) -> BaseModel:
@@ -374,38 +550,38 @@ class OpenAILLM(LLM):
 class AnthropicLLM(LLM):
     """Anthropic Claude LLM implementation."""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "claude-sonnet-4-20250514", max_tokens: int = 8192, **kwargs):
+    def __init__(self, api_key: Optional[str] = None, model: str = "claude-sonnet-4-20250514", max_tokens: int = 8192, prompt_caching: bool = False, **kwargs):
         import anthropic
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("Anthropic API key required. Set ANTHROPIC_API_KEY environment variable or pass api_key parameter.")
 
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.client = shared_client("anthropic", anthropic.Anthropic, api_key=self.api_key)
         self.model = model
         self.max_tokens = max_tokens  # Anthropic requires max_tokens (default 8192)
+        self.prompt_caching = prompt_caching
+
+    @property
+    def async_client(self):
+        """anthropic.AsyncAnthropic for the same key, shared per event loop."""
+        import anthropic
+        return shared_client("anthropic", anthropic.AsyncAnthropic, api_key=self.api_key)
     
     def complete(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, **kwargs) -> LLMResponse:
         """Complete a conversation with optional tool support."""
-        # Convert messages to Anthropic format
-        anthropic_messages, system = self._convert_messages(messages)
-
-        api_kwargs = {
-            "model": self.model,
-            "messages": anthropic_messages,
-            "max_tokens": self.max_tokens,  # Required by Anthropic
-            **kwargs  # User can override max_tokens via kwargs
-        }
-
-        if system:
-            api_kwargs["system"] = system
-
-        # Add tools if provided
-        if tools:
-            api_kwargs["tools"] = self._convert_tools(tools)
-
+        api_kwargs = self._request(messages, tools, kwargs)
         response = self._call_provider(
             lambda: self.client.messages.create(**api_kwargs))
-        
+        return self._response(response)
+
+    async def acomplete(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, **kwargs) -> LLMResponse:
+        """complete() through the asyncio client."""
+        api_kwargs = self._request(messages, tools, kwargs)
+        response = await self._acall_provider(
+            lambda: self.async_client.messages.create(**api_kwargs))
+        return self._response(response)
+
+    def _response(self, response) -> LLMResponse:
         # Parse tool calls if present
         tool_calls = []
         content = ""
@@ -420,26 +596,128 @@ class AnthropicLLM(LLM):
                     id=block.id
                 ))
 
-        # Extract token usage - Anthropic uses input_tokens/output_tokens
-        input_tokens = response.usage.input_tokens
-        output_tokens = response.usage.output_tokens
-        cached_tokens = getattr(response.usage, 'cache_read_input_tokens', 0) or 0
-        cache_write_tokens = getattr(response.usage, 'cache_creation_input_tokens', 0) or 0
-        cost = calculate_cost(self.model, input_tokens, output_tokens, cached_tokens, cache_write_tokens)
-
         return LLMResponse(
             content=content if content else None,
             tool_calls=tool_calls,
             raw_response=response,
-            usage=TokenUsage(
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                cached_tokens=cached_tokens,
-                cache_write_tokens=cache_write_tokens,
-                cost=cost,
+            usage=self._usage(
+                response.usage.input_tokens,
+                response.usage.output_tokens,
+                getattr(response.usage, 'cache_read_input_tokens', 0) or 0,
+                getattr(response.usage, 'cache_creation_input_tokens', 0) or 0,
             ),
         )
 
+    def stream(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, **kwargs) -> Iterator[StreamChunk]:
+        """Stream a conversation with optional tool support.
+
+        Reads the raw Messages event stream: text_delta and input_json_delta
+        become chunks, message_start and message_delta carry the usage.
+        """
+        api_kwargs = self._request(messages, tools, kwargs)
+
+        stream = self._call_provider(
+            lambda: self.client.messages.create(**api_kwargs, stream=True))
+        stop_watching = on_cancel(getattr(stream, "close", lambda: None))
+        text = []
+        blocks: Dict[int, Dict[str, Any]] = {}
+        input_tokens = output_tokens = cached_tokens = cache_write_tokens = 0
+        try:
+            for event in stream:
+                if event.type == "message_start":
+                    usage = event.message.usage
+                    input_tokens = usage.input_tokens or 0
+                    cached_tokens = getattr(usage, 'cache_read_input_tokens', 0) or 0
+                    cache_write_tokens = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+                elif event.type == "content_block_start" and event.content_block.type == "tool_use":
+                    block = event.content_block
+                    blocks[event.index] = {"id": block.id, "name": block.name, "json": []}
+                    yield StreamChunk(
+                        "tool_call", index=len(blocks) - 1, id=block.id, name=block.name,
+                    )
+                elif event.type == "content_block_delta":
+                    delta = event.delta
+                    if delta.type == "text_delta":
+                        text.append(delta.text)
+                        yield StreamChunk("text", text=delta.text)
+                    elif delta.type == "input_json_delta" and event.index in blocks:
+                        blocks[event.index]["json"].append(delta.partial_json)
+                        yield StreamChunk(
+                            "tool_call",
+                            index=list(blocks).index(event.index),
+                            arguments=delta.partial_json,
+                        )
+                elif event.type == "message_delta" and getattr(event, "usage", None):
+                    output_tokens = event.usage.output_tokens or output_tokens
+        finally:
+            stop_watching()
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+
+        tool_calls = [
+            ToolCall(
+                name=block["name"],
+                arguments=json.loads("".join(block["json"]) or "{}"),
+                id=block["id"],
+            )
+            for block in blocks.values()
+        ]
+        content = "".join(text)
+        yield StreamChunk("response", response=LLMResponse(
+            content=content if content else None,
+            tool_calls=tool_calls,
+            raw_response=None,
+            usage=self._usage(input_tokens, output_tokens, cached_tokens, cache_write_tokens),
+        ))
+
+    def _request(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Messages API arguments shared by complete() and stream()."""
+        # Convert messages to Anthropic format
+        anthropic_messages, system = self._convert_messages(messages)
+
+        api_kwargs = {
+            "model": self.model,
+            "messages": anthropic_messages,
+            "max_tokens": self.max_tokens,  # Required by Anthropic
+            **kwargs  # User can override max_tokens via kwargs
+        }
+
+        if system:
+            api_kwargs["system"] = system
+
+        # Add tools if provided
+        if tools:
+            api_kwargs["tools"] = self._convert_tools(tools)
+
+        if self.prompt_caching:
+            _mark_cache_breakpoints(api_kwargs)
+        return api_kwargs
+
+    def _usage(self, input_tokens: int, output_tokens: int, cached_tokens: int, cache_write_tokens: int) -> TokenUsage:
+        """Price Anthropic token counts, including prompt-cache reads and writes.
+
+        Anthropic's input_tokens counts only the uncached part of the prompt;
+        cache reads and writes are reported beside it, not inside it. TokenUsage
+        follows the OpenAI shape, where cached_tokens is a subset of
+        input_tokens, so the prompt total is rebuilt here. Left as Anthropic
+        sends it, 10,000 cached tokens beside 200 uncached read as a 100%
+        cache hit and the cached tokens were subtracted from the uncached ones
+        when pricing.
+        """
+        prompt_tokens = input_tokens + cached_tokens + cache_write_tokens
+        # Cache writes are priced at their own rate, so they are left out of
+        # the total calculate_cost splits into uncached and cached input.
+        cost = calculate_cost(self.model, input_tokens + cached_tokens, output_tokens,
+                              cached_tokens, cache_write_tokens)
+        return TokenUsage(
+            input_tokens=prompt_tokens,
+            output_tokens=output_tokens,
+            cached_tokens=cached_tokens,
+            cache_write_tokens=cache_write_tokens,
+            cost=cost,
+        )
+
     def structured_complete(self, messages: List[Dict], output_schema: Type[BaseModel], **kwargs) -> BaseModel:
         """Get structured Pydantic output using tool calling method.
 
@@ -482,115 +760,63 @@ class AnthropicLLM(LLM):
         raise ValueError("No structured output received from Claude")
 
     def _convert_messages(self, messages: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], Optional[str]]:
-        """Convert OpenAI-style messages to Anthropic format."""
+        """Convert OpenAI-style messages to Anthropic format.
+
+        Each message converts on its own (_anthropic_message); only grouping a
+        run of tool results into one user turn looks across messages, and that
+        pass is cheap. An agent's messages carry a per-message cache (see
+        provider_messages.py), so a long session re-parses only the new tail.
+        """
+        converted = getattr(messages, "converted", None)
+        if converted is not None:
+            parts = converted("anthropic", _anthropic_message)
+        else:
+            parts = [_anthropic_message(msg) for msg in messages]
+
         anthropic_messages = []
         system_parts = []
-        i = 0
-        
-        while i < len(messages):
-            msg = messages[i]
-            
+        tool_results = None  # the user turn collecting results for the last tool calls
+
+        for kind, part in parts:
             # Anthropic accepts system instructions as a top-level request parameter.
-            if msg["role"] == "system":
-                if msg.get("content"):
-                    system_parts.append(msg["content"])
-                i += 1
-                continue
-            
-            # Handle assistant messages with tool calls
-            if msg["role"] == "assistant" and msg.get("tool_calls"):
-                content_blocks = []
-                if msg.get("content"):
-                    content_blocks.append({
-                        "type": "text",
-                        "text": msg["content"]
-                    })
-                
-                for tc in msg["tool_calls"]:
-                    content_blocks.append({
-                        "type": "tool_use",
-                        "id": tc["id"],
-                        "name": tc["function"]["name"],
-                        "input": json.loads(tc["function"]["arguments"]) if isinstance(tc["function"]["arguments"], str) else tc["function"]["arguments"]
-                    })
-                
-                anthropic_messages.append({
-                    "role": "assistant",
-                    "content": content_blocks
-                })
-                
-                # Now collect all the tool responses that follow immediately
-                i += 1
-                tool_results = []
-                while i < len(messages) and messages[i]["role"] == "tool":
-                    tool_msg = messages[i]
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": tool_msg["tool_call_id"],
-                        "content": tool_msg["content"]
-                    })
-                    i += 1
-                
-                # Add all tool results in a single user message
-                if tool_results:
-                    anthropic_messages.append({
-                        "role": "user",
-                        "content": tool_results
-                    })
-            
-            # Handle tool role messages that aren't immediately after assistant tool calls
-            elif msg["role"] == "tool":
-                # This shouldn't happen in normal flow, but handle it just in case
-                anthropic_messages.append({
-                    "role": "user",
-                    "content": [{
-                        "type": "tool_result",
-                        "tool_use_id": msg["tool_call_id"],
-                        "content": msg["content"]
-                    }]
-                })
-                i += 1
-            
-            # Handle user messages
-            elif msg["role"] == "user":
-                if isinstance(msg.get("content"), list):
-                    # This is already a structured message
-                    anthropic_msg = {
-                        "role": "user",
-                        "content": []
-                    }
-                    for item in msg["content"]:
-                        if item.get("type") == "tool_result":
-                            anthropic_msg["content"].append({
-                                "type": "tool_result",
-                                "tool_use_id": item["tool_call_id"],
-                                "content": item["content"]
-                            })
-                    anthropic_messages.append(anthropic_msg)
+            if kind == "system":
+                if part:
+                    system_parts.append(part)
+                tool_results = None
+            elif kind == "tool_result":
+                if tool_results is not None:
+                    # All tool results that follow tool calls go in one user message
+                    if not tool_results["content"]:
+                        anthropic_messages.append(tool_results)
+                    tool_results["content"].append(part)
                 else:
-                    # Regular text message
-                    anthropic_messages.append({
-                        "role": "user",
-                        "content": msg["content"]
-                    })
-                i += 1
-            
-            # Handle regular assistant messages
-            elif msg["role"] == "assistant":
-                anthropic_messages.append({
-                    "role": "assistant",
-                    "content": msg["content"]
-                })
-                i += 1
-            
+                    # A tool message not right after tool calls shouldn't happen
+                    # in normal flow, but gets its own user message just in case
+                    anthropic_messages.append({"role": "user", "content": [part]})
+            elif kind == "tool_calls":
+                anthropic_messages.append(part)
+                tool_results = {"role": "user", "content": []}
             else:
-                i += 1
-        
+                if part is not None:
+                    anthropic_messages.append(part)
+                tool_results = None
+
         system = "\n\n".join(system_parts)
         return anthropic_messages, system or None
-    
+
     def _convert_tools(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Convert OpenAI-style tools to Anthropic format."""
+        """Convert OpenAI-style tools to Anthropic format.
+
+        A ToolRegistry's schemas carry a per-version cache, so an agent pays
+        for this once per tool set rather than once per iteration.
+        """
+        converted = getattr(tools, "converted", None)
+        if converted is not None:
+            return converted("anthropic", self._build_anthropic_tools)
+        return self._build_anthropic_tools(tools)
+
+    @staticmethod
+    def _build_anthropic_tools(tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         anthropic_tools = []
         
         for tool in tools:
@@ -609,6 +835,139 @@ class AnthropicLLM(LLM):
         return anthropic_tools
 
 
+# Anthropic caches a request prefix up to each block marked with this, for
+# five minutes, refreshed on every read.
+_EPHEMERAL = {"type": "ephemeral"}
+
+# The last two user turns carry history breakpoints. The newest writes the
+# whole prefix; the one before it is where the previous iteration's newest
+# was, so this request reads what that one wrote. With the tools and the
+# system prompt that is four, Anthropic's limit per request.
+_HISTORY_BREAKPOINTS = 2
+
+
+def _mark_cache_breakpoints(api_kwargs: Dict[str, Any]) -> None:
+    """Mark the stable prefixes of an Anthropic request as cacheable.
+
+    Tools, then the system prompt, then the history are what the API hashes,
+    in that order, and all three only grow between an agent's iterations. The
+    marked blocks are copies: tool envelopes and converted messages are cached
+    and shared between requests (see _convert_tools, provider_messages.py).
+    """
+    tools = api_kwargs.get("tools")
+    if tools:
+        api_kwargs["tools"] = [*tools[:-1], {**tools[-1], "cache_control": _EPHEMERAL}]
+
+    system = api_kwargs.get("system")
+    if isinstance(system, str) and system:
+        api_kwargs["system"] = [{"type": "text", "text": system, "cache_control": _EPHEMERAL}]
+
+    messages = list(api_kwargs["messages"])
+    marked = 0
+    for i in range(len(messages) - 1, -1, -1):
+        if marked == _HISTORY_BREAKPOINTS:
+            break
+        if messages[i]["role"] != "user":
+            continue
+        message = _with_cache_breakpoint(messages[i])
+        if message is not None:
+            messages[i] = message
+            marked += 1
+    api_kwargs["messages"] = messages
+
+
+def _with_cache_breakpoint(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """A copy of the message with its last content block marked, or None."""
+    content = message.get("content")
+    if isinstance(content, str):
+        if not content:
+            return None  # the API rejects a cache marker on empty text
+        blocks = [{"type": "text", "text": content, "cache_control": _EPHEMERAL}]
+    elif isinstance(content, list) and content:
+        blocks = [*content[:-1], {**content[-1], "cache_control": _EPHEMERAL}]
+    else:
+        return None
+    return {**message, "content": blocks}
+
+
+def _add_prompt_cache_key(api_kwargs: Dict[str, Any], messages: List[Dict[str, Any]], tools) -> None:
+    """Route requests that share a prefix to the same OpenAI prompt cache.
+
+    OpenAI caches prefixes on its own; the key only keeps requests with the
+    same system prompt and tools on the machines that hold their cache. Sent
+    through extra_body, which every openai>=1.0 accepts.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(api_kwargs["model"].encode("utf-8"))
+    for message in messages[:1]:
+        if message.get("role") == "system" and isinstance(message.get("content"), str):
+            digest.update(message["content"].encode("utf-8"))
+    for tool in tools or ():
+        digest.update(b"\0" + str(tool.get("name", "")).encode("utf-8"))
+    api_kwargs["extra_body"] = {"prompt_cache_key": digest.hexdigest(),
+                                **(api_kwargs.get("extra_body") or {})}
+
+
+def _anthropic_message(msg: Dict[str, Any]) -> tuple[str, Any]:
+    """One OpenAI-style message as (kind, Anthropic part).
+
+    kind is "system" (part is the text), "tool_calls" (an assistant message),
+    "tool_result" (a content block to group into a user turn) or "message".
+    """
+    role = msg["role"]
+    if role == "system":
+        return "system", msg.get("content")
+
+    # Handle assistant messages with tool calls
+    if role == "assistant" and msg.get("tool_calls"):
+        content_blocks = []
+        if msg.get("content"):
+            content_blocks.append({
+                "type": "text",
+                "text": msg["content"]
+            })
+        for tc in msg["tool_calls"]:
+            content_blocks.append({
+                "type": "tool_use",
+                "id": tc["id"],
+                "name": tc["function"]["name"],
+                "input": json.loads(tc["function"]["arguments"]) if isinstance(tc["function"]["arguments"], str) else tc["function"]["arguments"]
+            })
+        return "tool_calls", {"role": "assistant", "content": content_blocks}
+
+    if role == "tool":
+        return "tool_result", {
+            "type": "tool_result",
+            "tool_use_id": msg["tool_call_id"],
+            "content": msg["content"]
+        }
+
+    # Handle user messages
+    if role == "user":
+        if isinstance(msg.get("content"), list):
+            # This is already a structured message
+            return "message", {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": item["tool_call_id"],
+                        "content": item["content"]
+                    }
+                    for item in msg["content"]
+                    if item.get("type") == "tool_result"
+                ]
+            }
+        # Regular text message
+        return "message", {"role": "user", "content": msg["content"]}
+
+    # Handle regular assistant messages
+    if role == "assistant":
+        return "message", {"role": "assistant", "content": msg["content"]}
+
+    return "message", None
+
+
 class GeminiLLM(LLM):
     """Google Gemini LLM implementation using OpenAI-compatible endpoint."""
 
@@ -621,7 +980,8 @@ class GeminiLLM(LLM):
             raise ValueError("Gemini API key required. Set GEMINI_API_KEY environment variable or pass api_key parameter. (GOOGLE_API_KEY is also supported for backward compatibility)")
 
         # Use Gemini's OpenAI-compatible endpoint
-        self.client = openai.OpenAI(
+        self.client = shared_client(
+            "gemini", openai.OpenAI,
             api_key=self.api_key,
             base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
         )
@@ -636,7 +996,7 @@ class GeminiLLM(LLM):
         }
 
         if tools:
-            api_kwargs["tools"] = [{"type": "function", "function": tool} for tool in tools]
+            api_kwargs["tools"] = _openai_tools(tools)
             api_kwargs["tool_choice"] = "auto"
 
         response = self._call_provider(
@@ -700,7 +1060,8 @@ class GroqLLM(LLM):
             raise ValueError("Groq API key required. Set GROQ_API_KEY environment variable or pass api_key parameter.")
 
         self.model = model.removeprefix("groq/")
-        self.client = openai.OpenAI(
+        self.client = shared_client(
+            "groq", openai.OpenAI,
             api_key=self.api_key,
             base_url="https://api.groq.com/openai/v1"
         )
@@ -714,7 +1075,7 @@ class GroqLLM(LLM):
         }
 
         if tools:
-            api_kwargs["tools"] = [{"type": "function", "function": tool} for tool in tools]
+            api_kwargs["tools"] = _openai_tools(tools)
             api_kwargs["tool_choice"] = "auto"
 
         response = self._call_provider(
@@ -778,7 +1139,8 @@ class GrokLLM(LLM):
             raise ValueError("Grok API key required. Set XAI_API_KEY environment variable or pass api_key parameter.")
 
         self.model = model.removeprefix("grok/")
-        self.client = openai.OpenAI(
+        self.client = shared_client(
+            "grok", openai.OpenAI,
             api_key=self.api_key,
             base_url="https://api.x.ai/v1"
         )
@@ -792,7 +1154,7 @@ class GrokLLM(LLM):
         }
 
         if tools:
-            api_kwargs["tools"] = [{"type": "function", "function": tool} for tool in tools]
+            api_kwargs["tools"] = _openai_tools(tools)
             api_kwargs["tool_choice"] = "auto"
 
         response = self._call_provider(
@@ -866,7 +1228,7 @@ class OpenRouterLLM(LLM):
         if default_headers:
             client_kwargs["default_headers"] = default_headers
 
-        self.client = openai.OpenAI(**client_kwargs)
+        self.client = shared_client("openrouter", openai.OpenAI, **client_kwargs)
 
     def complete(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, **kwargs) -> LLMResponse:
         """Complete a conversation using OpenRouter's OpenAI-compatible endpoint."""
@@ -877,7 +1239,7 @@ class OpenRouterLLM(LLM):
         }
 
         if tools:
-            api_kwargs["tools"] = [{"type": "function", "function": tool} for tool in tools]
+            api_kwargs["tools"] = _openai_tools(tools)
             api_kwargs["tool_choice"] = "auto"
 
         response = self._call_provider(
@@ -940,7 +1302,8 @@ class MistralLLM(LLM):
             raise ValueError("Mistral API key required. Set MISTRAL_API_KEY environment variable or pass api_key parameter.")
 
         self.model = model.removeprefix("mistral/")
-        self.client = openai.OpenAI(
+        self.client = shared_client(
+            "mistral", openai.OpenAI,
             api_key=self.api_key,
             base_url="https://api.mistral.ai/v1"
         )
@@ -954,7 +1317,7 @@ class MistralLLM(LLM):
         }
 
         if tools:
-            api_kwargs["tools"] = [{"type": "function", "function": tool} for tool in tools]
+            api_kwargs["tools"] = _openai_tools(tools)
             api_kwargs["tool_choice"] = "auto"
 
         response = self._call_provider(
@@ -1076,7 +1439,20 @@ class OpenOnionLLM(LLM):
         # SDK default connect timeout is 5s with 2 retries; one transient network
         # blip killed whole agent runs with APITimeoutError, so allow 20s connects
         # and more retries.
-        self.client = openai.OpenAI(
+        self.client = shared_client(
+            "openonion", openai.OpenAI,
+            base_url=self.base_url,
+            api_key=self.auth_token,
+            timeout=openai.Timeout(600.0, connect=20.0),
+            max_retries=5,
+        )
+
+    @property
+    def async_client(self):
+        """openai.AsyncOpenAI for the same endpoint and settings, shared per event loop."""
+        import openai
+        return shared_client(
+            "openonion", openai.AsyncOpenAI,
             base_url=self.base_url,
             api_key=self.auth_token,
             timeout=openai.Timeout(600.0, connect=20.0),
@@ -1085,6 +1461,18 @@ class OpenOnionLLM(LLM):
 
     def complete(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, **kwargs) -> LLMResponse:
         """Complete a conversation with optional tool support using OpenAI-compatible API."""
+        api_kwargs = self._request(messages, tools, kwargs)
+        response = self._call(lambda: self.client.chat.completions.create(**api_kwargs))
+        return self._response(response)
+
+    async def acomplete(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, **kwargs) -> LLMResponse:
+        """complete() through the asyncio client."""
+        api_kwargs = self._request(messages, tools, kwargs)
+        response = await self._acall(lambda: self.async_client.chat.completions.create(**api_kwargs))
+        return self._response(response)
+
+    def _request(self, messages, tools, kwargs) -> Dict[str, Any]:
+        """The chat.completions.create() arguments shared by complete() and stream()."""
         api_kwargs = {
             "model": self.model,
             "messages": messages,
@@ -1093,11 +1481,11 @@ class OpenOnionLLM(LLM):
 
         # Add tools if provided
         if tools:
-            api_kwargs["tools"] = [{"type": "function", "function": tool} for tool in tools]
+            api_kwargs["tools"] = _openai_tools(tools)
             api_kwargs["tool_choice"] = "auto"
+        return api_kwargs
 
-        response = self._call(lambda: self.client.chat.completions.create(**api_kwargs))
-
+    def _response(self, response) -> LLMResponse:
         message = response.choices[0].message
 
         # Parse tool calls if present
@@ -1116,39 +1504,7 @@ class OpenOnionLLM(LLM):
         # Extract token usage (OpenAI-compatible format)
         usage = None
         if hasattr(response, 'usage') and response.usage:
-            input_tokens = response.usage.prompt_tokens
-            output_tokens = response.usage.completion_tokens
-            cached_tokens = 0
-            if hasattr(response.usage, 'prompt_tokens_details') and response.usage.prompt_tokens_details:
-                cached_tokens = getattr(response.usage.prompt_tokens_details, 'cached_tokens', 0) or 0
-            # The server bills the account and says what it took. Use that,
-            # not the local table: prompt_tokens + completion_tokens is 12 on a
-            # call whose total_tokens is 114, because the reasoning models
-            # charge for tokens the OpenAI-shaped fields never name. Arithmetic
-            # over those two numbers came out 11.6x under what was charged.
-            #
-            # `is not None` rather than a truth test — a free call reports 0.0,
-            # and falling back there would invent a charge for it.
-            cost = getattr(response.usage, 'cost_usd', None)
-            if cost is None:
-                cost = calculate_cost(self.model, input_tokens, output_tokens, cached_tokens)
-            # total_tokens for the same reason as cost_usd, and it was the half of
-            # this decision left undone: the cost came from the server while the
-            # token count stayed on the two fields just described as not naming
-            # the reasoning tokens. Measured here: prompt 17 + completion 3
-            # printed as "20 tok · $0.0017" on a call the server billed 243
-            # tokens for — a line 34x off itself.
-            #
-            # Only when it exceeds the sum. Equal or smaller means the provider is
-            # restating those two fields and there is nothing extra to report.
-            server_total = getattr(response.usage, 'total_tokens', 0) or 0
-            usage = TokenUsage(
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                cached_tokens=cached_tokens,
-                cost=cost,
-                total_tokens=server_total if server_total > input_tokens + output_tokens else 0,
-            )
+            usage = self._usage(response.usage)
 
         return LLMResponse(
             content=message.content,
@@ -1157,6 +1513,47 @@ class OpenOnionLLM(LLM):
             usage=usage,
         )
 
+    def stream(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]] = None, **kwargs) -> Iterator[StreamChunk]:
+        """Stream a conversation with optional tool support using OpenAI-compatible API."""
+        api_kwargs = self._request(messages, tools, kwargs)
+        return self._stream_chat_completions(api_kwargs, self._call, self._usage)
+
+    def _usage(self, usage) -> TokenUsage:
+        """Build TokenUsage from a chat-completions usage object, preferring server billing."""
+        input_tokens = usage.prompt_tokens
+        output_tokens = usage.completion_tokens
+        cached_tokens = 0
+        if hasattr(usage, 'prompt_tokens_details') and usage.prompt_tokens_details:
+            cached_tokens = getattr(usage.prompt_tokens_details, 'cached_tokens', 0) or 0
+        # The server bills the account and says what it took. Use that,
+        # not the local table: prompt_tokens + completion_tokens is 12 on a
+        # call whose total_tokens is 114, because the reasoning models
+        # charge for tokens the OpenAI-shaped fields never name. Arithmetic
+        # over those two numbers came out 11.6x under what was charged.
+        #
+        # `is not None` rather than a truth test — a free call reports 0.0,
+        # and falling back there would invent a charge for it.
+        cost = getattr(usage, 'cost_usd', None)
+        if cost is None:
+            cost = calculate_cost(self.model, input_tokens, output_tokens, cached_tokens)
+        # total_tokens for the same reason as cost_usd, and it was the half of
+        # this decision left undone: the cost came from the server while the
+        # token count stayed on the two fields just described as not naming
+        # the reasoning tokens. Measured here: prompt 17 + completion 3
+        # printed as "20 tok · $0.0017" on a call the server billed 243
+        # tokens for — a line 34x off itself.
+        #
+        # Only when it exceeds the sum. Equal or smaller means the provider is
+        # restating those two fields and there is nothing extra to report.
+        server_total = getattr(usage, 'total_tokens', 0) or 0
+        return TokenUsage(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cached_tokens=cached_tokens,
+            cost=cost,
+            total_tokens=server_total if server_total > input_tokens + output_tokens else 0,
+        )
+
     def _call(self, send):
         """Make one request and translate the failures callers are written against.
 
@@ -1170,9 +1567,20 @@ class OpenOnionLLM(LLM):
         One helper rather than a copied block: two copies of a translation table
         drift, and the half that drifts is the half nobody tested.
         """
+        with self._errors():
+            return send()
+
+    async def _acall(self, send):
+        """_call() for the asyncio client: send() returns an awaitable."""
+        with self._errors():
+            return await send()
+
+    @contextmanager
+    def _errors(self):
+        """The translation table behind _call() and _acall()."""
         import openai
         try:
-            return send()
+            yield
         except openai.APIStatusError as e:
             if e.status_code == 402:
                 raise InsufficientCreditsError(e) from e
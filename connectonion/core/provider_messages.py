@@ -1,17 +1,140 @@
-"""Build detached provider input from canonical ConnectOnion messages."""
+"""Build detached provider input from canonical ConnectOnion messages.
+
+An agent calls the provider once per iteration with the whole history, so the
+copy -- and each provider's conversion of it -- would otherwise be redone for
+hundreds of messages that have not changed since the last call.
+ProviderMessageCache keeps both per message, keyed by the message's `id` or,
+for the many messages the agent appends without one (user input, tool calls,
+tool results, the system prompt), by their position in the history. Each
+entry is checked against the message before it is reused: a plugin that
+assigns a new value (system_reminder appending to a tool result, auto_compact
+replacing the list) gets a fresh conversion, and messages that left the
+history are dropped.
+"""
 
 from __future__ import annotations
 
-from collections.abc import Iterable, Mapping
+from collections.abc import Callable, Iterable, Mapping
 from typing import Any
 
+_MISSING = object()
+_POSITION = "position"
+
 
 def messages_for_provider(
     messages: Iterable[Mapping[str, Any]],
+    cache: ProviderMessageCache | None = None,
 ) -> list[dict[str, Any]]:
-    """Copy messages without ConnectOnion's top-level domain identity."""
+    """Copy messages without ConnectOnion's top-level domain identity.
+
+    With a cache, unchanged messages reuse the copy made for an earlier call
+    and the result carries converted() for provider formats.
+    """
+    if cache is not None:
+        return cache.detach(messages)
+    return [_detach(message) for message in messages]
+
+
+def _detach(message: Mapping[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in message.items() if key != "id"}
+
+
+class ProviderMessages(list):
+    """Detached messages for one provider call, backed by a ProviderMessageCache.
+
+    A plain list to every provider, so complete(messages, ...) keeps its
+    signature. A provider that needs its own format asks converted(), which
+    converts only the messages the cache has not seen in that format. The
+    copies and conversions are shared with later calls, so providers treat
+    them as read-only, as every provider in core/llm.py does.
+    """
+
+    def __init__(self, detached, entries, cache: ProviderMessageCache):
+        super().__init__(detached)
+        self._entries = entries
+        self._cache = cache
+
+    def converted(self, key: str, convert: Callable[[dict[str, Any]], Any]) -> list:
+        """[convert(m) for m in self], reusing earlier results per message."""
+        out = []
+        for message, entry in zip(self, self._entries):
+            result = entry.converted.get(key, _MISSING)
+            if result is _MISSING:
+                self._cache.misses += 1
+                result = entry.converted[key] = convert(message)
+            else:
+                self._cache.hits += 1
+            out.append(result)
+        return out
+
+
+class _Entry:
+    __slots__ = ("source", "snapshot", "detached", "converted")
+
+    def __init__(self, message: Mapping[str, Any]):
+        self.source = message
+        self.snapshot = tuple(message.items())
+        self.detached = _detach(message)
+        self.converted: dict[str, Any] = {}
+
+    def matches(self, message: Mapping[str, Any]) -> bool:
+        """Whether the message still holds what this entry was built from.
+
+        Values are compared by identity first, so an untouched message costs a
+        few pointer checks. A message rebuilt from storage with equal values
+        (a resumed session) matches too. Editing a nested list in place is not
+        seen; plugins assign a new value instead.
+        """
+        if len(message) != len(self.snapshot):
+            return False
+        same = message is self.source
+        for key, value in self.snapshot:
+            current = message.get(key, _MISSING)
+            if current is value:
+                continue
+            if same or current != value:
+                return False
+        if not same:
+            self.source = message
+            self.snapshot = tuple(message.items())
+        return True
+
+
+class ProviderMessageCache:
+    """Per-session copies and provider conversions of messages.
+
+    Keyed by a message's `id` when it has one, otherwise by its index in the
+    history. The agent only appends, so an index keeps naming the same message
+    from one call to the next; when it does not (a plugin inserted a message,
+    compaction rebuilt the list), matches() sees different values there and
+    the entry is rebuilt.
+    """
+
+    def __init__(self):
+        self._entries: dict[Any, _Entry] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def detach(self, messages: Iterable[Mapping[str, Any]]) -> ProviderMessages:
+        live: dict[Any, _Entry] = {}
+        detached, entries = [], []
+        for index, message in enumerate(messages):
+            key = message.get("id")
+            if key is None:
+                # A tuple never equals a string id, so positions and ids
+                # cannot collide.
+                key = (_POSITION, index)
+            entry = self._entries.get(key)
+            if entry is None or not entry.matches(message):
+                entry = _Entry(message)
+            live[key] = entry
+            detached.append(entry.detached)
+            entries.append(entry)
+        # Keep only what is in the history now: compaction and a new session
+        # release everything they replaced.
+        self._entries = live
+        return ProviderMessages(detached, entries, self)
 
-    return [
-        {key: value for key, value in message.items() if key != "id"}
-        for message in messages
-    ]
+    def stats(self) -> dict:
+        """Hit/miss counts for provider conversions, and entries held."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,20 @@
+"""
+Purpose: Small summary statistics shared by latency reports
+LLM-Note:
+  Dependencies: imports from [typing] | imported by [network/gather.py, cli/commands/eval_commands.py] | tested by [tests/unit/test_connect_many.py, tests/unit/test_co_eval_runs_in_parallel_and_offline.py, tests/unit/test_stats.py]
+  Data flow: percentile(ordered, pct) → the nearest-rank value of an already sorted list, or None for an empty one
+  State/Effects: none
+  Integration: exposes percentile()
+  Performance: O(1) on the sorted input; sorting is the caller's, since every caller already holds the values sorted
+  Errors: none raised; an empty list answers None
+"""
+
+from typing import Optional, Sequence
+
+
+def percentile(ordered: Sequence, pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
@@ -4,8 +4,8 @@ LLM-Note:
   Dependencies: imports from [time, json, typing, xray.py] | imported by [agent.py] | tested by [tests/unit/test_tool_executor.py]
   Data flow: receives Agent tool calls → injects xray → hosted agent-aware tools use a copied session/revocable IO; opted-in stateful tools also fork → commit completed calls → record result and clear xray
   State/Effects: mutates agent.current_session['messages'] by appending assistant message with tool_calls and tool result messages | mutates agent.current_session['trace'] by appending tool_call then tool_result entries | calls logger.log_tool_call() and logger.log_tool_result() for user feedback | injects/clears xray context via thread-local storage
-  Integration: exposes execute_and_record_tools(tool_calls, tools, agent, logger), execute_single_tool(...) | uses logger.log_tool_call(name, args) for natural function-call style output: greet(name='Alice') | creates trace entries with type, tool_name, arguments, call_id, result, status, timing, iteration, timestamp
-  Performance: times each tool execution in milliseconds | executes tools sequentially (not parallel) | trace entry added BEFORE auto-trace so xray.trace() sees it | agent injection uses cached _needs_agent flag (set by tool_factory) instead of inspect.signature() for zero overhead
+  Integration: exposes execute_and_record_tools(tool_calls, tools, agent, logger), execute_single_tool(...), and their async forms execute_and_record_tools_async(...), execute_single_tool_async(...) (coroutine tools awaited on the caller's loop, plain functions on a worker thread) | uses logger.log_tool_call(name, args) for natural function-call style output: greet(name='Alice') | creates trace entries with type, tool_name, arguments, call_id, result, status, timing, iteration, timestamp
+  Performance: times each tool execution in milliseconds | executes tools sequentially unless agent.max_parallel_tools > 1, then consecutive parallel_safe tools share a bounded thread pool (hooks, trace and messages stay in call order) | trace entry added BEFORE auto-trace so xray.trace() sees it | agent injection uses cached _needs_agent flag (set by tool_factory) instead of inspect.signature() for zero overhead
   Errors: catches all tool execution exceptions | wraps errors in trace_entry with error, error_type fields | returns error message to LLM for retry | prints error to logger with red ✗
 """
 
@@ -201,25 +201,104 @@ def execute_and_record_tools(
     # before_tools fires ONCE before ALL tools in the batch execute
     agent._invoke_events('before_tools')
 
-    # Execute each tool
-    for i, tool_call in enumerate(tool_calls):
-        # Execute the tool and get trace entry
-        trace_entry = execute_single_tool(
-            tool_name=tool_call.name,
-            tool_args=tool_call.arguments,
-            tool_id=tool_call.id,
-            tools=tools,
-            agent=agent,
-            logger=logger
-        )
+    # Execute each tool. With agent.max_parallel_tools > 1, consecutive calls
+    # to tools marked parallel_safe run together; everything else, and every
+    # message and after-hook, stays in the order the model asked for.
+    limit = _parallel_limit(agent)
+    i = 0
+    while i < len(tool_calls):
+        group = _parallel_group(tool_calls, i, tools, limit)
+        if len(group) > 1:
+            trace_entries, held_stop = _execute_parallel_tools(group, tools, agent, logger, limit)
+        else:
+            tool_call = group[0]
+            trace_entries, held_stop = [execute_single_tool(
+                tool_name=tool_call.name,
+                tool_args=tool_call.arguments,
+                tool_id=tool_call.id,
+                tools=tools,
+                agent=agent,
+                logger=logger
+            )], None
+
+        i, stopped = _record_group_results(tool_calls, i, group, trace_entries, held_stop, agent)
+        if stopped:
+            break
+
+    _finish_tool_batch(agent)
+
+
+async def execute_and_record_tools_async(
+    tool_calls: List,
+    tools: Any,  # ToolRegistry
+    agent: Any,
+    logger: Any  # Logger instance
+) -> None:
+    """execute_and_record_tools() for Agent.input_async().
+
+    Messages, trace and hooks follow exactly the same order. A coroutine tool
+    is awaited on the caller's event loop (execute_single_tool_async); a
+    plain function, and a parallel-safe group, runs on a worker thread so the
+    loop stays free for other sessions while it blocks.
+    """
+    _add_assistant_message(agent.current_session['messages'], tool_calls)
+    agent._invoke_events('before_tools')
+
+    limit = _parallel_limit(agent)
+    i = 0
+    while i < len(tool_calls):
+        group = _parallel_group(tool_calls, i, tools, limit)
+        if len(group) > 1:
+            trace_entries, held_stop = await asyncio.to_thread(
+                _execute_parallel_tools, group, tools, agent, logger, limit
+            )
+        else:
+            tool_call = group[0]
+            trace_entries, held_stop = [await execute_single_tool_async(
+                tool_name=tool_call.name,
+                tool_args=tool_call.arguments,
+                tool_id=tool_call.id,
+                tools=tools,
+                agent=agent,
+                logger=logger
+            )], None
+
+        i, stopped = _record_group_results(tool_calls, i, group, trace_entries, held_stop, agent)
+        if stopped:
+            break
+
+    _finish_tool_batch(agent)
+
+
+def _record_group_results(
+    tool_calls: List,
+    i: int,
+    group: List,
+    trace_entries: List[Dict[str, Any]],
+    held_stop: Any,
+    agent: Any,
+) -> tuple[int, bool]:
+    """Add the group's results to messages and fire their after-hooks, in call order.
+
+    Returns the index of the next call to run and whether a stop_signal ended
+    the batch.
+    """
+    for j, trace_entry in enumerate(trace_entries):
+        tool_call = group[j]
+        i += 1
+        # A rejection raised while a parallel group was being approved is
+        # held until the calls approved before it have been recorded, so
+        # it lands on the same call it would have sequentially.
+        if held_stop is not None and j == len(trace_entries) - 1:
+            agent.current_session['stop_signal'] = held_stop
 
         # stop_signal: swap result with clean message, mark remaining as rejected
         rejection = agent.current_session.get('stop_signal')
         if rejection:
             _add_tool_result_message(agent.current_session['messages'], tool_call.id, rejection)
-            for remaining in tool_calls[i + 1:]:
+            for remaining in tool_calls[i:]:
                 _add_tool_result_message(agent.current_session['messages'], remaining.id, "Rejected by user")
-            break
+            return i, True
 
         # Add result to conversation messages
         _add_tool_result_message(
@@ -239,7 +318,10 @@ def execute_and_record_tools(
         # after_each_tool fires for EACH tool execution (success, error, not_found)
         # WARNING: Do NOT add messages here - it breaks Anthropic's message ordering
         agent._invoke_events('after_each_tool')
+    return i, False
 
+
+def _finish_tool_batch(agent: Any) -> None:
     # An interrupt exits through on_stop_signal. Do not run after_tools hooks:
     # built-in reflection can make another blocking LLM call, defeating Stop.
     if not agent.current_session.get('stop_signal'):
@@ -249,6 +331,169 @@ def execute_and_record_tools(
         agent._invoke_events('after_tools')
 
 
+def _parallel_limit(agent: Any) -> int:
+    """Worker count for parallel-safe tool calls; 1 keeps execution sequential."""
+    limit = getattr(agent, 'max_parallel_tools', 1)
+    if not isinstance(limit, int) or isinstance(limit, bool):
+        return 1
+    return max(limit, 1)
+
+
+def _parallel_group(tool_calls: List, start: int, tools: Any, limit: int) -> List:
+    """The calls from ``start`` that may run together (always at least one).
+
+    A call joins the group only if its tool opted in with ``parallel_safe``.
+    Agent-injected tools are excluded: they run on a forked session and a
+    revocable IO lease that are committed one invocation at a time.
+    """
+    group = [tool_calls[start]]
+    if limit <= 1:
+        return group
+
+    def eligible(tool_call) -> bool:
+        tool_func = tools.get(tool_call.name)
+        return (
+            tool_func is not None
+            and getattr(tool_func, '_parallel_safe', False)
+            and not getattr(tool_func, '_needs_agent', False)
+        )
+
+    if not eligible(tool_calls[start]):
+        return group
+    for tool_call in tool_calls[start + 1:]:
+        if not eligible(tool_call):
+            break
+        group.append(tool_call)
+    return group
+
+
+def _execute_parallel_tools(
+    group: List,
+    tools: Any,  # ToolRegistry
+    agent: Any,
+    logger: Any,
+    limit: int,
+) -> tuple[List[Dict[str, Any]], Any]:
+    """Run a group of parallel-safe calls and return their trace entries in order.
+
+    Hooks, trace entries and logging all stay on the agent thread; only the
+    tool bodies run on the pool. ``before_each_tool`` fires for every call
+    before any of them starts, so a hook that rejects call k stops the group
+    there: calls before k still run, k and everything after it do not.
+
+    Returns ``(trace_entries, held_stop)``. ``held_stop`` is a stop_signal a
+    hook set while approving the last returned call; the caller restores it
+    when it reaches that call, exactly where the sequential loop would see it.
+    """
+    prepared = []  # (trace_entry, tool_func, call_args)
+    trace_entries = []
+    held_stop = None
+    interrupted = False
+
+    for tool_call in group:
+        tool_func = tools.get(tool_call.name)
+        trace_entry, tool_args = _open_tool_call(
+            tool_call.name, tool_call.arguments, tool_call.id, tool_func, agent, logger
+        )
+        trace_entries.append(trace_entry)
+
+        hook_start = time.time()
+        try:
+            _before_each_tool(tool_call.name, tool_args, tool_call.id, tool_func, agent)
+        except UserInterrupt:
+            interrupted = True
+        except Exception as e:
+            _record_tool_error(
+                trace_entry, e, (time.time() - hook_start) * 1000, tool_func, agent, logger
+            )
+        else:
+            prepared.append((trace_entry, tool_func, tool_args))
+
+        if interrupted:
+            break
+        if agent.current_session.get('stop_signal'):
+            held_stop = agent.current_session.pop('stop_signal')
+            break
+
+    if interrupted:
+        # An interrupt during approval ends the batch: nothing approved in
+        # this group starts.
+        for trace_entry, _tool_func, _tool_args in prepared:
+            _record_tool_interrupted(trace_entry, time.time(), agent, logger)
+        _record_tool_interrupted(trace_entries[-1], time.time(), agent, logger)
+        return trace_entries, None
+
+    if not prepared:
+        return trace_entries, held_stop
+
+    _inject_xray(agent)
+
+    def run_tool(tool_func, call_args):
+        start = time.time()
+        try:
+            if inspect.iscoroutinefunction(tool_func):
+                result = _run_async_tool(tool_func(**call_args))
+            else:
+                result = tool_func(**call_args)
+        except Exception as error:
+            return False, error, (time.time() - start) * 1000
+        return True, result, (time.time() - start) * 1000
+
+    pool = ThreadPoolExecutor(
+        max_workers=min(limit, len(prepared)), thread_name_prefix="co-parallel-tool"
+    )
+    group_start = time.time()
+    try:
+        futures = [
+            pool.submit(run_tool, tool_func, call_args)
+            for _trace_entry, tool_func, call_args in prepared
+        ]
+        outcomes, interrupted = run_interruptible(
+            lambda: [future.result() for future in futures],
+            agent.io,
+        )
+    finally:
+        # Never wait on an abandoned group: an interrupted worker's late
+        # result is discarded, as with run_interruptible's own step thread.
+        pool.shutdown(wait=not interrupted, cancel_futures=True)
+        clear_xray_context()
+
+    if interrupted:
+        for trace_entry, _tool_func, _tool_args in prepared:
+            _record_tool_interrupted(trace_entry, group_start, agent, logger)
+        return trace_entries, None
+
+    for (trace_entry, tool_func, _call_args), (succeeded, result, duration) in zip(prepared, outcomes):
+        if not succeeded and isinstance(result, UserInterrupt):
+            _record_tool_interrupted(trace_entry, group_start, agent, logger)
+        elif succeeded:
+            _record_tool_success(
+                trace_entry, result, duration, is_xray_enabled(tool_func), agent, logger
+            )
+        else:
+            _record_tool_error(trace_entry, result, duration, tool_func, agent, logger)
+
+    return trace_entries, held_stop
+
+
+def _record_tool_interrupted(
+    trace_entry: Dict[str, Any],
+    tool_start: float,
+    agent: Any,
+    logger: Any,
+) -> None:
+    """Complete a trace entry for a call the user interrupted and record it."""
+    interruption = "Interrupted by user"
+    agent.current_session['stop_signal'] = interruption
+    trace_entry.update({
+        "timing_ms": (time.time() - tool_start) * 1000,
+        "result": interruption,
+        "status": "interrupted",
+    })
+    agent._record_trace(trace_entry)
+    logger.log_tool_result(interruption, trace_entry["timing_ms"])
+
+
 def execute_single_tool(
     tool_name: str,
     tool_args: Dict,
@@ -275,72 +520,18 @@ def execute_single_tool(
     Returns:
         Dict trace entry with: type, tool_name, arguments, call_id, result, status, timing, iteration, timestamp
     """
-    # Detach the model's presentation sentence from ordinary implementation
-    # arguments. Old sessions and third-party callers may omit it; execution
-    # remains compatible and readers provide a deterministic fallback.
-    tool_args = dict(tool_args)
     tool_func = tools.get(tool_name)
-    summary = _bounded_tool_summary(tool_args.get("summary"))
-    if not getattr(tool_func, "_summary_is_function_argument", False):
-        tool_args.pop("summary", None)
-
-    # Log tool call before execution
-    logger.log_tool_call(tool_name, tool_args)
-
-    trace_entry = {
-        "type": "tool_result",
-        "tool_id": tool_id,  # LLM's tool call ID for client-side matching
-        "name": tool_name,
-        "args": tool_args,
-        "status": "pending",
-        "result": None,
-        "timing_ms": 0,
-    }
-    if summary:
-        trace_entry["summary"] = summary
-
-    # Every result must have a preceding start with the same stable ID.  This
-    # is required by streaming clients and also avoids a completion that cannot be
-    # correlated by ConnectOnion clients when the requested tool is unknown.
-    start_entry = {
-        "type": "tool_call",
-        "tool_id": tool_id,
-        "name": tool_name,
-        "args": tool_args,
-    }
-    if summary:
-        start_entry["summary"] = summary
-    agent._record_trace(start_entry)
+    trace_entry, tool_args = _open_tool_call(tool_name, tool_args, tool_id, tool_func, agent, logger)
 
     # Check if tool exists
     if tool_func is None:
-        error_msg = f"Tool '{tool_name}' not found"
-
-        trace_entry["result"] = error_msg
-        trace_entry["status"] = "not_found"
-        trace_entry["error"] = error_msg
-
-        agent._record_trace(trace_entry)
-        logger.print(f"[red]✗[/red] {error_msg}")
-
-        return trace_entry
+        return _record_tool_not_found(trace_entry, agent, logger)
 
     # Check if tool has @xray decorator
     xray_enabled = is_xray_enabled(tool_func)
 
-    previous_tools = [
-        entry.get("name") for entry in agent.current_session['trace']
-        if entry.get("type") == "tool_result"
-    ]
-
     # Inject xray context before tool execution
-    inject_xray_context(
-        agent=agent,
-        user_prompt=agent.current_session.get('user_prompt', ''),
-        messages=agent.current_session['messages'].copy(),
-        iteration=agent.current_session['iteration'],
-        previous_tools=previous_tools
-    )
+    _inject_xray(agent)
 
     # Initialize timing (for error case if before_tool fails)
     tool_start = time.time()
@@ -355,32 +546,13 @@ def execute_single_tool(
     tool_instance = None
 
     def interrupted_tool_result():
-        interruption = "Interrupted by user"
-        agent.current_session['stop_signal'] = interruption
-        trace_entry.update({
-            "timing_ms": (time.time() - tool_start) * 1000,
-            "result": interruption,
-            "status": "interrupted",
-        })
-        agent._record_trace(trace_entry)
-        logger.log_tool_result(interruption, trace_entry["timing_ms"])
+        _record_tool_interrupted(trace_entry, tool_start, agent, logger)
         return trace_entry
 
     try:
-        # Set pending_tool for before_tool handlers to access
-        agent.current_session['pending_tool'] = {
-            'name': tool_name,
-            'arguments': tool_args,
-            'id': tool_id,
-            'description': getattr(tool_func, 'description', '')
-        }
-
         # Invoke before_each_tool events. A rejection or interrupt is control
         # flow, but pending_tool is transient in every outcome.
-        try:
-            agent._invoke_events('before_each_tool')
-        finally:
-            agent.current_session.pop('pending_tool', None)
+        _before_each_tool(tool_name, tool_args, tool_id, tool_func, agent)
 
         # Execute the tool with timing (restart timer AFTER events for accurate tool timing)
         tool_start = time.time()
@@ -489,8 +661,10 @@ def execute_single_tool(
         if tool_session is not None:
             original_session.clear()
             original_session.update(tool_session)
-            original_tools._tools.clear()
-            original_tools._tools.update(tool_tools._tools)
+            if original_tools._tools != tool_tools._tools:
+                original_tools._tools.clear()
+                original_tools._tools.update(tool_tools._tools)
+                original_tools._invalidate()
             original_tools._instances.clear()
             original_tools._instances.update(tool_tools._instances)
         if tool_io is not None and not tool_io.commit():
@@ -499,65 +673,20 @@ def execute_single_tool(
         if not succeeded:
             raise result
 
-        trace_entry["timing_ms"] = tool_duration
-        trace_entry["result"] = str(result)
-        trace_entry["status"] = "success"
-
     except UserInterrupt:
         return interrupted_tool_result()
 
     except Exception as e:
         # Calculate timing from initial start (includes before_tool if it succeeded)
         tool_duration = (time.time() - tool_start) * 1000
-
-        trace_entry["timing_ms"] = tool_duration
-        trace_entry["status"] = "error"
-        trace_entry["error"] = str(e)
-        trace_entry["error_type"] = type(e).__name__
-
-        # Always include schema info so LLM knows how to fix the call
-        schema = getattr(tool_func, 'get_parameters_schema', lambda: {})()
-        required = schema.get('required', [])
-        properties = list(schema.get('properties', {}).keys())
-
-        error_msg = f"Error: {str(e)}"
-        error_msg += f"\n\nTool '{tool_name}' schema: required={required}, all_params={properties}, you_provided={list(tool_args.keys())}"
-        trace_entry["result"] = error_msg
-
-        agent._record_trace(trace_entry)
-
-        time_str = f"{tool_duration/1000:.4f}s" if tool_duration < 100 else f"{tool_duration/1000:.1f}s"
-        logger.print(f"[red]✗[/red] Error ({time_str}): {str(e)}")
+        _record_tool_error(trace_entry, e, tool_duration, tool_func, agent, logger)
 
         # Note: on_error event will fire in execute_and_record_tools after result message added
 
     else:
-        wire_extras = None
-        if agent.io:
-            try:
-                structured, raw_output = _structured_tool_output(result)
-            except Exception:
-                structured, raw_output = False, None
-            if structured:
-                try:
-                    matches_canonical = str(raw_output) == trace_entry["result"]
-                except Exception:
-                    matches_canonical = False
-                if matches_canonical:
-                    wire_extras = {"raw_output": raw_output}
-            agent._record_trace(trace_entry, wire_extras=wire_extras)
-        else:
-            agent._record_trace(trace_entry)
-        logger.log_tool_result(trace_entry["result"], tool_duration)
-
-        if xray_enabled:
-            logger.print_xray_table(
-                tool_name=tool_name,
-                tool_args=tool_args,
-                result=result,
-                timing=tool_duration,
-                agent=agent
-            )
+        _record_tool_success(
+            trace_entry, result, tool_duration, xray_enabled, agent, logger
+        )
 
         # after_tool fires later, after the LLM tool message is added.
 
@@ -575,6 +704,228 @@ def execute_single_tool(
     return trace_entry
 
 
+async def execute_single_tool_async(
+    tool_name: str,
+    tool_args: Dict,
+    tool_id: str,
+    tools: Any,  # ToolRegistry
+    agent: Any,
+    logger: Any  # Logger instance
+) -> Dict[str, Any]:
+    """execute_single_tool(), awaiting a coroutine tool on the running event loop.
+
+    Instead of _run_async_tool's shared loop thread, the coroutine runs on
+    the loop that called Agent.input_async(), so many sessions' tools overlap
+    on one thread. Loop-bound resources a tool keeps between calls therefore
+    belong to the caller's loop here.
+
+    Only an agent without io takes this path. Hosted tools need the forked
+    session and revocable IO lease that execute_single_tool sets up, and plain
+    functions would block the loop, so both run execute_single_tool on a
+    worker thread instead.
+    """
+    tool_func = tools.get(tool_name)
+    if agent.io is not None or not inspect.iscoroutinefunction(tool_func):
+        return await asyncio.to_thread(
+            execute_single_tool, tool_name, tool_args, tool_id, tools, agent, logger
+        )
+
+    trace_entry, tool_args = _open_tool_call(tool_name, tool_args, tool_id, tool_func, agent, logger)
+    xray_enabled = is_xray_enabled(tool_func)
+    _inject_xray(agent)
+
+    tool_start = time.time()
+    try:
+        _before_each_tool(tool_name, tool_args, tool_id, tool_func, agent)
+
+        tool_start = time.time()
+        call_args = tool_args
+        if getattr(tool_func, '_needs_agent', False):
+            call_args = {**tool_args, 'agent': agent}
+        agent.current_session['_active_tool_call_id'] = tool_id
+        result = await tool_func(**call_args)
+        tool_duration = (time.time() - tool_start) * 1000
+
+    except UserInterrupt:
+        _record_tool_interrupted(trace_entry, tool_start, agent, logger)
+
+    except Exception as e:
+        tool_duration = (time.time() - tool_start) * 1000
+        _record_tool_error(trace_entry, e, tool_duration, tool_func, agent, logger)
+
+    else:
+        _record_tool_success(
+            trace_entry, result, tool_duration, xray_enabled, agent, logger
+        )
+
+    finally:
+        agent.current_session.pop('_active_tool_call_id', None)
+        clear_xray_context()
+
+    return trace_entry
+
+
+def _open_tool_call(
+    tool_name: str,
+    tool_args: Dict,
+    tool_id: str,
+    tool_func: Any,
+    agent: Any,
+    logger: Any,
+) -> tuple[Dict[str, Any], Dict]:
+    """Log and record the start of a call; return its pending trace entry and arguments."""
+    # Detach the model's presentation sentence from ordinary implementation
+    # arguments. Old sessions and third-party callers may omit it; execution
+    # remains compatible and readers provide a deterministic fallback.
+    tool_args = dict(tool_args)
+    summary = _bounded_tool_summary(tool_args.get("summary"))
+    if not getattr(tool_func, "_summary_is_function_argument", False):
+        tool_args.pop("summary", None)
+
+    # Log tool call before execution
+    logger.log_tool_call(tool_name, tool_args)
+
+    trace_entry = {
+        "type": "tool_result",
+        "tool_id": tool_id,  # LLM's tool call ID for client-side matching
+        "name": tool_name,
+        "args": tool_args,
+        "status": "pending",
+        "result": None,
+        "timing_ms": 0,
+    }
+    if summary:
+        trace_entry["summary"] = summary
+
+    # Every result must have a preceding start with the same stable ID.  This
+    # is required by streaming clients and also avoids a completion that cannot be
+    # correlated by ConnectOnion clients when the requested tool is unknown.
+    start_entry = {
+        "type": "tool_call",
+        "tool_id": tool_id,
+        "name": tool_name,
+        "args": tool_args,
+    }
+    if summary:
+        start_entry["summary"] = summary
+    agent._record_trace(start_entry)
+    return trace_entry, tool_args
+
+
+def _record_tool_not_found(trace_entry: Dict[str, Any], agent: Any, logger: Any) -> Dict[str, Any]:
+    error_msg = f"Tool '{trace_entry['name']}' not found"
+
+    trace_entry["result"] = error_msg
+    trace_entry["status"] = "not_found"
+    trace_entry["error"] = error_msg
+
+    agent._record_trace(trace_entry)
+    logger.print(f"[red]✗[/red] {error_msg}")
+
+    return trace_entry
+
+
+def _before_each_tool(tool_name: str, tool_args: Dict, tool_id: str, tool_func: Any, agent: Any) -> None:
+    """Fire before_each_tool with pending_tool set for the handlers to read."""
+    agent.current_session['pending_tool'] = {
+        'name': tool_name,
+        'arguments': tool_args,
+        'id': tool_id,
+        'description': getattr(tool_func, 'description', '')
+    }
+    try:
+        agent._invoke_events('before_each_tool')
+    finally:
+        agent.current_session.pop('pending_tool', None)
+
+
+def _inject_xray(agent: Any) -> None:
+    previous_tools = [
+        entry.get("name") for entry in agent.current_session['trace']
+        if entry.get("type") == "tool_result"
+    ]
+    inject_xray_context(
+        agent=agent,
+        user_prompt=agent.current_session.get('user_prompt', ''),
+        messages=agent.current_session['messages'].copy(),
+        iteration=agent.current_session['iteration'],
+        previous_tools=previous_tools
+    )
+
+
+def _record_tool_error(
+    trace_entry: Dict[str, Any],
+    error: Exception,
+    tool_duration: float,
+    tool_func: Any,
+    agent: Any,
+    logger: Any,
+) -> None:
+    """Complete a trace entry for a failed call and record it."""
+    tool_name = trace_entry["name"]
+    tool_args = trace_entry["args"]
+
+    trace_entry["timing_ms"] = tool_duration
+    trace_entry["status"] = "error"
+    trace_entry["error"] = str(error)
+    trace_entry["error_type"] = type(error).__name__
+
+    # Always include schema info so LLM knows how to fix the call
+    schema = getattr(tool_func, 'get_parameters_schema', lambda: {})()
+    required = schema.get('required', [])
+    properties = list(schema.get('properties', {}).keys())
+
+    error_msg = f"Error: {str(error)}"
+    error_msg += f"\n\nTool '{tool_name}' schema: required={required}, all_params={properties}, you_provided={list(tool_args.keys())}"
+    trace_entry["result"] = error_msg
+
+    agent._record_trace(trace_entry)
+
+    time_str = f"{tool_duration/1000:.4f}s" if tool_duration < 100 else f"{tool_duration/1000:.1f}s"
+    logger.print(f"[red]✗[/red] Error ({time_str}): {str(error)}")
+
+
+def _record_tool_success(
+    trace_entry: Dict[str, Any],
+    result: Any,
+    tool_duration: float,
+    xray_enabled: bool,
+    agent: Any,
+    logger: Any,
+) -> None:
+    """Complete a trace entry for a successful call and record it."""
+    trace_entry["timing_ms"] = tool_duration
+    trace_entry["result"] = str(result)
+    trace_entry["status"] = "success"
+
+    wire_extras = None
+    if agent.io:
+        try:
+            structured, raw_output = _structured_tool_output(result)
+        except Exception:
+            structured, raw_output = False, None
+        if structured:
+            try:
+                matches_canonical = str(raw_output) == trace_entry["result"]
+            except Exception:
+                matches_canonical = False
+            if matches_canonical:
+                wire_extras = {"raw_output": raw_output}
+        agent._record_trace(trace_entry, wire_extras=wire_extras)
+    else:
+        agent._record_trace(trace_entry)
+    logger.log_tool_result(trace_entry["result"], tool_duration)
+
+    if xray_enabled:
+        logger.print_xray_table(
+            tool_name=trace_entry["name"],
+            tool_args=trace_entry["args"],
+            result=result,
+            timing=tool_duration,
+            agent=agent
+        )
+
+
 def _bounded_tool_summary(value: Any) -> str | None:
     """Return a bounded action summary or no summary for old callers."""
     if not isinstance(value, str):
@@ -3,8 +3,8 @@ Purpose: Convert Python functions and class methods into agent-compatible tool s
 LLM-Note:
   Dependencies: imports from [inspect, functools, typing] | imported by [agent.py, __init__.py] | tested by [tests/unit/test_tool_factory.py]
   Data flow: receives func: Callable → inspects signature with inspect.signature() → extracts type hints with get_type_hints() → maps Python types to JSON Schema via get_json_schema_type() → skips 'self' and 'agent' params from schema → caches _needs_agent flag for tool_executor → creates tool with .name, .description, .to_function_schema(), .run() attributes → returns wrapped Callable
-  State/Effects: no side effects | pure function transformations | preserves @xray and @replay decorator flags via hasattr checks | creates wrapper functions for bound methods to maintain self reference | sets _needs_agent=True on tools that declare 'agent' in signature
-  Integration: exposes get_json_schema_type(param_type), create_tool_from_function(func), extract_methods_from_instance(obj), is_class_instance(obj) | used by Agent.__init__ to auto-convert tools | supports both standalone functions and bound methods | skips private methods (starting with _)
+  State/Effects: no side effects | pure function transformations | preserves @xray and @replay decorator flags via hasattr checks | creates wrapper functions for bound methods to maintain self reference | sets _needs_agent=True on tools that declare 'agent' in signature | sets _parallel_safe from the @parallel_safe marker or the parallel_safe argument
+  Integration: exposes get_json_schema_type(param_type), create_tool_from_function(func, parallel_safe=None), parallel_safe(func), extract_methods_from_instance(obj), is_class_instance(obj) | used by Agent.__init__ to auto-convert tools | supports both standalone functions and bound methods | skips private methods (starting with _)
   Performance: uses inspect module (relatively fast) | TYPE_MAP provides O(1) type lookups | caches _needs_agent at registration time so tool_executor avoids inspect.signature() on every call
   Errors: skips methods without type annotations | skips methods without return type hint | handles inspection failures gracefully | wraps functions with functools.wraps to preserve metadata
   Type Support: handles Optional[X], List[X], Dict[K,V] via get_json_schema_type() | extracts inner types from Union/Optional | generates proper JSON Schema with "items" for arrays
@@ -132,10 +132,26 @@ def _unbound_method_owner(func):
     return parts[-2]
 
 
-def create_tool_from_function(func: Callable) -> Callable:
+def parallel_safe(func: Callable) -> Callable:
+    """Mark a tool as safe to run alongside other calls from the same LLM response.
+
+    Only a promise the tool makes about itself: no shared mutable state, no
+    ordering dependency on sibling calls. The agent still runs it sequentially
+    unless it was created with max_parallel_tools > 1.
+
+        @parallel_safe
+        def web_fetch(url: str) -> str: ...
+    """
+    func.__parallel_safe__ = True
+    return func
+
+
+def create_tool_from_function(func: Callable, parallel_safe: bool | None = None) -> Callable:
     """
     Converts a Python function into a tool that is compatible with the Agent,
     by inspecting its signature and docstring.
+
+    parallel_safe overrides the @parallel_safe marker; None reads the marker.
     """
     name = func.__name__
     raw_doc = inspect.getdoc(func)
@@ -239,7 +255,7 @@ def create_tool_from_function(func: Callable) -> Callable:
         # Preserve decorator flags from the underlying function (for backward compatibility)
         # Note: xray context is now injected for ALL tools automatically,
         # so @xray decorator is optional
-        for attr in ("__xray_enabled__", "__replay_enabled__"):
+        for attr in ("__xray_enabled__", "__replay_enabled__", "__parallel_safe__"):
             if hasattr(base_func, attr):
                 try:
                     setattr(wrapper, attr, getattr(base_func, attr))
@@ -257,6 +273,10 @@ def create_tool_from_function(func: Callable) -> Callable:
     # Convention: if the original function has 'agent' in its signature, the executor provides it.
     tool_func._needs_agent = 'agent' in sig.parameters
     tool_func._summary_is_function_argument = 'summary' in sig.parameters
+    # Cached like _needs_agent: the executor groups parallel-safe calls per batch.
+    if parallel_safe is None:
+        parallel_safe = getattr(func, '__parallel_safe__', False)
+    tool_func._parallel_safe = bool(parallel_safe)
 
     # Preserve the exact owner of a bound method. The executor must not infer
     # ownership by scanning registered instances for a matching method name:
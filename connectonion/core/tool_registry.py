@@ -1,11 +1,11 @@
 """
 Purpose: Store and manage agent tools and class instances with O(1) lookup and conflict detection
 LLM-Note:
-  Dependencies: None (standalone module) | imported by [agent.py] | tested by [tests/unit/test_tool_registry.py]
-  Data flow: Agent.__init__() creates ToolRegistry → .add(tool) stores tool with tool.name key → .add_instance(name, instance) stores class instances → .get(name) returns tool or None → __getattr__ enables agent.tools.send() attribute access → __iter__ yields tools for LLM schema generation
-  State/Effects: stores tools in _tools dict and instances in _instances dict | no file I/O or external effects | raises ValueError on duplicate names or conflicts between tool/instance names
-  Integration: exposes ToolRegistry class with add(), add_instance(), get(), get_instance(), remove(), names() | supports iteration (for tool in registry) | supports len() and bool | supports 'in' operator | attribute access checks instances first, then tools
-  Performance: O(1) dict-based lookup for all operations | iteration yields tools only (not instances) | memory proportional to number of tools/instances
+  Dependencies: itertools (standalone module) | imported by [agent.py, tool_executor.py, llm.py] | tested by [tests/unit/test_tool_registry.py]
+  Data flow: Agent.__init__() creates ToolRegistry → .add(tool) stores tool with tool.name key → .add_instance(name, instance) stores class instances → .get(name) returns tool or None → __getattr__ enables agent.tools.send() attribute access → __iter__ yields tools → .schemas() returns the cached ToolSchemas list sent to the LLM
+  State/Effects: stores tools in _tools dict and instances in _instances dict | version bumps on add()/remove() and drops the cached ToolSchemas | no file I/O or external effects | raises ValueError on duplicate names or conflicts between tool/instance names
+  Integration: exposes ToolRegistry class with add(), add_instance(), get(), get_instance(), remove(), names(), schemas(), schema_cache_stats() | ToolSchemas is a plain list of function schemas plus .converted(key, convert) for per-provider variants | supports iteration (for tool in registry) | supports len() and bool | supports 'in' operator | attribute access checks instances first, then tools
+  Performance: O(1) dict-based lookup for all operations | to_function_schema() runs once per tool per registry version, not once per LLM call | provider conversions (e.g. Anthropic input_schema) are cached on the same ToolSchemas object | iteration yields tools only (not instances) | memory proportional to number of tools/instances
   Errors: raises ValueError for duplicate tool names | raises ValueError if tool name conflicts with instance name | raises AttributeError for unknown tool/instance names via __getattr__
 
 Agent tools and instances with attribute access and conflict detection.
@@ -24,12 +24,48 @@ Usage:
     agent.tools.add_instance('gmail', gmail_obj)
     agent.tools.get('send')
     agent.tools.get_instance('gmail')
+    agent.tools.schemas()        # cached until the next add/remove
 
     # Iteration (tools only)
     for tool in agent.tools:
         print(tool.name)
 """
 
+import itertools
+
+# Versions come from one process-wide counter, not one per registry. The tool
+# executor works on a shallow copy of the registry while a hosted tool runs; a
+# per-registry counter would let the copy and the original reach the same
+# number with different tools and serve each other's cached schemas.
+_versions = itertools.count(1)
+
+
+class ToolSchemas(list):
+    """The function schemas for one registry version, in registration order.
+
+    A plain list to every provider, so complete(messages, tools=...) keeps its
+    signature. Providers that need another shape ask for it through
+    converted(), which is computed once per version instead of once per call.
+    """
+
+    def __init__(self, schemas, version: int, registry=None):
+        super().__init__(schemas)
+        self.version = version
+        self._registry = registry
+        self._converted = {}
+
+    def converted(self, key: str, convert):
+        """Return convert(self), cached under key for as long as this version lives."""
+        cached = self._converted.get(key)
+        if cached is not None:
+            if self._registry is not None:
+                self._registry._schema_hits += 1
+            return cached
+        if self._registry is not None:
+            self._registry._schema_misses += 1
+        cached = self._converted[key] = convert(self)
+        return cached
+
 
 class ToolRegistry:
     """Agent tools and class instances with attribute access and conflict detection."""
@@ -37,6 +73,15 @@ class ToolRegistry:
     def __init__(self):
         self._tools = {}
         self._instances = {}
+        self._version = next(_versions)
+        self._schemas = None
+        self._schema_hits = 0
+        self._schema_misses = 0
+
+    def _invalidate(self):
+        """Start a new version: the tool set changed, so cached schemas are stale."""
+        self._version = next(_versions)
+        self._schemas = None
 
     def add(self, tool):
         """Add a tool. Raises ValueError if name conflicts with existing tool or instance."""
@@ -46,6 +91,7 @@ class ToolRegistry:
         if name in self._instances:
             raise ValueError(f"Tool name '{name}' conflicts with instance name")
         self._tools[name] = tool
+        self._invalidate()
 
     def add_instance(self, name: str, instance):
         """Add a class instance. Raises ValueError if name conflicts."""
@@ -69,6 +115,7 @@ class ToolRegistry:
         """Remove tool by name."""
         if name in self._tools:
             del self._tools[name]
+            self._invalidate()
             return True
         return False
 
@@ -76,6 +123,27 @@ class ToolRegistry:
         """List all tool names."""
         return list(self._tools.keys())
 
+    def schemas(self) -> ToolSchemas:
+        """Function schemas for every tool, rebuilt only after add() or remove()."""
+        if self._schemas is not None and self._schemas.version == self._version:
+            self._schema_hits += 1
+            return self._schemas
+        self._schema_misses += 1
+        self._schemas = ToolSchemas(
+            [tool.to_function_schema() for tool in self._tools.values()],
+            self._version,
+            self,
+        )
+        return self._schemas
+
+    def schema_cache_stats(self) -> dict:
+        """Version and hit/miss counts for schemas() and provider conversions."""
+        return {
+            "version": self._version,
+            "hits": self._schema_hits,
+            "misses": self._schema_misses,
+        }
+
     def __getattr__(self, name):
         """Attribute access: agent.tools.send() or agent.tools.gmail.my_id"""
         if name.startswith('_'):
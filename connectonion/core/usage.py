@@ -3,7 +3,7 @@ Purpose: Token usage tracking and cost calculation for LLM calls
 LLM-Note:
   Dependencies: pydantic | imported by [cli/commands/doctor_commands.py, cli/commands/eval_commands.py, cli/commands/project_cmd_lib.py, console.py, core/__init__.py, core/agent.py, core/exceptions.py, core/llm.py, logger.py]
   Data flow: receives model name + token counts → returns cost in USD
-  Integration: exposes TokenUsage, MODEL_PRICING, MODEL_CONTEXT_LIMITS, calculate_cost(), get_context_limit(), is_estimated_price(), FREE_MANAGED_MODELS and PAID_MANAGED_MODELS (read by exceptions.py for PaidModelRequiredError and by project_cmd_lib.py for what `co auth` prints)
+  Integration: exposes TokenUsage, MODEL_PRICING, MODEL_CONTEXT_LIMITS, calculate_cost(), cache_hit_ratio(), get_context_limit(), is_estimated_price(), FREE_MANAGED_MODELS and PAID_MANAGED_MODELS (read by exceptions.py for PaidModelRequiredError and by project_cmd_lib.py for what `co auth` prints)
 """
 
 from pydantic import BaseModel
@@ -407,6 +407,22 @@ def turn_usage_from_trace(trace: list) -> dict | None:
     return totals
 
 
+def cache_hit_ratio(usage: dict | None) -> float | None:
+    """Share of the prompt served from the provider's cache, 0.0 to 1.0.
+
+    Read against input_tokens, of which cached_tokens is a subset (see
+    TokenUsage; AnthropicLLM rebuilds that total, since Anthropic reports its
+    cache reads beside input_tokens rather than inside it). None when nothing was measured, rather than a 0.0 that would
+    read as a cache that missed.
+    """
+    if not usage:
+        return None
+    input_tokens = _usage_int(usage, 'input_tokens')
+    if not input_tokens:
+        return None
+    return round(min(1.0, _usage_int(usage, 'cached_tokens') / input_tokens), 4)
+
+
 def _usage_int(usage: dict, field: str) -> int:
     value = usage.get(field, 0)
     if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
@@ -1,10 +1,10 @@
 """
 Purpose: Network layer package re-exporting host, IO, asgi, relay, connect, announce, trust modules
 LLM-Note:
-  Dependencies: imports from [host/, io/, connect.py, relay.py, announce.py, trust/] | imported by [__init__.py main package, user code] | tested via submodule tests
+  Dependencies: imports from [host/, io/, connect.py, gather.py, relay.py, announce.py, trust/] | imported by [__init__.py main package, user code] | tested via submodule tests
   Data flow: pure re-export module aggregating networking functionality
   State/Effects: no state
-  Integration: exposes host(agent, port, trust), create_app(), IO/WebSocketIO, SessionStorage/Session, connect(url), RemoteAgent, Response, PermissionModeError, relay server (relay_connect, serve_loop), announce (create_announce_message), trust (TrustAgent) | unified networking API surface
+  Integration: exposes host(agent, port, trust), create_app(), IO/WebSocketIO, SessionStorage/Session, connect(url), RemoteAgent, Response, PermissionModeError, connect_many/AgentGroup (fan-out), relay server (relay_connect, serve_loop), announce (create_announce_message), trust (TrustAgent) | unified networking API surface
   Performance: trivial
   Errors: none
 Network layer for hosting and connecting agents.
@@ -15,6 +15,7 @@ This module contains:
 - asgi: ASGI app implementation
 - relay: Agent relay server for P2P discovery
 - connect: Multi-agent networking (RemoteAgent)
+- gather: One prompt or tool call to many agents at once (connect_many)
 - announce: Service announcement protocol
 - trust: Trust verification system (TrustAgent is the single interface)
 """
@@ -25,6 +26,7 @@ from .host import (
 )
 from .io import IO, WebSocketIO
 from .connect import PermissionModeError, connect, RemoteAgent, Response, ExecResult
+from .gather import connect_many, AgentGroup, AgentResult, Gathered
 from .relay import connect as relay_connect, serve_loop
 from .announce import create_announce_message
 from .trust import TrustAgent, Decision, TRUST_LEVELS, parse_policy
@@ -42,6 +44,10 @@ __all__ = [
     "Response",
     "ExecResult",
     "PermissionModeError",
+    "connect_many",
+    "AgentGroup",
+    "AgentResult",
+    "Gathered",
     "HTTPRequest",
     "HTTPResponse",
     "HTTPRoute",
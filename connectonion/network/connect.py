@@ -1,33 +1,37 @@
 """
 Purpose: Python client for remote ConnectOnion agents — signed transport, acknowledged Host permission profiles, streaming UI events, and onboarding.
 LLM-Note:
-  Dependencies: imports from [asyncio, copy, json, time, uuid, dataclasses, typing, httpx, websockets (lazy), ..address (sign)] | imported by [network/__init__.py, connectonion/__init__.py]
-  Data flow: input() sends signed CONNECT/INPUT and consumes stream/OUTPUT | set_permission_profile() validates Host mode state, sends signed OIP mode_change, and waits for mode_changed
-  State/Effects: mutates current session/modes/UI/status only from authenticated carrier responses; opens outbound sockets; signs deep-detached command payloads; endpoint resolution may query relay and candidate /info endpoints
-  Integration: exposes connect(), RemoteAgent, Response, ExecResult, PermissionModeError; RemoteAgent provides input/call/set_permission_profile sync+async actions and read-only state; set_session_mode is deprecated
-  Performance: endpoint resolution attempted once per RemoteAgent (cached in _endpoint_resolved/_resolved_endpoint) | per-recv asyncio.wait_for to avoid hangs (default timeout=60s, 30s for CONNECTED) | sync .input() rejected inside running event loop (use input_async)
-  Errors: raises ConnectionError on transport/auth failure, PermissionModeError on owned policy refusal, TimeoutError on receive timeout, RuntimeError for sync calls in async contexts, ValueError for invalid choices
+  Dependencies: imports from [asyncio, copy, json, threading, time, uuid, weakref, dataclasses, typing, httpx, websockets (lazy), ..address (sign)] | imported by [network/__init__.py, connectonion/__init__.py]
+  Data flow: input()/call() acquire this loop's _Channel → one socket authenticated once with signed CONNECT → INPUT/EXEC sent on it → reader task routes EXEC_RESULT by exec_id, everything else onto the session stream the turn in flight consumes until OUTPUT | set_permission_profile() validates Host mode state, sends signed OIP mode_change on its own socket, and waits for mode_changed
+  State/Effects: mutates current session/modes/UI/status only from authenticated carrier responses; keeps one outbound socket per RemoteAgent per event loop open between requests; sync calls run on one process-wide daemon loop thread; signs deep-detached command payloads; endpoint resolution may query relay and candidate /info endpoints
+  Integration: exposes connect(), RemoteAgent, Response, ExecResult, PermissionModeError, resolve_endpoint(), forget_endpoint(), clear_endpoint_cache(); RemoteAgent provides input/call/set_permission_profile sync+async actions, connection_stats(), close()/aclose(), and read-only state; set_session_mode is deprecated
+  Performance: CONNECT handshake and signature paid once per connection, not per request | concurrent call_async share the socket; turns on one session are serialized (OUTPUT is tagged by session, not input_id) | endpoint resolution attempted once per RemoteAgent (_endpoint_resolved/_resolved_endpoint) and cached process-wide per (relay, address) with TTL, misses included | candidate /info endpoints probed concurrently, best-ranked verified one wins | per-event asyncio.wait_for to avoid hangs (default timeout=60s, 30s for CONNECTED) | sync .input() rejected inside running event loop (use input_async)
+  Errors: raises ConnectionError on transport/auth failure or a drop the host cannot resume, PermissionModeError on owned policy refusal, TimeoutError on receive timeout, RuntimeError for sync calls in async contexts, ValueError for invalid choices | a failed or timed-out turn closes its socket so its late frames never answer the next turn
 Protocol: CONNECT → CONNECTED → INPUT → streaming events → OUTPUT
 See docs/network/websocket-protocol.md for full specification.
 
 Lifecycle:
   1. connect(address) creates RemoteAgent instance
-  2. agent.input(prompt) opens WebSocket, sends CONNECT to authenticate
+  2. the first agent.input(prompt) or call() opens a WebSocket, sends CONNECT to authenticate
   3. Server responds with CONNECTED { session_id, status }
   4. Client sends INPUT { prompt }
   5. Receives streaming events: tool_call, tool_result, thinking, assistant
   6. Receives final OUTPUT or ask_user
-  7. Returns Response(text, done)
+  7. Returns Response(text, done); the socket stays open for the next request
+  8. A dropped socket is replaced by a CONNECT naming the session; the host
+     resumes streaming a turn that is still running
 """
 
 import asyncio
 import copy
 import json
 import sys
+import threading
 import time
 import uuid
+import weakref
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
@@ -137,6 +141,17 @@ def endpoint_is_safe(url: str) -> bool:
     return (parsed.hostname or "") in LOOPBACK
 
 
+# Discovery is a relay round trip plus an /info probe, and its answer is about
+# the agent, not the handle asking. Process-wide, so a fleet of connect()
+# handles to the same agents resolves each one once. A miss is remembered too,
+# for less time: an agent with no direct path is asked about on every handle
+# otherwise, and each ask can cost a probe timeout.
+ENDPOINT_TTL = 300.0
+NEGATIVE_ENDPOINT_TTL = 30.0
+_endpoint_cache: Dict[Tuple[str, str], Tuple[float, Optional[str]]] = {}
+_endpoint_cache_lock = threading.Lock()
+
+
 async def resolve_endpoint(
     agent_address: str,
     relay_url: str,
@@ -148,8 +163,11 @@ async def resolve_endpoint(
     Steps:
     1. Query relay server for agent endpoints
     2. Sort by priority (localhost → local network → public)
-    3. Verify each HTTP endpoint by checking /info
-    4. Return first working ws:// endpoint where address matches
+    3. Verify every HTTP endpoint's /info at once
+    4. Return the highest-priority ws:// endpoint whose address matches
+
+    The answer, found or not, is cached process-wide for ENDPOINT_TTL (or
+    NEGATIVE_ENDPOINT_TTL when nothing was found).
 
     Returns:
         WebSocket URL (ws://...) or None if resolution fails
@@ -158,6 +176,34 @@ async def resolve_endpoint(
     if not agent_address.startswith("0x") or len(agent_address) != 66:
         return None
 
+    key = (relay_url.rstrip("/"), agent_address)
+    with _endpoint_cache_lock:
+        cached = _endpoint_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    endpoint = await _discover_endpoint(agent_address, relay_url, timeout)
+    ttl = ENDPOINT_TTL if endpoint else NEGATIVE_ENDPOINT_TTL
+    with _endpoint_cache_lock:
+        _endpoint_cache[key] = (time.monotonic() + ttl, endpoint)
+    return endpoint
+
+
+def forget_endpoint(agent_address: str, relay_url: str) -> None:
+    """Drop one cached resolution, so the next resolve_endpoint asks again."""
+    with _endpoint_cache_lock:
+        _endpoint_cache.pop((relay_url.rstrip("/"), agent_address), None)
+
+
+def clear_endpoint_cache() -> None:
+    """Forget every cached resolution."""
+    with _endpoint_cache_lock:
+        _endpoint_cache.clear()
+
+
+async def _discover_endpoint(
+    agent_address: str, relay_url: str, timeout: float
+) -> Optional[str]:
     # Convert wss://relay to https://relay for API call
     https_relay = relay_url.replace("wss://", "https://").replace("ws://", "http://").rstrip("/")
 
@@ -191,30 +237,56 @@ async def resolve_endpoint(
         # Step 2: Sort endpoints (localhost first)
         sorted_endpoints = _sort_endpoints(agent_info["endpoints"])
 
-        # Step 3: Try each HTTP endpoint
+        # Step 3: Probe the HTTP endpoints
         http_endpoints = [ep for ep in sorted_endpoints
                           if (ep.startswith("http://") or ep.startswith("https://"))
                           and endpoint_is_safe(ep)]
 
-        for http_url in http_endpoints:
-            try:
-                info_response = await client.get(f"{http_url}/info")
-                if info_response.status_code != 200:
-                    continue
-
-                info = info_response.json()
-
-                # Step 4: Verify address matches
-                if info.get("address") == agent_address:
-                    # Build WebSocket URL from HTTP URL
-                    ws_url = http_url.replace("https://", "wss://").replace("http://", "ws://")
-                    if not ws_url.endswith("/ws"):
-                        ws_url = ws_url.rstrip("/") + "/ws"
-                    return ws_url
-            except Exception:
-                continue
+        return await _best_verified(client, http_endpoints, agent_address)
+
 
-    return None
+async def _best_verified(client, http_endpoints: List[str], agent_address: str) -> Optional[str]:
+    """Probe every candidate at once; the best-ranked one that verifies wins.
+
+    One at a time, a dead LAN address in front of a live public one cost a full
+    timeout before the public one was even asked. All at once, resolution takes
+    as long as the slowest probe it has to wait for -- and it only waits for
+    candidates ranked above the best verified one, so localhost still beats a
+    public endpoint that happened to answer first. Probes it no longer needs
+    are cancelled.
+    """
+    probes = [asyncio.create_task(_probe(client, url, agent_address)) for url in http_endpoints]
+    try:
+        for probe in probes:
+            ws_url = await probe
+            if ws_url:
+                return ws_url
+        return None
+    finally:
+        for probe in probes:
+            probe.cancel()
+        # Let them unwind before the caller closes the client under them.
+        await asyncio.gather(*probes, return_exceptions=True)
+
+
+async def _probe(client, http_url: str, agent_address: str) -> Optional[str]:
+    """The ws:// form of `http_url` if its /info names this agent, else None."""
+    try:
+        info_response = await client.get(f"{http_url}/info")
+        if info_response.status_code != 200:
+            return None
+        info = info_response.json()
+    except Exception:
+        return None
+
+    # Step 4: Verify address matches
+    if info.get("address") != agent_address:
+        return None
+    # Build WebSocket URL from HTTP URL
+    ws_url = http_url.replace("https://", "wss://").replace("http://", "ws://")
+    if not ws_url.endswith("/ws"):
+        ws_url = ws_url.rstrip("/") + "/ws"
+    return ws_url
 
 
 @dataclass
@@ -252,6 +324,138 @@ class PermissionModeError(ConnectionError):
         self.data = data
 
 
+class _Refused(ConnectionError):
+    """The agent answered CONNECT with a refusal. `reason` is its own words."""
+
+    def __init__(self, reason: Any):
+        super().__init__(f"Auth error: {reason}")
+        self.reason = reason
+
+
+@dataclass(eq=False)
+class _Closed:
+    """Queued when a socket dies, so the turn waiting on the queue wakes up.
+
+    It names the socket: a turn that began after a reconnect must not take the
+    death notice of the one before for its own.
+    """
+    ws: Any
+
+
+class _Channel:
+    """One RemoteAgent's traffic on one event loop, over one authenticated socket.
+
+    The socket is replaced when it dies; the channel is not. A single reader
+    task owns recv() and routes every frame: EXEC_RESULT to the call waiting on
+    its exec_id, PING answered in place, everything else onto `events`, the
+    session stream the turn in flight consumes. The host tags OUTPUT with the
+    session rather than the input_id -- a socket is one session and a session
+    runs one turn -- so turns take `turn` one at a time. Calls never wait for
+    them.
+    """
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.ws: Any = None
+        self.is_direct = False
+        self.connected: Dict[str, Any] = {}
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.execs: Dict[str, asyncio.Future] = {}
+        self.opening = asyncio.Lock()
+        self.turn = asyncio.Lock()
+        self.in_turn = False
+        self.ever_attached = False
+        self._reader: Optional[asyncio.Task] = None
+
+    def attach(self, ws: Any, is_direct: bool, connected: Dict[str, Any]) -> None:
+        self.ws = ws
+        self.is_direct = is_direct
+        self.connected = connected
+        self.ever_attached = True
+        self._reader = asyncio.create_task(self._read(ws))
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        await self.ws.send(json.dumps(message))
+
+    async def close(self) -> None:
+        ws, reader = self.ws, self._reader
+        self.ws = self._reader = None
+        # Whatever is still queued answered a request that has given up on it.
+        self.events = asyncio.Queue()
+        self._fail_calls()
+        if reader is not None:
+            reader.cancel()
+        if ws is not None:
+            await _close_socket(ws)
+
+    async def _read(self, ws: Any) -> None:
+        try:
+            while True:
+                event = json.loads(await ws.recv())
+                event_type = event.get("type")
+                if event_type == "PING":
+                    await ws.send(json.dumps({"type": "PONG"}))
+                elif event_type == "EXEC_RESULT":
+                    waiter = self.execs.pop(event.get("exec_id"), None)
+                    if waiter is not None and not waiter.done():
+                        waiter.set_result(event)
+                elif event_type == "ERROR" and not self.in_turn and self.execs:
+                    # An ERROR carries no id. The host answers one socket's
+                    # frames in order, so it belongs to the oldest call waiting.
+                    waiter = self.execs.pop(next(iter(self.execs)))
+                    if not waiter.done():
+                        waiter.set_result(event)
+                else:
+                    self.events.put_nowait(event)
+        except Exception:
+            pass  # the socket is gone; whoever waits on it is told below
+        finally:
+            if self.ws is ws:
+                self.ws = None
+                self.events.put_nowait(_Closed(ws))
+                self._fail_calls()
+
+    def _fail_calls(self) -> None:
+        for waiter in self.execs.values():
+            if not waiter.done():
+                waiter.set_exception(ConnectionError("Connection to the agent was lost"))
+        self.execs.clear()
+
+
+async def _close_socket(ws: Any) -> None:
+    try:
+        await ws.__aexit__(None, None, None)
+    except Exception:
+        pass
+
+
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _run_sync(coro):
+    """Run `coro` on the process's RemoteAgent loop and wait for its result.
+
+    input() and call() used asyncio.run, which closes its loop -- and every
+    socket opened on it -- before returning, so each call paid a fresh
+    connection and handshake. One long-lived loop lets the next call find the
+    connection still open.
+    """
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_sync_loop.run_forever, name="connectonion-remote", daemon=True
+            ).start()
+    future = asyncio.run_coroutine_threadsafe(coro, _sync_loop)
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+
 class RemoteAgent:
     """
     Interface to a remote agent with real-time UI updates.
@@ -292,6 +496,16 @@ class RemoteAgent:
         self._available_permission_profiles: List[Dict[str, Any]] = []
         self._resolved_endpoint: Optional[str] = None
         self._endpoint_resolved = False
+        # One channel per event loop: a socket and its futures belong to the
+        # loop that opened them. Bumping the generation retires every channel,
+        # each on its own loop, the next time it is used.
+        self._channels: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Channel]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._generation = 0
+        self._connection_stats = {
+            "requests": 0, "new_connections": 0, "reused_connections": 0, "reattached": 0,
+        }
 
     @property
     def status(self) -> str:
@@ -337,7 +551,7 @@ class RemoteAgent:
         except RuntimeError as exc:
             if "set_permission_profile() cannot be used" in str(exc):
                 raise
-        asyncio.run(self.set_permission_profile_async(profile_id, timeout=timeout))
+        _run_sync(self.set_permission_profile_async(profile_id, timeout=timeout))
 
     async def set_permission_profile_async(
         self, profile_id: str, timeout: float = 30.0
@@ -396,6 +610,9 @@ class RemoteAgent:
             await self._wait_for_mode_response(
                 ws, profile_id
             )
+        # An open session socket still carries the policy it was CONNECTed
+        # with; the next request reconnects under the new one.
+        self._generation += 1
 
     def input(
         self,
@@ -445,7 +662,7 @@ class RemoteAgent:
         except RuntimeError as e:
             if "input() cannot be used" in str(e):
                 raise
-        return asyncio.run(self._stream_input(prompt, timeout, on_onboard, images, files))
+        return _run_sync(self._stream_input(prompt, timeout, on_onboard, images, files))
 
     async def input_async(
         self,
@@ -493,94 +710,100 @@ class RemoteAgent:
         except RuntimeError as e:
             if "call() cannot be used" in str(e):
                 raise
-        return asyncio.run(self.call_async(tool, timeout=timeout, **args))
+        return _run_sync(self.call_async(tool, timeout=timeout, **args))
 
     async def call_async(self, tool: str, timeout: float = 60.0, **args) -> ExecResult:
-        """Async version of call()."""
-        import websockets
-
-        await self._try_resolve_endpoint()
+        """Async version of call().
 
+        Rides this loop's open connection, alongside any turn in flight and
+        any other call: each waits only for the EXEC_RESULT with its exec_id.
+        """
         exec_id = str(uuid.uuid4())
 
-        connection, is_direct = await self._open_best_connection(websockets)
-        connect_msg = self._build_connect_message(is_direct)
-        exec_msg = self._build_command_message(
-            {"type": "EXEC", "exec_id": exec_id, "tool": tool, "args": args},
-            is_direct,
-        )
+        async def onboard(methods, payment_amount):
+            # The same exchange input() does, on the same socket: submit
+            # credentials and keep waiting. The host finishes the CONNECT its
+            # trust gate interrupted (ws_router/session.py pops the stashed
+            # pending_connect and calls establish_connection), so CONNECTED
+            # arrives and the EXEC goes out after it.
+            #
+            # This used to answer "run input() once to onboard" — the Python
+            # API, which is no help to whoever typed `co call`.
+            if not sys.stdin.isatty():
+                # A script has no stdin to answer with, and prompting would
+                # hang it. Fail, but say what the agent asked for.
+                raise _Refused(
+                    f"agent requires onboarding ({', '.join(methods) or 'no methods offered'})"
+                    " — run this from a terminal to enter an invite code")
+            try:
+                return await asyncio.to_thread(self._prompt_onboard, methods, payment_amount)
+            except ValueError as declined:
+                # Entering nothing is an answer, and a normal one. Every other
+                # refusal call() can meet — a blacklist, a bad code, a tool that
+                # is not whitelisted — comes back as an ExecResult. This is that
+                # same channel, not a swallowed error.
+                raise _Refused(f"onboarding not completed: {declined}") from None
+
+        channel = self._channel()
+        try:
+            # EXEC needs the same auth gate as INPUT.
+            await self._acquire(channel, onboard)
+        except _Refused as refused:
+            return ExecResult(text="", status="error", error=refused.reason or "connect failed")
+        except asyncio.TimeoutError:
+            return ExecResult(text="", status="error", error=f"exec timed out after {timeout}s")
 
+        waiter = asyncio.get_running_loop().create_future()
+        channel.execs[exec_id] = waiter
         try:
-            async with connection as ws:
-                await ws.send(json.dumps(connect_msg))
-
-                # Wait for CONNECTED (EXEC needs the same auth gate as INPUT).
-                while True:
-                    raw = await asyncio.wait_for(ws.recv(), timeout=30)
-                    event = json.loads(raw)
-                    etype = event.get("type")
-                    if etype == "CONNECTED":
-                        break
-                    if etype == "ONBOARD_REQUIRED":
-                        # The same exchange input() does, on the same socket: submit
-                        # credentials and keep waiting. The host finishes the CONNECT
-                        # its trust gate interrupted (ws_router/session.py pops the
-                        # stashed pending_connect and calls establish_connection), so
-                        # CONNECTED arrives on this loop and the EXEC goes out below.
-                        #
-                        # This used to answer "run input() once to onboard" — the
-                        # Python API, which is no help to whoever typed `co call`.
-                        methods = event.get("methods", [])
-                        if not sys.stdin.isatty():
-                            # A script has no stdin to answer with, and prompting
-                            # would hang it. Fail, but say what the agent asked for.
-                            return ExecResult(
-                                text="", status="error",
-                                error=f"agent requires onboarding ({', '.join(methods) or 'no methods offered'})"
-                                      " — run this from a terminal to enter an invite code")
-                        try:
-                            credentials = self._prompt_onboard(methods, event.get("payment_amount"))
-                        except ValueError as declined:
-                            # Entering nothing is an answer, and a normal one.
-                            # _prompt_onboard raises for it, and every other refusal
-                            # call() can meet — a blacklist, a bad code, a tool that
-                            # is not whitelisted — comes back as an ExecResult. This
-                            # is that same channel, not a swallowed error.
-                            return ExecResult(text="", status="error",
-                                              error=f"onboarding not completed: {declined}")
-                        await ws.send(json.dumps(self._build_onboard_submit(credentials)))
-                        continue
-                    if etype == "ERROR":
-                        return ExecResult(text="", status="error",
-                                          error=event.get("message", "connect failed"))
-
-                await ws.send(json.dumps(exec_msg))
-
-                # Wait for our EXEC_RESULT; answer keepalive PINGs, skip other frames.
-                while True:
-                    raw = await asyncio.wait_for(ws.recv(), timeout=timeout)
-                    event = json.loads(raw)
-                    etype = event.get("type")
-                    if etype == "EXEC_RESULT" and event.get("exec_id") == exec_id:
-                        return ExecResult(
-                            text=event.get("result", ""),
-                            status=event.get("status", "error"),
-                            duration_ms=event.get("duration_ms", 0),
-                            error=event.get("error"),
-                        )
-                    if etype == "PING":
-                        await ws.send(json.dumps({"type": "PONG"}))
-                    elif etype == "ERROR":
-                        return ExecResult(text="", status="error",
-                                          error=event.get("message", "exec failed"))
+            await channel.send(self._build_command_message(
+                {"type": "EXEC", "exec_id": exec_id, "tool": tool, "args": args},
+                channel.is_direct,
+            ))
+            event = await asyncio.wait_for(waiter, timeout=timeout)
         except asyncio.TimeoutError:
             return ExecResult(text="", status="error", error=f"exec timed out after {timeout}s")
+        finally:
+            channel.execs.pop(exec_id, None)
+
+        if event.get("type") == "ERROR":
+            return ExecResult(text="", status="error",
+                              error=event.get("message", "exec failed"))
+        return ExecResult(
+            text=event.get("result", ""),
+            status=event.get("status", "error"),
+            duration_ms=event.get("duration_ms", 0),
+            error=event.get("error"),
+        )
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Requests sent, sockets opened for them, and how many rode one already open.
+
+        `reattached` counts the opened sockets that replaced one that dropped.
+        """
+        return dict(self._connection_stats)
+
+    def close(self) -> None:
+        """Close the connection input() and call() share; the next one reconnects."""
+        self._generation += 1
+        loop = _sync_loop
+        channel = self._channels.get(loop) if loop is not None else None
+        if channel is not None:
+            asyncio.run_coroutine_threadsafe(channel.close(), loop).result()
+
+    async def aclose(self) -> None:
+        """Close this event loop's connection; the next request reconnects."""
+        channel = self._channels.get(asyncio.get_running_loop())
+        if channel is not None:
+            await channel.close()
 
     def reset(self) -> None:
         """Clear conversation and start fresh."""
         self._current_session = None
         self._ui_events = []
         self._status = "idle"
+        # The open socket is bound to the old session.
+        self._generation += 1
 
     def _ways_to_reach(self) -> list:
         """Where to try, best first: the agent itself, then the relay behind it.
@@ -619,6 +842,8 @@ class RemoteAgent:
         """Stop trying a corpse on every turn; resolve again when next asked."""
         self._resolved_endpoint = None
         self._endpoint_resolved = False
+        # Other handles to this agent would be handed the same corpse.
+        forget_endpoint(self.address, self._relay_url)
 
     async def _try_resolve_endpoint(self) -> None:
         """Try to resolve endpoint for the agent address. Only attempts once."""
@@ -627,6 +852,69 @@ class RemoteAgent:
         self._endpoint_resolved = True
         self._resolved_endpoint = await resolve_endpoint(self.address, self._relay_url)
 
+    def _channel(self) -> _Channel:
+        """This event loop's channel, created on first use."""
+        loop = asyncio.get_running_loop()
+        channel = self._channels.get(loop)
+        if channel is None:
+            channel = self._channels[loop] = _Channel(self._generation)
+        return channel
+
+    async def _acquire(self, channel: _Channel, onboard) -> None:
+        """Make sure `channel` has a live, authenticated socket, reusing the open one."""
+        self._connection_stats["requests"] += 1
+        async with channel.opening:
+            if channel.generation != self._generation:
+                await channel.close()
+                channel.generation = self._generation
+                channel.ever_attached = False
+            if channel.ws is None:
+                await self._reconnect(channel, onboard)
+            else:
+                self._connection_stats["reused_connections"] += 1
+
+    async def _reconnect(self, channel: _Channel, onboard) -> None:
+        """Open a socket, CONNECT on it, and hand it to the channel.
+
+        CONNECT names the session this agent is in, so after a drop it is the
+        host's reattach: a turn still running there resumes streaming to the
+        new socket (status "running").
+        """
+        import websockets
+
+        await self._try_resolve_endpoint()
+        # The agent itself when it answers, the relay behind it when it does not.
+        ws, is_direct = await self._open_best_connection(websockets)
+        try:
+            connected = await self._authenticate(ws, is_direct, onboard)
+        except BaseException:
+            await _close_socket(ws)
+            raise
+        self._connection_stats["new_connections"] += 1
+        if channel.ever_attached:
+            self._connection_stats["reattached"] += 1
+        channel.attach(ws, is_direct, connected)
+
+    async def _authenticate(self, ws, is_direct: bool, onboard) -> Dict[str, Any]:
+        """Send CONNECT and wait for CONNECTED, onboarding if the host asks."""
+        # Built after opening, because it is shaped by which way answered and a
+        # relay-bound frame is not a direct one.
+        await ws.send(json.dumps(self._build_connect_message(is_direct)))
+        while True:
+            event = json.loads(await asyncio.wait_for(ws.recv(), timeout=30))
+            event_type = event.get("type")
+            if event_type == "CONNECTED":
+                self._consume_connected_mode_state(event)
+                return event
+            if event_type == "ERROR":
+                raise _Refused(event.get("message", event.get("error")))
+            if event_type == "ONBOARD_REQUIRED":
+                credentials = await onboard(event.get("methods", []), event.get("payment_amount"))
+                await ws.send(json.dumps(self._build_onboard_submit(credentials)))
+                # Keep waiting: the host finishes the CONNECT once onboarded.
+            elif event_type == "PING":
+                await ws.send(json.dumps({"type": "PONG"}))
+
     async def _stream_input(
         self,
         prompt: str,
@@ -635,163 +923,158 @@ class RemoteAgent:
         images: Optional[List[str]] = None,
         files: Optional[List[Dict[str, Any]]] = None,
     ) -> Response:
-        """Send prompt via WebSocket and stream events."""
-        import websockets
-
+        """Send prompt over this loop's connection and stream events."""
         self._status = "working"
 
-        # Try endpoint resolution (once, cached)
-        await self._try_resolve_endpoint()
-
         # Add user event to UI
         self._add_ui_event({
             "type": "user",
             "content": prompt
         })
 
+        async def onboard(methods, payment_amount):
+            self._add_ui_event({
+                "type": "onboard_required",
+                "methods": methods,
+                "payment_amount": payment_amount
+            })
+            # Get credentials from callback or prompt interactively. Either may
+            # block on a person; the other requests on this loop carry on.
+            ask = on_onboard or self._prompt_onboard
+            return await asyncio.to_thread(ask, methods, payment_amount)
+
+        channel = self._channel()
+        try:
+            async with channel.turn:
+                await self._acquire(channel, onboard)
+                channel.in_turn = True
+                try:
+                    return await self._run_turn(
+                        channel, prompt, timeout, onboard, images, files
+                    )
+                except BaseException:
+                    # Frames of an abandoned turn would answer the next one.
+                    await channel.close()
+                    raise
+                finally:
+                    channel.in_turn = False
+        except asyncio.TimeoutError:
+            self._status = "idle"
+            raise TimeoutError(f"Request timed out after {timeout}s")
+        except BaseException:
+            self._status = "idle"
+            raise
+
+    async def _run_turn(
+        self,
+        channel: _Channel,
+        prompt: str,
+        timeout: float,
+        onboard,
+        images: Optional[List[str]],
+        files: Optional[List[Dict[str, Any]]],
+    ) -> Response:
+        """Send INPUT on the channel and consume its stream until OUTPUT or ask_user."""
         # Generate input_id for routing/response matching
         input_id = str(uuid.uuid4())
+        await channel.send(self._build_input_message(
+            prompt, input_id, channel.is_direct, images, files
+        ))
+        ws = channel.ws
+        reattached = False
 
-        # The agent itself when it answers, the relay behind it when it does not.
-        connection, is_direct = await self._open_best_connection(websockets)
+        # Stream events until OUTPUT or timeout
+        while True:
+            # Wrap the wait in timeout to prevent hanging indefinitely
+            event = await asyncio.wait_for(channel.events.get(), timeout=timeout)
+
+            if isinstance(event, _Closed):
+                if event.ws is not ws:
+                    continue  # a socket this turn never used
+                # The socket dropped mid-turn. Reattach once: the host keeps
+                # the agent running and resumes streaming to the new socket.
+                # Anything else means the answer is lost, and sending INPUT
+                # again could run the prompt twice.
+                if not reattached:
+                    async with channel.opening:
+                        if channel.ws is None:
+                            await self._reconnect(channel, onboard)
+                    reattached = True
+                    if channel.connected.get("status") == "running":
+                        ws = channel.ws
+                        continue
+                raise ConnectionError("Connection to the agent was lost before it answered")
 
-        # Build the CONNECT and INPUT messages -- after opening, because both are
-        # shaped by which way answered and a relay-bound frame is not a direct one.
-        connect_msg = self._build_connect_message(is_direct)
-        input_msg = self._build_input_message(prompt, input_id, is_direct, images, files)
+            event_type = event.get("type")
 
-        try:
-            async with connection as ws:
-                # Authenticate first
-                await ws.send(json.dumps(connect_msg))
-
-                # Wait for CONNECTED
-                while True:
-                    raw = await asyncio.wait_for(ws.recv(), timeout=30)
-                    event = json.loads(raw)
-                    if event.get("type") == "CONNECTED":
-                        self._consume_connected_mode_state(event)
-                        break
-                    elif event.get("type") == "ERROR":
-                        self._status = "idle"
-                        raise ConnectionError(f"Auth error: {event.get('message', event.get('error'))}")
-                    elif event.get("type") == "ONBOARD_REQUIRED":
-                        # Handle onboard during connect
-                        methods = event.get("methods", [])
-                        payment_amount = event.get("payment_amount")
-                        self._add_ui_event({"type": "onboard_required", "methods": methods, "payment_amount": payment_amount})
-                        if on_onboard:
-                            credentials = on_onboard(methods, payment_amount)
-                        else:
-                            credentials = self._prompt_onboard(methods, payment_amount)
-                        submit_msg = self._build_onboard_submit(credentials)
-                        await ws.send(json.dumps(submit_msg))
-                        # Continue waiting for CONNECTED or ONBOARD_SUCCESS
-
-                # Now send INPUT
-                await ws.send(json.dumps(input_msg))
-
-                # Stream events until OUTPUT or timeout
-                result_text = ""
-                done = True
-
-                while True:
-                    # Wrap recv in timeout to prevent hanging indefinitely
-                    msg = await asyncio.wait_for(ws.recv(), timeout=timeout)
-                    event = json.loads(msg)
-                    event_type = event.get("type")
-
-                    if event_type == "OUTPUT":
-                        # Final result
-                        result_text = event.get("result", "")
-                        self._current_session = event.get("session")
-                        self._status = "idle"
-
-                        # Add agent response to UI
-                        self._add_ui_event({
-                            "type": "agent",
-                            "content": result_text
-                        })
-                        break
-
-                    elif event_type == "ERROR":
-                        self._status = "idle"
-                        raise ConnectionError(f"Agent error: {event.get('message', event.get('error'))}")
-
-                    elif event_type == "ONBOARD_REQUIRED":
-                        # Agent requires onboarding (invite code or payment)
-                        methods = event.get("methods", [])
-                        payment_amount = event.get("payment_amount")
-
-                        # Add onboard_required event to UI
-                        self._add_ui_event({
-                            "type": "onboard_required",
-                            "methods": methods,
-                            "payment_amount": payment_amount
-                        })
-
-                        # Get credentials from callback or prompt interactively
-                        if on_onboard:
-                            credentials = on_onboard(methods, payment_amount)
-                        else:
-                            credentials = self._prompt_onboard(methods, payment_amount)
-
-                        # Send ONBOARD_SUBMIT
-                        submit_msg = self._build_onboard_submit(credentials)
-                        await ws.send(json.dumps(submit_msg))
-                        # Continue loop to wait for ONBOARD_SUCCESS
-
-                    elif event_type == "ONBOARD_SUCCESS":
-                        # Onboard successful - add to UI
-                        self._add_ui_event({
-                            "type": "onboard_success",
-                            "level": event.get("level", "contact"),
-                            "message": event.get("message", "Onboard successful")
-                        })
-
-                        # Retry the original prompt
-                        retry_input_id = str(uuid.uuid4())
-                        retry_msg = self._build_input_message(prompt, retry_input_id, is_direct)
-                        await ws.send(json.dumps(retry_msg))
-                        # Continue loop to wait for OUTPUT
-
-                    elif event_type == "ask_user":
-                        # Agent is asking a question - return done=False so caller sends another input()
-                        #
-                        # `question` is the field the tool sends. This read `text`,
-                        # which no producer has ever sent -- useful_tools/ask_user.py
-                        # and diff_writer.py both send `question` -- so every
-                        # multi-turn conversation over the network arrived with the
-                        # question missing and the options intact, the one field
-                        # both sides happened to spell alike. `text` stays accepted
-                        # for anything built against the old shape.
-                        self._status = "waiting"
-                        done = False
-                        result_text = event.get("question") or event.get("text") or ""
-
-                        # multi_select and fields were dropped: a client could not
-                        # tell one answer from many, and a form asked for over the
-                        # network could not be rendered at all.
-                        asked = {
-                            "type": "ask_user",
-                            "text": result_text,
-                            "options": event.get("options"),
-                            "multi_select": event.get("multi_select"),
-                        }
-                        if event.get("fields") is not None:
-                            asked["fields"] = event["fields"]
-                        self._add_ui_event(asked)
-                        break
-
-                    else:
-                        # Stream event (tool_call, tool_result, thinking, etc.)
-                        self._handle_stream_event(event)
-
-                return Response(text=result_text, done=done)
+            if event_type == "OUTPUT":
+                # Final result
+                result_text = event.get("result", "")
+                self._current_session = event.get("session")
+                self._status = "idle"
 
-        except asyncio.TimeoutError:
-            self._status = "idle"
-            raise TimeoutError(f"Request timed out after {timeout}s")
+                # Add agent response to UI
+                self._add_ui_event({
+                    "type": "agent",
+                    "content": result_text
+                })
+                return Response(text=result_text, done=True)
+
+            elif event_type == "ERROR":
+                raise ConnectionError(f"Agent error: {event.get('message', event.get('error'))}")
+
+            elif event_type == "ONBOARD_REQUIRED":
+                # Agent requires onboarding (invite code or payment)
+                credentials = await onboard(event.get("methods", []), event.get("payment_amount"))
+                await channel.send(self._build_onboard_submit(credentials))
+                # Continue loop to wait for ONBOARD_SUCCESS
+
+            elif event_type == "ONBOARD_SUCCESS":
+                # Onboard successful - add to UI
+                self._add_ui_event({
+                    "type": "onboard_success",
+                    "level": event.get("level", "contact"),
+                    "message": event.get("message", "Onboard successful")
+                })
+
+                # Retry the original prompt
+                retry_input_id = str(uuid.uuid4())
+                retry_msg = self._build_input_message(prompt, retry_input_id, channel.is_direct)
+                await channel.send(retry_msg)
+                # Continue loop to wait for OUTPUT
+
+            elif event_type == "ask_user":
+                # Agent is asking a question - return done=False so caller sends another input()
+                #
+                # `question` is the field the tool sends. This read `text`,
+                # which no producer has ever sent -- useful_tools/ask_user.py
+                # and diff_writer.py both send `question` -- so every
+                # multi-turn conversation over the network arrived with the
+                # question missing and the options intact, the one field
+                # both sides happened to spell alike. `text` stays accepted
+                # for anything built against the old shape.
+                self._status = "waiting"
+                result_text = event.get("question") or event.get("text") or ""
+
+                # multi_select and fields were dropped: a client could not
+                # tell one answer from many, and a form asked for over the
+                # network could not be rendered at all.
+                asked = {
+                    "type": "ask_user",
+                    "text": result_text,
+                    "options": event.get("options"),
+                    "multi_select": event.get("multi_select"),
+                }
+                if event.get("fields") is not None:
+                    asked["fields"] = event["fields"]
+                self._add_ui_event(asked)
+                # The agent is still running. What it streams before the answer
+                # stays queued on the channel for the turn that answers it.
+                return Response(text=result_text, done=False)
+
+            else:
+                # Stream event (tool_call, tool_result, thinking, etc.)
+                self._handle_stream_event(event)
 
     async def _wait_for_mode_connected(self, ws) -> Dict[str, Any]:
         while True:
@@ -887,6 +1170,9 @@ class RemoteAgent:
             connect_msg["payload"] = payload
             connect_msg["from"] = self._keys["address"]
             connect_msg["signature"] = signature.hex()
+            # Tells the host which canonical form was signed, so it
+            # serializes the payload once instead of trying each form.
+            connect_msg["canonical"] = "escaped"
 
         return connect_msg
 
@@ -941,6 +1227,7 @@ class RemoteAgent:
             frame["payload"] = command
             frame["from"] = self._keys["address"]
             frame["signature"] = addr.sign(self._keys, canonical.encode()).hex()
+            frame["canonical"] = "escaped"
         return frame
 
     def _build_onboard_submit(self, credentials: Dict[str, Any]) -> Dict[str, Any]:
@@ -961,6 +1248,7 @@ class RemoteAgent:
             signature = addr.sign(self._keys, canonical.encode())
             submit_msg["from"] = self._keys["address"]
             submit_msg["signature"] = signature.hex()
+            submit_msg["canonical"] = "escaped"
 
         return submit_msg
 
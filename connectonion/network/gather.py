@@ -0,0 +1,255 @@
+"""
+Purpose: Send one prompt or tool call to many remote agents at once and collect the answers as they land
+LLM-Note:
+  Dependencies: imports from [asyncio, contextlib, statistics, time, dataclasses, typing, core/stats.py (percentile), .connect (RemoteAgent, Response, ExecResult, _run_sync, _this_callers_identity)] | imported by [network/__init__.py, connectonion/__init__.py] | tested by [tests/unit/test_connect_many.py]
+  Data flow: connect_many(addresses) → AgentGroup of RemoteAgents → stream_input(prompt)/stream_call(tool) start one task per agent under a Semaphore(concurrency) → each task awaits RemoteAgent.input_async/call_async under its own asyncio.wait_for deadline → AgentResult yielded as each finishes | gather_input/gather_call collect the stream into a Gathered (results in agent order + latency_stats)
+  State/Effects: no state of its own; each RemoteAgent keeps its connection between rounds (sync rounds run on connect.py's shared loop, so the sockets survive from one round to the next) | an abandoned stream cancels the agents still running
+  Integration: exposes connect_many(), AgentGroup (stream_input, stream_call, gather_input[_async], gather_call[_async], agents), AgentResult, Gathered, latency_stats()
+  Performance: N agents cost max(latency) instead of sum(latency), bounded by `concurrency` sockets in flight | no thread per agent — all of them share one event loop
+  Errors: an agent's failure or timeout is its AgentResult.error, never the round's | KeyboardInterrupt/cancellation propagate and cancel the rest | sync gather_* inside a running loop raises RuntimeError (use the *_async form)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from ..core.stats import percentile
+from .connect import ExecResult, RemoteAgent, Response, _run_sync, _this_callers_identity
+
+Timeout = Union[float, Mapping[str, float]]
+_Send = Callable[[RemoteAgent, float], Awaitable[Any]]
+
+
+@dataclass
+class AgentResult:
+    """One agent's answer to a fan-out round."""
+    address: str
+    response: Optional[Union[Response, ExecResult]] = None
+    error: Optional[BaseException] = None
+    duration_ms: int = 0
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        if self.error is not None or self.response is None:
+            return False
+        # A refused tool call comes back as an ExecResult, not an exception.
+        return getattr(self.response, "ok", True)
+
+    @property
+    def text(self) -> str:
+        return self.response.text if self.response is not None else ""
+
+
+@dataclass
+class Gathered:
+    """Every agent's result, in the order the agents were given, and the round's latency."""
+    results: List[AgentResult] = field(default_factory=list)
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> List[AgentResult]:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> List[AgentResult]:
+        return [r for r in self.results if not r.ok]
+
+
+def latency_stats(results: Iterable[AgentResult], wall_ms: Optional[int] = None) -> Dict[str, Any]:
+    """Counts and latency percentiles (ms) over a round's results."""
+    results = list(results)
+    durations = sorted(r.duration_ms for r in results)
+    stats: Dict[str, Any] = {
+        "agents": len(results),
+        "ok": sum(1 for r in results if r.ok),
+        "failed": sum(1 for r in results if not r.ok),
+        "timed_out": sum(1 for r in results if r.timed_out),
+        "wall_ms": wall_ms,
+        "min_ms": durations[0] if durations else None,
+        "p50_ms": percentile(durations, 50),
+        "p95_ms": percentile(durations, 95),
+        "max_ms": durations[-1] if durations else None,
+        "mean_ms": round(statistics.fmean(durations)) if durations else None,
+    }
+    return stats
+
+
+class AgentGroup:
+    """Many RemoteAgents addressed as one.
+
+    Every agent gets the same prompt or tool call; results come back as each
+    agent finishes (stream_*) or all together in agent order (gather_*). One
+    agent's failure or timeout is recorded on its own result and never costs
+    the others theirs.
+
+    Usage:
+        fleet = connect_many(["0xaaa...", "0xbbb..."], concurrency=8)
+        round = fleet.gather_input("Summarise today's tickets", timeout=30)
+        print(round.stats["p95_ms"], [r.text for r in round.ok])
+    """
+
+    def __init__(self, agents: Iterable[RemoteAgent], *, concurrency: int = 16):
+        if isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1:
+            raise ValueError("concurrency must be a positive integer")
+        self._agents = list(agents)
+        self.concurrency = concurrency
+
+    @property
+    def agents(self) -> List[RemoteAgent]:
+        return list(self._agents)
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __repr__(self):
+        return f"AgentGroup({len(self._agents)} agents, concurrency={self.concurrency})"
+
+    def stream_input(self, prompt: str, timeout: Timeout = 60.0, **kwargs) -> AsyncIterator[AgentResult]:
+        """Send `prompt` to every agent; yield each AgentResult as it lands.
+
+        Leaving the stream early (close it, or read it inside
+        `contextlib.aclosing`) cancels the agents that have not answered.
+
+        `timeout` is each agent's own deadline, in seconds — one number for
+        all, or a mapping of address to seconds (addresses it leaves out get
+        60). Extra keyword arguments go to RemoteAgent.input_async.
+        """
+        return self._results(_input(prompt, kwargs), timeout)
+
+    def stream_call(self, tool: str, timeout: Timeout = 60.0, **args) -> AsyncIterator[AgentResult]:
+        """Run `tool` on every agent; yield each AgentResult as it lands."""
+        return self._results(_call(tool, args), timeout)
+
+    async def gather_input_async(self, prompt: str, timeout: Timeout = 60.0, **kwargs) -> Gathered:
+        """Async version of gather_input()."""
+        return await self._gather(_input(prompt, kwargs), timeout)
+
+    async def gather_call_async(self, tool: str, timeout: Timeout = 60.0, **args) -> Gathered:
+        """Async version of gather_call()."""
+        return await self._gather(_call(tool, args), timeout)
+
+    def gather_input(self, prompt: str, timeout: Timeout = 60.0, **kwargs) -> Gathered:
+        """Send `prompt` to every agent and wait for all of them."""
+        _refuse_inside_a_loop("gather_input")
+        return _run_sync(self.gather_input_async(prompt, timeout, **kwargs))
+
+    def gather_call(self, tool: str, timeout: Timeout = 60.0, **args) -> Gathered:
+        """Run `tool` on every agent and wait for all of them."""
+        _refuse_inside_a_loop("gather_call")
+        return _run_sync(self.gather_call_async(tool, timeout, **args))
+
+    async def _gather(self, send: _Send, timeout: Timeout) -> Gathered:
+        start = time.monotonic()
+        results: List[Optional[AgentResult]] = [None] * len(self._agents)
+        async with contextlib.aclosing(self._run(send, timeout)) as finished:
+            async for index, result in finished:
+                results[index] = result
+        wall_ms = int((time.monotonic() - start) * 1000)
+        return Gathered(results=results, stats=latency_stats(results, wall_ms))
+
+    async def _results(self, send: _Send, timeout: Timeout) -> AsyncIterator[AgentResult]:
+        # Closing this stream has to close _run's too, or the agents still
+        # running wait for the garbage collector to be cancelled.
+        async with contextlib.aclosing(self._run(send, timeout)) as finished:
+            async for _, result in finished:
+                yield result
+
+    async def _run(self, send: _Send, timeout: Timeout) -> AsyncIterator[Tuple[int, AgentResult]]:
+        """(agent index, result) for every agent, in the order they finish."""
+        gate = asyncio.Semaphore(self.concurrency)
+
+        async def one(index: int, agent: RemoteAgent):
+            seconds = _timeout_for(agent.address, timeout)
+            async with gate:
+                start = time.monotonic()
+                result = AgentResult(address=agent.address)
+                try:
+                    # The RemoteAgent's own timeout is per frame; this one is
+                    # the agent's whole deadline.
+                    result.response = await asyncio.wait_for(send(agent, seconds), timeout=seconds)
+                except (asyncio.TimeoutError, TimeoutError):
+                    result.error = TimeoutError(f"{agent.address} did not answer within {seconds}s")
+                    result.timed_out = True
+                except Exception as exc:
+                    result.error = exc
+                result.duration_ms = int((time.monotonic() - start) * 1000)
+                return index, result
+
+        tasks = [asyncio.create_task(one(i, agent)) for i, agent in enumerate(self._agents)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # A caller that stops reading early does not want the rest.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _input(prompt: str, kwargs: Dict[str, Any]) -> _Send:
+    return lambda agent, seconds: agent.input_async(prompt, timeout=seconds, **kwargs)
+
+
+def _call(tool: str, args: Dict[str, Any]) -> _Send:
+    return lambda agent, seconds: agent.call_async(tool, timeout=seconds, **args)
+
+
+def _timeout_for(address: str, timeout: Timeout) -> float:
+    if isinstance(timeout, Mapping):
+        return float(timeout.get(address, 60.0))
+    return float(timeout)
+
+
+def _refuse_inside_a_loop(name: str) -> None:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    raise RuntimeError(
+        f"{name}() cannot be used inside async context. "
+        f"Use 'await group.{name}_async()' instead."
+    )
+
+
+def connect_many(
+    addresses: Iterable[str],
+    *,
+    keys: Optional[Dict[str, Any]] = None,
+    relay_url: Optional[str] = None,
+    concurrency: int = 16,
+) -> AgentGroup:
+    """
+    Connect to many remote agents and address them as one group.
+
+    Args:
+        addresses: Agents' public key addresses (0x...)
+        keys: Signing keys, as for connect()
+        relay_url: Relay server base URL (default: the configured backend)
+        concurrency: Most agents with a request in flight at once
+
+    Returns:
+        AgentGroup whose rounds go to every agent concurrently
+
+    Example:
+        >>> from connectonion import connect_many
+        >>>
+        >>> fleet = connect_many(["0x3d4017c3...", "0x8a1b...", "0x51f0..."])
+        >>> round = fleet.gather_call("bash", command="uptime", timeout=10)
+        >>> for result in round.results:
+        ...     print(result.address, result.ok, result.duration_ms)
+        >>> print(round.stats)     # {'agents': 3, 'ok': 3, 'p50_ms': ..., ...}
+    """
+    if keys is None:
+        # Looked up once for the fleet, not once per agent. False keeps a
+        # caller with no identity from being looked up again for each one.
+        keys = _this_callers_identity() or False
+    return AgentGroup(
+        [RemoteAgent(address, keys=keys, relay_url=relay_url) for address in addresses],
+        concurrency=concurrency,
+    )
@@ -0,0 +1,157 @@
+"""
+Purpose: Keep prepared Agent instances warm so a hosted turn does not pay the factory on its request path
+LLM-Note:
+  Dependencies: imports from [queue, threading] | imported by [network/host/server.py, network/host/http_router.py (type only)] | tested by [tests/unit/test_agent_pool.py]
+  Data flow: AgentPool(create_agent, size) probes the factory (two instances), refuses with PoolingRefused if they share an Agent or a tool's bound instance differs between them, then warms up to `size` | acquire() pops an idle agent or builds one | release(agent, reusable) restores the attributes the factory built it with, resets conversation/io/storage and keeps it if there is room; an agent whose tools or event handlers changed is dropped instead
+  State/Effects: holds up to `size` idle Agents in a LIFO queue and a build-time snapshot of each (weakly keyed); a turn that raised, or changed the tool set or handlers, is never returned to the pool
+  Integration: host.yaml `agent_pool: N` or host(agent_pool=N); input_handler borrows through pool.acquire/release when one is passed
+  Performance: a borrowed turn skips tool processing, plugin registration, skill discovery and LLM client construction; a burst past `size` falls back to the factory rather than waiting
+  Errors: PoolingRefused (ValueError) names why the factory is unsafe to pool; host() prints it and serves unpooled
+"""
+
+import queue
+import threading
+import weakref
+from typing import Callable
+
+
+class PoolingRefused(ValueError):
+    """The factory's agents carry state that must not outlive one request."""
+
+
+class AgentPool:
+    """Prepared agents, borrowed for one turn and reset on return."""
+
+    def __init__(self, create_agent: Callable, size: int):
+        if size < 1:
+            raise ValueError("agent pool size must be at least 1")
+        self.create_agent = create_agent
+        self.size = size
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._lock = threading.Lock()
+        # What each agent looked like when the factory returned it.
+        self._built = weakref.WeakKeyDictionary()
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+        first, second = self._build(), self._build()
+        _refuse_unsafe(first, second)
+        self._idle.put(first)
+        if size > 1:
+            self._idle.put(second)
+        # Warm the rest now, at startup, where the cost is nobody's latency.
+        for _ in range(size - 2):
+            self._idle.put(self._build())
+
+    def _build(self):
+        agent = self.create_agent()
+        with self._lock:
+            self.created += 1
+            self._built[agent] = _snapshot(agent)
+        return agent
+
+    def acquire(self):
+        """An idle agent, or a fresh one when a burst has emptied the pool."""
+        try:
+            agent = self._idle.get_nowait()
+        except queue.Empty:
+            return self._build()
+        with self._lock:
+            self.reused += 1
+        return agent
+
+    def release(self, agent, reusable: bool = True) -> None:
+        """Return an agent after its turn.
+
+        Only a turn that finished is reusable. One that raised may have stopped
+        anywhere -- mid-tool, mid-plugin -- and whatever it left half-done is
+        exactly the bleed between requests this pool must not introduce.
+
+        Nor is one whose tool set or event handlers changed: a turn that added
+        a tool would hand it to the next caller, and undoing that in place is
+        guesswork. Attributes set on the agent itself -- a plugin's counters,
+        the host's full-access ceiling, the _yolo_* flags -- are put back to
+        what the factory returned, and any the turn added are removed.
+        """
+        with self._lock:
+            built = self._built.get(agent)
+        if not reusable or built is None or _snapshot_changed(agent, built):
+            with self._lock:
+                self.discarded += 1
+            return
+        _restore(agent, built)
+        agent.reset_conversation()
+        agent.io = None
+        agent.storage = None
+        if self._idle.qsize() < self.size:
+            self._idle.put(agent)
+
+    def idle(self) -> int:
+        return self._idle.qsize()
+
+
+def _snapshot(agent) -> dict:
+    """The agent's attributes, tool-set version and event handlers, as built."""
+    events = getattr(agent, "events", None)
+    return {
+        "attrs": dict(vars(agent)),
+        "tools": getattr(agent.tools, "_version", None),
+        "events": {name: list(handlers) for name, handlers in events.items()}
+        if isinstance(events, dict) else None,
+    }
+
+
+def _snapshot_changed(agent, built: dict) -> bool:
+    """Whether a turn changed what a shallow restore cannot put back."""
+    if getattr(agent.tools, "_version", None) != built["tools"]:
+        return True
+    if agent.__dict__.get("tools") is not built["attrs"].get("tools"):
+        return True
+    events = getattr(agent, "events", None)
+    if built["events"] is None:
+        return events is not built["attrs"].get("events")
+    return events is not built["attrs"].get("events") or {
+        name: list(handlers) for name, handlers in events.items()} != built["events"]
+
+
+def _restore(agent, built: dict) -> None:
+    attrs = vars(agent)
+    for name in [name for name in attrs if name not in built["attrs"]]:
+        del attrs[name]
+    for name, value in built["attrs"].items():
+        if attrs.get(name, _MISSING) is not value:
+            attrs[name] = value
+
+
+_MISSING = object()
+
+
+def _refuse_unsafe(first, second) -> None:
+    """Refuse a factory whose agents are not interchangeable between requests.
+
+    Two cases, both visible by building twice and comparing:
+
+    - The same Agent twice. That is host(agent) -- one shared instance -- or a
+      factory returning a global; there is nothing to pool.
+    - A tool bound to a *new* object per call. That is the documented
+      per-request isolation pattern (a BrowserTool built inside the factory),
+      and its state -- a logged-in tab, an open file -- belongs to one caller.
+      Pooling would hand it to the next. A tool bound to the *same* object in
+      both was shared by the factory on purpose and pools fine.
+    """
+    if first is second:
+        raise PoolingRefused(
+            "the factory returns one shared Agent, so there is nothing to pool"
+        )
+    for tool in first.tools:
+        owner = getattr(tool, "_bound_instance", None)
+        if owner is None:
+            continue
+        twin = second.tools.get(tool.name)
+        if getattr(twin, "_bound_instance", None) is not owner:
+            raise PoolingRefused(
+                f"tool '{tool.name}' is bound to a new {type(owner).__name__} per "
+                "call, which is per-request state; create it outside the factory "
+                "to share it, or leave agent_pool off"
+            )
@@ -2,10 +2,10 @@
 Purpose: Ed25519 signature verification and trust-based authentication for hosted agents
 LLM-Note:
   Dependencies: imports from [network/trust/TrustAgent, nacl.signing] | imported by [network/host/http_router.py, network/host/server.py, network/host/ws_router/connect.py] | tested by [tests/unit/test_host_auth.py]
-  Data flow: receives request dict with {payload, from, signature} → extract_and_authenticate() verifies Ed25519 signature → uses TrustAgent.should_allow() for trust decisions (fast rules + LLM fallback) → returns (prompt, agent_address, sig_valid, error)
-  State/Effects: TrustAgent handles all trust state (whitelist, contacts, blocklist in ~/.co/)
-  Integration: exposes verify_signature(), extract_and_authenticate(), get_agent_address(), is_custom_trust() | used by host() to enforce authentication
-  Performance: TrustAgent.should_allow() runs fast rules first (zero tokens), only uses LLM for 'ask' cases
+  Data flow: receives request dict with {payload, from, signature, canonical?} → extract_and_authenticate() verifies Ed25519 signature over the form `canonical` names (or each of CANONICAL_FORMS in turn) → uses TrustAgent.should_allow() for trust decisions (fast rules + LLM fallback) → returns (prompt, agent_address, sig_valid, error)
+  State/Effects: TrustAgent handles all trust state (whitelist, contacts, blocklist in ~/.co/) | an LRU of parsed verify keys, VERIFY_KEY_CACHE_SIZE addresses
+  Integration: exposes verify_signature(), extract_and_authenticate(), get_agent_address(), is_custom_trust(), CANONICAL_FORMS | used by host() to enforce authentication | connect.py and signed_request() mark their frames canonical="escaped"
+  Performance: TrustAgent.should_allow() runs fast rules first (zero tokens), only uses LLM for 'ask' cases | a hinted frame serializes its payload once; an unhinted one serializes each form only after the previous failed | benchmark: tests/e2e/manual/host_auth_benchmark.py
   Errors: returns error strings: "unauthorized: ...", "forbidden: ...", "misconfigured: ..." (a trust list the agent cannot read) | does NOT raise exceptions
 Authentication and signature verification for hosted agents.
 
@@ -15,6 +15,7 @@ Trust evaluation (via TrustAgent.should_allow()):
 3. TrustAgent handles fast rules + LLM fallback
 """
 
+import functools
 import hashlib
 import json
 import math
@@ -30,51 +31,94 @@ from .replay import (
 )
 
 
-def verify_signature(payload: dict, signature: str, public_key: str) -> bool:
+# The byte strings a client may have signed for one payload, in the order a
+# frame without a `canonical` hint tries them. Python historically escaped
+# non-ASCII characters while JavaScript's JSON.stringify emits their UTF-8
+# representation. Both are deterministic encodings of the same JSON value, so
+# either is accepted; the escaped form stays first because it is what every
+# existing Python client signs. connectonion-ts <= the 1.6 candidate sorted
+# only the envelope's top-level keys, keeping the nested insertion order
+# received on the wire; that form is the migration path for those clients.
+CANONICAL_FORMS = {
+    "escaped": lambda payload: json.dumps(
+        payload, sort_keys=True, separators=(",", ":")),
+    "utf8": lambda payload: json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False),
+    "legacy_ts": lambda payload: json.dumps(
+        {key: payload[key] for key in sorted(payload)},
+        separators=(",", ":"), ensure_ascii=False),
+}
+
+# Parsed keys for the addresses seen lately. A connection verifies its CONNECT
+# and then every signed command with the same key; parsing the hex and
+# building the curve point again for each frame is work the previous frame
+# already did.
+VERIFY_KEY_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=VERIFY_KEY_CACHE_SIZE)
+def _verify_key(key_hex: str):
+    """The nacl VerifyKey for a hex public key, or None if it is not one."""
+    from nacl.signing import VerifyKey
+
+    try:
+        return VerifyKey(bytes.fromhex(key_hex))
+    except ValueError:
+        return None
+
+
+def verify_signature(payload: dict, signature: str, public_key: str,
+                     canonical: str | None = None) -> bool:
     """Verify Ed25519 signature.
 
     Args:
         payload: The payload that was signed
         signature: Hex-encoded signature (with or without 0x prefix)
         public_key: Hex-encoded public key (with or without 0x prefix)
+        canonical: Which of CANONICAL_FORMS the client signed, when it says.
+            Only that form is serialized and checked; a hint naming no known
+            form fails. Without one, each form is tried in turn.
 
     Returns:
         True if signature is valid, False otherwise
     """
     from nacl.exceptions import BadSignatureError
-    from nacl.signing import VerifyKey
 
     # Remove 0x prefix if present
     sig_hex = signature[2:] if signature.startswith("0x") else signature
     key_hex = public_key[2:] if public_key.startswith("0x") else public_key
 
+    verify_key = _verify_key(key_hex.lower())
     try:
-        verify_key = VerifyKey(bytes.fromhex(key_hex))
         signature_bytes = bytes.fromhex(sig_hex)
     except ValueError:
+        signature_bytes = None
+    if verify_key is None or signature_bytes is None:
         # Invalid public key or signature hex.
         return False
 
-    # Python historically escaped non-ASCII characters while JavaScript's
-    # JSON.stringify emits their UTF-8 representation. Both byte strings are
-    # deterministic encodings of the same JSON value, so accept either during
-    # verification. Keeping the escaped form first preserves every signature
-    # made by existing Python clients while allowing TS/browser clients to sign
-    # prompts such as Chinese text.
-    escaped = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-    utf8 = json.dumps(
-        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
-    )
-    # connectonion-ts <= the 1.6 candidate sorted only the envelope's top-level
-    # keys. Preserve the nested insertion order received on the wire as a
-    # migration path; new TS releases recursively sort to match Python.
-    top_level_sorted = {key: payload[key] for key in sorted(payload)}
-    legacy_ts = json.dumps(
-        top_level_sorted, separators=(",", ":"), ensure_ascii=False
-    )
-    for canonical in dict.fromkeys((escaped, utf8, legacy_ts)):
+    if canonical is None:
+        forms = CANONICAL_FORMS.values()
+    elif isinstance(canonical, str) and canonical in CANONICAL_FORMS:
+        # The hint only chooses which bytes to check: a signature is valid
+        # for one of them or for none, so a wrong hint can make a good frame
+        # fail but never a bad one pass.
+        forms = (CANONICAL_FORMS[canonical],)
+    else:
+        return False
+
+    # Serialized one at a time, and only after the previous form failed: a
+    # large prompt (base64 images) signed by a Python client costs one
+    # json.dumps, not three. For an all-ASCII payload the UTF-8 form is the
+    # escaped one again, so it is not checked twice.
+    tried = set()
+    for form in forms:
+        message = form(payload).encode()
+        if message in tried:
+            continue
+        tried.add(message)
         try:
-            verify_key.verify(canonical.encode(), signature_bytes)
+            verify_key.verify(message, signature_bytes)
             return True
         except BadSignatureError:
             continue
@@ -316,6 +360,7 @@ def sign_request_body(keys: dict, method: str, path: str, payload=None,
         "payload": signed_payload,
         "from": keys["address"],
         "signature": _address.sign(keys, _canonical(signed_payload)).hex(),
+        "canonical": "escaped",
     }
 
 
@@ -535,7 +580,7 @@ def _authenticate_signed(data: dict, *, blacklist=None, recipient_address=None):
         return None, agent_address, "unauthorized: wrong recipient"
 
     # Verify signature ALWAYS (no whitelist bypass - that's at policy level)
-    if not verify_signature(payload, signature, agent_address):
+    if not verify_signature(payload, signature, agent_address, data.get("canonical")):
         return None, agent_address, "unauthorized: invalid signature"
 
     return prompt, agent_address, None
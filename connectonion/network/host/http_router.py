@@ -5,7 +5,7 @@ LLM-Note:
   Data flow: claim durable session → create/disarm Agent → input → normalize → save
   State/Effects: reads/writes append-only SessionStorage; rejects busy/foreign claims
   Integration: route handlers used by server.py and ASGI adapters
-  Performance: creates one isolated Agent per request; storage applies TTL cleanup
+  Performance: creates one isolated Agent per request, or borrows one from an AgentPool; storage applies TTL cleanup
   Errors: missing session IDs are invalid; missing sessions return None
 
 Session ID ownership:
@@ -47,8 +47,14 @@ def input_handler(create_agent: Callable, storage: SessionStorage, prompt: str,
                   session: dict | None = None, connection=None, images: list[str] | None = None,
                   files: list[dict] | None = None, requester: dict | None = None,
                   mode_policy: HostPermissionPolicy | None = None,
-                  is_admin: bool = False) -> dict:
-    """POST /input (and WebSocket /ws) with session merge and UI conversion."""
+                  is_admin: bool = False, pool=None) -> dict:
+    """POST /input (and WebSocket /ws) with session merge and UI conversion.
+
+    With an AgentPool the turn borrows a prepared agent instead of calling the
+    factory, and hands it back reset once the turn has finished.
+    """
+    if pool is not None:
+        create_agent = pool.acquire
     session = session or {}
     session_id = session.get('session_id')
     if not session_id:
@@ -74,6 +80,7 @@ def input_handler(create_agent: Callable, storage: SessionStorage, prompt: str,
     session = record.session
 
     start = time.time()
+    finished = False
     try:
         if agent is None:
             agent = create_agent()
@@ -106,6 +113,7 @@ def input_handler(create_agent: Callable, storage: SessionStorage, prompt: str,
         record.duration_ms = duration_ms
         record.session = agent.current_session
         storage.save(record)
+        finished = True
     except Exception:
         # The claim is already durable. Always terminate it so a factory/model
         # exception cannot leave this session busy until Host restarts.
@@ -125,15 +133,20 @@ def input_handler(create_agent: Callable, storage: SessionStorage, prompt: str,
                 "Unable to persist failed Host prompt %s", session_id
             )
         raise
+    finally:
+        # Read before release: returning to the pool resets the conversation.
+        final_session = agent.current_session if agent is not None else None
+        if pool is not None and agent is not None:
+            pool.release(agent, reusable=finished)
 
-    chat_items = session_to_chat_items(agent.current_session)
+    chat_items = session_to_chat_items(final_session)
 
     return {
         "session_id": session_id,
         "status": "done",
         "result": result,
         "duration_ms": duration_ms,
-        "session": agent.current_session,
+        "session": final_session,
         "chat_items": chat_items,
         "server_newer": server_newer,
     }
@@ -237,15 +250,21 @@ def session_handler(storage: SessionStorage, session_id: str,
     return session.model_dump() if session else None
 
 
-def sessions_handler(storage: SessionStorage, caller: str | None = None) -> dict:
-    """GET /sessions — the caller's own.
+# How many of the agent's newest sessions GET /sessions looks through for the
+# caller's own. Unbounded, every request loaded and hydrated the whole store.
+SESSIONS_LIST_LIMIT = 200
+
+
+def sessions_handler(storage: SessionStorage, caller: str | None = None,
+                     limit: int = SESSIONS_LIST_LIMIT) -> dict:
+    """GET /sessions — the caller's own, among the agent's newest `limit`.
 
     This returned every conversation on the agent, to anyone who could reach
     the port (#683), and was where #696's attack got its session ids.
     """
     from .session import session_owner
 
-    mine = [s for s in storage.list()
+    mine = [s for s in storage.list(limit=limit)
             if (session_owner(s) or caller) == caller]
     return {"sessions": [s.model_dump() for s in mine]}
 
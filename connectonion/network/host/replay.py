@@ -1,7 +1,8 @@
 """
 Purpose: Cross-process one-use signature storage for hosted-agent authentication
-State/Effects: stores only signature digests and timestamps in .co/replay.sqlite3
-Integration: SignatureReplayStore.already_used is injected into every hosted route
+State/Effects: stores only signature digests and timestamps in .co/replay.sqlite3 (WAL); one connection per thread; a bounded in-memory record of digests this process has claimed
+Integration: SignatureReplayStore.already_used is injected into every hosted route; start_replay_sweep runs the expiry DELETE off the request path, from the host app's startup until a stop Event set at its shutdown
+Performance: a claim is one upsert on a kept connection; a replay this process already saw is answered from memory
 Errors: raises ReplayProtectionError so callers can fail closed with a safe message
 """
 
@@ -9,7 +10,9 @@ import hashlib
 import math
 import os
 import sqlite3
+import threading
 import time
+from collections import OrderedDict
 from contextlib import closing
 from pathlib import Path
 
@@ -19,6 +22,11 @@ SIGNATURE_EXPIRY_SECONDS = 300
 # holding the write lock. Stay bounded and fail closed after ordinary runner
 # scheduling jitter has had time to clear (#804).
 SQLITE_BUSY_TIMEOUT_SECONDS = 2.0
+# Expired rows are unreachable (a claim overwrites one in place), so deleting
+# them is only about the file's size and can wait for a background pass.
+SWEEP_INTERVAL_SECONDS = 60
+# Digests this process has claimed, kept to answer a repeat without the disk.
+RECENT_CLAIMS = 4096
 
 
 class ReplayProtectionError(RuntimeError):
@@ -43,12 +51,21 @@ class SignatureReplayStore:
         self.path = Path(path).resolve()
         self.expiry_seconds = expiry_seconds
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._recent: OrderedDict = OrderedDict()
+        self._recent_lock = threading.Lock()
         try:
             descriptor = os.open(self.path, os.O_CREAT | os.O_WRONLY, 0o600)
             os.close(descriptor)
             if os.name != "nt":
                 os.chmod(self.path, 0o600)
             with closing(self._connect()) as database:
+                try:
+                    # Readers never wait on a claim, and claims from other
+                    # workers queue on the WAL rather than the whole file.
+                    database.execute("PRAGMA journal_mode = WAL")
+                except sqlite3.OperationalError:
+                    pass      # another worker is switching it right now
                 with database:
                     # Serialize schema inspection and migration across workers.
                     database.execute("BEGIN IMMEDIATE")
@@ -91,6 +108,15 @@ class SignatureReplayStore:
         )
         return database
 
+    def _database(self):
+        """This thread's connection, kept open across claims."""
+        database = getattr(self._local, "database", None)
+        if database is None:
+            database = self._connect()
+            database.isolation_level = None     # one statement, autocommit
+            self._local.database = database
+        return database
+
     def _expires_at(self, data: dict, seen_at: float) -> float:
         """Return the point after which a verified signature cannot be valid."""
         timestamp = (data.get("payload") or {}).get("timestamp")
@@ -109,20 +135,77 @@ class SignatureReplayStore:
         seen_at = time.time() if now is None else now
         expires_at = self._expires_at(data, seen_at)
         digest = signature_digest(signature)
+
+        # A replay of something this process claimed needs no disk: it was
+        # recorded there before this entry was made. Anything else -- a fresh
+        # digest, or one another worker may hold -- is decided by the ledger.
+        with self._recent_lock:
+            known = self._recent.get(digest)
+        if known is not None and known >= seen_at:
+            return True
+
         try:
-            with closing(self._connect()) as database:
-                with database:
-                    database.execute(
-                        "DELETE FROM used_signatures WHERE expires_at < ?",
-                        (seen_at,),
-                    )
-                    inserted = database.execute(
-                        "INSERT OR IGNORE INTO used_signatures "
-                        "(digest, seen_at, expires_at) VALUES (?, ?, ?)",
-                        (digest, seen_at, expires_at),
-                    ).rowcount
-            return inserted == 0
+            # An expired row is overwritten in place, so a claim never depends
+            # on the sweep having run: fresh or expired counts as unused.
+            claimed = self._database().execute(
+                "INSERT INTO used_signatures (digest, seen_at, expires_at) "
+                "VALUES (?, ?, ?) ON CONFLICT(digest) DO UPDATE SET "
+                "seen_at = excluded.seen_at, expires_at = excluded.expires_at "
+                "WHERE used_signatures.expires_at < excluded.seen_at",
+                (digest, seen_at, expires_at),
+            ).rowcount
+        except (OSError, sqlite3.Error) as exc:
+            self._local.database = None      # reconnect next time
+            raise ReplayProtectionError(
+                f"replay protection storage is unavailable: {self.path}"
+            ) from exc
+        if claimed:
+            self._remember(digest, expires_at)
+        return claimed == 0
+
+    def _remember(self, digest: bytes, expires_at: float) -> None:
+        with self._recent_lock:
+            self._recent[digest] = expires_at
+            self._recent.move_to_end(digest)
+            while len(self._recent) > RECENT_CLAIMS:
+                self._recent.popitem(last=False)
+
+    def sweep(self, *, now=None) -> int:
+        """Delete expired digests. Returns how many went."""
+        now = time.time() if now is None else now
+        with self._recent_lock:
+            for digest in [d for d, e in self._recent.items() if e < now]:
+                del self._recent[digest]
+        try:
+            return self._database().execute(
+                "DELETE FROM used_signatures WHERE expires_at < ?", (now,)
+            ).rowcount
         except (OSError, sqlite3.Error) as exc:
+            self._local.database = None
             raise ReplayProtectionError(
                 f"replay protection storage is unavailable: {self.path}"
             ) from exc
+
+
+def start_replay_sweep(store: SignatureReplayStore,
+                       interval: float = SWEEP_INTERVAL_SECONDS,
+                       stop: threading.Event | None = None) -> threading.Thread:
+    """Start the background expiry sweep (runs every `interval` seconds).
+
+    Runs until `stop` is set; the host sets it from the app's shutdown, so an
+    app that is built and dropped (every test does) leaves no sweeper behind.
+    A failed pass is skipped, not fatal: claims stay correct without it, and
+    the next pass catches up.
+    """
+    stop = stop or threading.Event()
+
+    def sweep_loop():
+        while not stop.wait(interval):
+            try:
+                store.sweep()
+            except ReplayProtectionError:
+                continue
+
+    thread = threading.Thread(target=sweep_loop, daemon=True, name="replay-sweep")
+    thread.start()
+    return thread
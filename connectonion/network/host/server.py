@@ -27,6 +27,7 @@ don't interfere between concurrent requests.
 
 import asyncio
 import random
+import threading
 from functools import partial
 import os
 from pathlib import Path
@@ -46,9 +47,9 @@ from .schedule import create_schedule_lifespan
 from ..trust import TrustAgent, parse_policy, TRUST_LEVELS
 from ..trust.factory import PROMPTS_DIR
 from .auth import authenticate_connect, extract_and_authenticate
-from .replay import SignatureReplayStore
+from .replay import SignatureReplayStore, start_replay_sweep
 from .config import load_host_config, load_list_file, validate_files, validate_images, project_co_dir, DEFAULT_FILE_LIMITS
-from .session import SessionStorage, ActiveSessionRegistry, start_cleanup_job
+from .session import SessionStorage, ActiveSessionRegistry, open_session_storage, start_cleanup_job
 from .session.mode import HostPermissionPolicy
 from .http_router import (
     input_handler,
@@ -68,6 +69,7 @@ from .http_router import (
     admin_admins_remove_handler,
 )
 from .provider_workroom import prepare_provider_workroom_turn
+from .agent_pool import AgentPool, PoolingRefused
 
 
 EXEC_REQUIRES = ("admin", "whitelist", "contact")
@@ -215,6 +217,22 @@ def _build_agent_profile(agent_metadata: dict) -> dict:
     return profile
 
 
+def _agent_pool(create_agent: Callable, size) -> AgentPool | None:
+    """host.yaml `agent_pool: N` -- N agents warmed now, or None to build per turn.
+
+    A refused factory still serves, unpooled: the pool is a latency
+    optimisation, and the reason it was refused is printed where the operator
+    reads the banner.
+    """
+    if not size:
+        return None
+    try:
+        return AgentPool(create_agent, int(size))
+    except PoolingRefused as e:
+        print(f"[host] agent_pool off: {e}")
+        return None
+
+
 def _create_route_handlers(
     create_agent: Callable,
     agent_metadata: dict,
@@ -224,6 +242,7 @@ def _create_route_handlers(
     exec_permissions: dict | None = None,
     replay_check=None,
     mode_policy: HostPermissionPolicy | None = None,
+    pool: AgentPool | None = None,
 ):
     """Create route handler dict for ASGI app.
 
@@ -239,6 +258,8 @@ def _create_route_handlers(
                           EXEC (direct tool execution). Same list the LLM
                           approval flow uses; empty dict → nothing runs directly.
         replay_check: Atomic one-use signature guard for this hosted project.
+        pool: Prepared agents that input turns borrow instead of calling
+              create_agent (see agent_pool.py); None builds one per turn.
     """
     agent_name = agent_metadata["name"]
     exec_permissions = exec_permissions or {}
@@ -265,7 +286,7 @@ def _create_route_handlers(
         return input_handler(
             create_agent, storage, prompt, result_ttl, session, connection,
             images, files, requester=requester, mode_policy=mode_policy,
-            is_admin=bool(requester and requester["level"] == "admin"),
+            is_admin=bool(requester and requester["level"] == "admin"), pool=pool,
         )
 
     def handle_ws_input(storage, prompt, connection, session=None, images=None,
@@ -281,7 +302,8 @@ def _create_route_handlers(
         return input_handler(create_agent, storage, prompt, result_ttl, session,
                              connection, images, files, requester=requester,
                              mode_policy=mode_policy,
-                             is_admin=bool(requester and requester["level"] == "admin"))
+                             is_admin=bool(requester and requester["level"] == "admin"),
+                             pool=pool)
 
     handle_ws_exec = _make_ws_exec(create_agent, exec_permissions, trust_agent)
 
@@ -659,6 +681,28 @@ async def _refresh_published_balance(sample, agent_metadata: dict,
         profile["balance_usd"] = balance
 
 
+def _create_replay_sweep_lifespan(store: SignatureReplayStore):
+    """Sweep the replay ledger while the app serves, and stop when it stops.
+
+    Started from app construction, the sweeper outlived the app: one more
+    thread that could never end for every create_app() in the process.
+    """
+    stop = threading.Event()
+    thread = None
+
+    async def on_startup():
+        nonlocal thread
+        stop.clear()
+        thread = start_replay_sweep(store, stop=stop)
+
+    async def on_shutdown():
+        stop.set()
+        if thread is not None:
+            await asyncio.to_thread(thread.join)
+
+    return on_startup, on_shutdown
+
+
 def _create_balance_lifespan(sample, agent_metadata: dict,
                              profile: dict | None = None):
     """Refresh /info, authenticated profile, and relay profile once a minute."""
@@ -851,6 +895,7 @@ def host(
     summary: str = None,
     examples: list = None,
     http=None,
+    agent_pool: int = None,
 ):
     """
     Host an agent over HTTP/WebSocket with P2P relay discovery (enabled by default).
@@ -897,6 +942,10 @@ def host(
         summary: Agent description (default: from config or agent.system_prompt)
         examples: Example prompts (default: from config or auto-generated)
         http: Optional HTTPRouter with publisher-defined resource routes
+        agent_pool: Keep this many agents prepared for input turns instead of
+                    calling the factory per turn (default: off, or from config).
+                    Refused for a shared instance or a factory that builds
+                    per-request tool objects.
 
     Direct execution (WS EXEC):
         Clients can run a tool directly, bypassing the LLM, via
@@ -949,7 +998,7 @@ def host(
         co_dir,
         port=port, trust=trust, result_ttl=result_ttl,
         workers=workers, reload=reload,
-        summary=summary, examples=examples,
+        summary=summary, examples=examples, agent_pool=agent_pool,
     )
 
     # Extract final values from config
@@ -1003,7 +1052,9 @@ def host(
     ensure_dashboard(agent_metadata)
 
     # co_dir, not the default: host(co_dir=...) must put the sessions there too.
-    storage = SessionStorage(co_dir / "session_results.jsonl")
+    # host.yaml `session_store: sqlite` swaps in the indexed store, importing
+    # the JSONL history the first time.
+    storage = open_session_storage(co_dir, config.get("session_store"))
 
     # Any session still marked `running` belongs to a process that is gone —
     # this one just started and owns none. Left alone they are permanent, since
@@ -1040,6 +1091,7 @@ def host(
         create_agent, agent_metadata, result_ttl, trust_agent, config,
         exec_permissions, replay_store.already_used,
         mode_policy=_host_mode_policy(sample),
+        pool=_agent_pool(create_agent, config.get("agent_pool")),
     )
 
     # Parse trust config for /info onboard info
@@ -1078,6 +1130,9 @@ def host(
     )
     on_startup = _both(on_startup, balance_startup)
     on_shutdown = _both(balance_shutdown, on_shutdown)
+    sweep_startup, sweep_shutdown = _create_replay_sweep_lifespan(replay_store)
+    on_startup = _both(on_startup, sweep_startup)
+    on_shutdown = _both(sweep_shutdown, on_shutdown)
 
     # The schedule is not conditional on the relay. An agent reachable only on
     # localhost still has recurring work to do, and tying its clock to whether
@@ -1182,6 +1237,7 @@ def create_app(create_agent: Callable, storage=None, trust="careful", result_ttl
     balance_startup, balance_shutdown = _create_balance_lifespan(
         sample, agent_metadata
     )
+    sweep_startup, sweep_shutdown = _create_replay_sweep_lifespan(replay_store)
     return asgi_create_app(
         route_handlers=route_handlers,
         storage=storage,
@@ -1189,7 +1245,7 @@ def create_app(create_agent: Callable, storage=None, trust="careful", result_ttl
         trust=trust_agent,  # Pass resolved TrustAgent, not raw trust
         blacklist=blacklist,
         whitelist=whitelist,
-        on_startup=balance_startup,
-        on_shutdown=balance_shutdown,
+        on_startup=_both(balance_startup, sweep_startup),
+        on_shutdown=_both(sweep_shutdown, balance_shutdown),
         http=http,
     )
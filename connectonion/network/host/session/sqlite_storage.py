@@ -0,0 +1,347 @@
+"""
+Purpose: Indexed SQLite session storage with the same contract as the JSONL SessionStorage
+LLM-Note:
+  Dependencies: imports from [sqlite3, threading, time, pathlib, .storage (Session, SessionStorage)] | imported by [host/session/storage.py open_session_storage (lazy), host/ws_router/dashboard.py (lazy)] | tested by [test_session_storage.py]
+  Data flow: save() upserts one row per session_id, its message/trace entries stored once by digest in `bodies` | atomic_update() runs read → updater → upsert inside BEGIN IMMEDIATE | get() is one primary-key lookup | list(limit, status) is one indexed query | migrate_jsonl() imports the newest record per session from session_results.jsonl once
+  State/Effects: .co/sessions.sqlite3 (WAL) with a thread-local connection per storage; the migrated JSONL (and its bodies file) is renamed to *.migrated so nothing reads or imports it twice
+  Integration: chosen by `session_store: sqlite` in host.yaml; subclass of SessionStorage, so checkpoint()/UNFINISHED and every caller typed against SessionStorage work unchanged | recent_summaries(path, limit) reads a page of metadata read-only for the dashboard
+  Performance: get O(log n); list O(page) via the created/status/expires indexes; compact is one DELETE plus a sweep of unreferenced bodies; reconcile touches only unfinished rows
+  Errors: lock waits are bounded by the busy timeout and surface as TimeoutError like the JSONL lock; an updater that raises rolls the transaction back
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from ....project import project_co_dir
+from .storage import BODY_REF, Session, SessionStorage
+
+# Same bound as the JSONL lock's backstop: long enough for another worker's
+# short commit, short enough that a wedged one fails the request, not the host.
+SQLITE_BUSY_TIMEOUT_SECONDS = 30.0
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS sessions ("
+    "session_id TEXT PRIMARY KEY, status TEXT NOT NULL, created REAL"
+    ", expires REAL, record TEXT NOT NULL"
+    ") WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS sessions_status ON sessions(status)",
+    "CREATE INDEX IF NOT EXISTS sessions_created ON sessions(created)",
+    "CREATE INDEX IF NOT EXISTS sessions_expires ON sessions(expires)",
+    "CREATE TABLE IF NOT EXISTS bodies ("
+    "digest TEXT PRIMARY KEY, body TEXT NOT NULL"
+    ") WITHOUT ROWID",
+)
+
+# Under SQLite's default bound on host parameters.
+_IN_CHUNK = 500
+
+# What list() and get() may return: running is exempt from TTL, see storage.py.
+_VISIBLE = "(status = 'running' OR expires IS NULL OR expires > ?)"
+
+
+class SQLiteSessionStorage(SessionStorage):
+    """SQLite storage. One row per session, newest write wins."""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else project_co_dir() / "sessions.sqlite3"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_state = threading.local()
+        self._local = threading.local()
+        try:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                for statement in _SCHEMA:
+                    db.execute(statement)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        except sqlite3.OperationalError as exc:
+            raise TimeoutError(f"could not open session storage: {self.path}") from exc
+
+    def _db(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use.
+
+        A connection per thread rather than one shared: sqlite3 connections are
+        not safe to share mid-transaction, and atomic_update holds one open
+        across the caller's updater.
+        """
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT_SECONDS,
+                                 isolation_level=None, check_same_thread=False)
+            db.execute(f"PRAGMA busy_timeout = {int(SQLITE_BUSY_TIMEOUT_SECONDS * 1000)}")
+            db.execute("PRAGMA journal_mode = WAL")
+            db.execute("PRAGMA synchronous = NORMAL")
+            self._local.db = db
+        return db
+
+    # -- the lock: a write transaction instead of a flock -------------------
+
+    def _acquire_lock(self, *, wait: bool = True) -> bool:
+        depth = getattr(self._lock_state, "depth", 0)
+        if depth:
+            self._lock_state.depth = depth + 1
+            return True
+        db = self._db()
+        try:
+            if not wait:
+                db.execute("PRAGMA busy_timeout = 0")
+            try:
+                db.execute("BEGIN IMMEDIATE")
+            finally:
+                if not wait:
+                    db.execute(f"PRAGMA busy_timeout = {int(SQLITE_BUSY_TIMEOUT_SECONDS * 1000)}")
+        except sqlite3.OperationalError:
+            return False
+        self._lock_state.depth = 1
+        return True
+
+    def _release_lock(self, *, commit: bool = True) -> None:
+        depth = getattr(self._lock_state, "depth", 0)
+        if depth <= 0:
+            raise RuntimeError("session storage lock is not held")
+        if depth > 1:
+            self._lock_state.depth = depth - 1
+            return
+        del self._lock_state.depth
+        self._db().execute("COMMIT" if commit else "ROLLBACK")
+
+    def _write(self, body: Callable[[], object]):
+        """Run body inside the write transaction, rolling back if it raises."""
+        if not self._acquire_lock():
+            raise TimeoutError("could not acquire session storage lock")
+        try:
+            result = body()
+        except BaseException:
+            self._release_lock(commit=False)
+            raise
+        self._release_lock()
+        return result
+
+    # -- the SessionStorage contract -----------------------------------------
+
+    def _put_bodies(self, bodies: dict) -> None:
+        self._db().executemany(
+            "INSERT OR IGNORE INTO bodies (digest, body) VALUES (?, ?)",
+            bodies.items(),
+        )
+
+    def _get_bodies(self, digests: set) -> dict:
+        wanted = list(digests)
+        found = {}
+        for i in range(0, len(wanted), _IN_CHUNK):
+            chunk = wanted[i:i + _IN_CHUNK]
+            marks = ", ".join("?" for _ in chunk)
+            found.update(self._db().execute(
+                f"SELECT digest, body FROM bodies WHERE digest IN ({marks})", chunk
+            ).fetchall())
+        if len(found) != len(wanted):
+            raise KeyError("session body missing")
+        return found
+
+    def _append_locked(self, session: Session, *, replace: bool = True) -> int:
+        line, bodies = self._record_line(session)
+        if bodies:
+            self._put_bodies(bodies)
+        conflict = (" ON CONFLICT(session_id) DO UPDATE SET status = excluded.status,"
+                    " created = excluded.created, expires = excluded.expires,"
+                    " record = excluded.record") if replace else " ON CONFLICT DO NOTHING"
+        return self._db().execute(
+            "INSERT INTO sessions (session_id, status, created, expires, record)"
+            " VALUES (?, ?, ?, ?, ?)" + conflict,
+            (session.session_id, session.status, session.created,
+             session.expires, line),
+        ).rowcount
+
+    def _load(self, raw: str) -> Session | None:
+        try:
+            return self._hydrate(json.loads(raw))
+        except Exception:
+            return None       # one unreadable row, not an unreadable store
+
+    def save(self, session: Session):
+        self._write(lambda: self._append_locked(session))
+
+    def atomic_update(
+        self,
+        session_id: str,
+        updater: Callable[[Session | None], Session],
+    ) -> Session:
+        """Read latest, prepare a replacement, and write it in one transaction.
+
+        Same contract as the JSONL store: the updater gets a detached record,
+        raising leaves storage unchanged, and changing the session id is refused.
+        """
+        def update() -> Session:
+            current = self.get(session_id)
+            if current is not None:
+                current = current.model_copy(deep=True)
+            replacement = updater(current)
+            if not isinstance(replacement, Session):
+                raise TypeError("session storage updater must return Session")
+            if replacement.session_id != session_id:
+                raise ValueError("session storage updater changed session id")
+            if current is None or replacement != current:
+                self._append_locked(replacement)
+            return replacement.model_copy(deep=True)
+
+        return self._write(update)
+
+    def get(self, session_id: str) -> Session | None:
+        row = self._db().execute(
+            "SELECT record FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        session = self._load(row[0]) if row else None
+        if session is None:
+            return None
+        if session.status == "running" or not session.expires or session.expires > time.time():
+            return session
+        return None  # Expired
+
+    def list(self, limit: int | None = None, status: str | None = None) -> list[Session]:
+        """Visible sessions, newest first -- one indexed page, not the history."""
+        sql = f"SELECT record FROM sessions WHERE {_VISIBLE}"
+        params: list = [time.time()]
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += " ORDER BY created DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        rows = self._db().execute(sql, params).fetchall()
+        return [s for s in (self._load(r[0]) for r in rows) if s is not None]
+
+    def _records(self) -> list:
+        rows = self._db().execute(
+            "SELECT record FROM sessions ORDER BY created"
+        ).fetchall()
+        return [s for s in (self._load(r[0]) for r in rows) if s is not None]
+
+    def compact(self) -> None:
+        """Drop sessions past their TTL that are not running.
+
+        There are no superseded records to drop -- a save replaces its row -- so
+        this is only the TTL half of the JSONL compaction. Skipped, like there,
+        when another writer holds the lock.
+        """
+        if not self._acquire_lock(wait=False):
+            return
+        try:
+            db = self._db()
+            db.execute(
+                "DELETE FROM sessions WHERE status != 'running'"
+                " AND expires IS NOT NULL AND expires <= ?",
+                (time.time(),),
+            )
+            # Bodies only the deleted or superseded records named.
+            db.execute("CREATE TEMP TABLE IF NOT EXISTS kept_bodies"
+                       " (digest TEXT PRIMARY KEY) WITHOUT ROWID")
+            db.execute("DELETE FROM kept_bodies")
+            for (raw,) in db.execute("SELECT record FROM sessions").fetchall():
+                db.executemany("INSERT OR IGNORE INTO kept_bodies VALUES (?)",
+                               ((d,) for d in _body_refs(raw)))
+            db.execute("DELETE FROM bodies WHERE digest NOT IN"
+                       " (SELECT digest FROM kept_bodies)")
+            db.execute("DELETE FROM kept_bodies")
+        except BaseException:
+            self._release_lock(commit=False)
+            raise
+        self._release_lock()
+
+    def reconcile_interrupted(self):
+        """Close out unfinished sessions; see SessionStorage.reconcile_interrupted."""
+        marks = ", ".join("?" for _ in self.UNFINISHED)
+
+        def reconcile() -> None:
+            rows = self._db().execute(
+                f"SELECT record FROM sessions WHERE status IN ({marks})",
+                self.UNFINISHED,
+            ).fetchall()
+            for (raw,) in rows:
+                session = self._load(raw)
+                if session is not None:
+                    session.status = "interrupted"
+                    self._append_locked(session)
+
+        self._write(reconcile)
+
+    def migrate_jsonl(self, jsonl_path) -> int:
+        """Import the newest record of each session from a JSONL store, once.
+
+        Rows already here win: they were written after the switch, so they are
+        newer than anything in the old file. The file is renamed afterwards so a
+        restart does not import it again and nothing keeps appending to it
+        unseen. Returns how many sessions were imported.
+        """
+        jsonl_path = Path(jsonl_path)
+        if not jsonl_path.is_file():
+            return 0
+        old = SessionStorage(jsonl_path)
+
+        def migrate() -> int:
+            imported = 0
+            for session in old._latest_by_id().values():
+                imported += self._append_locked(session, replace=False)
+            return imported
+
+        imported = self._write(migrate)
+        for done in (jsonl_path, old._bodies_path):
+            try:
+                done.replace(done.with_name(done.name + ".migrated"))
+            except FileNotFoundError:
+                pass      # another worker migrated it first; existing rows won
+
+        return imported
+
+
+def recent_summaries(path, limit: int) -> list[dict]:
+    """The newest visible sessions at `path` as stored, without their bodies.
+
+    For pages that only list sessions (Home's Recent rows). A read-only
+    connection, closed before returning: constructing a SQLiteSessionStorage
+    would run the schema under BEGIN IMMEDIATE -- a write lock against the
+    live host -- keep a thread-local connection open for good, and hydrate
+    every message and trace body just to show a prompt and a status.
+    """
+    try:
+        db = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True,
+                             timeout=SQLITE_BUSY_TIMEOUT_SECONDS)
+    except sqlite3.OperationalError:
+        return []
+    try:
+        rows = db.execute(
+            f"SELECT record FROM sessions WHERE {_VISIBLE} ORDER BY created DESC LIMIT ?",
+            (time.time(), int(limit)),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return []         # no sessions table yet: nothing has been saved
+    finally:
+        db.close()
+    summaries = []
+    for (raw,) in rows:
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            continue
+        if isinstance(record, dict):
+            record.pop("session", None)
+            summaries.append(record)
+    return summaries
+
+
+def _body_refs(raw: str) -> list:
+    """Every body digest a stored record names."""
+    try:
+        inner = json.loads(raw).get("session") or {}
+    except (ValueError, AttributeError):
+        return []
+    return [d for key in SessionStorage.BODY_KEYS
+            if isinstance(inner.get(key), dict)
+            for d in inner[key].get(BODY_REF, [])]
@@ -2,13 +2,14 @@
 Purpose: Persistent session storage for hosted agent requests with TTL expiry
 LLM-Note:
   Dependencies: imports from [pydantic, pathlib, json, os, threading, time] | imported by [host/http_router.py, host/server.py, host/ws_router/, host/session/] | tested by [test_session_storage.py, test_host_session_mode.py]
-  Data flow: save() appends under the file lock | atomic_update() locks, reads detached latest, validates replacement, and appends if changed | get() reads newest matching valid line | compact() replaces under the same lock
-  State/Effects: append-only JSONL plus sibling lock file; thread-local depth permits same-thread nested operations while OS locks serialize threads/processes
+  Data flow: save() appends under the file lock, writing new message/trace entries once to the sibling *.bodies.jsonl and referencing them by digest | atomic_update() locks, reads detached latest, validates replacement, and appends if changed | get() reads newest matching valid line | compact() replaces under the same lock
+  State/Effects: append-only JSONL plus sibling content-addressed bodies file and lock file; thread-local depth permits same-thread nested operations while OS locks serialize threads/processes
   Integration: atomic_update is the durable boundary shared by prompt claims and Host policy transactions
-  Performance: append O(1); reverse get usually finds recent state near EOF; list/compaction scan the file
+  Performance: append O(1); reverse get usually finds recent state near EOF; list/compaction scan the file -- sqlite_storage.SQLiteSessionStorage is the indexed alternative (host.yaml `session_store: sqlite`)
   Errors: missing/expired returns None; torn records are skipped; lock timeout and invalid updater fail closed without an unlocked append
 """
 
+import hashlib
 import json
 import os
 import threading
@@ -49,6 +50,23 @@ def session_owner(record) -> str | None:
     return requester.get("address")
 
 
+# Marks a list in a stored record whose entries live in the bodies file.
+BODY_REF = "$bodies"
+
+
+def _body_digest(raw: str) -> str:
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _body_line(digest: str, raw: str) -> str:
+    # Fixed shape, so the index can read the digest without parsing the body.
+    return f'{{"digest":"{digest}","body":{raw}}}'
+
+
+_BODY_PREFIX = len('{"digest":"')
+_DIGEST_LEN = 32
+
+
 def _exclusive(path: Path, wait: bool = True, attempts: int = 3000,
                pause: float = 0.01):
     """Hold this file against other writers.
@@ -110,6 +128,27 @@ def _release(handle) -> None:
         handle.close()
 
 
+def open_session_storage(co_dir: Path, backend: str | None = None) -> "SessionStorage":
+    """The session store host.yaml asks for: `session_store: jsonl | sqlite`.
+
+    JSONL stays the default -- it is what every existing agent has on disk and
+    what a person can read with `tail`. SQLite answers list() and get() from
+    indexes, so a long-lived host pays for a page rather than its whole history;
+    switching imports the JSONL once (see SQLiteSessionStorage.migrate_jsonl).
+    """
+    jsonl = Path(co_dir) / "session_results.jsonl"
+    backend = (backend or "jsonl").lower()
+    if backend == "jsonl":
+        return SessionStorage(jsonl)
+    if backend == "sqlite":
+        from .sqlite_storage import SQLiteSessionStorage
+
+        storage = SQLiteSessionStorage(Path(co_dir) / "sessions.sqlite3")
+        storage.migrate_jsonl(jsonl)
+        return storage
+    raise ValueError(f"unknown session_store {backend!r}: use 'jsonl' or 'sqlite'")
+
+
 class SessionStorage:
     """JSONL file storage. Append-only, last entry wins."""
 
@@ -124,11 +163,130 @@ class SessionStorage:
         self.path = Path(path) if path else project_co_dir() / "session_results.jsonl"
         self.path.parent.mkdir(exist_ok=True)
         self._lock_state = threading.local()
+        self._body_guard = threading.Lock()
+        self._reset_body_index()
 
     @property
     def _lock_path(self) -> Path:
         return self.path.with_suffix(self.path.suffix + ".lock")
 
+    @property
+    def _bodies_path(self) -> Path:
+        return self.path.with_suffix(".bodies" + self.path.suffix)
+
+    # The parts of a session that only ever grow. Every record used to carry
+    # the whole list, so a status change -- a prompt claim, the checkpoint
+    # before an approval -- rewrote the entire conversation: hundreds of KB for
+    # a 200-message session, per change. A record now names each entry by
+    # digest and the entry is written once, so a write costs the record and
+    # whatever is new.
+    BODY_KEYS = ("messages", "trace")
+
+    def _record_line(self, session: Session) -> tuple[str, dict]:
+        """The stored form of a record, and the bodies it refers to."""
+        data = session.model_dump(mode="json")
+        bodies = {}
+        inner = data.get("session")
+        if isinstance(inner, dict):
+            for key in self.BODY_KEYS:
+                entries = inner.get(key)
+                if not isinstance(entries, list):
+                    continue
+                refs = []
+                for entry in entries:
+                    raw = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+                    digest = _body_digest(raw)
+                    bodies[digest] = raw
+                    refs.append(digest)
+                inner[key] = {BODY_REF: refs}
+        return json.dumps(data, ensure_ascii=False), bodies
+
+    def _hydrate(self, data: dict) -> Session:
+        """A stored record with its bodies put back. KeyError if one is lost.
+
+        A record written before bodies were split carries its lists inline and
+        passes through untouched.
+        """
+        inner = data.get("session")
+        if isinstance(inner, dict):
+            refs = {key: inner[key][BODY_REF] for key in self.BODY_KEYS
+                    if isinstance(inner.get(key), dict) and BODY_REF in inner[key]}
+            wanted = {d for r in refs.values() for d in r}
+            if refs:
+                found = self._get_bodies(wanted) if wanted else {}
+                for key, digests in refs.items():
+                    # One parse per list, not per entry.
+                    inner[key] = json.loads("[" + ",".join(found[d] for d in digests) + "]")
+        return Session(**data)
+
+    def _reset_body_index(self) -> None:
+        self._body_index: dict[str, tuple[int, int]] = {}
+        self._body_scanned = 0
+        self._body_inode = None
+
+    def _catch_up_bodies(self) -> None:
+        """Index whatever was appended to the bodies file since last time.
+
+        Other workers append too, so the index follows the file rather than
+        trusting what this process wrote. A replaced file (compaction, here or
+        elsewhere) has a new inode and is indexed again from the start.
+        """
+        try:
+            st = os.stat(self._bodies_path)
+        except FileNotFoundError:
+            self._reset_body_index()
+            return
+        if st.st_ino != self._body_inode or st.st_size < self._body_scanned:
+            self._reset_body_index()
+            self._body_inode = st.st_ino
+        if st.st_size == self._body_scanned:
+            return
+        with open(self._bodies_path, "rb") as f:
+            f.seek(self._body_scanned)
+            block = f.read(st.st_size - self._body_scanned)
+        end = block.rfind(b"\n")
+        if end < 0:
+            return              # half a line so far; its writer is still going
+        pos = self._body_scanned
+        for raw in block[:end].split(b"\n"):
+            digest = raw[_BODY_PREFIX:_BODY_PREFIX + _DIGEST_LEN].decode("ascii", "replace")
+            if raw.startswith(b'{"digest":"') and len(digest) == _DIGEST_LEN:
+                self._body_index.setdefault(digest, (pos, len(raw)))
+            pos += len(raw) + 1
+        self._body_scanned += end + 1
+
+    def _put_bodies(self, bodies: dict) -> None:
+        """Append the bodies not already stored. Called under the storage lock."""
+        with self._body_guard:
+            self._catch_up_bodies()
+            missing = [d for d in bodies if d not in self._body_index]
+            if not missing:
+                return
+            with open(self._bodies_path, "a", encoding="utf-8") as f:
+                for digest in missing:
+                    f.write(_body_line(digest, bodies[digest]) + "\n")
+            self._catch_up_bodies()
+
+    def _get_bodies(self, digests: set) -> dict:
+        """The raw JSON of each body, by digest. KeyError if one is missing."""
+        with self._body_guard:
+            for attempt in (0, 1):
+                self._catch_up_bodies()
+                found = {}
+                with open(self._bodies_path, "rb") as f:
+                    for digest in digests:
+                        offset, length = self._body_index[digest]
+                        f.seek(offset)
+                        line = f.read(length).decode("utf-8")
+                        head = _body_line(digest, "")[:-1]
+                        if not (line.startswith(head) and line.endswith("}")):
+                            break       # the file moved under an offset
+                        found[digest] = line[len(head):-1]
+                if len(found) == len(digests):
+                    return found
+                self._reset_body_index()
+            raise KeyError("session body index is stale")
+
     def save(self, session: Session):
         # Excludes compact(), which replaces this file wholesale.
         if not self._acquire_lock():
@@ -168,8 +326,13 @@ class SessionStorage:
             self._release_lock()
 
     def _append_locked(self, session: Session) -> None:
+        # Bodies first: a crash between the two leaves an unreferenced body,
+        # never a record pointing at nothing.
+        line, bodies = self._record_line(session)
+        if bodies:
+            self._put_bodies(bodies)
         with open(self.path, "a", encoding="utf-8") as f:
-            f.write(session.model_dump_json() + "\n")
+            f.write(line + "\n")
 
     def _acquire_lock(self, *, wait: bool = True) -> bool:
         """Acquire this storage lock, reusing it only in the owning thread."""
@@ -218,7 +381,7 @@ class SessionStorage:
                 if not line:
                     continue
                 try:
-                    out.append(Session(**json.loads(line)))
+                    out.append(self._hydrate(json.loads(line)))
                 except Exception:
                     continue      # one unreadable record, not an unreadable file
         return out
@@ -264,9 +427,9 @@ class SessionStorage:
             if not isinstance(data, dict) or data.get("session_id") != session_id:
                 continue
             try:
-                session = Session(**data)
+                session = self._hydrate(data)
             except Exception:
-                continue
+                continue          # torn, or its bodies are gone
             if session.status == "running" or not session.expires or session.expires > now:
                 return session
             return None  # Expired
@@ -314,9 +477,19 @@ class SessionStorage:
                 if s.status == "running" or not s.expires or s.expires > now]
 
         tmp = self.path.with_suffix(f"{self.path.suffix}.compact.{os.getpid()}")
+        bodies = {}
         with open(tmp, "w", encoding="utf-8") as f:
             for session in sorted(keep, key=lambda s: s.created or 0):
-                f.write(session.model_dump_json() + "\n")
+                line, used = self._record_line(session)
+                bodies.update(used)
+                f.write(line + "\n")
+        # Only the bodies a kept record still names; the rest belonged to
+        # superseded or expired records and nothing can reach them.
+        tmp_bodies = self._bodies_path.with_suffix(
+            f"{self._bodies_path.suffix}.compact.{os.getpid()}")
+        with open(tmp_bodies, "w", encoding="utf-8") as f:
+            for digest, raw in bodies.items():
+                f.write(_body_line(digest, raw) + "\n")
 
         # Someone appended while we were reading and writing, and their record
         # is only in the file we are about to replace. A lost session record is
@@ -340,9 +513,15 @@ class SessionStorage:
             unchanged = False
         if not unchanged:
             tmp.unlink(missing_ok=True)
+            tmp_bodies.unlink(missing_ok=True)
             return
 
+        # Bodies before records: until the records move, the old ones may name
+        # a body that is gone, but only records no reader returns do.
+        tmp_bodies.replace(self._bodies_path)
         tmp.replace(self.path)
+        with self._body_guard:
+            self._reset_body_index()
 
     def reconcile_interrupted(self):
         """Close out sessions this process cannot possibly finish.
@@ -380,12 +559,14 @@ class SessionStorage:
         """The newest record for each session, whatever its status or age."""
         return {s.session_id: s for s in self._records()}
 
-    def list(self) -> list[Session]:
+    def list(self, limit: int | None = None, status: str | None = None) -> list[Session]:
         now = time.time()
         sessions = self._latest_by_id()
         valid = [s for s in sessions.values()
-                 if s.status == "running" or not s.expires or s.expires > now]
-        return sorted(valid, key=lambda s: s.created or 0, reverse=True)
+                 if (s.status == "running" or not s.expires or s.expires > now)
+                 and (status is None or s.status == status)]
+        valid.sort(key=lambda s: s.created or 0, reverse=True)
+        return valid if limit is None else valid[:limit]
 
     def checkpoint(self, session: dict) -> None:
         """Save session checkpoint before blocking operation (approval, ask_user)."""
@@ -490,6 +490,14 @@ def recent_runs(limit=MAX_ACTIVITY_ROWS):
     is also the one seen first.
     """
     import json as _json
+
+    # An agent on `session_store: sqlite` has no JSONL to tail; its store
+    # answers the page from the created index, read-only and without bodies.
+    db = _co() / "sessions.sqlite3"
+    if db.is_file():
+        from ..session.sqlite_storage import recent_summaries
+        return recent_summaries(db, limit)
+
     path = _co() / "session_results.jsonl"
     if not path.is_file():
         return []
@@ -4,7 +4,7 @@ LLM-Note:
   Dependencies: imports from [network/io/base.IO, asyncio, threading, time, uuid] | imported by [network/host/ws_router/agent_io.py] | tested by [tests/unit/test_io.py, tests/unit/test_io_image_support.py]
   Data flow: agent calls io.send(event) → auto-stamps id (UUID) and ts if missing → enqueues for async forwarder | Agent._record_trace() calls internal _send_persisted_trace(event) → queues a private dict subtype as Host-local provenance | client message → enqueued for agent | read_msgs_from_agent() async-iterates outgoing for forwarding to client | send_to_agent() pushes incoming messages to agent
   State/Effects: maintains incoming + outgoing channels (async-safe) | finished flag prevents sends after close | unblocks agent's blocking receive on close
-  Integration: exposes WebSocketIO() implementing IO interface | send/receive for agent-side, internal persisted-trace provenance queried by Host forwarder, read_msgs_from_agent/send_to_agent for transport-side, push_runtime_input/pop_runtime_inputs/finish_runtime_inputs for lossless mid-execution interjection, rewind_to(last_msg_id) for replay on reconnect, mark_agent_done() to terminate
+  Integration: exposes WebSocketIO() implementing IO interface | send/receive for agent-side, internal persisted-trace provenance queried by Host forwarder, read_msgs_from_agent/send_to_agent for transport-side, push_runtime_input/pop_runtime_inputs/finish_runtime_inputs for lossless mid-execution interjection, watch_mailbox(event) so run_interruptible() wakes on new client mail instead of polling, rewind_to(last_msg_id) for replay on reconnect, mark_agent_done() to terminate
   Performance: queue-based coordination between sync agent thread and async transport | blocking receive() is intended for agent thread | _wait_for_msgs_from_agent waits at most ~1s so idle-session forwarders don't pin executor-pool threads
   Errors: closed IO unblocks pending receive() so agent thread doesn't hang | no exceptions raised — channel coordination handled internally
 """
@@ -14,7 +14,7 @@ import threading
 import time
 import uuid
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
 from .base import IO
 
@@ -81,6 +81,8 @@ class WebSocketIO(IO):
         # ── Client messages (client→agent) ──
         self._msgs_from_client: list[Dict[str, Any]] = []
         self._client_condition = threading.Condition()
+        # Events set on every new client message (see watch_mailbox).
+        self._mailbox_watchers: set[threading.Event] = set()
 
         # ── Runtime input (client→agent, separate from receive()) ──
         self._runtime_inputs: list[Dict[str, Any]] = []
@@ -200,6 +202,25 @@ class WebSocketIO(IO):
             ]
             return matched
 
+    def watch_mailbox(self, wakeup: threading.Event) -> Callable[[], None]:
+        """Set ``wakeup`` whenever a client message arrives; return the unsubscriber.
+
+        run_interruptible() waits on this instead of polling for INTERRUPT.
+        """
+        with self._client_condition:
+            self._mailbox_watchers.add(wakeup)
+
+        def stop() -> None:
+            with self._client_condition:
+                self._mailbox_watchers.discard(wakeup)
+
+        return stop
+
+    def _wake_watchers(self) -> None:
+        # Caller holds _client_condition.
+        for wakeup in self._mailbox_watchers:
+            wakeup.set()
+
     def take_interrupt(self, on_interrupt=None) -> bool:
         """Drain one interrupt and revoke its worker lease under the same lock."""
         with self._client_condition:
@@ -359,6 +380,7 @@ class WebSocketIO(IO):
         with self._client_condition:
             self._msgs_from_client.append(msg)
             self._client_condition.notify_all()
+            self._wake_watchers()
 
     def request_interrupt(self) -> bool:
         """Deliver at most one interrupt for this turn's IO generation."""
@@ -369,6 +391,7 @@ class WebSocketIO(IO):
             self._interrupt_requested = True
             self._msgs_from_client.append({"type": "INTERRUPT"})
             self._client_condition.notify_all()
+            self._wake_watchers()
             return True
 
     def register_permission_request(
@@ -403,6 +426,7 @@ class WebSocketIO(IO):
                 self._normalized_legacy_permission(response)
             )
             self._client_condition.notify_all()
+            self._wake_watchers()
             return True
 
     @staticmethod
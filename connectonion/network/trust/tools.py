@@ -5,7 +5,7 @@ LLM-Note:
   Data flow: Fast rules call is_whitelisted/is_blocked/is_contact directly → returns bool for instant decisions | Trust agents call check_whitelist/check_blocklist/get_level → returns strings for LLM interpretation
   State/Effects: Reads/writes ~/.co/{whitelist,blocklist,contacts}.txt files | Supports wildcard patterns with * | promote_*/demote_*/block/unblock modify list files
   Integration: exposes fast rule helpers (is_*), trust agent tools (check_*, get_level), state modifiers (promote_*, demote_*, block, unblock) | Used by factory.py and fast_rules.py
-  Performance: Simple file I/O | No network calls | O(n) list lookup
+  Performance: TrustListIndex per list file: one stat per lookup, reparse only on change | exact entries O(1) set, `prefix*` entries O(distinct prefix lengths), other wildcards one compiled alternation | No network calls
 
 Trust Levels (stored in ~/.co/):
   - stranger: Not in any list (default for unknown clients)
@@ -15,6 +15,7 @@ Trust Levels (stored in ~/.co/):
 """
 
 import re
+import threading
 from pathlib import Path
 from typing import List, Callable
 
@@ -81,11 +82,19 @@ def _check_list(list_name: str, agent_id: str, co_dir: Path = None) -> bool:
     Comparison folds case. Addresses are generated lowercase (address.py:64),
     but an admin pastes what a UI showed them, and `block("0xABCDEF…")` that
     silently blocks nobody is worse than one that errors — it reported success.
+
+    Answered from a TrustListIndex, which rereads the file only when it changes.
     """
     list_path = list_file(list_name, co_dir)
-    if not list_path.exists():
+    index = _index_for(list_path)
+    found = index.contains(agent_id)
+    if found is None:
         _mention_a_legacy_list(list_name, co_dir)
         return False
+    return found
+
+
+def _read_list(list_path: Path) -> str:
     # An unreadable file is not an empty file.
     #
     # This used to be `except Exception: return False`, which is the safe
@@ -95,10 +104,10 @@ def _check_list(list_name: str, agent_id: str, co_dir: Path = None) -> bool:
     # swallow, safe one way and dangerous the other, which is why it lasted —
     # the direction that matters is the one nobody tests.
     #
-    # Absent is an answer, and still returns False above. Unreadable is a
-    # question this agent cannot answer, so it says which file and stops.
+    # Absent is an answer, and still returns False in _check_list. Unreadable
+    # is a question this agent cannot answer, so it says which file and stops.
     try:
-        content = list_path.read_text(encoding='utf-8')
+        return list_path.read_text(encoding='utf-8')
     except OSError as exc:
         raise OSError(f"cannot read {list_path}: {exc}") from exc
     except UnicodeDecodeError as exc:
@@ -108,14 +117,80 @@ def _check_list(list_name: str, agent_id: str, co_dir: Path = None) -> bool:
             f"local code page; re-save it as UTF-8"
         ) from None
 
-    agent_id = agent_id.strip().lower()
-    for line in content.strip().split('\n'):
-        line = line.strip()
-        if not line or line.startswith('#'):
-            continue
-        if _matches(agent_id, line.lower()):
+
+class TrustListIndex:
+    """One list file, parsed once and reparsed when the file changes.
+
+    `evaluate_request` asks several of these per request, and each used to read
+    the file and compile a regex per line: a 10k-line blocklist was 10k
+    compiles for every caller. Now exact lines are a set, `prefix*` lines are
+    sets keyed by prefix length, and whatever else has a `*` is one compiled
+    alternation. Same matching rules as `_matches`.
+
+    Freshness is (mtime, size, inode) from one stat per lookup, so an admin's
+    hand edit or another worker's promote is seen on the next request. Writes
+    through this module also invalidate directly.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._stamp = None
+        self._exact: set = set()
+        self._prefixes: dict[int, set] = {}
+        self._pattern = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._stamp = None
+
+    def contains(self, agent_id: str) -> bool | None:
+        """Whether agent_id matches a line; None when the file does not exist."""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        with self._lock:
+            if stamp != self._stamp:
+                self._load(_read_list(self.path))
+                self._stamp = stamp
+            exact, prefixes, pattern = self._exact, self._prefixes, self._pattern
+
+        agent_id = agent_id.strip().lower()
+        if agent_id in exact:
+            return True
+        if any(agent_id[:n] in heads for n, heads in prefixes.items()):
             return True
-    return False
+        return pattern is not None and pattern.fullmatch(agent_id) is not None
+
+    def _load(self, content: str) -> None:
+        exact, prefixes, others = set(), {}, []
+        for line in content.strip().split('\n'):
+            line = line.strip().lower()
+            if not line or line.startswith('#'):
+                continue
+            if '*' not in line:
+                exact.add(line)
+            elif line.index('*') == len(line) - 1:
+                head = line[:-1]
+                prefixes.setdefault(len(head), set()).add(head)
+            else:
+                others.append(_pattern_expr(line))
+        self._exact, self._prefixes = exact, prefixes
+        self._pattern = re.compile("|".join(f"(?:{o})" for o in others)) if others else None
+
+
+_indexes: dict = {}
+_indexes_lock = threading.Lock()
+
+
+def _index_for(list_path: Path) -> TrustListIndex:
+    with _indexes_lock:
+        index = _indexes.get(list_path)
+        if index is None:
+            index = _indexes[list_path] = TrustListIndex(list_path)
+        return index
 
 
 def _matches(agent_id: str, pattern: str) -> bool:
@@ -128,8 +203,11 @@ def _matches(agent_id: str, pattern: str) -> bool:
     never wrote down. Escaping everything but `*` keeps the vocabulary exactly
     as documented.
     """
-    expr = ".*".join(re.escape(part) for part in pattern.split("*"))
-    return re.fullmatch(expr, agent_id) is not None
+    return re.fullmatch(_pattern_expr(pattern), agent_id) is not None
+
+
+def _pattern_expr(pattern: str) -> str:
+    return ".*".join(re.escape(part) for part in pattern.split("*"))
 
 
 def check_whitelist(agent_id: str) -> str:
@@ -213,6 +291,7 @@ def _add_to_list(list_name: str, client_id: str, co_dir: Path = None) -> bool:
     # Append to file
     with open(list_path, 'a', encoding='utf-8') as f:
         f.write(f"{client_id}\n")
+    _index_for(list_path).invalidate()
     return True
 
 
@@ -226,6 +305,7 @@ def _remove_from_list(list_name: str, client_id: str, co_dir: Path = None) -> bo
     lines = [line for line in content.strip().split('\n')
              if line.strip() and line.strip() != client_id]
     list_path.write_text('\n'.join(lines) + '\n' if lines else '', encoding='utf-8')
+    _index_for(list_path).invalidate()
     return True
 
 
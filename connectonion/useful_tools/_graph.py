@@ -0,0 +1,110 @@
+"""
+Purpose: The pooled HTTP client and $batch runner the Microsoft Graph tools share
+LLM-Note:
+  Dependencies: imports from [os, threading, time, httpx] | imported by [useful_tools/outlook.py, useful_tools/microsoft_calendar.py] | tested by [tests/unit/test_outlook_graph_transport.py]
+  Data flow: Outlook._request / MicrosoftCalendar._request → graph_client().request(...) on one keep-alive connection pool | Outlook._batch(requests) → run_batch(post, requests) splits into BATCH_LIMIT-sized $batch bodies → post(body) (the tool's authenticated _request) → per-part responses matched back by id → parts answered 429/503/504 go again after Retry-After → [{'status', 'headers', 'body'}] in request order
+  State/Effects: one httpx.Client per process, created on first use and dropped in a forked child (a pool's sockets must not be shared across fork)
+  Integration: exposes graph_client(), run_batch(), GraphError, BATCH_LIMIT, BATCH_ATTEMPTS, BATCH_RETRY_DELAY, GRAPH_TIMEOUT
+  Performance: every Graph call after the first reuses a warm TLS connection instead of opening its own | $batch turns N calls into ceil(N / 20) round trips
+  Errors: GraphError (a ValueError, as the tools raised before) carries status_code | a part still throttled after BATCH_ATTEMPTS comes back with its last status for the caller to report
+"""
+
+import os
+import threading
+import time
+
+import httpx
+
+GRAPH_TIMEOUT = 30.0
+# Graph's ceiling on requests in one $batch.
+BATCH_LIMIT = 20
+BATCH_ATTEMPTS = 4
+BATCH_RETRY_DELAY = 0.5
+_RETRY_STATUSES = {429, 503, 504}
+# Longest Retry-After honoured; Graph sometimes asks for minutes.
+_MAX_RETRY_AFTER = 10.0
+
+_client = None
+_client_lock = threading.Lock()
+
+
+class GraphError(ValueError):
+    """A Graph call that did not succeed; status_code says how."""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"Microsoft Graph API error: {status_code} - {text}")
+        self.status_code = status_code
+
+
+def graph_client() -> httpx.Client:
+    """The process-wide Graph client, keeping connections alive between calls."""
+    global _client
+    with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(
+                timeout=GRAPH_TIMEOUT,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return _client
+
+
+def _forget_client():
+    # The child of a fork shares the parent's sockets; a request from each
+    # would interleave bytes on one connection. The child starts its own.
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_client)
+
+
+def run_batch(post, requests: list) -> list:
+    """Send Graph requests through $batch; return their responses in request order.
+
+    `post(body)` sends one $batch body and returns the parsed reply -- the
+    calling tool's authenticated _request, so tokens and refresh stay its
+    business. Each request is a dict with method, url (relative to the
+    version root, e.g. "/me/messages/{id}") and optionally body and headers.
+    Parts Graph throttled or could not serve (429, 503, 504) go again in the
+    next round after the longest Retry-After it asked for.
+    """
+    results = [None] * len(requests)
+    pending = list(range(len(requests)))
+    for attempt in range(BATCH_ATTEMPTS):
+        retry, wait = [], 0.0
+        for start in range(0, len(pending), BATCH_LIMIT):
+            chunk = pending[start:start + BATCH_LIMIT]
+            parts = []
+            for index in chunk:
+                part = {"id": str(index), **requests[index]}
+                if "body" in part:
+                    part["headers"] = {"Content-Type": "application/json", **part.get("headers", {})}
+                parts.append(part)
+            reply = post({"requests": parts})
+            for response in reply.get("responses", []):
+                index = int(response["id"])
+                results[index] = {
+                    "status": response.get("status", 0),
+                    "headers": response.get("headers", {}),
+                    "body": response.get("body"),
+                }
+                if response.get("status") in _RETRY_STATUSES:
+                    retry.append(index)
+                    wait = max(wait, _retry_after(response.get("headers", {}), attempt))
+        if not retry or attempt == BATCH_ATTEMPTS - 1:
+            break
+        time.sleep(wait)
+        pending = sorted(retry)
+    return results
+
+
+def _retry_after(headers: dict, attempt: int) -> float:
+    for name, value in headers.items():
+        if name.lower() == "retry-after":
+            try:
+                return min(float(value), _MAX_RETRY_AFTER)
+            except ValueError:
+                break
+    return BATCH_RETRY_DELAY * (2 ** attempt)
@@ -0,0 +1,171 @@
+"""
+Purpose: Keep initialized coding-agent provider processes warm between tool calls, bounded and idle-expiring
+LLM-Note:
+  Dependencies: imports from [os, threading, time, weakref] | imported by [useful_tools/codex.py] | tested by [tests/unit/test_provider_pool.py, tests/unit/test_codex_tool.py]
+  Data flow: codex() → ProcessPool.acquire(key, create) → the newest idle process parked under key that still reports healthy() (a hit), else create() (a cold start: spawn + initialize) → the call runs its turn → ProcessPool.release(key, process) parks it again when healthy() and under max_uses, otherwise closes it
+  State/Effects: idle processes per key, each with a daemon expiry timer (the same shape as codex.py's open-only thread registry) | counters for hits, cold starts, releases, expiries, evictions and discards | a forked child forgets the parent's idle processes without closing them
+  Integration: exposes ProcessPool (acquire, release, close_expired, close_all, stats) | a pooled process provides close() and healthy(); anything without healthy() is never parked, so test doubles and older clients keep their one-process-per-call lifecycle
+  Performance: a hit skips process spawn and the initialize handshake | at most max_idle processes idle in total, max_idle_per_key under one key; the oldest are closed first
+  Errors: create() errors propagate and nothing is counted as parked | close() errors are swallowed so one stuck process cannot break a release
+"""
+
+import os
+import threading
+import time
+import weakref
+
+
+class ProcessPool:
+    """Idle, initialized provider processes keyed by the configuration they were started for."""
+
+    def __init__(self, *, max_idle: int = 4, max_idle_per_key: int = 2,
+                 idle_ttl: float = 300.0, max_uses: int = 20):
+        self.max_idle = max_idle
+        self.max_idle_per_key = max_idle_per_key
+        self.idle_ttl = idle_ttl
+        # A long-lived server accumulates loaded threads; retire it after a
+        # while rather than let one process carry every conversation.
+        self.max_uses = max_uses
+        self._lock = threading.Lock()
+        self._idle = {}
+        # Uses so far of each checked-out process; weak, so one the caller
+        # closed instead of releasing leaves nothing behind.
+        self._uses = weakref.WeakKeyDictionary()
+        self._stats = {"hits": 0, "cold_starts": 0, "released": 0,
+                       "expired": 0, "evicted": 0, "discarded": 0}
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._forget)
+
+    def acquire(self, key, create):
+        """A warm process for `key`, or create() when none is idle and healthy."""
+        self.close_expired()
+        while True:
+            with self._lock:
+                records = self._idle.get(key)
+                record = records.pop() if records else None
+                if records == []:
+                    del self._idle[key]
+            if record is None:
+                break
+            record["timer"].cancel()
+            if _healthy(record["process"]):
+                with self._lock:
+                    self._stats["hits"] += 1
+                    self._uses[record["process"]] = record["uses"]
+                return record["process"]
+            self._count("discarded")
+            _close(record["process"])
+        self._count("cold_starts")
+        return create()
+
+    def release(self, key, process) -> bool:
+        """Park `process` for the next call with `key`; close it instead if it cannot be reused."""
+        with self._lock:
+            uses = self._uses.pop(process, 0) + 1
+        if uses >= self.max_uses or not _healthy(process):
+            self._count("discarded")
+            _close(process)
+            return False
+        timer = threading.Timer(self.idle_ttl, self._expire, (key, process))
+        timer.daemon = True
+        record = {"process": process, "uses": uses, "idle_since": time.monotonic(), "timer": timer}
+        with self._lock:
+            self._stats["released"] += 1
+            self._idle.setdefault(key, []).append(record)
+            evicted = self._over_limit(key)
+        for old in evicted:
+            old["timer"].cancel()
+            _close(old["process"])
+        parked = all(old is not record for old in evicted)
+        if parked:
+            timer.start()
+        return parked
+
+    def close_expired(self, now=None) -> None:
+        """Close processes idle for idle_ttl or longer."""
+        now = time.monotonic() if now is None else now
+        expired = []
+        with self._lock:
+            for key in list(self._idle):
+                keep = []
+                for record in self._idle[key]:
+                    (expired if now - record["idle_since"] >= self.idle_ttl else keep).append(record)
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+            self._stats["expired"] += len(expired)
+        for record in expired:
+            record["timer"].cancel()
+            _close(record["process"])
+
+    def close_all(self) -> None:
+        """Close every idle process (at exit, and between tests)."""
+        with self._lock:
+            records = [record for records in self._idle.values() for record in records]
+            self._idle.clear()
+            self._uses.clear()
+        for record in records:
+            record["timer"].cancel()
+            _close(record["process"])
+
+    def stats(self) -> dict:
+        """Hits against cold starts, plus what was parked, expired, evicted or discarded."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle"] = sum(len(records) for records in self._idle.values())
+        return stats
+
+    def _expire(self, key, process):
+        with self._lock:
+            records = self._idle.get(key, [])
+            record = next((r for r in records if r["process"] is process), None)
+            if record is None:
+                return
+            records.remove(record)
+            if not records:
+                del self._idle[key]
+            self._stats["expired"] += 1
+        _close(process)
+
+    def _over_limit(self, key) -> list:
+        """Pop the oldest idle records past the per-key and total bounds. Caller holds the lock."""
+        evicted = []
+        records = self._idle[key]
+        while len(records) > self.max_idle_per_key:
+            evicted.append(records.pop(0))
+        while sum(len(r) for r in self._idle.values()) > self.max_idle:
+            oldest_key = min(self._idle, key=lambda k: self._idle[k][0]["idle_since"])
+            evicted.append(self._idle[oldest_key].pop(0))
+            if not self._idle[oldest_key]:
+                del self._idle[oldest_key]
+        self._stats["evicted"] += len(evicted)
+        return evicted
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _forget(self):
+        # The child of a fork inherited the parent's pipes to these processes,
+        # not the processes; closing them here would kill the parent's.
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._uses = weakref.WeakKeyDictionary()
+
+
+def _healthy(process) -> bool:
+    check = getattr(process, "healthy", None)
+    if not callable(check):
+        return False
+    try:
+        return bool(check())
+    except Exception:
+        return False
+
+
+def _close(process) -> None:
+    try:
+        process.close()
+    except Exception:
+        pass
@@ -1,11 +1,11 @@
 """
 Purpose: Run Codex via its native app-server protocol, stream steps and permission requests to the frontend, and resume sessions
 LLM-Note:
-  Dependencies: imports from [atexit, json, os, shutil, subprocess, threading, time] | imported by [useful_tools/__init__.py] | tested by [tests/unit/test_codex_tool.py, tests/e2e/real_api/test_real_codex.py]
+  Dependencies: imports from [atexit, json, os, shutil, subprocess, threading, time, ._provider_pool] | imported by [useful_tools/__init__.py] | tested by [tests/unit/test_codex_tool.py, tests/unit/test_provider_pool.py, tests/e2e/real_api/test_real_codex.py]
   Data flow: codex(prompt, session_id, cwd, sandbox, model, timeout, approval, agent) → spawns `codex app-server` → CodexAppServer speaks newline-delimited JSON-RPC 2.0 → initialize/initialized → thread/start or thread/resume with the requested policy reapplied → turn/start → item/started+item/completed notifications converted to OIP-aligned frontend events via agent.io.log; a completed native imageView becomes a bounded PNG/JPEG provider_artifact only when it stays inside cwd → method-specific approval responses are answered by the approval gate → waits for turn/completed → returns JSON envelope: str
-  State/Effects: spawns `codex app-server` subprocess | reader thread parses stdout | open-only threads remain in a process-local registry for at most 15 minutes (maximum 8) until their first turn persists the rollout | streams live events to agent.io using the tool_call/tool_result/approval_needed events that @connectonion/react already renders (NO frontend changes) | Codex persists threads under ~/.codex; file writes depend on sandbox + granted approvals
-  Integration: exposes codex(...) and CodexAppServer | this is the native adapter: ConnectOnion's Python client drives Codex app-server directly | lifecycle revisions/cache are owned by plugins/coding_agents.py and core/provider_events.py | agent injected by tool_executor (hidden from LLM) | codex binary overridable via $CODEX_CMD | session_id resumes via thread/resume; envelope's resumed flag reports it
-  Performance: one process per active call; open-only keeps its initialized process until first follow-up/expiry | streams incrementally | requests + turn wait have timeouts so a hung server can't block forever
+  State/Effects: spawns `codex app-server` subprocess | reader thread parses stdout | open-only threads remain in a process-local registry for at most 15 minutes (maximum 8) until their first turn persists the rollout | streams live events to agent.io using the tool_call/tool_result/approval_needed events that @connectonion/react already renders (NO frontend changes) | Codex persists threads under ~/.codex; file writes depend on sandbox + granted approvals | a call that finished cleanly parks its initialized app-server in _process_pool (ProcessPool keyed by command, cwd, sandbox, model; at most 4 idle, 2 per key, 5 minutes idle, 20 calls per process) instead of closing it
+  Integration: exposes codex(...), CodexAppServer and codex_pool_stats() | this is the native adapter: ConnectOnion's Python client drives Codex app-server directly | lifecycle revisions/cache are owned by plugins/coding_agents.py and core/provider_events.py | agent injected by tool_executor (hidden from LLM) | codex binary overridable via $CODEX_CMD | session_id resumes via thread/resume; envelope's resumed flag reports it
+  Performance: one process per active call; a parked healthy() server skips spawn + initialize for the next call with the same key (codex_pool_stats() counts hits vs cold starts); timed-out, cancelled or failed calls close theirs; open-only keeps its initialized process until first follow-up/expiry | streams incrementally | requests + turn wait have timeouts so a hung server can't block forever
   Errors: returns envelope with error on missing binary, JSON-RPC failure/timeout, or exception | never raises to the agent loop
 
 Codex tool. ConnectOnion drives the codex CLI's built-in `app-server` (OpenAI's
@@ -45,6 +45,7 @@ import threading
 import time
 from pathlib import Path
 
+from ._provider_pool import ProcessPool
 from ..core.provider_events import (
     command_phase,
     next_provider_state_revision,
@@ -83,6 +84,20 @@ _MAX_WORKROOM_INPUT_LENGTH = 12_000
 _open_threads = {}
 _open_threads_lock = threading.Lock()
 
+# Initialized app-servers parked between calls, keyed by the launch command,
+# cwd, sandbox and model they last served. Spawn plus the initialize
+# handshake costs seconds; a parked server only needs its next thread.
+_POOL_MAX_IDLE = 4
+_POOL_MAX_IDLE_PER_KEY = 2
+_POOL_IDLE_TTL_SECONDS = 5 * 60
+_POOL_MAX_USES = 20
+_process_pool = ProcessPool(
+    max_idle=_POOL_MAX_IDLE,
+    max_idle_per_key=_POOL_MAX_IDLE_PER_KEY,
+    idle_ttl=_POOL_IDLE_TTL_SECONDS,
+    max_uses=_POOL_MAX_USES,
+)
+
 
 def codex(prompt: str = "", session_id: str = "", cwd: str = "",
           sandbox: str = "workspace-write", model: str = "", timeout: int = 600,
@@ -147,6 +162,8 @@ def codex(prompt: str = "", session_id: str = "", cwd: str = "",
     deadline = time.monotonic() + timeout
     force_close = False
     keep_open = False
+    reusable = False
+    pool_key = (tuple(command), working_directory, sandbox, model)
     try:
         has_prompt = bool(prompt.strip())
         approval_policy = "untrusted" if approval == "manual" else "never"
@@ -167,15 +184,21 @@ def codex(prompt: str = "", session_id: str = "", cwd: str = "",
             sid = session_id
             resumed = True
         else:
-            client = CodexAppServer(
-                command=command,
-                cwd=working_directory,
-                on_event=on_event,
-                on_approval=on_approval,
-                cancelled=cancellation_check,
+            client = _process_pool.acquire(
+                pool_key,
+                lambda: _start_app_server(
+                    command,
+                    working_directory,
+                    deadline,
+                    on_event=on_event,
+                    on_approval=on_approval,
+                    cancelled=cancellation_check,
+                ),
             )
-            client.start()
-            client.initialize(timeout=_remaining(deadline))
+            # A warm server still carries the previous call's callbacks.
+            client.on_event = on_event
+            client.on_approval = on_approval
+            client.cancelled = cancellation_check or (lambda: False)
             if has_prompt:
                 client.refresh_account(timeout=_remaining(deadline))
         if not reused_open_thread:
@@ -207,6 +230,7 @@ def codex(prompt: str = "", session_id: str = "", cwd: str = "",
                     approval_policy=approval_policy,
                 )
                 keep_open = True
+            reusable = True
             return _envelope(
                 sid, resumed=resumed, exit_code=0, opened=True
             )
@@ -229,6 +253,7 @@ def codex(prompt: str = "", session_id: str = "", cwd: str = "",
                 agent,
             )
         turn = client.run_turn(sid, prompt, **turn_options)
+        reusable = True
     except _ProviderCancelled as e:
         # ``turn/interrupt`` is sent before this control path exits. The
         # app-server owns the persisted native thread, but its local process
@@ -246,6 +271,8 @@ def codex(prompt: str = "", session_id: str = "", cwd: str = "",
         if client is not None and not keep_open:
             if force_close:
                 client.close(force=True)
+            elif reusable:
+                _release_app_server(pool_key, client)
             else:
                 client.close()
 
@@ -258,6 +285,35 @@ def codex(prompt: str = "", session_id: str = "", cwd: str = "",
                      usage=turn.get("usage", {}), exit_code=1, error=f"turn {status}: {_turn_error(turn)}")
 
 
+def _start_app_server(command, cwd, deadline, **callbacks):
+    """Spawn and initialize a fresh app-server: the pool's cold start."""
+    client = CodexAppServer(command=command, cwd=cwd, **callbacks)
+    try:
+        client.start()
+        client.initialize(timeout=_remaining(deadline))
+    except _ProviderCancelled:
+        client.close(force=True)
+        raise
+    except BaseException:
+        client.close()
+        raise
+    return client
+
+
+def _release_app_server(pool_key, client):
+    """Park a server whose call finished cleanly; the pool closes it if it is unfit."""
+    # An idle server must not keep the finished call's agent reachable.
+    client.on_event = lambda event: None
+    client.on_approval = lambda method, params: False
+    client.cancelled = lambda: False
+    _process_pool.release(pool_key, client)
+
+
+def codex_pool_stats():
+    """Warm-pool hits against cold starts, and what is idle now."""
+    return _process_pool.stats()
+
+
 def _thread_config(cwd, sandbox, model, approval_policy):
     return cwd, sandbox, model, approval_policy
 
@@ -345,6 +401,7 @@ def _close_open_threads():
 
 
 atexit.register(_close_open_threads)
+atexit.register(_process_pool.close_all)
 
 
 def _turn_error(turn):
@@ -1199,6 +1256,15 @@ class CodexAppServer:
                 except OSError:
                     pass
 
+    def healthy(self):
+        """Whether the next call may reuse this server: running, reader intact, no turn in flight."""
+        if self.proc is None or self.proc.poll() is not None:
+            return False
+        with self._lock:
+            if self._exit_error is not None or self._pending:
+                return False
+        return self._active_turn_id is None
+
     def _read_stderr(self):
         """Drain stderr without allowing diagnostics to grow without bound."""
         try:
@@ -1,18 +1,20 @@
 """
 Purpose: FileTools class with read-before-edit state tracking and permission control
 LLM-Note:
-  Dependencies: imports from [hashlib, pathlib, typing, .read_file, .edit, .multi_edit, .write_file, .glob_files, .grep_files]
+  Dependencies: imports from [hashlib, collections, pathlib, typing, .read_file, .edit, .multi_edit, .write_file, .glob, .grep, .walk]
   Data flow: Agent uses FileTools instance -> tracks read snapshots -> validates before edit
-  State/Effects: maintains _snapshots dict (path → content hash) for stale-read detection
+  State/Effects: maintains _snapshots dict (path → content hash) for stale-read detection | keeps a FileIndex per searched directory (at most FILE_INDEX_LIMIT) so repeated glob/grep calls skip the re-walk
   Integration: exposes FileTools class | used as agent tool bundle
   Errors: edit returns error if file not read first | edit returns error if file changed since read
 
 Usage:
     FileTools()                    # full access with read-before-edit tracking
     FileTools(permission="read")   # read-only mode
+    FileTools(index=False)         # walk the tree on every glob/grep
 """
 
 import hashlib
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, List, Literal
 
@@ -20,8 +22,13 @@ from .read import read_file as _read_file
 from .edit import edit as _edit
 from .multi_edit import multi_edit as _multi_edit, EditOperation
 from .write import write as _write
-from .glob import glob as _glob
-from .grep import grep as _grep
+from .glob import glob_files as _glob
+from .grep import grep_files as _grep
+from .walk import FileIndex
+
+# Directories whose file index a FileTools keeps; the least recently searched
+# is dropped past this.
+FILE_INDEX_LIMIT = 8
 
 
 class FileTools:
@@ -31,20 +38,42 @@ class FileTools:
     - Tracks file snapshots (MD5 hash) when read
     - Validates file hasn't changed before edit (stale-read protection)
     - Permission-based access control (write/read)
+    - glob/grep reuse a per-directory file index across calls
 
     Usage:
         FileTools()                    # full access (default)
         FileTools(permission="read")   # read-only
     """
 
-    def __init__(self, permission: Literal["write", "read"] = "write"):
+    def __init__(self, permission: Literal["write", "read"] = "write", index: bool = True):
         """Initialize FileTools.
 
         Args:
             permission: "write" (full access) or "read" (read-only)
+            index: Keep a file index per searched directory between glob/grep
+                calls, refreshed from directory mtimes (default True)
         """
         self._permission = permission
         self._snapshots: dict[str, str] = {}  # path → MD5 hash
+        self._index = index
+        self._indexes: OrderedDict[Path, FileIndex] = OrderedDict()
+
+    def _index_for(self, path: Optional[str]) -> Optional[FileIndex]:
+        """The index for a search directory, created on first search there."""
+        if not self._index:
+            return None
+        base = Path(path) if path else Path.cwd()
+        if not base.is_dir():
+            return None
+        key = base.resolve()
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = FileIndex(base)
+            while len(self._indexes) > FILE_INDEX_LIMIT:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(key)
+        return index
 
     def read_file(
         self, path: str, offset: Optional[int] = None, limit: Optional[int] = None
@@ -82,7 +111,7 @@ class FileTools:
         Returns:
             Matching file paths, one per line, sorted by modification time
         """
-        return _glob(pattern, path)
+        return _glob(pattern, path, self._index_for(path))
 
     def grep(
         self,
@@ -109,7 +138,8 @@ class FileTools:
             Search results based on output_mode
         """
         return _grep(
-            pattern, path, file_pattern, output_mode, context_lines, ignore_case, max_results
+            pattern, path, file_pattern, output_mode, context_lines, ignore_case, max_results,
+            self._index_for(path),
         )
 
     def edit(
@@ -1,10 +1,11 @@
 """
 Purpose: Glob tool for file pattern matching
 LLM-Note:
-  Dependencies: imports from [pathlib, typing] | imported by [useful_tools/__init__, grep]
-  Data flow: Agent calls glob(pattern) -> searches directory -> returns matching paths
+  Dependencies: imports from [re, pathlib, typing, .walk] | imported by [useful_tools/__init__, file_tools.FileTools]
+  Data flow: Agent calls glob(pattern) -> walk_files() (or a FileIndex) lists candidate files -> pattern matched against each relative path -> matches sorted newest first
   State/Effects: reads filesystem (no writes)
-  Integration: exposes glob(pattern, path) function | used as agent tool | shared IGNORE_DIRS constant
+  Integration: exposes glob(pattern, path) function | used as agent tool | glob_files(pattern, path, index) is the same search over a FileIndex, used by FileTools | re-exports IGNORE_DIRS from walk
+  Performance: only matching files are stat()ed for the sort | with an index the directory listings are reused across searches (no scandir), but each matching file's mtime is still stat()ed on every search, so an edit made behind the index orders correctly
 
 Usage:
     glob("**/*.py")           # All Python files
@@ -13,31 +14,25 @@ Usage:
     glob("*.md", "docs")      # Markdown files in docs/
 """
 
+import re
 from pathlib import Path
 from typing import Optional
 
-IGNORE_DIRS = {
-    ".git",
-    "node_modules",
-    "__pycache__",
-    ".venv",
-    "venv",
-    ".env",
-    "dist",
-    "build",
-    ".next",
-    ".nuxt",
-    "target",
-    ".idea",
-    ".vscode",
-    "*.egg-info",
-}
+from .walk import IGNORE_DIRS, FileIndex, glob_to_regex, walk_files
+from ...core.tool_factory import parallel_safe
 
+# glob() lists at most this many files.
+MAX_GLOB_RESULTS = 100
 
+
+@parallel_safe
 def glob(pattern: str, path: Optional[str] = None) -> str:
     """
     Search for files matching a glob pattern.
 
+    Directories such as node_modules and .git, and anything the project's
+    .gitignore excludes, are skipped.
+
     Args:
         pattern: Glob pattern (e.g., "**/*.py", "src/**/*.ts")
         path: Directory to search in (default: current directory)
@@ -51,6 +46,11 @@ def glob(pattern: str, path: Optional[str] = None) -> str:
         glob("**/test_*.py")      # All test files
         glob("*.md", "docs")      # Markdown files in docs/
     """
+    return glob_files(pattern, path)
+
+
+def glob_files(pattern: str, path: Optional[str] = None, index: Optional[FileIndex] = None) -> str:
+    """glob(), reading the file list from `index` when one is given for `path`."""
     base = Path(path) if path else Path.cwd()
 
     if not base.exists():
@@ -59,39 +59,34 @@ def glob(pattern: str, path: Optional[str] = None) -> str:
     if not base.is_dir():
         return f"Error: Path '{base}' is not a directory"
 
-    matches = []
-    for p in base.glob(pattern):
-        if p.is_file() and not _should_ignore(p):
-            matches.append(p)
+    # Patterns are matched against "/"-separated paths relative to base, the
+    # way Path.glob matched them: "*.py" is top level only, "**/" spans zero
+    # or more directories.
+    regex = re.compile(glob_to_regex(pattern.removeprefix("./")))
+
+    if index is not None:
+        matches = [(f.rel, f.mtime) for f in index.files() if regex.fullmatch(f.rel)]
+    else:
+        matches = []
+        for entry, rel in walk_files(base):
+            if regex.fullmatch(rel):
+                try:
+                    matches.append((rel, entry.stat().st_mtime))
+                except OSError:
+                    continue  # vanished between listing and stat
 
     if not matches:
         return f"No files found matching '{pattern}'"
 
     # Sort by modification time (newest first)
-    matches.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    matches.sort(key=lambda m: m[1], reverse=True)
 
     # Format output
-    results = []
-    for p in matches[:100]:  # Limit to 100 results
-        rel_path = p.relative_to(base) if path else p.relative_to(Path.cwd())
-        results.append(str(rel_path))
+    results = [str(Path(rel)) for rel, _ in matches[:MAX_GLOB_RESULTS]]
 
     output = "\n".join(results)
 
-    if len(matches) > 100:
-        output += f"\n\n... and {len(matches) - 100} more files"
+    if len(matches) > MAX_GLOB_RESULTS:
+        output += f"\n\n... and {len(matches) - MAX_GLOB_RESULTS} more files"
 
     return output
-
-
-def _should_ignore(path: Path) -> bool:
-    """Check if path should be ignored."""
-    parts = path.parts
-    for part in parts:
-        if part in IGNORE_DIRS:
-            return True
-        # Handle patterns like *.egg-info
-        for ignore in IGNORE_DIRS:
-            if "*" in ignore and Path(part).match(ignore):
-                return True
-    return False
@@ -1,10 +1,11 @@
 """
 Purpose: Grep tool for content searching
 LLM-Note:
-  Dependencies: imports from [re, pathlib, typing, .glob_files] | imported by [useful_tools/__init__]
-  Data flow: Agent calls grep(pattern) -> searches files -> returns matches
+  Dependencies: imports from [re, os, mmap, itertools, concurrent.futures, fnmatch, pathlib, typing, .walk] | imported by [useful_tools/__init__, file_tools.FileTools]
+  Data flow: Agent calls grep(pattern) -> walk_files() (or a FileIndex) streams candidate files (ignored dirs and .gitignore pruned) -> a thread pool scans a bounded window of them in walk order -> results formatted in that order until max_results, then the walk and pending scans are abandoned
   State/Effects: reads filesystem (no writes)
-  Integration: exposes grep(pattern, path, file_pattern, output_mode) function | used as agent tool
+  Integration: exposes grep(pattern, path, file_pattern, output_mode) function | used as agent tool | grep_files(..., index) is the same search over a FileIndex, used by FileTools
+  Performance: a file is skipped on extension or a NUL in its first 8KB before decoding; large files are mapped, not read; a whole-file search rules out non-matching files before any line splitting; reads overlap across worker threads
 
 Usage:
     grep("def main")                           # Find "def main" in all files
@@ -13,13 +14,36 @@ Usage:
     grep("import", output_mode="count")        # Count imports per file
 """
 
+import itertools
+import mmap
+import os
 import re
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
 from typing import Optional, Literal
 
-from .glob import IGNORE_DIRS
+from .walk import FileIndex, walk_files
+from ...core.tool_factory import parallel_safe
 
+# Files at least this big are mapped rather than read into a bytes copy.
+MMAP_THRESHOLD = 1 << 20
 
+# How much of a file is checked for NUL bytes before it is treated as text.
+BINARY_SNIFF_BYTES = 8192
+
+# Content mode shows at most this many matches per file.
+CONTENT_MATCHES_PER_FILE = 10
+
+GREP_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+# A search over the whole file can only miss a match that a per-line search
+# finds if the pattern looks at what surrounds it: anchors, negative
+# lookaround, \B, conditionals. Those patterns skip the prefilter.
+_LINE_SENSITIVE = re.compile(r"(?<!\[)\^|\$|\\[AZB]|\(\?<?!|\(\?\(")
+
+
+@parallel_safe
 def grep(
     pattern: str,
     path: Optional[str] = None,
@@ -32,6 +56,9 @@ def grep(
     """
     Search for content in files using regex.
 
+    Directories such as node_modules and .git, and anything the project's
+    .gitignore excludes, are skipped. Binary files are skipped.
+
     Args:
         pattern: Regular expression pattern to search for
         path: File or directory to search in (default: current directory)
@@ -53,6 +80,21 @@ def grep(
         grep("class.*Agent", output_mode="content") # Show matching lines
         grep("import", output_mode="count")        # Count imports per file
     """
+    return grep_files(pattern, path, file_pattern, output_mode, context_lines,
+                      ignore_case, max_results)
+
+
+def grep_files(
+    pattern: str,
+    path: Optional[str] = None,
+    file_pattern: Optional[str] = None,
+    output_mode: Literal["files", "content", "count"] = "files",
+    context_lines: int = 0,
+    ignore_case: bool = False,
+    max_results: int = 50,
+    index: Optional[FileIndex] = None,
+) -> str:
+    """grep(), reading the file list from `index` when one is given for `path`."""
     base = Path(path) if path else Path.cwd()
 
     if not base.exists():
@@ -65,39 +107,21 @@ def grep(
     except re.error as e:
         return f"Error: Invalid regex pattern: {e}"
 
-    # Collect files to search
-    if base.is_file():
-        files = [base]
-    else:
-        if file_pattern:
-            files = list(base.glob(f"**/{file_pattern}"))
-        else:
-            files = list(base.glob("**/*"))
+    prefilter = None if _LINE_SENSITIVE.search(pattern) else regex
+    first_only = output_mode == "files"
+    keep_lines = output_mode == "content" and context_lines > 0
 
-        files = [f for f in files if f.is_file() and not _should_ignore(f) and _is_text_file(f)]
+    def scan(file: str, sniff: bool):
+        return _scan(file, regex, prefilter, sniff=sniff,
+                     first_only=first_only, keep_lines=keep_lines)
 
     results = []
     total_matches = 0
 
-    for file in files:
-        if total_matches >= max_results:
-            break
-
-        try:
-            content = file.read_text(encoding="utf-8", errors="ignore")
-            lines = content.splitlines()
-        except Exception:
+    for rel_path, scanned in _scanned(base, file_pattern, scan, index):
+        if scanned is None:
             continue
-
-        file_matches = []
-        for i, line in enumerate(lines):
-            if regex.search(line):
-                file_matches.append((i + 1, line))  # 1-indexed line number
-
-        if not file_matches:
-            continue
-
-        rel_path = _relative_path(file, base)
+        file_matches, lines = scanned
 
         if output_mode == "files":
             results.append(str(rel_path))
@@ -109,7 +133,7 @@ def grep(
 
         elif output_mode == "content":
             results.append(f"\n{rel_path}:")
-            for line_num, line_text in file_matches[:10]:  # Limit per file
+            for line_num, line_text in file_matches[:CONTENT_MATCHES_PER_FILE]:
                 # Add context if requested
                 if context_lines > 0:
                     start = max(0, line_num - 1 - context_lines)
@@ -125,6 +149,9 @@ def grep(
                 if total_matches >= max_results:
                     break
 
+        if total_matches >= max_results:
+            break
+
     if not results:
         return f"No matches found for '{pattern}'"
 
@@ -136,16 +163,95 @@ def grep(
     return output
 
 
-def _should_ignore(path: Path) -> bool:
-    """Check if path should be ignored."""
-    parts = path.parts
-    for part in parts:
-        if part in IGNORE_DIRS:
-            return True
-        for ignore in IGNORE_DIRS:
-            if "*" in ignore and Path(part).match(ignore):
-                return True
-    return False
+def _scanned(base: Path, file_pattern: Optional[str], scan, index: Optional[FileIndex] = None):
+    """Yield (relative path, scan result) in walk order.
+
+    Scans run on a thread pool, at most a couple of files per worker ahead of
+    the one being reported. The window keeps output in walk order and bounds
+    the work thrown away when the caller stops early: leaving the loop closes
+    this generator, which stops the walk and cancels scans not yet started.
+    """
+    if base.is_file():
+        yield _relative_path(base, base), scan(str(base), False)
+        return
+
+    if index is not None:
+        listed = ((f.rel, f.path) for f in index.files())
+    else:
+        listed = ((rel, entry.path) for entry, rel in walk_files(base))
+    candidates = (
+        (Path(rel), file)
+        for rel, file in listed
+        if _wanted(rel.rsplit("/", 1)[-1], rel, file_pattern)
+    )
+    window = GREP_WORKERS * 2
+    pool = ThreadPoolExecutor(max_workers=GREP_WORKERS, thread_name_prefix="grep")
+    try:
+        pending = [(rel, pool.submit(scan, file, True))
+                   for rel, file in itertools.islice(candidates, window)]
+        while pending:
+            rel, future = pending.pop(0)
+            for rel_next, file in itertools.islice(candidates, 1):
+                pending.append((rel_next, pool.submit(scan, file, True)))
+            yield rel, future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _wanted(name: str, rel: str, file_pattern: Optional[str]) -> bool:
+    if not _is_text_file(Path(name)):
+        return False
+    if not file_pattern:
+        return True
+    # "*.py" names a file anywhere; "src/*.py" is matched from the right, as
+    # the recursive "**/<pattern>" glob this replaced did.
+    if "/" in file_pattern:
+        return PurePosixPath(rel).match(file_pattern)
+    return fnmatchcase(name, file_pattern)
+
+
+def _scan(file: str, regex, prefilter, *, sniff: bool, first_only: bool, keep_lines: bool):
+    """Matching (line number, line) pairs of one file, or None if nothing matches.
+
+    The second element is the file's lines when the caller needs context, so
+    the file is not read twice.
+    """
+    try:
+        text = _read_text(file, sniff)
+    except (OSError, ValueError):
+        return None
+    if text is None:
+        return None
+    if prefilter is not None and not prefilter.search(text):
+        return None
+
+    lines = text.splitlines()
+    file_matches = []
+    for i, line in enumerate(lines):
+        if regex.search(line):
+            file_matches.append((i + 1, line))  # 1-indexed line number
+            if first_only:
+                break
+    if not file_matches:
+        return None
+    return file_matches, lines if keep_lines else None
+
+
+def _read_text(file: str, sniff: bool) -> Optional[str]:
+    """The file decoded as UTF-8, or None when it looks binary."""
+    with open(file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return ""
+        if size < MMAP_THRESHOLD:
+            data = f.read()
+            if sniff and b"\0" in data[:BINARY_SNIFF_BYTES]:
+                return None
+            return data.decode("utf-8", errors="ignore")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if sniff and mapped.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1:
+                return None
+            return str(mapped, "utf-8", "ignore")
 
 
 def _is_text_file(path: Path) -> bool:
@@ -15,7 +15,10 @@ Usage:
 from pathlib import Path
 from typing import Optional
 
+from ...core.tool_factory import parallel_safe
 
+
+@parallel_safe
 def read_file(
     path: str,
     offset: Optional[int] = None,
@@ -0,0 +1,339 @@
+"""
+Purpose: Directory walker and file index shared by grep and glob -- os.scandir, ignored directories pruned before descending, .gitignore honoured
+LLM-Note:
+  Dependencies: imports from [os, re, threading, pathlib, fnmatch] | imported by [grep, glob, file_tools.FileTools]
+  Data flow: walk_files(base) -> finds enclosing git repo's .gitignore rules above base -> scandir each directory, sorted by name -> skips IGNORE_DIRS names and gitignored entries -> yields (DirEntry, rel_posix) for files, lazily | FileIndex(root).files() -> same files, same order, as IndexedFile(rel, path, mtime) from listings kept between calls
+  State/Effects: reads directories and .gitignore files (no writes) | FileIndex holds one listing per directory, keyed by relative path; file mtimes are stat'ed on read, never kept
+  Integration: exposes IGNORE_DIRS, walk_files(base, gitignore=True), FileIndex, glob_to_regex(pattern), is_ignored_name(name), GitIgnore | grep stops consuming walk_files once it has enough results, so the walk stops too
+  Performance: one scandir per directory; DirEntry caches is_dir; an ignored directory is never opened | FileIndex refresh is two stats per directory and re-lists only directories whose mtime or .gitignore changed
+"""
+
+import fnmatch
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+IGNORE_DIRS = {
+    ".git",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".env",
+    "dist",
+    "build",
+    ".next",
+    ".nuxt",
+    "target",
+    ".idea",
+    ".vscode",
+    "*.egg-info",
+}
+
+_IGNORE_EXACT = {name for name in IGNORE_DIRS if "*" not in name}
+_IGNORE_GLOBS = [name for name in IGNORE_DIRS if "*" in name]
+
+
+def is_ignored_name(name: str) -> bool:
+    """Whether one path component is on the built-in ignore list."""
+    return name in _IGNORE_EXACT or any(fnmatch.fnmatchcase(name, g) for g in _IGNORE_GLOBS)
+
+
+class GitIgnore:
+    """The rules of one .gitignore, matched against paths relative to its directory.
+
+    Enough of gitignore(5) for a search tool: `#` comments, `!` negation, a
+    trailing `/` for directories only, a `/` elsewhere anchoring the pattern to
+    this directory, and `*`, `?`, `[...]`, `**`. The last matching rule wins.
+    """
+
+    def __init__(self, prefix: str, lines: list[str]):
+        self.prefix = prefix              # this file's directory, relative to the walk root
+        self.rules = []
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            line = line.lstrip("/")
+            self.rules.append((re.compile(glob_to_regex(line)), negate, dir_only, anchored))
+
+    @classmethod
+    def load(cls, directory: Path, prefix: str) -> Optional["GitIgnore"]:
+        try:
+            text = (directory / ".gitignore").read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            return None
+        rules = cls(prefix, text.splitlines())
+        return rules if rules.rules else None
+
+    def match(self, rel: str, is_dir: bool) -> Optional[bool]:
+        """True ignored, False re-included, None when no rule speaks."""
+        if self.prefix:
+            if not rel.startswith(self.prefix + "/"):
+                return None
+            rel = rel[len(self.prefix) + 1:]
+        name = rel.rsplit("/", 1)[-1]
+        verdict = None
+        for regex, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.fullmatch(rel if anchored else name):
+                verdict = not negate
+        return verdict
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Regex for a glob over "/"-separated relative paths; `**/` spans directories."""
+    out, i, n = [], 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end < 0:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+
+
+def _ignored(rules: tuple, rel: str, is_dir: bool) -> bool:
+    verdict = False
+    for ignore in rules:
+        said = ignore.match(rel, is_dir)
+        if said is not None:
+            verdict = said
+    return verdict
+
+
+def _enclosing_rules(base: Path, load=GitIgnore.load) -> tuple:
+    """.gitignore files between the repository root and `base`, outermost first.
+
+    A search started in `repo/src` still owes `repo/.gitignore` its say. The
+    rules are re-rooted at `base` by keeping only what can match below it.
+    """
+    base = base.resolve()
+    chain = []
+    for parent in [base, *base.parents]:
+        chain.append(parent)
+        if (parent / ".git").exists():
+            break
+    else:
+        return ()
+    rules = []
+    for directory in reversed(chain[1:]):
+        ignore = load(directory, "")
+        if ignore is not None:
+            below = base.relative_to(directory).as_posix()
+            rules.append(_Rerooted(ignore, below))
+    return tuple(rules)
+
+
+class _Rerooted:
+    """A parent directory's .gitignore, asked about paths relative to the walk root."""
+
+    def __init__(self, ignore: GitIgnore, below: str):
+        self.ignore = ignore
+        self.below = below
+
+    def __eq__(self, other):
+        return (isinstance(other, _Rerooted) and self.ignore is other.ignore
+                and self.below == other.below)
+
+    def match(self, rel: str, is_dir: bool) -> Optional[bool]:
+        return self.ignore.match(f"{self.below}/{rel}", is_dir)
+
+
+def _list_dir(directory: str, prefix: str, rules: tuple, load) -> tuple[list, list]:
+    """One directory's wanted files and subdirectories, sorted by name.
+
+    Files are (DirEntry, rel); subdirectories are (path, rel, rules) with this
+    directory's own .gitignore appended to the rules they inherit.
+    """
+    if load is not None:
+        own = load(Path(directory), prefix)
+        if own is not None:
+            rules = rules + (own,)
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return [], []         # unreadable directory: skip it, keep walking
+    files, subdirs = [], []
+    for entry in entries:
+        if is_ignored_name(entry.name):
+            continue
+        rel = f"{prefix}/{entry.name}" if prefix else entry.name
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            continue
+        if rules and _ignored(rules, rel, is_dir):
+            continue
+        if is_dir:
+            if not entry.is_symlink():
+                subdirs.append((entry.path, rel, rules))
+        elif entry.is_file():
+            files.append((entry, rel))
+    return files, subdirs
+
+
+def walk_files(base: Path, *, gitignore: bool = True) -> Iterator[tuple[os.DirEntry, str]]:
+    """Yield (entry, path relative to base) for every file worth searching.
+
+    Depth-first, sorted by name within a directory, so output is stable. A
+    directory on IGNORE_DIRS or gitignored is pruned before it is opened --
+    that is most of the cost on a repo with node_modules in it.
+    """
+    base = Path(base)
+    load = GitIgnore.load if gitignore else None
+    stack = [(str(base), "", _enclosing_rules(base) if gitignore else ())]
+    while stack:
+        directory, prefix, rules = stack.pop()
+        files, subdirs = _list_dir(directory, prefix, rules, load)
+        yield from files
+        stack.extend(reversed(subdirs))
+
+
+class IndexedFile:
+    """One file in a FileIndex. `mtime` is read from disk on every access.
+
+    Not cached: a file edited in place by an editor, git or a subprocess
+    leaves its directory's mtime alone, so nothing would tell the index its
+    cached value went stale. Only glob reads it, and only for its matches --
+    the same stat per match the unindexed walk pays.
+    """
+
+    __slots__ = ("rel", "path")
+
+    def __init__(self, rel: str, path: str):
+        self.rel = rel
+        self.path = path
+
+    @property
+    def mtime(self) -> float:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return 0.0
+
+
+class _Listing:
+    __slots__ = ("stamp", "rules", "files", "subdirs")
+
+    def __init__(self, stamp, rules, files, subdirs):
+        self.stamp = stamp
+        self.rules = rules
+        self.files = files
+        self.subdirs = subdirs
+
+
+class FileIndex:
+    """The walk_files() result for one directory, kept between searches.
+
+    Each refresh stats every indexed directory and its .gitignore, nothing
+    else: a directory whose mtime and .gitignore are unchanged, and whose
+    inherited rules are the same, keeps its listing. Creating, deleting or
+    renaming a file changes its directory's mtime, so those are seen on the
+    next search. Editing a file in place does not, and needs not: grep reads
+    content fresh and glob reads each match's mtime fresh.
+    """
+
+    def __init__(self, root, *, gitignore: bool = True):
+        self.root = Path(root)
+        self.gitignore = gitignore
+        self.rescans = 0                  # directories listed, for tests and tuning
+        self._listings: dict[str, _Listing] = {}
+        self._ignores: dict[str, tuple] = {}   # .gitignore path -> (mtime_ns, GitIgnore)
+        self._ordered: Optional[list] = None
+        self._lock = threading.Lock()
+
+    def files(self) -> list[IndexedFile]:
+        """Every file walk_files() would yield now, in the same order."""
+        with self._lock:
+            self._refresh()
+            return self._ordered
+
+    def _load(self, directory: Path, prefix: str) -> Optional[GitIgnore]:
+        """GitIgnore.load, returning the same object while the file is unchanged.
+
+        Identity matters: a subdirectory keeps its listing only if the rules it
+        inherits compare equal, and a re-parsed .gitignore never would.
+        """
+        path = directory / ".gitignore"
+        stamp = _mtime_ns(path)
+        cached = self._ignores.get(str(path))
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        ignore = GitIgnore.load(directory, prefix) if stamp is not None else None
+        self._ignores[str(path)] = (stamp, ignore)
+        return ignore
+
+    def _refresh(self) -> None:
+        load = self._load if self.gitignore else None
+        rules = _enclosing_rules(self.root, self._load) if self.gitignore else ()
+        stack = [(str(self.root), "", rules)]
+        seen, changed, ordered = set(), False, []
+        while stack:
+            directory, prefix, rules = stack.pop()
+            seen.add(prefix)
+            stamp = (_mtime_ns(directory),
+                     _mtime_ns(os.path.join(directory, ".gitignore")) if self.gitignore else None)
+            listing = self._listings.get(prefix)
+            if listing is None or listing.stamp != stamp or listing.rules != rules:
+                found, subdirs = _list_dir(directory, prefix, rules, load)
+                listing = _Listing(stamp, rules,
+                                   [IndexedFile(rel, entry.path) for entry, rel in found],
+                                   subdirs)
+                self._listings[prefix] = listing
+                self.rescans += 1
+                changed = True
+            ordered.extend(listing.files)
+            stack.extend(reversed(listing.subdirs))
+        if len(seen) != len(self._listings):
+            for gone in set(self._listings) - seen:
+                del self._listings[gone]
+            changed = True
+        if changed or self._ordered is None:
+            self._ordered = ordered
+
+
+def _mtime_ns(path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
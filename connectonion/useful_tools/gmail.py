@@ -1,12 +1,12 @@
 """
 Purpose: Gmail integration tool for reading, sending, and managing emails via Google API
 LLM-Note:
-  Dependencies: imports from [os, base64, google.oauth2.credentials, googleapiclient.discovery, googleapiclient.errors] | imported by [useful_tools/__init__.py] | requires OAuth tokens from 'co auth google' | tested by [tests/unit/test_gmail.py]
-  Data flow: Agent calls Gmail methods → validates the ambient OpenOnion account and refreshes server-owned Google credentials via oo-api → builds Gmail API service → API calls to Gmail REST endpoints → returns formatted results (email summaries, bodies, send confirmations)
-  State/Effects: reads GOOGLE_* env vars and OPENONION_API_KEY | persists refreshed tokens to ~/.co/keys.env | makes HTTP calls to Gmail API | can modify mailbox state (mark read/unread, archive, star, send emails)
+  Dependencies: imports from [os, base64, google.oauth2.credentials, googleapiclient.discovery, googleapiclient.errors, useful_tools/gmail_store.py (lazy)] | imported by [useful_tools/__init__.py] | requires OAuth tokens from 'co auth google' | tested by [tests/unit/test_gmail.py, tests/unit/test_gmail_fetches_in_batches.py, tests/unit/test_gmail_sync_index.py]
+  Data flow: Agent calls Gmail methods → validates the ambient OpenOnion account and refreshes server-owned Google credentials via oo-api → builds Gmail API service → API calls to Gmail REST endpoints → returns formatted results (email summaries, bodies, send confirmations) | sync_emails() → history.list since the stored historyId (or a full listing of the window) → new messages fetched in batches → MailIndex in emails_db → list_search()/_scan_contacts() answer from the index while it is fresh
+  State/Effects: reads GOOGLE_* env vars and OPENONION_API_KEY | persists refreshed tokens to ~/.co/keys.env | makes HTTP calls to Gmail API | can modify mailbox state (mark read/unread, archive, star, send emails) | sync_emails() writes the SQLite index at emails_db (default data/emails.sqlite3)
   Integration: exposes Gmail class with read_inbox(), get_sent_emails(), search_emails(), get_email_body(), send(), reply(), mark_read(), mark_unread(), archive_email(), star_email(), get_labels(), add_label(), count_unread(), get_all_contacts(), analyze_contact(), get_unanswered_emails(), update_contact() | used as agent tool via Agent(tools=[Gmail()])
-  Performance: network I/O per API call | batch fetching for list operations | email body fetched separately (lazy loading)
-  Errors: raises ValueError if OAuth not configured | HttpError from Google API propagates | returns error strings for display to user
+  Performance: listings fetch metadata in Gmail batch requests (BATCH_SIZE per round trip) via _batch_get | message metadata cached per instance by id, expired through one history.list call from the last historyId | email body fetched separately (lazy loading) | sync_emails() after the first run costs one history.list plus a batch per BATCH_SIZE new messages | search_emails() and contact scans skip the API while the index is fresh and holds a full answer
+  Errors: raises ValueError if OAuth not configured | HttpError from Google API propagates (a batch part that is rate limited or 5xx is retried with backoff first; one that is 404 is skipped) | returns error strings for display to user
 
 Gmail tool for reading and managing Gmail emails.
 
@@ -67,12 +67,37 @@ from ._attachment_files import path_of_open_file
 
 GMAIL_ATTACHMENT_LIMIT = 25_000_000
 
+# Gmail takes up to 100 calls in one batch request but starts rate limiting
+# past 50 (developers.google.com/gmail/api/guides/batch).
+BATCH_SIZE = 50
+BATCH_ATTEMPTS = 4
+BATCH_RETRY_DELAY = 0.5
+# One header set for every metadata listing, so a message cached by
+# read_inbox also serves the contact scan and routed-address detection.
+METADATA_HEADERS = ['From', 'To', 'Cc', 'Subject', 'Date', 'X-Forwarded-To']
+# Full messages sync_emails() fetches before writing them to the index.
+SYNC_CHUNK = 500
+
+
+def _status(error) -> int | None:
+    """The HTTP status of a googleapiclient HttpError (None for anything else)."""
+    return getattr(getattr(error, 'resp', None), 'status', None)
+
+
+def _retryable(error) -> bool:
+    """Rate limited or a server-side blip: worth sending again after a pause."""
+    status = _status(error)
+    if status in (429, 500, 502, 503, 504):
+        return True
+    return status == 403 and 'ratelimitexceeded' in str(error).lower()
+
 
 class Gmail:
     """Gmail tool for reading and managing emails."""
 
     def __init__(self, emails_csv: str = "data/emails.csv", contacts_csv: str = "data/contacts.csv",
-                 allow_external_attachments: bool = False):
+                 allow_external_attachments: bool = False, emails_db: str = "data/emails.sqlite3",
+                 index_max_age: float = 900.0):
         """Initialize Gmail tool.
 
         Args:
@@ -81,6 +106,10 @@ class Gmail:
             allow_external_attachments: Let trusted operator code attach files
                 outside the project. Agent-facing instances should keep the
                 secure default.
+            emails_db: Path to the SQLite index sync_emails() keeps (default:
+                "data/emails.sqlite3"). None turns the index off.
+            index_max_age: Seconds after a sync during which searches and
+                contact scans may answer from the index (default: 900)
 
         Validates that gmail.readonly scope is authorized.
         Raises ValueError if scope is missing.
@@ -106,6 +135,13 @@ class Gmail:
         self.contacts_csv = contacts_csv
         self._attachment_root = project_root().resolve()
         self._allow_external_attachments = allow_external_attachments
+        # Message metadata by id, and the mailbox historyId it is known to be
+        # current as of. See _message_metadata().
+        self._metadata = {}
+        self._history_id = None
+        self.emails_db = emails_db
+        self.index_max_age = index_max_age
+        self._mail_index = None
 
     def _get_service(self):
         """Get Gmail API service, refreshing the access token once per instance.
@@ -211,35 +247,185 @@ class Gmail:
 
         return new_access_token
 
-    def _email_dicts(self, messages, max_results=10):
-        """Fetch metadata for message stubs and return plain email dicts."""
+    def _batch_get(self, service, make_request, ids) -> dict:
+        """Fetch one resource per id in Gmail batch requests; return {id: response}.
+
+        One round trip per BATCH_SIZE ids instead of one per id. A part that
+        comes back 404 was deleted after it was listed and is left out. A part
+        that was rate limited or hit a 5xx goes into the next batch after a
+        backoff; any other failure is raised once its batch has finished.
+        """
+        import time
+
+        results = {}
+        pending = list(dict.fromkeys(ids))
+        for attempt in range(BATCH_ATTEMPTS):
+            retry, failures = [], []
+
+            def answer(request_id, response, exception):
+                if exception is None:
+                    results[request_id] = response
+                elif _status(exception) == 404:
+                    pass
+                elif _retryable(exception):
+                    retry.append((request_id, exception))
+                else:
+                    failures.append(exception)
+
+            for start in range(0, len(pending), BATCH_SIZE):
+                batch = service.new_batch_http_request()
+                for item in pending[start:start + BATCH_SIZE]:
+                    batch.add(make_request(item), callback=answer, request_id=item)
+                batch.execute()
+
+            if failures:
+                raise failures[0]
+            if not retry:
+                return results
+            pending = [request_id for request_id, _ in retry]
+            if attempt + 1 < BATCH_ATTEMPTS:
+                time.sleep(BATCH_RETRY_DELAY * 2 ** attempt)
+        raise retry[0][1]
+
+    def _message_metadata(self, message_ids) -> dict:
+        """Metadata (METADATA_HEADERS, labels, snippet) for each id: {id: message}.
+
+        Cached per instance. A cached message is only trusted until Gmail's
+        history says it changed -- before using the cache, one history.list
+        call from the last known historyId names every message that was
+        relabelled (read, archived, starred) or deleted since, and those are
+        fetched again. Messages deleted between listing and fetching are
+        missing from the result.
+        """
         service = self._get_service()
-        emails = []
+        self._expire_changed_metadata(service)
 
-        for msg in messages[:max_results]:
-            message = service.users().messages().get(
+        missing = [mid for mid in message_ids if mid not in self._metadata]
+        fetched = self._batch_get(
+            service,
+            lambda mid: service.users().messages().get(
                 userId='me',
-                id=msg['id'],
+                id=mid,
                 format='metadata',
-                metadataHeaders=['From', 'Subject', 'Date']
+                metadataHeaders=METADATA_HEADERS
+            ),
+            missing,
+        )
+        for mid, message in fetched.items():
+            # Without a historyId there is no way to tell later whether it
+            # changed, so it is used this once and not kept.
+            if message.get('historyId'):
+                self._metadata[mid] = message
+                self._history_id = max(self._history_id or 0, int(message['historyId']))
+
+        result = {}
+        for mid in message_ids:
+            message = self._metadata.get(mid) or fetched.get(mid)
+            if message is not None:
+                result[mid] = message
+        return result
+
+    def _expire_changed_metadata(self, service):
+        """Drop cached messages that changed since self._history_id."""
+        if not self._metadata or self._history_id is None:
+            return
+
+        try:
+            records, history_id = self._history_since(service, self._history_id)
+        except HttpError as e:
+            if _status(e) != 404:
+                raise
+            # Gmail keeps about a week of history; past that it cannot say
+            # what changed, so nothing cached can be vouched for.
+            self._metadata.clear()
+            self._history_id = None
+            return
+
+        for record in records:
+            for kind in ('messagesDeleted', 'labelsAdded', 'labelsRemoved'):
+                for entry in record.get(kind, []):
+                    self._metadata.pop(entry['message']['id'], None)
+        if history_id:
+            self._history_id = int(history_id)
+
+    def _history_since(self, service, start_history_id) -> tuple:
+        """Every history record after `start_history_id`, and the mailbox's historyId now.
+
+        Raises HttpError 404 when Gmail no longer has history that old.
+        """
+        records = []
+        page_token = None
+        while True:
+            response = service.users().history().list(
+                userId='me',
+                startHistoryId=str(start_history_id),
+                pageToken=page_token
             ).execute()
+            records.extend(response.get('history', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return records, response.get('historyId')
 
-            headers = message['payload']['headers']
-            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
-            from_email = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown')
-            date = next((h['value'] for h in headers if h['name'] == 'Date'), 'Unknown')
+    def _index(self, create: bool = False):
+        """The local MailIndex, or None when there is none (or it is turned off).
 
-            emails.append({
-                'id': msg['id'],
-                'from': from_email,
-                'subject': subject,
-                'date': date,
-                'snippet': message.get('snippet', ''),
-                'unread': 'UNREAD' in message.get('labelIds', [])
-            })
+        Reading never creates the file; only sync_emails() does.
+        """
+        if not self.emails_db:
+            return None
+        if self._mail_index is None:
+            if not create and not os.path.exists(self.emails_db):
+                return None
+            from .gmail_store import MailIndex
+            self._mail_index = MailIndex(self.emails_db)
+        return self._mail_index
+
+    def _from_index(self, read, limit: int):
+        """Rows from the local index when they can stand in for Gmail's answer, else None.
+
+        The index must be fresh (synced within index_max_age) and must return
+        a full `limit` of rows whose oldest is inside the synced window. The
+        index holds every message since the window started, so no message it
+        lacks could have ranked above that oldest row; short of that, Gmail
+        might know newer matches the index does not, and is asked instead.
+        """
+        index = self._index()
+        if index is None or not index.fresh(self.index_max_age):
+            return None
+        rows = read(index)
+        if not rows or len(rows) < limit or rows[-1]['ts'] < index.complete_since():
+            return None
+        return rows
+
+    def _email_dicts(self, messages, max_results=10):
+        """Fetch metadata for message stubs and return plain email dicts."""
+        stubs = messages[:max_results]
+        metadata = self._message_metadata([msg['id'] for msg in stubs])
+        emails = []
+
+        for msg in stubs:
+            message = metadata.get(msg['id'])
+            if message is not None:
+                emails.append(self._email_dict(msg['id'], message))
 
         return emails
 
+    def _email_dict(self, email_id, message):
+        """One listing entry from a metadata-shaped message."""
+        headers = message['payload']['headers']
+        subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
+        from_email = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown')
+        date = next((h['value'] for h in headers if h['name'] == 'Date'), 'Unknown')
+
+        return {
+            'id': email_id,
+            'from': from_email,
+            'subject': subject,
+            'date': date,
+            'snippet': message.get('snippet', ''),
+            'unread': 'UNREAD' in message.get('labelIds', [])
+        }
+
     def _format_dicts(self, emails):
         """Format email dicts (from _email_dicts) into a readable list."""
         if not emails:
@@ -290,7 +476,15 @@ class Gmail:
         """Search emails and return them as dicts (same shape as list_inbox).
 
         Programmatic counterpart of search_emails() — used by the CLI.
+
+        Answered from the local index (see sync_emails()) when it is fresh and
+        understands the query; otherwise by Gmail.
         """
+        rows = self._from_index(lambda index: index.search(query, max_results), max_results)
+        if rows is not None:
+            from .gmail_store import as_message
+            return [self._email_dict(row['id'], as_message(row)) for row in rows]
+
         service = self._get_service()
 
         results = service.users().messages().list(
@@ -966,13 +1160,12 @@ class Gmail:
             q='in:inbox'
         ).execute()
 
-        for msg_meta in results.get('messages', []):
-            msg = service.users().messages().get(
-                userId='me',
-                id=msg_meta['id'],
-                format='metadata',
-                metadataHeaders=['To', 'X-Forwarded-To']
-            ).execute()
+        stubs = results.get('messages', [])
+        metadata = self._message_metadata([m['id'] for m in stubs])
+        for msg_meta in stubs:
+            msg = metadata.get(msg_meta['id'])
+            if msg is None:
+                continue
 
             headers = {h['name']: h['value'] for h in msg.get('payload', {}).get('headers', [])}
 
@@ -1057,30 +1250,35 @@ class Gmail:
         def is_automated(email_addr: str) -> bool:
             return any(pattern in email_addr.lower() for pattern in automated_patterns)
 
-        # Get emails with pagination
-        messages = []
-        page_token = None
-        while len(messages) < max_emails:
-            results = service.users().messages().list(
-                userId='me',
-                maxResults=min(100, max_emails - len(messages)),
-                pageToken=page_token
-            ).execute()
-            messages.extend(results.get('messages', []))
-            page_token = results.get('nextPageToken')
-            if not page_token:
-                break
+        # The newest max_emails messages: from the local index when it is
+        # fresh, else listed page by page and fetched from Gmail.
+        rows = self._from_index(lambda index: index.recent(max_emails), max_emails)
+        if rows is not None:
+            from .gmail_store import as_message
+            messages = [{'id': row['id']} for row in rows]
+            metadata = {row['id']: as_message(row) for row in rows}
+        else:
+            messages = []
+            page_token = None
+            while len(messages) < max_emails:
+                results = service.users().messages().list(
+                    userId='me',
+                    maxResults=min(100, max_emails - len(messages)),
+                    pageToken=page_token
+                ).execute()
+                messages.extend(results.get('messages', []))
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
+            metadata = self._message_metadata([m['id'] for m in messages])
 
         contacts = defaultdict(lambda: {'name': '', 'threads': set(), 'last_contact': None})
         email_records = []
 
         for msg in messages:
-            message = service.users().messages().get(
-                userId='me',
-                id=msg['id'],
-                format='metadata',
-                metadataHeaders=['From', 'To', 'Cc', 'Subject', 'Date']
-            ).execute()
+            message = metadata.get(msg['id'])
+            if message is None:
+                continue
 
             headers = message['payload']['headers']
             headers_dict = {h['name']: h['value'] for h in headers}
@@ -1275,20 +1473,31 @@ Emails:
             if not messages:
                 break
 
+            thread_ids = []
             for msg in messages:
-                # Get thread to check if we replied
                 thread_id = msg.get('threadId')
-                if thread_id in seen_threads:
+                if thread_id not in seen_threads:
+                    seen_threads.add(thread_id)
+                    thread_ids.append(thread_id)
+
+            threads = {}
+            for i, thread_id in enumerate(thread_ids):
+                # Get threads to check if we replied, a batch at a time and only
+                # as far into the page as it takes to find max_results.
+                if i % BATCH_SIZE == 0:
+                    threads = self._batch_get(
+                        service,
+                        lambda tid: service.users().threads().get(
+                            userId='me',
+                            id=tid,
+                            format='metadata',
+                            metadataHeaders=['From', 'Subject', 'Date']
+                        ),
+                        thread_ids[i:i + BATCH_SIZE],
+                    )
+                thread = threads.get(thread_id)
+                if thread is None:
                     continue
-                seen_threads.add(thread_id)
-
-                # Get full thread
-                thread = service.users().threads().get(
-                    userId='me',
-                    id=thread_id,
-                    format='metadata',
-                    metadataHeaders=['From', 'Subject', 'Date']
-                ).execute()
 
                 thread_messages = thread.get('messages', [])
                 if not thread_messages:
@@ -1421,10 +1630,18 @@ Emails:
     # === CSV Caching ===
 
     def sync_emails(self, days_back: int = 300) -> str:
-        """Sync emails to CSV cache file with full content (incremental).
+        """Sync emails into the local index (SQLite, full-text searchable), incrementally.
 
-        First run: fetches all emails from last N days with full body.
-        Subsequent runs: only fetches new emails not already in cache.
+        First run: lists the messages from the last N days and fetches each
+        one not yet indexed, with its full body.
+        Later runs: reads Gmail's history since the last sync and applies only
+        what changed -- new messages fetched, deleted ones dropped, label
+        changes (read, archived) recorded. A longer days_back than the last
+        full sync, or a last sync too old for Gmail's history, lists the
+        window again; messages already indexed are still not re-fetched.
+
+        While the index is fresh (synced within index_max_age seconds),
+        search_emails() and the contact scans answer from it.
 
         Args:
             days_back: How many days of email history to sync (default: 300)
@@ -1432,93 +1649,117 @@ Emails:
         Returns:
             Summary of sync operation
         """
-        if not self.emails_csv:
-            return "No emails_csv path configured. Initialize Gmail with emails_csv parameter."
+        if not self.emails_db:
+            return "No emails_db path configured. Initialize Gmail with emails_db parameter."
 
-        import csv
-        import base64
-        from datetime import datetime, timedelta
+        import time
 
         service = self._get_service()
+        index = self._index(create=True)
 
-        # Get existing email IDs from cache
-        existing_ids = set()
-        if os.path.exists(self.emails_csv):
-            with open(self.emails_csv, 'r', encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    existing_ids.add(row['id'])
-
-        # Build query for date range
-        after_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y/%m/%d')
-        query = f"after:{after_date}"
-
-        # Fetch ALL email IDs in date range with pagination
-        messages = []
-        page_token = None
-        while True:
-            results = service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=100,
-                pageToken=page_token
-            ).execute()
-            messages.extend(results.get('messages', []))
-            page_token = results.get('nextPageToken')
-            if not page_token:
-                break
-
-        # Filter out already cached emails
-        new_msg_ids = [msg for msg in messages if msg['id'] not in existing_ids]
-
-        def get_email_body(payload):
-            """Extract plain text body from email payload."""
-            if 'body' in payload and payload['body'].get('data'):
-                return base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8', errors='replace')
-
-            if 'parts' in payload:
-                for part in payload['parts']:
-                    if part['mimeType'] == 'text/plain' and part['body'].get('data'):
-                        return base64.urlsafe_b64decode(part['body']['data']).decode('utf-8', errors='replace')
-                    # Recurse into nested parts
-                    if 'parts' in part:
-                        result = get_email_body(part)
-                        if result:
-                            return result
-            return ''
-
-        new_emails = []
-        for msg in new_msg_ids:
-            message = service.users().messages().get(
-                userId='me',
-                id=msg['id'],
-                format='full'
-            ).execute()
+        added, deleted, relabelled = [], set(), {}
+        history_id = index.state('history_id')
+        lost = False
+        if history_id is not None:
+            try:
+                records, new_history_id = self._history_since(service, history_id)
+            except HttpError as e:
+                if _status(e) != 404:
+                    raise
+                lost = True
+            else:
+                for record in records:
+                    added.extend(entry['message']['id'] for entry in record.get('messagesAdded', []))
+                    deleted.update(entry['message']['id'] for entry in record.get('messagesDeleted', []))
+                    for kind in ('labelsAdded', 'labelsRemoved'):
+                        for entry in record.get(kind, []):
+                            if 'labelIds' in entry['message']:
+                                relabelled[entry['message']['id']] = entry['message']['labelIds']
+
+        full = history_id is None or lost or days_back > int(index.state('window_days', 0))
+        if full:
+            if history_id is None or lost:
+                # Bookmarked before listing, so whatever changes while the
+                # window is being listed is in the next sync's history.
+                new_history_id = service.users().getProfile(userId='me').execute()['historyId']
+            window_start = time.time() - days_back * 86400
+            after_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y/%m/%d')
+            listed = []
+            page_token = None
+            while True:
+                results = service.users().messages().list(
+                    userId='me',
+                    q=f"after:{after_date}",
+                    maxResults=500,
+                    pageToken=page_token
+                ).execute()
+                listed.extend(msg['id'] for msg in results.get('messages', []))
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
+            added.extend(listed)
+            if lost:
+                # Gmail no longer has the history to say what changed since
+                # the last sync: what the window no longer lists was deleted,
+                # and everything it does list is fetched again for its labels.
+                deleted.update(index.ids_since(window_start) - set(listed))
+
+        added = [mid for mid in dict.fromkeys(added) if mid not in deleted]
+        known = set() if lost else index.known(added)
+        new_ids = [mid for mid in added if mid not in known]
+
+        # Labels first: a message fetched below carries its current labels,
+        # which must win over an older history entry's.
+        index.set_labels({mid: labels for mid, labels in relabelled.items() if mid not in deleted})
+        index.delete(deleted)
+
+        # Fetched in batches and written a chunk at a time, so an interrupted
+        # first sync keeps what it got; the next one skips those ids.
+        fetched = 0
+        for start in range(0, len(new_ids), SYNC_CHUNK):
+            messages = self._batch_get(
+                service,
+                lambda mid: service.users().messages().get(userId='me', id=mid, format='full'),
+                new_ids[start:start + SYNC_CHUNK],
+            )
+            fetched += index.put(self._index_record(message) for message in messages.values())
 
-            headers = {h['name']: h['value'] for h in message['payload'].get('headers', [])}
-            body = get_email_body(message['payload'])
+        state = {'history_id': new_history_id, 'synced_at': time.time()}
+        if full:
+            state.update(window_start=window_start, window_days=days_back)
+        index.set_state(**state)
 
-            new_emails.append({
-                'id': msg['id'],
-                'thread_id': message.get('threadId', ''),
-                'from_email': headers.get('From', ''),
-                'to_email': headers.get('To', ''),
-                'subject': headers.get('Subject', ''),
-                'date': headers.get('Date', ''),
-                'body': body,
-                'snippet': message.get('snippet', '')
-            })
+        if full:
+            return (f"Synced {fetched} new emails (from {len(added)} total in last {days_back} days). "
+                    f"Index now has {index.count()} emails.")
+        return (f"Synced {fetched} new emails, {len(deleted)} deleted, {len(relabelled)} relabelled "
+                f"since the last sync. Index now has {index.count()} emails.")
 
-        # Append new emails to CSV
-        fieldnames = ['id', 'thread_id', 'from_email', 'to_email', 'subject', 'date', 'body', 'snippet']
-        file_exists = os.path.exists(self.emails_csv) and os.path.getsize(self.emails_csv) > 0
-        with open(self.emails_csv, 'a', newline='', encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if not file_exists:
-                writer.writeheader()
-            writer.writerows(new_emails)
+    def _index_record(self, message) -> dict:
+        """A messages.get(format='full') response as a MailIndex row."""
+        from email.utils import parsedate_to_datetime
 
-        return f"Synced {len(new_emails)} new emails (from {len(messages)} total in last {days_back} days). Cache now has {len(existing_ids) + len(new_emails)} emails."
+        headers = {h['name']: h['value'] for h in message['payload'].get('headers', [])}
+        if message.get('internalDate'):
+            ts = int(message['internalDate']) / 1000
+        else:
+            try:
+                ts = parsedate_to_datetime(headers.get('Date', '')).timestamp()
+            except (TypeError, ValueError):
+                ts = 0.0
+        return {
+            'id': message['id'],
+            'thread_id': message.get('threadId', ''),
+            'from_email': headers.get('From', ''),
+            'to_email': headers.get('To', ''),
+            'cc': headers.get('Cc', ''),
+            'subject': headers.get('Subject', ''),
+            'date': headers.get('Date', ''),
+            'ts': ts,
+            'body': self._extract_body(message['payload']),
+            'snippet': message.get('snippet', ''),
+            'labels': ' '.join(message.get('labelIds', [])),
+        }
 
     def sync_contacts(self, max_emails: int = 500, exclude_domains: str = "") -> str:
         """Sync contacts - adds new, updates existing, KEEPS all contacts, PRESERVES CRM data.
@@ -0,0 +1,230 @@
+"""
+Purpose: Local SQLite + FTS5 index of synced Gmail messages, so searches and contact scans can skip the API
+LLM-Note:
+  Dependencies: imports from [re, sqlite3, threading, time, pathlib] | imported by [useful_tools/gmail.py (lazy)] | tested by [tests/unit/test_gmail_sync_index.py]
+  Data flow: Gmail.sync_emails() → MailIndex.put(records) upserts messages rows (triggers keep messages_fts in step) / delete(ids) / set_labels(id, labels) → set_state(history_id, synced_at, window_start, window_days) | Gmail.list_search() → MailIndex.search(query, limit) → parse_query() turns the Gmail query into SQL, or None when the index cannot answer it | Gmail._scan_contacts() → MailIndex.recent(limit) → as_message(row) in the metadata shape the scan already reads
+  State/Effects: one SQLite file (WAL) per Gmail instance's emails_db path, created by the first sync | tables messages, messages_fts (external-content FTS5), state | a thread-local connection per index
+  Integration: exposes MailIndex (put, delete, set_labels, known, ids_since, count, state, set_state, fresh, complete_since, search, recent), parse_query(), as_message()
+  Performance: search is one FTS5 MATCH plus an indexed ORDER BY ts; put/delete are single executemany statements | nothing reads the whole mailbox to find what is already there, unlike the old emails.csv scan
+  Errors: queries the index cannot express (labels, dates, negation, grouping) return None so the caller asks Gmail instead | sqlite3 errors propagate
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS messages ("
+    "id TEXT PRIMARY KEY, thread_id TEXT, from_email TEXT, to_email TEXT, cc TEXT"
+    ", subject TEXT, date TEXT, ts REAL, body TEXT, snippet TEXT, labels TEXT)",
+    "CREATE INDEX IF NOT EXISTS messages_ts ON messages(ts)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5("
+    "subject, from_email, to_email, body, snippet, content='messages', content_rowid='rowid')",
+    # External-content FTS: the triggers are what keep the index in step.
+    "CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN "
+    "INSERT INTO messages_fts(rowid, subject, from_email, to_email, body, snippet) "
+    "VALUES (new.rowid, new.subject, new.from_email, new.to_email, new.body, new.snippet); END",
+    "CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN "
+    "INSERT INTO messages_fts(messages_fts, rowid, subject, from_email, to_email, body, snippet) "
+    "VALUES ('delete', old.rowid, old.subject, old.from_email, old.to_email, old.body, old.snippet); END",
+    "CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE ON messages BEGIN "
+    "INSERT INTO messages_fts(messages_fts, rowid, subject, from_email, to_email, body, snippet) "
+    "VALUES ('delete', old.rowid, old.subject, old.from_email, old.to_email, old.body, old.snippet); "
+    "INSERT INTO messages_fts(rowid, subject, from_email, to_email, body, snippet) "
+    "VALUES (new.rowid, new.subject, new.from_email, new.to_email, new.body, new.snippet); END",
+    "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID",
+)
+
+_COLUMNS = ("id", "thread_id", "from_email", "to_email", "cc", "subject", "date", "ts",
+            "body", "snippet", "labels")
+
+# Gmail's own listings leave these out unless asked; so does the index.
+_LISTED = ("NOT (' ' || coalesce(labels, '') || ' ' LIKE '% SPAM %'"
+           " OR ' ' || coalesce(labels, '') || ' ' LIKE '% TRASH %')")
+
+# Under SQLite's default bound on host parameters.
+_IN_CHUNK = 500
+
+_TOKEN = re.compile(r'\S+?:"[^"]*"|"[^"]*"|\S+')
+
+
+def parse_query(query: str):
+    """A Gmail search as OR-ed groups of AND-ed (field, value) terms, or None.
+
+    Understood: bare words, "quoted phrases", from:, to:, subject:, and OR
+    between terms -- enough for the searches agents and analyze_contact() send.
+    Anything else (label:, is:, after:, -negation, grouping) returns None and
+    the caller asks Gmail, which understands all of it.
+    """
+    groups, terms = [], []
+    for token in _TOKEN.findall(query or ""):
+        if token == "OR":
+            if not terms:
+                return None
+            groups.append(terms)
+            terms = []
+            continue
+        if token[0] in "-({}" or token.endswith(")"):
+            return None
+        field, sep, value = token.partition(":")
+        if not sep or token.startswith('"'):
+            field, value = "text", token
+        elif field.lower() not in ("from", "to", "subject"):
+            return None
+        value = value.strip('"')
+        if not value:
+            return None
+        terms.append((field.lower(), value))
+    if not terms:
+        return None
+    groups.append(terms)
+    return groups
+
+
+def _like(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _condition(field: str, value: str):
+    if field == "from":
+        return "from_email LIKE ? ESCAPE '\\'", [_like(value)]
+    if field == "to":
+        return "(to_email LIKE ? ESCAPE '\\' OR cc LIKE ? ESCAPE '\\')", [_like(value), _like(value)]
+    match = _phrase(value) if field == "text" else f"subject : {_phrase(value)}"
+    return "rowid IN (SELECT rowid FROM messages_fts WHERE messages_fts MATCH ?)", [match]
+
+
+def as_message(row: dict) -> dict:
+    """A stored row in the shape of a messages.get(format='metadata') response."""
+    headers = [("From", row["from_email"]), ("To", row["to_email"]), ("Cc", row["cc"]),
+               ("Subject", row["subject"]), ("Date", row["date"])]
+    return {
+        "id": row["id"],
+        "threadId": row["thread_id"],
+        "snippet": row["snippet"] or "",
+        "labelIds": (row["labels"] or "").split(),
+        "payload": {"headers": [{"name": name, "value": value} for name, value in headers if value]},
+    }
+
+
+class MailIndex:
+    """Synced messages in SQLite, full-text searchable, with the sync's bookmark."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        db = self._db()
+        with db:
+            for statement in _SCHEMA:
+                db.execute(statement)
+
+    def _db(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode = WAL")
+            db.execute("PRAGMA synchronous = NORMAL")
+            self._local.db = db
+        return db
+
+    # -- writes ---------------------------------------------------------------
+
+    def put(self, records) -> int:
+        """Insert or update message records (dicts keyed by column name)."""
+        rows = [tuple(record.get(column) for column in _COLUMNS) for record in records]
+        updates = ", ".join(f"{c} = excluded.{c}" for c in _COLUMNS[1:])
+        db = self._db()
+        with db:
+            db.executemany(
+                f"INSERT INTO messages ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)}) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                rows,
+            )
+        return len(rows)
+
+    def delete(self, ids) -> None:
+        db = self._db()
+        with db:
+            db.executemany("DELETE FROM messages WHERE id = ?", [(i,) for i in ids])
+
+    def set_labels(self, labels_by_id: dict) -> None:
+        db = self._db()
+        with db:
+            db.executemany("UPDATE messages SET labels = ? WHERE id = ?",
+                           [(" ".join(labels), mid) for mid, labels in labels_by_id.items()])
+
+    def set_state(self, **values) -> None:
+        db = self._db()
+        with db:
+            db.executemany("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                           [(key, str(value)) for key, value in values.items()])
+
+    # -- reads ----------------------------------------------------------------
+
+    def state(self, key: str, default=None):
+        row = self._db().execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def known(self, ids) -> set:
+        """Which of `ids` are already stored."""
+        wanted, found = list(ids), set()
+        for i in range(0, len(wanted), _IN_CHUNK):
+            chunk = wanted[i:i + _IN_CHUNK]
+            marks = ", ".join("?" for _ in chunk)
+            found.update(row[0] for row in self._db().execute(
+                f"SELECT id FROM messages WHERE id IN ({marks})", chunk))
+        return found
+
+    def ids_since(self, ts: float) -> set:
+        """Ids of the stored messages dated `ts` or later."""
+        return {row[0] for row in self._db().execute("SELECT id FROM messages WHERE ts >= ?", (ts,))}
+
+    def count(self) -> int:
+        return self._db().execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+    def fresh(self, max_age: float) -> bool:
+        """Synced within the last `max_age` seconds."""
+        synced_at = self.state("synced_at")
+        return synced_at is not None and time.time() - float(synced_at) <= max_age
+
+    def complete_since(self) -> float:
+        """The epoch time from which every message is in the index (inf if none)."""
+        return float(self.state("window_start", "inf"))
+
+    def search(self, query: str, limit: int):
+        """The newest `limit` stored messages matching a Gmail query, or None.
+
+        None means the query uses syntax parse_query() does not cover.
+        """
+        groups = parse_query(query)
+        if groups is None:
+            return None
+        clauses, params = [], []
+        for terms in groups:
+            parts = []
+            for field, value in terms:
+                sql, values = _condition(field, value)
+                parts.append(sql)
+                params.extend(values)
+            clauses.append("(" + " AND ".join(parts) + ")")
+        return self._rows(f"WHERE ({' OR '.join(clauses)}) AND {_LISTED}", params, limit)
+
+    def recent(self, limit: int) -> list:
+        """The newest `limit` stored messages, as messages.list would list them."""
+        return self._rows(f"WHERE {_LISTED}", [], limit)
+
+    def _rows(self, where: str, params: list, limit: int) -> list:
+        cursor = self._db().execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM messages {where} ORDER BY ts DESC LIMIT ?",
+            [*params, limit])
+        return [dict(row) for row in cursor]
@@ -1,12 +1,12 @@
 """
 Purpose: Microsoft Calendar integration tool for managing events via Microsoft Graph API
 LLM-Note:
-  Dependencies: imports from [os, datetime, httpx] | imported by [useful_tools/__init__.py] | requires OAuth tokens from 'co auth microsoft' | tested by [tests/unit/test_microsoft_calendar.py]
+  Dependencies: imports from [os, datetime, httpx, useful_tools/_graph.py] | imported by [useful_tools/__init__.py] | requires OAuth tokens from 'co auth microsoft' | tested by [tests/unit/test_microsoft_calendar.py]
   Data flow: Agent calls MicrosoftCalendar methods → refresh validates the ambient OpenOnion account before exchanging locally owned Microsoft tokens via oo-api → HTTP calls to Graph API (https://graph.microsoft.com/v1.0) → returns formatted results (event lists, confirmations, free slots)
   State/Effects: reads and locally refreshes MICROSOFT_* OAuth tokens | persists rotated tokens to user keys.env and an existing project .env | makes HTTP calls to Microsoft Graph API | can create/update/delete events, create Teams meetings
   Integration: exposes MicrosoftCalendar class with list_events(), get_today_events(), get_event(), create_event(), update_event(), delete_event(), create_teams_meeting(), get_upcoming_meetings(), find_free_slots(), check_availability() | used as agent tool via Agent(tools=[MicrosoftCalendar()])
-  Performance: network I/O per API call | batch fetching for list operations | date parsing for queries
-  Errors: raises ValueError if OAuth not configured | HTTP errors from Graph API propagate | returns error strings for display
+  Performance: network I/O per API call, over the Graph connection pool shared with Outlook (graph_client) | batch fetching for list operations | date parsing for queries
+  Errors: raises ValueError if OAuth not configured | HTTP errors from Graph API propagate as GraphError (a ValueError with status_code) | returns error strings for display
 
 Microsoft Calendar tool for managing calendar events via Microsoft Graph API.
 
@@ -48,6 +48,7 @@ from pathlib import Path
 import httpx
 from ..backend import backend_url
 from ..credentials import require_ambient_api_key
+from ._graph import GraphError, graph_client
 
 
 class MicrosoftCalendar:
@@ -155,7 +156,8 @@ class MicrosoftCalendar:
         }
 
         url = f"{self.GRAPH_API_URL}{endpoint}"
-        response = httpx.request(method, url, headers=headers, **kwargs)
+        client = graph_client()
+        response = client.request(method, url, headers=headers, **kwargs)
 
         if response.status_code == 401:
             refresh_token = os.getenv("MICROSOFT_REFRESH_TOKEN")
@@ -163,10 +165,10 @@ class MicrosoftCalendar:
                 self._access_token = None
                 token = self._refresh_via_backend(refresh_token)
                 headers["Authorization"] = f"Bearer {token}"
-                response = httpx.request(method, url, headers=headers, **kwargs)
+                response = client.request(method, url, headers=headers, **kwargs)
 
         if response.status_code not in [200, 201, 202, 204]:
-            raise ValueError(f"Microsoft Graph API error: {response.status_code} - {response.text}")
+            raise GraphError(response.status_code, response.text)
 
         if response.status_code == 204:
             return {}
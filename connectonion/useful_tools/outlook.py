@@ -1,12 +1,12 @@
 """
 Purpose: Outlook integration tool for email and contact management via Microsoft Graph API
 LLM-Note:
-  Dependencies: imports from [os, html, httpx] | imported by [useful_tools/__init__.py] | requires OAuth tokens from 'co auth microsoft' | tested by [tests/unit/test_outlook.py]
-  Data flow: Agent calls Outlook methods → _get_access_token() validates the ambient OpenOnion account and refreshes locally owned Microsoft tokens via oo-api → HTTP calls to Graph API (https://graph.microsoft.com/v1.0) → returns email/contact data or confirmations | download_attachments() decodes Graph fileAttachment bytes into a caller-selected project directory without overwriting existing paths | send()/reply() with attachments share _encoded_attachments() (validate, size-check, base64) and place fileAttachments on the sent message — reply() puts them on the reply action's message so Graph still threads it | send()/reply() with send_at attach deferred-send extended property (SystemTime 0x3FEF) so Exchange holds delivery | reply() escapes bodies (html.escape) and converts to HTML <p> paragraphs (blank-line splits, \n → <br>) since Graph renders the comment as HTML | get_scheduled() and contacts page through Graph collections
-  State/Effects: reads MICROSOFT_* env vars for OAuth tokens/scopes | makes HTTP calls to Microsoft Graph API | can modify mailbox state (mark read, archive, send emails), create contacts, and write downloaded attachments inside the project boundary | token refresh rewrites ~/.co/keys.env
+  Dependencies: imports from [os, html, datetime, httpx, useful_tools/_graph.py] | imported by [useful_tools/__init__.py] | requires OAuth tokens from 'co auth microsoft' | tested by [tests/unit/test_outlook.py, tests/unit/test_outlook_graph_transport.py]
+  Data flow: Agent calls Outlook methods → _get_access_token() validates the ambient OpenOnion account and refreshes locally owned Microsoft tokens via oo-api → HTTP calls to Graph API (https://graph.microsoft.com/v1.0) → returns email/contact data or confirmations | download_attachments() decodes Graph fileAttachment bytes into a caller-selected project directory without overwriting existing paths | send()/reply() with attachments share _encoded_attachments() (validate, size-check, base64) and place fileAttachments on the sent message — reply() puts them on the reply action's message so Graph still threads it | send()/reply() with send_at attach deferred-send extended property (SystemTime 0x3FEF) so Exchange holds delivery | reply() escapes bodies (html.escape) and converts to HTML <p> paragraphs (blank-line splits, \n → <br>) since Graph renders the comment as HTML | get_scheduled() pages through Graph collections | list_inbox() and the contact methods read per-instance mirrors kept current by _delta() (inbox: the last inbox_window_days via messages/delta, first walked by _warm() in the background from the instance's second read; contacts: contactFolders/{id}/contacts/delta per folder) | mark_read/mark_unread/archive_email/get_email_body with comma-separated ids go through _batch() → _graph.run_batch ($batch, 20 per request)
+  State/Effects: reads MICROSOFT_* env vars for OAuth tokens/scopes | _mirrors holds each delta collection and its deltaLink for the instance's lifetime, and _contact_folder_ids the folders found on first use | makes HTTP calls to Microsoft Graph API | can modify mailbox state (mark read, archive, send emails), create contacts, and write downloaded attachments inside the project boundary | token refresh rewrites ~/.co/keys.env
   Integration: exposes Outlook class with email methods plus add_contact(), list_contacts(), search_contacts() | structured list methods feed cli/commands/outlook_commands.py | used as agent tool via Agent(tools=[Outlook()]) | reply(email_id, body, send_at, *, attachments) keeps send_at third positional for pre-attachment callers, so attachments is keyword-only
-  Performance: network I/O per API call | batch fetching for list operations | email body fetched separately
-  Errors: raises ValueError if OAuth not configured | HTTP errors from Graph API propagate | deferred drafts cannot be deleted via API (Exchange 403) — cancel via Outlook's own Cancel Send | returns error strings for display to user
+  Performance: every call reuses the process-wide pooled httpx.Client (graph_client) instead of a fresh connection | a cold list_inbox() is one $top request; once the mirror is warm a repeated list_inbox()/list_contacts()/search_contacts() transfers only the delta since the last call | bulk actions cost one round trip per 20 ids | email body fetched separately
+  Errors: raises ValueError if OAuth not configured | HTTP errors from Graph API propagate as GraphError (a ValueError with status_code) | a bulk action reports each failed id instead of raising | an expired deltaLink (410) re-walks the collection | deferred drafts cannot be deleted via API (Exchange 403) — cancel via Outlook's own Cancel Send | returns error strings for display to user
 
 Outlook tool for reading and managing Outlook emails via Microsoft Graph API.
 
@@ -46,6 +46,8 @@ Example:
 
 import html
 import os
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import httpx
@@ -53,9 +55,14 @@ from ..backend import backend_url
 from ..credentials import require_ambient_api_key
 from ..project import project_root
 from ._attachment_files import path_of_open_file
+from ._graph import GraphError, graph_client, run_batch
 
 
 OUTLOOK_ATTACHMENT_LIMIT = 3_000_000
+# Items per page Graph is asked for when walking a delta round.
+DELTA_PAGE_SIZE = 100
+_INBOX_FIELDS = "id,from,subject,receivedDateTime,bodyPreview,isRead"
+_BODY_FIELDS = "from,toRecipients,subject,receivedDateTime,body"
 
 
 class Outlook:
@@ -63,11 +70,19 @@ class Outlook:
 
     GRAPH_API_URL = "https://graph.microsoft.com/v1.0"
 
-    def __init__(self, allow_external_attachments: bool = False):
+    def __init__(self, allow_external_attachments: bool = False, inbox_window_days: int = 14):
         """Initialize Outlook tool.
 
         Validates that Microsoft OAuth is configured.
         Raises ValueError if credentials are missing.
+
+        Args:
+            allow_external_attachments: Let trusted operator code attach files
+                outside the project. Agent-facing instances should keep the
+                secure default.
+            inbox_window_days: Days of inbox this instance mirrors through
+                Graph delta, so repeated list_inbox() calls transfer only what
+                changed (default: 14). 0 asks Graph every time.
         """
         scopes = os.getenv("MICROSOFT_SCOPES", "")
         granted_scopes = set(scopes.replace(",", " ").split())
@@ -86,6 +101,13 @@ class Outlook:
         self._access_token = None
         self._attachment_root = project_root().resolve()
         self._allow_external_attachments = allow_external_attachments
+        self.inbox_window_days = inbox_window_days
+        # name -> {'items': {id: item}, 'link': deltaLink, 'since': ...}
+        self._mirrors = {}
+        # name -> the thread walking that mirror's first round
+        self._warming = {}
+        self._inbox_reads = 0
+        self._contact_folder_ids = None
 
     def _require_scope(self, required_scope: str) -> None:
         """Raise a re-consent hint when an operation's OAuth scope is absent."""
@@ -176,16 +198,18 @@ class Outlook:
 
         return new_access_token
 
-    def _request(self, method: str, endpoint: str, **kwargs) -> dict:
+    def _request(self, method: str, endpoint: str, headers: dict = None, **kwargs) -> dict:
         """Make authenticated request to Microsoft Graph API."""
         token = self._get_access_token()
         headers = {
             "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            **(headers or {}),
         }
 
         url = f"{self.GRAPH_API_URL}{endpoint}"
-        response = httpx.request(method, url, headers=headers, **kwargs)
+        client = graph_client()
+        response = client.request(method, url, headers=headers, **kwargs)
 
         if response.status_code == 401:
             # Token might have expired, try refreshing
@@ -194,16 +218,128 @@ class Outlook:
                 self._access_token = None
                 token = self._refresh_via_backend(refresh_token)
                 headers["Authorization"] = f"Bearer {token}"
-                response = httpx.request(method, url, headers=headers, **kwargs)
+                response = client.request(method, url, headers=headers, **kwargs)
 
         if response.status_code not in [200, 201, 202, 204]:
-            raise ValueError(f"Microsoft Graph API error: {response.status_code} - {response.text}")
+            raise GraphError(response.status_code, response.text)
 
         # 202 (sendMail) and 204 come back with an empty body
         if response.status_code == 204 or not response.text:
             return {}
         return response.json()
 
+    def _batch(self, requests: list) -> list:
+        """Run Graph requests through $batch, 20 per round trip; responses in order."""
+        return run_batch(lambda body: self._request("POST", "/$batch", json=body), requests)
+
+    def _each(self, email_id: str, method: str, path: str, body: dict = None) -> tuple:
+        """Send one request per id in `email_id` (comma-separated) to `path` (with {id}).
+
+        One id is one plain request, whose failure raises as always. Several
+        go through $batch and come back as (ids that succeeded, [(id, error)]).
+        """
+        ids = [i.strip() for i in email_id.split(",") if i.strip()]
+        if len(ids) == 1:
+            if body is None:
+                self._request(method, path.format(id=ids[0]))
+            else:
+                self._request(method, path.format(id=ids[0]), json=body)
+            return ids, []
+        requests = [{"method": method, "url": path.format(id=i),
+                     **({"body": body} if body is not None else {})} for i in ids]
+        done, failed = [], []
+        for mid, response in zip(ids, self._batch(requests)):
+            if 200 <= response["status"] < 300:
+                done.append(mid)
+            else:
+                failed.append((mid, _part_error(response)))
+        return done, failed
+
+    @staticmethod
+    def _summary(done: list, failed: list, action: str) -> str:
+        """Confirmation for an action on one email or several."""
+        if len(done) == 1 and not failed:
+            return f"{action}: {done[0]}"
+        lines = [f"{action} ({len(done)}): {', '.join(done)}" if done else f"{action}: none"]
+        lines += [f"Failed {mid}: {error}" for mid, error in failed]
+        return "\n".join(lines)
+
+    def _delta(self, name: str, endpoint: str, params: dict = None, **state) -> dict:
+        """The `name` collection by id, kept current through Graph delta.
+
+        The first call walks every page of `endpoint` (a delta function) and
+        keeps the deltaLink Graph ends the round with. Later calls send only
+        that link and get back what was added, changed or removed since --
+        usually one small page. A link Graph no longer honours (410) starts
+        the walk over. A round that ends without a deltaLink is returned but
+        not kept, so the next call walks again. `state` is stored on a new
+        mirror with it, so no reader sees the mirror without it.
+        """
+        mirror = self._mirrors.get(name)
+        changes = None
+        if mirror is not None:
+            try:
+                changes, link = self._delta_pages(mirror["link"])
+            except GraphError as e:
+                if e.status_code != 410:
+                    raise
+                mirror = None
+        if mirror is None:
+            changes, link = self._delta_pages(endpoint, params)
+            mirror = {"items": {}, **state}
+
+        items = mirror["items"]
+        for item in changes:
+            if "@removed" in item:
+                items.pop(item.get("id"), None)
+            else:
+                # A change can carry only the properties that changed.
+                items[item["id"]] = {**items.get(item["id"], {}), **item}
+
+        if link:
+            mirror["link"] = link
+            self._mirrors[name] = mirror
+        else:
+            self._mirrors.pop(name, None)
+        return items
+
+    def _warm(self, name: str, endpoint: str, params: dict = None, **state) -> None:
+        """Walk a mirror's first delta round on a background thread, once.
+
+        The walk can be many pages; the caller that triggered it is answered
+        directly and a later call finds the mirror ready. A failed walk is
+        dropped, and the next call after it tries again.
+        """
+        running = self._warming.get(name)
+        if running is not None and running.is_alive():
+            return
+
+        def walk():
+            try:
+                self._delta(name, endpoint, params, **state)
+            except Exception:
+                pass
+
+        thread = threading.Thread(target=walk, daemon=True, name=f"outlook-{name}-delta")
+        self._warming[name] = thread
+        thread.start()
+
+    def _delta_pages(self, endpoint: str, params: dict = None) -> tuple:
+        """Every item of one delta round, and the deltaLink it ended with (or None)."""
+        prefer = {"Prefer": f"odata.maxpagesize={DELTA_PAGE_SIZE}"}
+        items = []
+        while True:
+            result = self._request("GET", endpoint, params=params, headers=prefer)
+            items.extend(result.get("value", []))
+            if result.get("@odata.nextLink"):
+                endpoint, params = self._relative(result["@odata.nextLink"]), None
+                continue
+            delta_link = result.get("@odata.deltaLink")
+            return items, self._relative(delta_link) if delta_link else None
+
+    def _relative(self, link: str) -> str:
+        return link.replace(self.GRAPH_API_URL, "")
+
     def _email_dicts(self, messages: list) -> list:
         """Convert raw Graph messages into plain email dicts."""
         return [{
@@ -253,11 +389,15 @@ class Outlook:
         Returns:
             List of email dicts, newest first
         """
+        mirrored = self._from_inbox_window(last, unread)
+        if mirrored is not None:
+            return self._email_dicts(mirrored)
+
         endpoint = "/me/mailFolders/inbox/messages"
         params = {
             "$top": last,
             "$orderby": "receivedDateTime desc",
-            "$select": "id,from,subject,receivedDateTime,bodyPreview,isRead"
+            "$select": _INBOX_FIELDS
         }
 
         if unread:
@@ -269,6 +409,49 @@ class Outlook:
         result = self._request("GET", endpoint, params=params)
         return self._email_dicts(result.get('value', []))
 
+    def _from_inbox_window(self, last: int, unread: bool):
+        """The newest `last` inbox messages from the delta mirror, or None.
+
+        The mirror holds every inbox message received since its window
+        started, so its newest `last` are the inbox's newest `last` -- as long
+        as the oldest of them is inside the window. When it is not (the
+        window has fewer), Graph is asked directly.
+
+        Without a mirror the answer is None too, so a cold call costs one
+        $top request rather than a walk of the whole window. Only a second
+        read on the same instance -- a caller that lives long enough to
+        repeat itself -- starts that walk, in the background; one-shot CLI
+        calls and short-lived agents never pay for it.
+        """
+        if self.inbox_window_days <= 0 or last < 1:
+            return None
+        self._inbox_reads += 1
+        mirror = self._mirrors.get("inbox")
+        if mirror is None:
+            if self._inbox_reads > 1:
+                since = (datetime.now(timezone.utc) - timedelta(days=self.inbox_window_days)
+                         ).strftime("%Y-%m-%dT%H:%M:%SZ")
+                self._warm("inbox", "/me/mailFolders/inbox/messages/delta", {
+                    "$select": _INBOX_FIELDS,
+                    "$filter": f"receivedDateTime ge {since}",
+                }, since=since)
+            return None
+        since = mirror["since"]
+        messages = self._delta("inbox", "/me/mailFolders/inbox/messages/delta", {
+            "$select": _INBOX_FIELDS,
+            "$filter": f"receivedDateTime ge {since}",
+        }, since=since)
+        if "inbox" not in self._mirrors:
+            return None
+
+        newest = sorted(messages.values(), key=lambda m: m.get("receivedDateTime", ""), reverse=True)
+        if unread:
+            newest = [m for m in newest if not m.get("isRead", True)]
+        picked = newest[:last]
+        if len(picked) < last or picked[-1].get("receivedDateTime", "") < since:
+            return None
+        return picked
+
     def read_inbox(self, last: int = 10, unread: bool = False) -> str:
         """Read emails from inbox.
 
@@ -363,18 +546,40 @@ class Outlook:
         }
 
     def _iter_contacts(self):
-        """Yield normalized contacts from every Graph contacts page."""
-        endpoint = (
-            "/me/contacts"
-            "?$select=id,displayName,emailAddresses"
-            "&$orderby=displayName&$top=100"
-        )
-        while endpoint:
-            result = self._request("GET", endpoint)
-            for contact in result.get("value", []):
-                yield self._contact_dict(contact)
-            next_link = result.get("@odata.nextLink")
-            endpoint = next_link.replace(self.GRAPH_API_URL, "") if next_link else None
+        """Yield normalized contacts, by display name, from the delta mirrors.
+
+        Graph's contacts delta is per folder (contactFolders/{id}/contacts/
+        delta), so there is one mirror per contact folder. The first call
+        pages through every contact; later ones fetch only the contacts
+        added, changed or deleted since.
+        """
+        contacts = {}
+        for folder_id in self._contact_folders():
+            contacts.update(self._delta(
+                f"contacts/{folder_id}",
+                f"/me/contactFolders/{folder_id}/contacts/delta?$select=id,displayName,emailAddresses",
+            ))
+        for contact in sorted(contacts.values(), key=lambda c: (c.get("displayName") or "").casefold()):
+            yield self._contact_dict(contact)
+
+    def _contact_folders(self) -> list:
+        """The default contacts folder's id, then its subfolders', looked up once.
+
+        /me/contactFolders lists the subfolders, each naming the default
+        folder as its parent. With no subfolders, a contact in the default
+        folder names it instead; with neither there are no contacts to sync.
+        """
+        if self._contact_folder_ids is None:
+            folders = self._request("GET", "/me/contactFolders", params={
+                "$select": "id,parentFolderId", "$top": 100}).get("value", [])
+            parents = [f["parentFolderId"] for f in folders if f.get("parentFolderId")]
+            if not parents:
+                sample = self._request("GET", "/me/contacts", params={
+                    "$select": "parentFolderId", "$top": 1}).get("value", [])
+                parents = [c["parentFolderId"] for c in sample if c.get("parentFolderId")]
+            self._contact_folder_ids = list(dict.fromkeys(
+                parents[:1] + [f["id"] for f in folders if f.get("id")]))
+        return self._contact_folder_ids
 
     def add_contact(self, name: str, email: str) -> dict:
         """Create an Outlook contact with a display name and email address."""
@@ -422,18 +627,34 @@ class Outlook:
         """Get full email body.
 
         Args:
-            email_id: Outlook message ID
+            email_id: Outlook message ID, or several separated by commas
+                (fetched together in one batch request)
 
         Returns:
             Full email content with headers
         """
-        endpoint = f"/me/messages/{email_id}"
+        ids = [i.strip() for i in email_id.split(",") if i.strip()]
+        if len(ids) > 1:
+            responses = self._batch([
+                {"method": "GET", "url": f"/me/messages/{mid}?$select={_BODY_FIELDS}"} for mid in ids
+            ])
+            bodies = []
+            for mid, response in zip(ids, responses):
+                if 200 <= response["status"] < 300:
+                    bodies.append(self._format_body(response["body"] or {}))
+                else:
+                    bodies.append(f"ID: {mid}\nError: {_part_error(response)}")
+            return "\n\n========\n\n".join(bodies)
+
+        endpoint = f"/me/messages/{ids[0] if ids else email_id}"
         params = {
-            "$select": "from,toRecipients,subject,receivedDateTime,body"
+            "$select": _BODY_FIELDS
         }
 
-        message = self._request("GET", endpoint, params=params)
+        return self._format_body(self._request("GET", endpoint, params=params))
 
+    def _format_body(self, message: dict) -> str:
+        """A fetched message as headers plus plain-text body."""
         from_email = message.get('from', {}).get('emailAddress', {})
         from_addr = f"{from_email.get('name', '')} <{from_email.get('address', '')}>"
 
@@ -807,49 +1028,40 @@ class Outlook:
         """Mark email as read.
 
         Args:
-            email_id: Outlook message ID
+            email_id: Outlook message ID, or several separated by commas
+                (sent together in one batch request)
 
         Returns:
             Confirmation message
         """
-        endpoint = f"/me/messages/{email_id}"
-        data = {"isRead": True}
-
-        self._request("PATCH", endpoint, json=data)
-
-        return f"Marked email as read: {email_id}"
+        done, failed = self._each(email_id, "PATCH", "/me/messages/{id}", {"isRead": True})
+        return self._summary(done, failed, "Marked email as read")
 
     def mark_unread(self, email_id: str) -> str:
         """Mark email as unread.
 
         Args:
-            email_id: Outlook message ID
+            email_id: Outlook message ID, or several separated by commas
+                (sent together in one batch request)
 
         Returns:
             Confirmation message
         """
-        endpoint = f"/me/messages/{email_id}"
-        data = {"isRead": False}
-
-        self._request("PATCH", endpoint, json=data)
-
-        return f"Marked email as unread: {email_id}"
+        done, failed = self._each(email_id, "PATCH", "/me/messages/{id}", {"isRead": False})
+        return self._summary(done, failed, "Marked email as unread")
 
     def archive_email(self, email_id: str) -> str:
         """Archive email (move to archive folder).
 
         Args:
-            email_id: Outlook message ID
+            email_id: Outlook message ID, or several separated by commas
+                (sent together in one batch request)
 
         Returns:
             Confirmation message
         """
-        endpoint = f"/me/messages/{email_id}/move"
-        data = {"destinationId": "archive"}
-
-        self._request("POST", endpoint, json=data)
-
-        return f"Archived email: {email_id}"
+        done, failed = self._each(email_id, "POST", "/me/messages/{id}/move", {"destinationId": "archive"})
+        return self._summary(done, failed, "Archived email")
 
     # === Stats ===
 
@@ -885,3 +1097,11 @@ class Outlook:
         email = result.get('mail') or result.get('userPrincipalName', 'Unknown')
 
         return f"Connected as: {email}"
+
+
+def _part_error(response: dict) -> str:
+    """A failed $batch part as the message a lone request would have raised."""
+    body = response.get("body") or {}
+    error = body.get("error", {}) if isinstance(body, dict) else {}
+    detail = error.get("message") or error.get("code") or body
+    return f"Microsoft Graph API error: {response['status']} - {detail}"
@@ -31,6 +31,8 @@ Usage:
 
 import httpx
 
+from ..core.tool_factory import parallel_safe
+
 
 class WebFetch:
     """Web fetching tool with single-responsibility functions."""
@@ -43,6 +45,7 @@ class WebFetch:
         """
         self.timeout = timeout
 
+    @parallel_safe
     def fetch(self, url: str) -> str:
         """HTTP GET request, returns raw HTML.
 
@@ -176,6 +179,7 @@ class WebFetch:
 
     # === High-level APIs (with LLM) ===
 
+    @parallel_safe
     def analyze_page(self, url: str) -> str:
         """Analyze what a webpage/company does.
 
@@ -196,6 +200,7 @@ class WebFetch:
             system_prompt="Briefly describe what this website/company does in 2-3 sentences. Be concise and factual."
         )
 
+    @parallel_safe
     def get_contact_info(self, url: str) -> str:
         """Extract contact information from a webpage.
 
@@ -365,6 +365,36 @@ def _forget_seen_signatures():
     _seen_signatures.clear()
 
 
+@pytest.fixture(autouse=True)
+def _fresh_shared_clients():
+    """Provider SDK clients are shared process-wide per endpoint and key.
+
+    Unit tests build `AnthropicLLM(api_key="test-key")` and then replace
+    `llm.client.messages` with a fake. With a shared client that fake would
+    be what the next test's "fresh" LLM talks to, so every test starts with
+    an empty registry.
+    """
+    from connectonion.core.http_clients import reset_shared_clients
+
+    reset_shared_clients()
+    yield
+    reset_shared_clients()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_endpoint_cache():
+    """Resolved endpoints are cached process-wide per relay and address.
+
+    Tests resolve the same fake address against a different fake relay reply
+    each time; a cached answer from the last test would stand in for it.
+    """
+    from connectonion.network.connect import clear_endpoint_cache
+
+    clear_endpoint_cache()
+    yield
+    clear_endpoint_cache()
+
+
 @pytest.fixture(autouse=True)
 def _no_stray_project_above_the_test(tmp_path_factory):
     """A `.co/` in a shared parent silently becomes every test's project.
@@ -0,0 +1,85 @@
+"""
+LLM-Note: Manual benchmark for host signature verification
+
+What it measures:
+- verify_signature() per frame at representative payload sizes: a short
+  prompt, a long prompt, and prompts carrying base64 images
+- the old cost (fresh VerifyKey, all three canonical forms serialized) against
+  an unhinted frame and a frame whose `canonical` hint names the signed form
+- Manual script (not pytest): python tests/e2e/manual/host_auth_benchmark.py
+
+Components under test:
+- connectonion.network.host.auth (verify_signature, _verify_key, CANONICAL_FORMS)
+"""
+
+import base64
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from nacl.exceptions import BadSignatureError
+from nacl.signing import SigningKey, VerifyKey
+
+from connectonion.network.host.auth import CANONICAL_FORMS, verify_signature
+
+SIZES = {
+    "short prompt": 200,
+    "long prompt": 16 * 1024,
+    "1 image (256 KB)": 256 * 1024,
+    "images (4 MB)": 4 * 1024 * 1024,
+}
+
+
+def payload_of(size: int) -> dict:
+    payload = {"type": "INPUT", "input_id": "bench", "prompt": "héllo " * 20,
+               "timestamp": int(time.time()), "nonce": "n", "to": "0x" + "12" * 32}
+    if size > 1024:
+        payload["images"] = [base64.b64encode(os.urandom(size * 3 // 4)).decode()]
+    return payload
+
+
+def previous_verify(payload, signature, key_hex) -> bool:
+    """What every frame paid before: a new key and every form serialized up front."""
+    key = VerifyKey(bytes.fromhex(key_hex))
+    forms = [form(payload) for form in CANONICAL_FORMS.values()]
+    for canonical in dict.fromkeys(forms):
+        try:
+            key.verify(canonical.encode(), bytes.fromhex(signature))
+            return True
+        except BadSignatureError:
+            continue
+    return False
+
+
+def per_call_ms(fn, *args) -> float:
+    rounds = 0
+    start = time.perf_counter()
+    while rounds < 5 or time.perf_counter() - start < 0.5:
+        assert fn(*args)
+        rounds += 1
+    return (time.perf_counter() - start) * 1000 / rounds
+
+
+def main():
+    signing_key = SigningKey.generate()
+    key_hex = signing_key.verify_key.encode().hex()
+    print(f"{'payload [signed form]':<28} {'previous':>10} {'no hint':>10} {'hinted':>10}   (ms per frame)")
+    for label, size in SIZES.items():
+        payload = payload_of(size)
+        for signed_form in ("escaped", "utf8"):
+            message = CANONICAL_FORMS[signed_form](payload).encode()
+            signature = signing_key.sign(message).signature.hex()
+            row = (
+                per_call_ms(previous_verify, payload, signature, key_hex),
+                per_call_ms(verify_signature, payload, signature, key_hex),
+                per_call_ms(verify_signature, payload, signature, key_hex, signed_form),
+            )
+            name = f"{label} [{signed_form}]"
+            print(f"{name:<28} " + " ".join(f"{ms:>10.3f}" for ms in row))
+
+
+if __name__ == "__main__":
+    main()
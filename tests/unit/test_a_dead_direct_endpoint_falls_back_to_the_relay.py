@@ -160,11 +160,13 @@ class TestTheConnectMessageMatchesThePathItIsSentOn:
 
     def test_the_relay_gets_a_relay_shaped_connect(self, monkeypatch):
         agent, _, socket = _agent_whose_direct_endpoint_is_dead(monkeypatch, EXEC_OK)
+        # Built first: CONNECTED hands the agent its session, and the CONNECT
+        # that went out could not have carried it.
+        expected = agent._build_connect_message(False)
 
         agent.call("bash", command="pwd")
 
         sent = [m for m in socket.sent if m.get("type") == "CONNECT"][0]
-        expected = agent._build_connect_message(False)
         assert set(sent) == set(expected)
 
 
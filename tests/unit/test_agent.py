@@ -489,6 +489,96 @@ class TestAgentIO:
 
         assert io_in_handler[0] is None
 
+    def test_llm_deltas_stream_to_io(self):
+        """With io connected, stream() deltas are sent before llm_result."""
+        from connectonion.core.llm import StreamChunk
+
+        class StreamingLLM(MockLLM):
+            def stream(self, messages, tools=None):
+                yield StreamChunk("text", text="Hel")
+                yield StreamChunk("text", text="lo")
+                yield StreamChunk("response", response=LLMResponse(
+                    content="Hello", tool_calls=[], raw_response=None, usage=TokenUsage(),
+                ))
+
+        class RecordingIO:
+            def __init__(self):
+                self.sent = []
+
+            def send(self, event):
+                self.sent.append(event)
+
+            def receive_all(self, msg_type=None):
+                return []
+
+        io = RecordingIO()
+        agent = Agent(name="test", llm=StreamingLLM(), quiet=True, log=False)
+        agent.io = io
+
+        assert agent.input("hi") == "Hello"
+
+        llm_call = next(e for e in io.sent if e.get('type') == 'llm_call')
+        deltas = [e for e in io.sent if e.get('type') == 'llm_delta']
+        assert [d['text'] for d in deltas] == ["Hello"]
+        assert {d['llm_id'] for d in deltas} == {llm_call['id']}
+        types = [e.get('type') for e in io.sent]
+        assert types.index('llm_delta') < types.index('llm_result')
+        assert not any(t['type'] == 'llm_delta' for t in agent.current_session['trace'])
+
+    def _stream_deltas(self, chunks):
+        """llm_delta events sent while an agent streams `chunks` to a recording io."""
+        from connectonion.core.llm import StreamChunk
+
+        class StreamingLLM(MockLLM):
+            def stream(self, messages, tools=None):
+                yield from chunks
+                yield StreamChunk("response", response=LLMResponse(
+                    content="done", tool_calls=[], raw_response=None, usage=TokenUsage(),
+                ))
+
+        io = Mock()
+        io.receive_all.return_value = []
+        agent = Agent(name="test", llm=StreamingLLM(), quiet=True, log=False)
+        agent.io = io
+        agent.input("hi")
+        sent = [c.args[0] for c in io.send.call_args_list]
+        return [e for e in sent if e.get('type') == 'llm_delta']
+
+    def test_a_long_answer_is_sent_in_a_few_deltas_not_one_per_token(self):
+        from connectonion.core.llm import StreamChunk
+
+        tokens = [f"word{i} " for i in range(3000)]
+        deltas = self._stream_deltas([StreamChunk("text", text=t) for t in tokens])
+
+        assert ''.join(d['text'] for d in deltas) == ''.join(tokens)
+        assert len(deltas) < 30
+        assert all(len(d['text']) <= 2048 + len("word2999 ") for d in deltas)
+
+    def test_tool_call_deltas_join_per_call_and_keep_stream_order(self):
+        from connectonion.core.llm import StreamChunk
+
+        deltas = self._stream_deltas([
+            StreamChunk("text", text="Let me "),
+            StreamChunk("text", text="look."),
+            StreamChunk("tool_call", index=0, id="call_1", name="search", arguments='{"q": '),
+            StreamChunk("tool_call", index=0, arguments='"cats"}'),
+            StreamChunk("tool_call", index=1, id="call_2", name="open", arguments='{}'),
+        ])
+
+        assert [d.get('text') or d['tool_call'] for d in deltas] == [
+            "Let me look.",
+            {'index': 0, 'id': 'call_1', 'name': 'search', 'arguments': '{"q": "cats"}'},
+            {'index': 1, 'id': 'call_2', 'name': 'open', 'arguments': '{}'},
+        ]
+
+    def test_deltas_flush_once_the_interval_has_passed(self, monkeypatch):
+        from connectonion.core.llm import StreamChunk
+
+        monkeypatch.setattr("connectonion.core.agent._DELTA_FLUSH_SECONDS", 0)
+        deltas = self._stream_deltas([StreamChunk("text", text=t) for t in ("a", "b", "c")])
+
+        assert [d['text'] for d in deltas] == ["a", "b", "c"]
+
 
 def test_agent_input_with_images():
     """Test that agent.input() handles images parameter correctly for multimodal input."""
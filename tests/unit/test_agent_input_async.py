@@ -0,0 +1,143 @@
+"""Agent.input_async runs the same turn as input(), awaiting the provider and async tools."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from connectonion import Agent
+from connectonion.core.llm import LLM, LLMResponse, OpenAILLM, ToolCall
+
+pytestmark = pytest.mark.asyncio
+
+
+class SlowLLM(LLM):
+    """Asks for one lookup, then answers. acomplete waits like a network call."""
+
+    model = "slow-llm"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    def _next(self, messages):
+        if messages[-1]["role"] == "tool":
+            return LLMResponse(content=f"answer: {messages[-1]['content']}",
+                               tool_calls=[], raw_response=None)
+        return LLMResponse(content=None, raw_response=None, tool_calls=[
+            ToolCall(name="lookup", arguments={"query": messages[-1]["content"]}, id="call_1"),
+        ])
+
+    def complete(self, messages, tools=None, **kwargs):
+        time.sleep(self.delay)
+        return self._next(messages)
+
+    async def acomplete(self, messages, tools=None, **kwargs):
+        await asyncio.sleep(self.delay)
+        return self._next(messages)
+
+    def structured_complete(self, messages, output_schema, **kwargs):
+        raise NotImplementedError
+
+
+async def lookup(query: str) -> str:
+    """Look something up."""
+    await asyncio.sleep(0.2)
+    return f"found {query}"
+
+
+def make_agent(tmp_path, name="async", llm=None, tools=(lookup,)):
+    return Agent(name=name, llm=llm or SlowLLM(), tools=list(tools),
+                 log=False, quiet=True, co_dir=tmp_path / ".co")
+
+
+def shape(agent: Agent) -> list:
+    return [(e["type"], e.get("status")) for e in agent.current_session["trace"]]
+
+
+async def test_same_turn_as_input(tmp_path):
+    sync_agent = make_agent(tmp_path / "sync")
+    async_agent = make_agent(tmp_path / "async")
+
+    assert sync_agent.input("cats") == "answer: found cats"
+    assert await async_agent.input_async("cats") == "answer: found cats"
+
+    assert shape(async_agent) == shape(sync_agent)
+    strip = lambda m: {k: v for k, v in m.items() if k != "id"}
+    assert ([strip(m) for m in async_agent.current_session["messages"]]
+            == [strip(m) for m in sync_agent.current_session["messages"]])
+
+    # The session carries on into a second turn like input()'s does.
+    assert await async_agent.input_async("dogs") == "answer: found dogs"
+    assert async_agent.current_session["turn"] == 2
+
+
+async def test_many_sessions_overlap_on_one_thread(tmp_path):
+    agents = [make_agent(tmp_path / str(i), name=f"a{i}", llm=SlowLLM(delay=0.2))
+              for i in range(50)]
+    threads_before = threading.active_count()
+
+    start = time.monotonic()
+    results = await asyncio.gather(*(a.input_async(f"q{i}") for i, a in enumerate(agents)))
+    elapsed = time.monotonic() - start
+
+    assert results == [f"answer: found q{i}" for i in range(50)]
+    # Each turn waits 0.6s (two LLM calls and a tool); 50 in sequence is 30s.
+    assert elapsed < 5
+    assert threading.active_count() <= threads_before + 2
+
+
+async def test_plain_tools_run_off_the_loop(tmp_path):
+    loop_thread = threading.current_thread()
+    seen = []
+
+    def lookup(query: str) -> str:
+        """Look something up."""
+        seen.append(threading.current_thread())
+        return f"found {query}"
+
+    agent = make_agent(tmp_path, tools=[lookup])
+    assert await agent.input_async("cats") == "answer: found cats"
+    assert seen and seen[0] is not loop_thread
+
+
+async def test_a_provider_failure_still_ends_the_turn(tmp_path):
+    llm = SlowLLM()
+    llm.acomplete = AsyncMock(side_effect=RuntimeError("provider down"))
+    agent = make_agent(tmp_path, llm=llm)
+
+    with pytest.raises(RuntimeError, match="provider down"):
+        await agent.input_async("cats")
+
+    outcome = agent.current_session["trace"][-1]
+    assert (outcome["type"], outcome["reason"], outcome["error_type"]) == (
+        "turn_result", "error", "RuntimeError")
+
+
+async def test_openai_acomplete_awaits_the_async_client(monkeypatch):
+    message = SimpleNamespace(content="ok", tool_calls=None)
+    create = AsyncMock(return_value=SimpleNamespace(
+        choices=[SimpleNamespace(message=message)],
+        usage=SimpleNamespace(prompt_tokens=3, completion_tokens=1, prompt_tokens_details=None),
+    ))
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(OpenAILLM, "async_client", property(lambda self: client))
+    llm = OpenAILLM(api_key="test-key", model="gpt-4o")
+
+    response = await llm.acomplete([{"role": "user", "content": "hi"}], temperature=0)
+
+    assert response.content == "ok"
+    assert response.usage.input_tokens == 3
+    assert create.await_args.kwargs == {
+        "model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}], "temperature": 0,
+    }
+
+
+async def test_async_clients_are_shared_within_a_loop():
+    llm = OpenAILLM(api_key="test-key")
+    assert llm.async_client is OpenAILLM(api_key="test-key").async_client
+    assert llm.async_client is not llm.client
@@ -0,0 +1,153 @@
+"""A pooled host turn borrows a prepared agent instead of building one.
+
+`input_handler` used to call the factory for every prompt, re-running tool
+processing, plugin registration, skill discovery and LLM client construction
+on the request path. The pool builds them at startup and resets each on return.
+"""
+
+import pytest
+
+from connectonion.core.tool_factory import create_tool_from_function
+from connectonion.core.tool_registry import ToolRegistry
+from connectonion.network.host.agent_pool import AgentPool, PoolingRefused
+from connectonion.network.host.http_router import input_handler
+from connectonion.network.host.session import SessionStorage
+
+
+def lookup(query: str) -> str:
+    """Look something up."""
+    return query
+
+
+class Browser:
+    def open(self, url: str) -> str:
+        """Open a page."""
+        return url
+
+
+class FakeAgent:
+    def __init__(self, *tools):
+        self.tools = ToolRegistry()
+        for tool in tools:
+            self.tools.add(create_tool_from_function(tool))
+        self.current_session = None
+        self.io = None
+        self.storage = None
+        self.fail = False
+
+    def reset_conversation(self):
+        self.current_session = None
+
+    def input(self, prompt, session=None, images=None, files=None):
+        if self.fail:
+            raise RuntimeError("model down")
+        self.current_session = dict(session, messages=[{"role": "user", "content": prompt}])
+        return f"echo {prompt}"
+
+
+def counting_factory(make=lambda: FakeAgent(lookup)):
+    built = []
+
+    def create_agent():
+        built.append(make())
+        return built[-1]
+
+    return create_agent, built
+
+
+def test_the_pool_is_warmed_at_startup():
+    create_agent, built = counting_factory()
+    pool = AgentPool(create_agent, size=3)
+    assert len(built) == 3
+    assert pool.idle() == 3
+
+
+def test_a_turn_borrows_and_returns_a_reset_agent(tmp_path):
+    create_agent, built = counting_factory()
+    pool = AgentPool(create_agent, size=2)
+    storage = SessionStorage(tmp_path / "s.jsonl")
+
+    for i in range(5):
+        result = input_handler(create_agent, storage, f"hi {i}", 3600,
+                               session={"session_id": f"s{i}"}, pool=pool)
+        assert result["result"] == f"echo hi {i}"
+        assert result["session"]["messages"][-1]["content"] == f"hi {i}"
+
+    assert len(built) == 2, "every turn should have reused a warm agent"
+    assert all(a.current_session is None and a.storage is None for a in built)
+    assert pool.reused == 5
+
+
+def test_a_failed_turn_does_not_go_back_in_the_pool(tmp_path):
+    create_agent, built = counting_factory()
+    pool = AgentPool(create_agent, size=1)
+    pool._idle.queue[0].fail = True
+
+    with pytest.raises(RuntimeError, match="model down"):
+        input_handler(create_agent, SessionStorage(tmp_path / "s.jsonl"), "hi", 3600,
+                      session={"session_id": "s"}, pool=pool)
+
+    assert pool.idle() == 0
+    assert pool.acquire() is built[-1] and len(built) == 3
+
+
+def test_one_shared_agent_is_refused():
+    agent = FakeAgent(lookup)
+    with pytest.raises(PoolingRefused, match="shared Agent"):
+        AgentPool(lambda: agent, size=2)
+
+
+def test_a_tool_built_per_call_is_refused():
+    with pytest.raises(PoolingRefused, match="'open'.*Browser"):
+        AgentPool(lambda: FakeAgent(Browser().open), size=2)
+
+
+def test_a_tool_shared_by_the_factory_pools_fine():
+    browser = Browser()
+    pool = AgentPool(lambda: FakeAgent(browser.open), size=2)
+    assert pool.idle() == 2
+
+
+def shout(text: str) -> str:
+    """Shout something."""
+    return text.upper()
+
+
+class ToolAddingAgent(FakeAgent):
+    """A turn that grows the agent: a tool, a host flag, a plugin's counter."""
+
+    def input(self, prompt, session=None, images=None, files=None):
+        if prompt == "add a tool":
+            self.tools.add(create_tool_from_function(shout))
+        self._host_full_access_turns_ceiling = 99
+        self._yolo_turns = 3
+        self.calls = getattr(self, "calls", 0) + 1
+        return super().input(prompt, session, images, files)
+
+
+def test_a_tool_added_during_a_turn_is_not_handed_to_the_next(tmp_path):
+    create_agent, built = counting_factory(lambda: ToolAddingAgent(lookup))
+    pool = AgentPool(create_agent, size=1)
+    storage = SessionStorage(tmp_path / "s.jsonl")
+
+    input_handler(create_agent, storage, "add a tool", 3600,
+                  session={"session_id": "a"}, pool=pool)
+
+    assert pool.discarded == 1
+    for _ in range(3):
+        agent = pool.acquire()
+        assert agent.tools.get("shout") is None
+        pool.release(agent)
+
+
+def test_attributes_a_turn_set_are_put_back(tmp_path):
+    create_agent, built = counting_factory(lambda: ToolAddingAgent(lookup))
+    pool = AgentPool(create_agent, size=1)
+    storage = SessionStorage(tmp_path / "s.jsonl")
+
+    input_handler(create_agent, storage, "hi", 3600, session={"session_id": "a"}, pool=pool)
+
+    agent = pool.acquire()
+    assert agent is built[0] and pool.discarded == 0
+    for name in ("_host_full_access_turns_ceiling", "_yolo_turns", "calls"):
+        assert not hasattr(agent, name)
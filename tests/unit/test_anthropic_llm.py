@@ -5,7 +5,9 @@ from unittest.mock import Mock
 
 from pydantic import BaseModel
 
+from connectonion import Agent
 from connectonion.core.llm import AnthropicLLM
+from connectonion.core.provider_messages import ProviderMessageCache, messages_for_provider
 
 
 class Answer(BaseModel):
@@ -74,3 +76,149 @@ def test_structured_complete_passes_system_prompt():
     request = llm.client.messages.create.call_args.kwargs
     assert request["system"] == "Return a short answer."
     assert request["messages"] == [{"role": "user", "content": "Hello"}]
+
+
+def test_stream_assembles_text_and_tool_use_from_events():
+    events = [
+        SimpleNamespace(type="message_start", message=SimpleNamespace(
+            usage=SimpleNamespace(input_tokens=12, output_tokens=1, cache_read_input_tokens=4),
+        )),
+        SimpleNamespace(type="content_block_start", index=0,
+                        content_block=SimpleNamespace(type="text", text="")),
+        SimpleNamespace(type="content_block_delta", index=0,
+                        delta=SimpleNamespace(type="text_delta", text="Look")),
+        SimpleNamespace(type="content_block_delta", index=0,
+                        delta=SimpleNamespace(type="text_delta", text="ing")),
+        SimpleNamespace(type="content_block_start", index=1, content_block=SimpleNamespace(
+            type="tool_use", id="toolu_1", name="search")),
+        SimpleNamespace(type="content_block_delta", index=1,
+                        delta=SimpleNamespace(type="input_json_delta", partial_json='{"q": ')),
+        SimpleNamespace(type="content_block_delta", index=1,
+                        delta=SimpleNamespace(type="input_json_delta", partial_json='"cats"}')),
+        SimpleNamespace(type="message_delta", usage=SimpleNamespace(output_tokens=7)),
+    ]
+    llm = make_llm(iter(events))
+
+    chunks = list(llm.stream([{"role": "user", "content": "Find cats"}]))
+
+    assert llm.client.messages.create.call_args.kwargs["stream"] is True
+    assert [c.text for c in chunks if c.kind == "text"] == ["Look", "ing"]
+    fragments = [c for c in chunks if c.kind == "tool_call"]
+    assert (fragments[0].id, fragments[0].name) == ("toolu_1", "search")
+    assert "".join(c.arguments for c in fragments) == '{"q": "cats"}'
+    response = chunks[-1].response
+    assert chunks[-1].kind == "response"
+    assert response.content == "Looking"
+    assert [(t.name, t.arguments, t.id) for t in response.tool_calls] == [
+        ("search", {"q": "cats"}, "toolu_1"),
+    ]
+    assert (response.usage.input_tokens, response.usage.output_tokens,
+            response.usage.cached_tokens) == (16, 7, 4)
+
+
+def _tool_turn(call_id, text):
+    # Shaped as tool_executor appends them: neither message carries an id.
+    return [
+        {"role": "assistant", "tool_calls": [
+            {"id": call_id, "type": "function",
+             "function": {"name": "search", "arguments": '{"q": "x"}'}},
+        ]},
+        {"role": "tool", "tool_call_id": call_id, "content": text},
+    ]
+
+
+def test_tool_results_group_into_one_user_turn():
+    llm = AnthropicLLM(api_key="test-key")
+    messages = [
+        {"role": "system", "content": "Rules."},
+        {"role": "user", "content": "go", "id": "u1"},
+        {"role": "assistant", "content": "checking", "id": "a1", "tool_calls": [
+            {"id": "c1", "function": {"name": "f", "arguments": '{"a": 1}'}},
+            {"id": "c2", "function": {"name": "g", "arguments": {"b": 2}}},
+        ]},
+        {"role": "tool", "tool_call_id": "c1", "content": "one", "id": "t1"},
+        {"role": "tool", "tool_call_id": "c2", "content": "two", "id": "t2"},
+        {"role": "tool", "tool_call_id": "c3", "content": "stray", "id": "t3"},
+        {"role": "assistant", "content": "done", "id": "a2"},
+    ]
+    for batch in (messages, messages_for_provider(messages, ProviderMessageCache())):
+        converted, system = llm._convert_messages(batch)
+        assert system == "Rules."
+        assert converted == [
+            {"role": "user", "content": "go"},
+            {"role": "assistant", "content": [
+                {"type": "text", "text": "checking"},
+                {"type": "tool_use", "id": "c1", "name": "f", "input": {"a": 1}},
+                {"type": "tool_use", "id": "c2", "name": "g", "input": {"b": 2}},
+            ]},
+            {"role": "user", "content": [
+                {"type": "tool_result", "tool_use_id": "c1", "content": "one"},
+                {"type": "tool_result", "tool_use_id": "c2", "content": "two"},
+                {"type": "tool_result", "tool_use_id": "c3", "content": "stray"},
+            ]},
+            {"role": "assistant", "content": "done"},
+        ]
+
+
+def test_cached_conversion_converts_only_new_and_changed_messages():
+    llm = AnthropicLLM(api_key="test-key")
+    cache = ProviderMessageCache()
+    history = [{"role": "system", "content": "Rules."},
+               {"role": "user", "content": "go"}, *_tool_turn("c1", "one")]
+
+    first, _ = llm._convert_messages(messages_for_provider(history, cache))
+    assert cache.stats()["misses"] == 4
+
+    history += _tool_turn("c2", "two")
+    second, _ = llm._convert_messages(messages_for_provider(history, cache))
+    assert cache.stats()["misses"] == 6
+    assert cache.stats()["hits"] == 4
+    assert second[:len(first)] == first
+
+    # A plugin rewriting an earlier message is converted again, not served stale.
+    history[3] = {**history[3], "content": "one (edited)"}
+    third, _ = llm._convert_messages(messages_for_provider(history, cache))
+    assert third[2]["content"][0]["content"] == "one (edited)"
+    assert cache.stats()["misses"] == 7
+
+    # A message inserted mid-history shifts every later position; each one
+    # is checked against what it held and converted again.
+    history.insert(2, {"role": "user", "content": "also this"})
+    fourth, _ = llm._convert_messages(messages_for_provider(history, cache))
+    assert fourth[1] == {"role": "user", "content": "also this"}
+    assert fourth[2]["content"][0]["input"] == {"q": "x"}
+
+    # Compaction replaces the list; entries for dropped messages are released.
+    compacted = [history[0], {"role": "user", "content": "summary", "id": "s1"}]
+    llm._convert_messages(messages_for_provider(compacted, cache))
+    assert cache.stats()["entries"] == 2
+
+
+def test_agent_tool_loop_reuses_earlier_conversions():
+    def lookup(q: str) -> str:
+        """Look something up."""
+        return f"found {q}"
+
+    def tool_use(call_id):
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="tool_use", id=call_id, name="lookup", input={"q": call_id})],
+            usage=SimpleNamespace(input_tokens=1, output_tokens=1),
+        )
+
+    done = SimpleNamespace(
+        content=[SimpleNamespace(type="text", text="all done")],
+        usage=SimpleNamespace(input_tokens=1, output_tokens=1),
+    )
+    llm = AnthropicLLM(api_key="test-key")
+    llm.client.messages.create = Mock(side_effect=[tool_use("c1"), tool_use("c2"), tool_use("c3"), done])
+    agent = Agent(name="cache_loop", tools=[lookup], llm=llm, log=False)
+
+    assert agent.input("look three things up") == "all done"
+
+    # Four calls over a history that only grows: system + user + three
+    # (tool call, result) pairs are each converted once, and every call
+    # after the first reuses what the calls before it converted.
+    stats = agent._message_cache.stats()
+    assert stats["misses"] == 8
+    assert stats["hits"] == 2 + 4 + 6
+    assert stats["entries"] == 8
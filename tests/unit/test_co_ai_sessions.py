@@ -4,15 +4,19 @@ LLM-Note: Tests for co ai sessions
 
 What it tests:
 - Co Ai Sessions functionality
+- Append-only message rows, paged loads, full-text search, legacy JSON migration
 
 Components under test:
 - Module: co_ai_sessions
 """
 
 
+import json
+import sqlite3
 from pathlib import Path
 
 import connectonion.cli.co_ai.sessions as sessions_mod
+from connectonion.cli.co_ai.commands import sessions as sessions_cmd
 
 
 def test_session_manager_lifecycle(tmp_path, monkeypatch):
@@ -34,3 +38,114 @@ def test_session_manager_lifecycle(tmp_path, monkeypatch):
 
     assert manager.delete_session(session_id) is True
     assert manager.load_session(session_id) is None
+
+
+def _manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(sessions_mod, "get_db_path", lambda: tmp_path / "sessions.db")
+    sessions_mod._manager = None
+    return sessions_mod.get_session_manager()
+
+
+def _open(manager, session_id, title="New Session"):
+    # create_session ids are per-second; tests need several in one second.
+    manager.conn.execute(
+        "INSERT INTO sessions (id, title, model, created_at, updated_at) VALUES (?, ?, '', '', '')",
+        (session_id, title))
+    manager.conn.commit()
+    manager.current_id = session_id
+
+
+def test_save_message_appends_rows(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, monkeypatch)
+    session_id = manager.create_session()
+    for i in range(5):
+        manager.save_message("user", f"message {i}")
+
+    rows = manager.conn.execute(
+        "SELECT seq, content FROM messages WHERE session_id = ? ORDER BY seq", (session_id,)).fetchall()
+    assert [tuple(r) for r in rows] == [(i, f"message {i}") for i in range(5)]
+    session = manager.list_sessions()[0]
+    assert session["message_count"] == 5
+    assert session["title"] == "message 0"
+
+
+def test_load_session_pages_backwards(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, monkeypatch)
+    session_id = manager.create_session()
+    for i in range(10):
+        manager.save_message("user", f"m{i}")
+
+    last = manager.load_session(session_id, limit=3)
+    assert [m["content"] for m in last] == ["m7", "m8", "m9"]
+    earlier = manager.load_session(session_id, limit=3, before=last[0]["seq"])
+    assert [m["content"] for m in earlier] == ["m4", "m5", "m6"]
+    assert len(manager.load_session(session_id)) == 10
+
+
+def test_search_finds_messages_across_sessions(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, monkeypatch)
+    _open(manager, "a", "deploy")
+    manager.save_message("user", "how do I deploy the relay server?")
+    manager.save_message("assistant", "run co deploy from the project root")
+    _open(manager, "b", "other")
+    manager.save_message("user", "write a haiku about tests")
+
+    hits = manager.search("deploy")
+    assert [(h["session_id"], h["seq"]) for h in hits] == [("a", 1), ("a", 0)]
+    assert "**deploy**" in hits[0]["snippet"]
+    assert [h["session_id"] for h in manager.search("haiku tests")] == ["b"]
+    assert manager.search("relay haiku") == []
+    # FTS operators in user input are taken as plain words.
+    assert manager.search('deploy" OR "haiku') == []
+
+
+def test_search_like_fallback(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, monkeypatch)
+    manager._fts = False
+    _open(manager, "a")
+    manager.save_message("user", "100% done_now")
+    manager.save_message("user", "1000 done")
+
+    assert [h["seq"] for h in manager.search("100% done_")] == [0]
+
+
+def test_delete_session_drops_search_hits(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, monkeypatch)
+    _open(manager, "a")
+    manager.save_message("user", "unique needle")
+
+    manager.delete_session("a")
+    assert manager.search("needle") == []
+    assert manager.conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 0
+
+
+def test_legacy_json_column_is_migrated(tmp_path, monkeypatch):
+    path = tmp_path / "sessions.db"
+    legacy = sqlite3.connect(path)
+    legacy.execute("CREATE TABLE sessions (id TEXT PRIMARY KEY, title TEXT, model TEXT, "
+                   "created_at TEXT, updated_at TEXT, messages TEXT)")
+    old = [{"role": "user", "content": "old question", "timestamp": "t0"},
+           {"role": "assistant", "content": "old answer", "timestamp": "t1"}]
+    legacy.execute("INSERT INTO sessions VALUES ('old', 'old question', 'm', 't0', 't1', ?)",
+                   (json.dumps(old),))
+    legacy.commit()
+    legacy.close()
+
+    manager = _manager(tmp_path, monkeypatch)
+
+    assert [m["content"] for m in manager.load_session("old")] == ["old question", "old answer"]
+    assert [h["seq"] for h in manager.search("answer")] == [1]
+    assert manager.conn.execute("SELECT messages FROM sessions").fetchone()[0] is None
+    manager.save_message("user", "new one")
+    newest = manager.load_session("old", limit=1)[0]
+    assert (newest["seq"], newest["content"]) == (2, "new one")
+
+
+def test_cmd_sessions_searches_with_query(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, monkeypatch)
+    _open(manager, "a", "deploy")
+    manager.save_message("user", "deploy the relay")
+
+    out = sessions_cmd.cmd_sessions("relay")
+    assert "`a`" in out and "**relay**" in out
+    assert "No messages match" in sessions_cmd.cmd_sessions("nothing")
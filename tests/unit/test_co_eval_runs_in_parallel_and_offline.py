@@ -0,0 +1,253 @@
+"""`co eval --jobs N --cassette record|replay`: evals in parallel, and offline.
+
+A suite of 150 evals ran one file and one turn at a time against a live model:
+close to an hour, and impossible in a CI sandbox with no network. --jobs runs
+eval files in a process pool, one set of agents per worker; --cassette record
+saves every agent and judge answer beside the eval, and replay answers from
+there with no key, no model and no judge provider -- including for an agent
+file that builds a co/ model.
+"""
+
+import os
+import textwrap
+
+import pytest
+import yaml
+
+from connectonion.cli.commands import eval_commands
+from connectonion.cli.commands.eval_cassette import Cassette, CassetteLLM, CassetteMiss
+from connectonion.core.llm import LLM, LLMResponse, ToolCall
+from connectonion.core.usage import TokenUsage
+
+
+AGENT_FILE = textwrap.dedent('''
+    import os
+    import time
+
+    from connectonion import Agent
+    from connectonion.core.llm import LLM, LLMResponse
+    from connectonion.core.usage import TokenUsage
+
+
+    class Echo(LLM):
+        model = "echo"
+
+        def complete(self, messages, tools=None, **kwargs):
+            if os.environ.get("EVAL_MODEL_DOWN"):
+                raise ConnectionError("no network in here")
+            time.sleep(float(os.environ.get("EVAL_MODEL_DELAY", "0")))
+            return LLMResponse(
+                content=f"echo {messages[-1]['content']} from {os.getpid()}",
+                tool_calls=[], raw_response=None,
+                usage=TokenUsage(input_tokens=10, output_tokens=5),
+            )
+
+        def structured_complete(self, messages, output_schema, **kwargs):
+            raise NotImplementedError
+
+
+    agent = Agent("echo", llm=Echo(), log=False, quiet=True)
+''')
+
+
+# What `co create` writes: a managed model, whose provider will not be built
+# without OPENONION_API_KEY.
+CO_AGENT_FILE = textwrap.dedent('''
+    from connectonion import Agent
+
+    agent = Agent("echo", model="co/gemini-2.5-flash", log=False, quiet=True)
+''')
+
+
+def echo_model(self, messages, tools=None, **kwargs):
+    """OpenOnionLLM.complete while recording: the managed model, minus the network."""
+    return LLMResponse(
+        content=f"echo {messages[-1]['content']} from {os.getpid()}",
+        tool_calls=[], raw_response=None,
+        usage=TokenUsage(input_tokens=10, output_tokens=5),
+    )
+
+
+def model_down(self, messages, tools=None, **kwargs):
+    raise ConnectionError("no network in here")
+
+
+class Judge(LLM):
+    """Passes any output that echoes the input back."""
+
+    model = "judge"
+
+    def __init__(self):
+        self.calls = 0
+
+    def complete(self, messages, tools=None, **kwargs):
+        raise NotImplementedError
+
+    def structured_complete(self, messages, output_schema, **kwargs):
+        self.calls += 1
+        prompt = messages[-1]["content"]
+        said = prompt.split("Input: ")[1].split("\n")[0]
+        return output_schema(passed=f"echo {said}" in prompt, analysis="checked the echo")
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    (tmp_path / "agent.py").write_text(AGENT_FILE, encoding="utf-8")
+    evals = tmp_path / ".co" / "evals"
+    evals.mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    return evals
+
+
+@pytest.fixture
+def co_project(project, monkeypatch):
+    """The project with a co/ agent file: records with a key, replays without."""
+    (project.parent.parent / "agent.py").write_text(CO_AGENT_FILE, encoding="utf-8")
+    monkeypatch.setenv("OPENONION_API_KEY", "recording-key")
+    monkeypatch.setattr("connectonion.core.llm.OpenOnionLLM.complete", echo_model)
+    return project
+
+
+def go_offline(monkeypatch):
+    """No key, no model and no judge provider: any of them in use fails the eval."""
+    monkeypatch.delenv("OPENONION_API_KEY")
+    monkeypatch.setattr("connectonion.core.llm.OpenOnionLLM.complete", model_down)
+    monkeypatch.setattr("connectonion.core.llm.create_llm",
+                        lambda model, **k: pytest.fail("replay built a provider"))
+
+
+def write_eval(evals, stem, *inputs, expected="an echo"):
+    turns = [{"input": text, **({"expected": expected} if expected else {})} for text in inputs]
+    (evals / f"{stem}.yaml").write_text(
+        yaml.safe_dump({"agent": "agent.py", "turns": turns}), encoding="utf-8")
+
+
+def outputs(evals, stem):
+    data = yaml.safe_load((evals / f"{stem}.yaml").read_text(encoding="utf-8"))
+    return [(t["output"], t.get("pass"), t["tokens"]) for t in data["turns"]]
+
+
+def test_a_recorded_suite_replays_offline_with_the_same_results(co_project, monkeypatch):
+    judge = Judge()
+    monkeypatch.setattr("connectonion.core.llm.create_llm", lambda model, **k: judge)
+    write_eval(co_project, "greet", "hello", "again")
+    write_eval(co_project, "count", "one two three")
+
+    assert eval_commands.handle_eval(cassette="record") == 0
+    recorded = {stem: outputs(co_project, stem) for stem in ("greet", "count")}
+    assert (co_project / "cassettes" / "greet.json").exists()
+    assert judge.calls == 3
+
+    go_offline(monkeypatch)
+
+    assert eval_commands.handle_eval(cassette="replay") == 0
+    assert {stem: outputs(co_project, stem) for stem in ("greet", "count")} == recorded
+    # The placeholder was only there while the agent file was imported.
+    assert "OPENONION_API_KEY" not in os.environ
+
+
+def test_a_request_the_cassette_never_saw_fails_that_eval(co_project, monkeypatch, capsys):
+    monkeypatch.setattr("connectonion.core.llm.create_llm", lambda model, **k: Judge())
+    write_eval(co_project, "greet", "hello")
+    write_eval(co_project, "other", "hi")
+    assert eval_commands.handle_eval(cassette="record") == 0
+
+    write_eval(co_project, "greet", "hello, but changed")
+    go_offline(monkeypatch)
+    code = eval_commands.handle_eval(cassette="replay")
+    out = capsys.readouterr().out
+
+    assert code == 1
+    assert "CassetteMiss" in out and "--cassette record" in out
+    # The eval that did not change still replayed.
+    assert outputs(co_project, "other")[0][1] is True
+
+
+def test_jobs_run_eval_files_in_separate_processes(project, monkeypatch, capsys):
+    monkeypatch.setenv("EVAL_MODEL_DELAY", "0.3")
+    for i in range(4):
+        write_eval(project, f"e{i}", f"q{i}", expected=None)
+
+    reports = eval_commands._run_evals(sorted(project.glob("*.yaml")), jobs=4)
+
+    assert [r["eval"] for r in reports] == ["e0", "e1", "e2", "e3"]
+    assert all(r["error"] is None and r["turns"] == 1 for r in reports)
+    pids = {outputs(project, f"e{i}")[0][0].rsplit(" ", 1)[1] for i in range(4)}
+    assert str(os.getpid()) not in pids
+    assert len(pids) > 1
+
+
+def test_the_report_has_latency_tokens_and_pass_rate(project, monkeypatch, capsys):
+    monkeypatch.setattr("connectonion.core.llm.create_llm", lambda model, **k: Judge())
+    write_eval(project, "greet", "hello", "again")
+
+    eval_commands.handle_eval(cassette="record")
+    out = capsys.readouterr().out
+
+    assert "Eval Run" in out
+    assert "2/2" in out and "2/2 passed (100%)" in out
+    assert "30 tokens" in out  # two turns of 15, the second reading the whole session
+    assert "recorded to .co/evals/cassettes/" in out
+
+
+def test_bad_options_are_refused(project):
+    write_eval(project, "greet", "hello")
+
+    assert eval_commands.handle_eval(cassette="sometimes") == 1
+    assert eval_commands.handle_eval(jobs=0) == 1
+
+
+class TestCassette:
+
+    def test_a_repeated_question_replays_its_answers_in_order(self, tmp_path):
+        class Counter(LLM):
+            model = "counter"
+            n = 0
+
+            def complete(self, messages, tools=None, **kwargs):
+                self.n += 1
+                return LLMResponse(content=str(self.n), raw_response=None, tool_calls=[
+                    ToolCall(name="look", arguments={"n": self.n}, id=f"call_{self.n}")],
+                    usage=TokenUsage(input_tokens=self.n))
+
+            def structured_complete(self, messages, output_schema, **kwargs):
+                raise NotImplementedError
+
+        ask = [{"role": "user", "content": "again?"}]
+        tape = Cassette(tmp_path / "cassettes" / "c.json", "record")
+        recorder = CassetteLLM(Counter(), tape)
+        live = [recorder.complete(ask) for _ in range(2)]
+        tape.save()
+
+        player = CassetteLLM(None, Cassette.for_eval(tmp_path / "c.yaml", "replay"), model="counter")
+        replayed = [player.complete(ask) for _ in range(2)]
+
+        assert [r.content for r in replayed] == [r.content for r in live] == ["1", "2"]
+        assert replayed[1].tool_calls == live[1].tool_calls
+        assert replayed[1].usage.input_tokens == 2
+        with pytest.raises(CassetteMiss):
+            player.complete(ask)
+
+    def test_the_tools_offered_are_part_of_the_request(self, tmp_path):
+        class Fixed(LLM):
+            model = "m"
+
+            def complete(self, messages, tools=None, **kwargs):
+                return LLMResponse(content="ok", tool_calls=[], raw_response=None)
+
+            def structured_complete(self, messages, output_schema, **kwargs):
+                raise NotImplementedError
+
+        ask = [{"role": "user", "content": "x"}]
+        tape = Cassette(tmp_path / "cassettes" / "c.json", "record")
+        CassetteLLM(Fixed(), tape).complete(ask)
+        tape.save()
+
+        player = CassetteLLM(None, Cassette.for_eval(tmp_path / "c.yaml", "replay"), model="m")
+        with pytest.raises(CassetteMiss):
+            player.complete(ask, tools=[{"name": "t"}])
+        assert player.complete(ask).content == "ok"
+
+    def test_recording_needs_a_model_to_record(self, tmp_path):
+        with pytest.raises(ValueError):
+            CassetteLLM(None, Cassette(tmp_path / "c.json", "record"))
@@ -24,8 +24,10 @@ codex_module = importlib.import_module("connectonion.useful_tools.codex")
 @pytest.fixture(autouse=True)
 def _reap_open_only_clients():
     codex_module._close_open_threads()
+    codex_module._process_pool.close_all()
     yield
     codex_module._close_open_threads()
+    codex_module._process_pool.close_all()
 
 
 class FakeServer:
@@ -421,6 +423,96 @@ class TestCodexRun:
         assert "positive integer" in result["error"]
 
 
+class PoolableServer(FakeServer):
+    """FakeServer that reports health, so codex() may park it between calls."""
+    created = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.alive = True
+        PoolableServer.created.append(self)
+
+    def healthy(self):
+        return self.alive
+
+    def close(self, force=False):
+        self.alive = False
+        super().close()
+
+
+class TestWarmPool:
+    def _call(self, **kwargs):
+        with patch.object(codex_module, "CodexAppServer", PoolableServer), \
+             patch.object(codex_module, "_base_command", return_value=["codex", "app-server"]):
+            return json.loads(codex(**{"cwd": ".", "approval": "auto", **kwargs}))
+
+    def setup_method(self):
+        PoolableServer.created = []
+
+    def test_second_call_reuses_the_initialized_server(self):
+        before = codex_module.codex_pool_stats()
+        first = self._call(prompt="fix", agent=_Agent(_IO()))
+        second = self._call(prompt="again", agent=_Agent(_IO()))
+        after = codex_module.codex_pool_stats()
+
+        assert first["exit_code"] == second["exit_code"] == 0
+        assert len(PoolableServer.created) == 1
+        server = PoolableServer.created[0]
+        assert server.calls.count("start") == 1
+        assert server.calls.count("initialize") == 1
+        assert [c[2] for c in server.calls if isinstance(c, tuple) and c[0] == "run_turn"] == ["fix", "again"]
+        assert "close" not in server.calls
+        assert after["hits"] - before["hits"] == 1
+        assert after["cold_starts"] - before["cold_starts"] == 1
+
+    def test_warm_server_reports_to_the_current_call_only(self):
+        first_io, second_io = _IO(), _IO()
+        self._call(prompt="fix", agent=_Agent(first_io))
+        first_events = list(first_io.events)
+        self._call(prompt="again", agent=_Agent(second_io))
+
+        assert first_io.events == first_events
+        assert second_io.events
+
+    def test_different_sandbox_or_model_gets_its_own_server(self):
+        self._call(prompt="fix", sandbox="read-only")
+        self._call(prompt="fix", sandbox="workspace-write")
+        self._call(prompt="fix", sandbox="read-only", model="gpt-5-codex")
+
+        assert len(PoolableServer.created) == 3
+
+    def test_unhealthy_server_is_discarded_for_a_cold_start(self):
+        self._call(prompt="fix")
+        PoolableServer.created[0].alive = False
+        self._call(prompt="again")
+
+        assert len(PoolableServer.created) == 2
+
+    def test_failed_call_closes_instead_of_parking(self):
+        class Failing(PoolableServer):
+            def run_turn(self, thread_id, prompt, cwd="", timeout=600):
+                raise TimeoutError("turn timed out after 1s")
+
+        with patch.object(codex_module, "CodexAppServer", Failing), \
+             patch.object(codex_module, "_base_command", return_value=["codex", "app-server"]):
+            result = json.loads(codex("fix", approval="auto"))
+
+        assert "timed out" in result["error"]
+        assert PoolableServer.created[0].calls[-1] == "close"
+        assert codex_module.codex_pool_stats()["idle"] == 0
+
+    def test_app_server_health_tracks_process_and_turn(self):
+        client = codex_module.CodexAppServer(["codex", "app-server"])
+        assert client.healthy() is False
+        client.proc = MagicMock(poll=lambda: None)
+        assert client.healthy() is True
+        client._active_turn_id = "turn-1"
+        assert client.healthy() is False
+        client._active_turn_id = None
+        client._exit_error = "app-server exited unexpectedly (code 1)"
+        assert client.healthy() is False
+
+
 class TestFrontendEventVocabulary:
     """Codex steps must be forwarded as the SDK's native tool_call/tool_result
     events (not a custom type), so the frontend renders them unchanged."""
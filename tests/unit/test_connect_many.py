@@ -0,0 +1,196 @@
+"""One prompt or tool call to many agents: concurrent, bounded, and per-agent."""
+
+import asyncio
+import contextlib
+import json
+import time
+
+import pytest
+
+from connectonion import AgentGroup, connect_many
+from connectonion.network.connect import ExecResult, Response
+from connectonion.network.gather import latency_stats
+
+
+class FakeAgent:
+    """Answers after `delay`; raises `fail` instead when it is given one."""
+
+    def __init__(self, address, delay=0.0, fail=None, gate=None):
+        self.address = address
+        self.delay = delay
+        self.fail = fail
+        self.gate = gate
+        self.timeouts = []
+        self.cancelled = False
+
+    async def _answer(self, make):
+        if self.gate is not None:
+            self.gate["now"] += 1
+            self.gate["peak"] = max(self.gate["peak"], self.gate["now"])
+        try:
+            try:
+                await asyncio.sleep(self.delay)
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+            if self.fail:
+                raise self.fail
+            return make()
+        finally:
+            if self.gate is not None:
+                self.gate["now"] -= 1
+
+    async def input_async(self, prompt, timeout=60.0, **kwargs):
+        self.timeouts.append(timeout)
+        return await self._answer(lambda: Response(text=f"{self.address}: {prompt}", done=True))
+
+    async def call_async(self, tool, timeout=60.0, **args):
+        self.timeouts.append(timeout)
+        return await self._answer(lambda: ExecResult(text=f"{tool} {args}", status="success"))
+
+
+def test_agents_answer_concurrently_and_in_agent_order():
+    group = AgentGroup([FakeAgent(f"a{i}", delay=0.3 - i * 0.05) for i in range(5)])
+
+    start = time.monotonic()
+    gathered = group.gather_input("hi")
+
+    assert time.monotonic() - start < 0.6  # five in sequence is ~1s
+    assert [r.text for r in gathered.results] == [f"a{i}: hi" for i in range(5)]
+    assert all(r.ok for r in gathered.results)
+
+
+@pytest.mark.asyncio
+async def test_results_stream_as_each_agent_finishes():
+    group = AgentGroup([FakeAgent("slow", delay=0.2), FakeAgent("fast")])
+
+    order = [r.address async for r in group.stream_input("hi")]
+
+    assert order == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    gate = {"now": 0, "peak": 0}
+    group = AgentGroup([FakeAgent(f"a{i}", delay=0.05, gate=gate) for i in range(10)],
+                       concurrency=3)
+
+    gathered = await group.gather_call_async("bash", command="uptime")
+
+    assert gate["peak"] == 3
+    assert gathered.stats["ok"] == 10
+    assert gathered.results[0].text == "bash {'command': 'uptime'}"
+
+
+@pytest.mark.asyncio
+async def test_each_agent_has_its_own_deadline():
+    agents = [FakeAgent("quick", delay=0.0), FakeAgent("stuck", delay=5)]
+    group = AgentGroup(agents)
+
+    gathered = await group.gather_input_async("hi", timeout={"quick": 1, "stuck": 0.1})
+
+    quick, stuck = gathered.results
+    assert quick.ok
+    assert stuck.timed_out and isinstance(stuck.error, TimeoutError)
+    assert agents[0].timeouts == [1.0] and agents[1].timeouts == [0.1]
+    assert gathered.stats["timed_out"] == 1
+
+
+@pytest.mark.asyncio
+async def test_one_failure_does_not_cost_the_others():
+    group = AgentGroup([FakeAgent("bad", fail=ConnectionError("refused")), FakeAgent("good")])
+
+    gathered = await group.gather_input_async("hi")
+
+    assert [r.address for r in gathered.failed] == ["bad"]
+    assert isinstance(gathered.failed[0].error, ConnectionError)
+    assert [r.address for r in gathered.ok] == ["good"]
+
+
+@pytest.mark.asyncio
+async def test_a_refused_tool_call_is_not_ok():
+    agent = FakeAgent("a")
+
+    async def refused(tool, timeout=60.0, **args):
+        return ExecResult(text="", status="error", error="blocked")
+
+    agent.call_async = refused
+    gathered = await AgentGroup([agent]).gather_call_async("rm")
+
+    assert not gathered.results[0].ok
+
+
+@pytest.mark.asyncio
+async def test_leaving_a_stream_early_cancels_the_rest():
+    slow = FakeAgent("slow", delay=5)
+    group = AgentGroup([FakeAgent("fast"), slow])
+
+    async with contextlib.aclosing(group.stream_input("hi")) as stream:
+        async for result in stream:
+            break
+
+    assert result.address == "fast"
+    assert slow.cancelled
+
+
+def test_latency_stats():
+    group = AgentGroup([FakeAgent(f"a{i}", delay=i * 0.02) for i in range(4)])
+    stats = group.gather_input("hi").stats
+
+    assert stats["agents"] == 4 and stats["ok"] == 4 and stats["failed"] == 0
+    assert stats["min_ms"] <= stats["p50_ms"] <= stats["p95_ms"] <= stats["max_ms"]
+    assert stats["max_ms"] <= stats["wall_ms"]
+    assert latency_stats([])["p50_ms"] is None
+
+
+@pytest.mark.asyncio
+async def test_sync_gather_is_refused_inside_a_loop():
+    with pytest.raises(RuntimeError, match="gather_input_async"):
+        AgentGroup([]).gather_input("hi")
+
+
+def test_connect_many_builds_one_remote_agent_per_address(monkeypatch):
+    import websockets
+
+    sockets = []
+
+    class Socket:
+        def __init__(self):
+            self.outbox = []
+
+        async def send(self, raw):
+            message = json.loads(raw)
+            if message["type"] == "CONNECT":
+                self.outbox.append({"type": "CONNECTED", "session_id": "s"})
+            elif message["type"] == "EXEC":
+                self.outbox.append({"type": "EXEC_RESULT", "exec_id": message["exec_id"],
+                                    "status": "success", "result": "up"})
+
+        async def recv(self):
+            while not self.outbox:
+                await asyncio.sleep(0.01)
+            return json.dumps(self.outbox.pop(0))
+
+        def __await__(self):
+            async def _self():
+                return self
+            return _self().__await__()
+
+        async def __aexit__(self, *exc):
+            return False
+
+    def open_socket(url, *a, **k):
+        sockets.append(Socket())
+        return sockets[-1]
+
+    monkeypatch.setattr(websockets, "connect", open_socket)
+    fleet = connect_many([f"0x{i}" for i in range(3)], keys=False, relay_url="wss://relay.test")
+
+    first = fleet.gather_call("bash", command="uptime", timeout=5)
+    second = fleet.gather_call("bash", command="uptime", timeout=5)
+
+    assert [r.text for r in first.results + second.results] == ["up"] * 6
+    # The second round rode the sockets the first one opened.
+    assert len(sockets) == 3
+    for agent in fleet.agents:
+        agent.close()
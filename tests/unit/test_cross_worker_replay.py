@@ -406,3 +406,51 @@ def test_non_finite_timestamps_are_rejected_before_replay_claim(
     assert payload is None
     assert error == "unauthorized: timestamp must be finite"
     assert claimed == []
+
+
+def test_a_claim_keeps_its_connection_and_does_not_sweep(tmp_path, monkeypatch):
+    store = SignatureReplayStore(tmp_path / "replay.sqlite3", expiry_seconds=300)
+    old = {"signature": "old", "payload": {"timestamp": 1_000}}
+    assert store.already_used(old, now=1_000) is False
+
+    opened = []
+    real_connect = store._connect
+    monkeypatch.setattr(store, "_connect", lambda: opened.append(1) or real_connect())
+    for n in range(5):
+        store.already_used({"signature": f"s{n}", "payload": {"timestamp": 2_000}},
+                           now=2_000)
+
+    assert opened == []
+    with sqlite3.connect(tmp_path / "replay.sqlite3") as database:
+        assert database.execute("SELECT COUNT(*) FROM used_signatures").fetchone() == (6,)
+    assert store.sweep(now=2_000) == 1
+
+
+def test_a_repeat_this_process_claimed_is_answered_without_the_disk(tmp_path):
+    path = tmp_path / "replay.sqlite3"
+    store = SignatureReplayStore(path)
+    data = {"signature": "captured"}
+    assert store.already_used(data) is False
+
+    with sqlite3.connect(path) as blocker:
+        blocker.execute("BEGIN EXCLUSIVE")
+        assert store.already_used(data) is True
+
+
+@pytest.mark.asyncio
+async def test_the_sweep_runs_with_the_app_and_stops_with_it(tmp_path):
+    import threading
+    from connectonion.network.host.server import _create_replay_sweep_lifespan
+
+    def sweepers():
+        return [t for t in threading.enumerate() if t.name == "replay-sweep"]
+
+    before = len(sweepers())
+    store = SignatureReplayStore(tmp_path / "replay.sqlite3")
+    on_startup, on_shutdown = _create_replay_sweep_lifespan(store)
+    assert len(sweepers()) == before      # building the app starts nothing
+
+    await on_startup()
+    assert len(sweepers()) == before + 1
+    await on_shutdown()
+    assert len(sweepers()) == before
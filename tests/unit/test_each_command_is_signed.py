@@ -30,6 +30,15 @@ def test_connect_negotiates_signed_commands(keys):
     assert auth.verify_signature(frame["payload"], frame["signature"], frame["from"])
 
 
+def test_signed_frames_declare_their_canonical_form(keys):
+    agent = RemoteAgent("0x" + "12" * 20, keys=keys)
+    for frame in (agent._build_connect_message(),
+                  agent._build_input_message("héllo", "input-1")):
+        assert frame["canonical"] == "escaped"
+        assert auth.verify_signature(frame["payload"], frame["signature"],
+                                     frame["from"], frame["canonical"])
+
+
 def test_input_signature_covers_every_field(keys):
     frame = RemoteAgent("0x" + "12" * 20, keys=keys)._build_input_message(
         "hello", "input-1", images=["image"], files=[{"name": "a.txt"}]
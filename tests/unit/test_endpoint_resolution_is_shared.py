@@ -0,0 +1,139 @@
+"""Endpoint discovery probes candidates at once and is remembered process-wide.
+
+Each candidate /info was probed in turn with its own timeout, so one dead LAN
+address in front of the live one doubled resolution time, and every new
+RemoteAgent for the same agent did all of it again.
+"""
+
+import asyncio
+import importlib
+import time
+
+import pytest
+
+connect_module = importlib.import_module("connectonion.network.connect")
+resolve_endpoint = connect_module.resolve_endpoint
+
+AGENT = "0x" + "a" * 64
+LOCAL = "http://localhost:8797"
+LAN = "https://10.0.0.5:8797"
+PUBLIC = "https://203.0.113.9:8797"
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+
+class SlowFleet:
+    """The relay lists `endpoints`; each host answers /info after its delay."""
+
+    def __init__(self, endpoints, delays, address=AGENT):
+        self.endpoints = endpoints
+        self.delays = delays
+        self.address = address
+        self.asked = []
+        self.cancelled = []
+
+    async def get(self, url, *a, **k):
+        self.asked.append(url)
+        if "/api/agents/" in url:
+            return FakeResponse({"endpoints": self.endpoints})
+        host = url.rsplit("/info", 1)[0]
+        try:
+            await asyncio.sleep(self.delays.get(host, 0))
+        except asyncio.CancelledError:
+            self.cancelled.append(host)
+            raise
+        if host not in self.delays:
+            return FakeResponse({}, status_code=404)
+        return FakeResponse({"address": self.address})
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def fleet(monkeypatch):
+    def install(endpoints, delays, **kw):
+        client = SlowFleet(endpoints, delays, **kw)
+        monkeypatch.setattr(connect_module.httpx, "AsyncClient", lambda *a, **k: client)
+        return client
+    return install
+
+
+def resolve():
+    return asyncio.run(resolve_endpoint(AGENT, "wss://relay.test", timeout=1))
+
+
+def test_candidates_are_probed_at_once(fleet):
+    fleet([LAN, PUBLIC], {LAN: 0.3, PUBLIC: 0.3})
+
+    start = time.monotonic()
+    assert resolve() == "wss://10.0.0.5:8797/ws"
+    assert time.monotonic() - start < 0.5
+
+
+def test_a_better_candidate_still_wins_over_a_faster_one(fleet):
+    fleet([PUBLIC, LOCAL], {LOCAL: 0.2, PUBLIC: 0})
+
+    assert resolve() == "ws://localhost:8797/ws"
+
+
+def test_probes_that_can_no_longer_win_are_cancelled(fleet):
+    client = fleet([LOCAL, PUBLIC], {LOCAL: 0, PUBLIC: 5})
+
+    start = time.monotonic()
+    assert resolve() == "ws://localhost:8797/ws"
+    assert time.monotonic() - start < 1
+    assert client.cancelled == [PUBLIC]
+
+
+def test_a_resolution_is_shared_by_every_handle(fleet):
+    client = fleet([LAN], {LAN: 0})
+
+    assert resolve() == resolve() == "wss://10.0.0.5:8797/ws"
+    assert len([u for u in client.asked if "/api/agents/" in u]) == 1
+
+
+def test_a_miss_is_remembered_for_less_time(fleet, monkeypatch):
+    client = fleet([LAN], {LAN: 0}, address="0x" + "b" * 64)
+
+    assert resolve() is None
+    assert resolve() is None
+    assert len([u for u in client.asked if "/api/agents/" in u]) == 1
+
+    now = time.monotonic()
+    monkeypatch.setattr(connect_module.time, "monotonic",
+                        lambda: now + connect_module.NEGATIVE_ENDPOINT_TTL + 1)
+    resolve()
+    assert len([u for u in client.asked if "/api/agents/" in u]) == 2
+
+
+def test_a_hit_expires_after_its_ttl(fleet, monkeypatch):
+    client = fleet([LAN], {LAN: 0})
+    resolve()
+
+    now = time.monotonic()
+    monkeypatch.setattr(connect_module.time, "monotonic",
+                        lambda: now + connect_module.ENDPOINT_TTL + 1)
+    resolve()
+    assert len([u for u in client.asked if "/api/agents/" in u]) == 2
+
+
+def test_a_dead_endpoint_is_forgotten_for_every_handle(fleet):
+    client = fleet([LAN], {LAN: 0})
+    resolve()
+
+    agent = connect_module.RemoteAgent(AGENT, keys=None, relay_url="wss://relay.test")
+    agent._forget_direct_endpoint()
+    resolve()
+
+    assert len([u for u in client.asked if "/api/agents/" in u]) == 2
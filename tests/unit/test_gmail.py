@@ -36,6 +36,31 @@ from pathlib import Path
 FUTURE_EXPIRY = (datetime.utcnow() + timedelta(hours=1)).isoformat() + 'Z'
 
 
+class SerialBatch:
+    """Stands in for googleapiclient's BatchHttpRequest on a mocked service:
+    executes each added request in turn and hands its result to the callback."""
+
+    def __init__(self, callback=None):
+        self.parts = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.parts.append((request, callback, request_id))
+
+    def execute(self):
+        for request, callback, request_id in self.parts:
+            try:
+                response, error = request.execute(), None
+            except Exception as e:
+                response, error = None, e
+            callback(request_id, response, error)
+
+
+def serve_batches(mock_service):
+    """Listings fetch metadata in batches; let a Mock service answer them."""
+    mock_service.new_batch_http_request.side_effect = lambda callback=None: SerialBatch(callback)
+    return mock_service
+
+
 @pytest.fixture(autouse=True)
 def _stub_token_refresh(request, monkeypatch):
     """Gmail refreshes its access token once per instance; stub that network
@@ -271,7 +296,7 @@ class TestReadEmails:
         }):
             from connectonion.useful_tools.gmail import Gmail
             gmail = Gmail()
-            mock_service = Mock()
+            mock_service = serve_batches(Mock())
             gmail._get_service = Mock(return_value=mock_service)
             return gmail, mock_service
 
@@ -421,7 +446,7 @@ class TestListingFormat:
         }):
             from connectonion.useful_tools.gmail import Gmail
             gmail = Gmail()
-            mock_service = Mock()
+            mock_service = serve_batches(Mock())
             gmail._get_service = Mock(return_value=mock_service)
             return gmail, mock_service
 
@@ -573,7 +598,7 @@ class TestEmailContent:
         }):
             from connectonion.useful_tools.gmail import Gmail
             gmail = Gmail()
-            mock_service = Mock()
+            mock_service = serve_batches(Mock())
             gmail._get_service = Mock(return_value=mock_service)
             return gmail, mock_service
 
@@ -713,7 +738,7 @@ class TestSendReply:
         }):
             from connectonion.useful_tools.gmail import Gmail
             gmail = Gmail()
-            mock_service = Mock()
+            mock_service = serve_batches(Mock())
             gmail._get_service = Mock(return_value=mock_service)
             return gmail, mock_service
 
@@ -782,7 +807,7 @@ class TestEmailActions:
         }):
             from connectonion.useful_tools.gmail import Gmail
             gmail = Gmail()
-            mock_service = Mock()
+            mock_service = serve_batches(Mock())
             gmail._get_service = Mock(return_value=mock_service)
             return gmail, mock_service
 
@@ -845,7 +870,7 @@ class TestLabels:
         }):
             from connectonion.useful_tools.gmail import Gmail
             gmail = Gmail()
-            mock_service = Mock()
+            mock_service = serve_batches(Mock())
             gmail._get_service = Mock(return_value=mock_service)
             return gmail, mock_service
 
@@ -941,7 +966,7 @@ class TestStats:
         }):
             from connectonion.useful_tools.gmail import Gmail
             gmail = Gmail()
-            mock_service = Mock()
+            mock_service = serve_batches(Mock())
             gmail._get_service = Mock(return_value=mock_service)
             return gmail, mock_service
 
@@ -990,7 +1015,7 @@ class TestCRM:
                 emails_csv=str(tmppath / "emails.csv"),
                 contacts_csv=str(tmppath / "contacts.csv")
             )
-            mock_service = Mock()
+            mock_service = serve_batches(Mock())
             gmail._get_service = Mock(return_value=mock_service)
             return gmail, mock_service
 
@@ -1171,7 +1196,7 @@ class TestAnalyzeContact:
         }):
             from connectonion.useful_tools.gmail import Gmail
             gmail = Gmail()
-            mock_service = Mock()
+            mock_service = serve_batches(Mock())
             gmail._get_service = Mock(return_value=mock_service)
             return gmail, mock_service
 
@@ -1272,7 +1297,7 @@ class TestGmailSendAttachments:
         }):
             from connectonion.useful_tools.gmail import Gmail
             gmail = Gmail(allow_external_attachments=True)
-            mock_service = Mock()
+            mock_service = serve_batches(Mock())
             gmail._get_service = Mock(return_value=mock_service)
             return gmail, mock_service
 
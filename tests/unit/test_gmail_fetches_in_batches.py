@@ -0,0 +1,273 @@
+"""Gmail listings fetch metadata in batches and keep it until history says it changed.
+
+`read_inbox(last=50)` made 51 round trips: one list, then one messages.get per
+message. The contact scan and get_unanswered_emails did the same per message
+and per thread. Metadata now comes in Gmail batch requests of BATCH_SIZE, and
+a second listing reuses what the first fetched unless history.list reports
+the message was relabelled or deleted since.
+
+Everything here runs against FakeGmail, a local mailbox that speaks the
+discovery client's shape and counts round trips.
+"""
+
+import os
+from unittest.mock import patch
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from connectonion.useful_tools import gmail as gmail_module
+from connectonion.useful_tools.gmail import BATCH_SIZE, Gmail
+
+
+def http_error(status):
+    return HttpError(httplib2.Response({"status": status}), b'{"error": "fake"}')
+
+
+class Request:
+    def __init__(self, mailbox, answer):
+        self.mailbox = mailbox
+        self.answer = answer
+
+    def execute(self):
+        self.mailbox.round_trips += 1
+        return self.answer()
+
+
+class Batch:
+    def __init__(self, mailbox):
+        self.mailbox = mailbox
+        self.parts = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.parts.append((request, callback, request_id))
+
+    def execute(self):
+        assert len(self.parts) <= BATCH_SIZE
+        self.mailbox.round_trips += 1
+        self.mailbox.batches.append(len(self.parts))
+        for request, callback, request_id in self.parts:
+            try:
+                response, error = request.answer(), None
+            except HttpError as e:
+                response, error = None, e
+            callback(request_id, response, error)
+
+
+class Resource:
+    def __init__(self, **methods):
+        self.__dict__.update(methods)
+
+
+class FakeGmail:
+    """A mailbox of `count` messages, two per thread, newest first."""
+
+    def __init__(self, count):
+        self.round_trips = 0
+        self.batches = []
+        self.history_id = 1000
+        self.oldest_history = 1000
+        self.history = []
+        self.failures = {}  # message id -> statuses to answer with, in order
+        self.messages = {}
+        for i in range(count):
+            self.messages[f"m{i}"] = {
+                "id": f"m{i}", "threadId": f"t{i // 2}", "labelIds": ["INBOX", "UNREAD"],
+                "historyId": self.history_id, "headers": {
+                    "From": f"Person {i} <p{i}@partner.org>", "To": "me@example.com",
+                    "Subject": f"Subject {i}", "Date": "Sun, 26 Jul 2026 14:30:00 +0000",
+                },
+            }
+
+    # -- the discovery client's surface --
+
+    def new_batch_http_request(self, callback=None):
+        return Batch(self)
+
+    def users(self):
+        return Resource(
+            messages=lambda: Resource(list=self._list, get=self._get, modify=self._modify),
+            threads=lambda: Resource(get=self._get_thread),
+            history=lambda: Resource(list=self._history),
+            getProfile=lambda userId: Request(self, lambda: {
+                "emailAddress": "me@example.com", "historyId": str(self.history_id)}),
+            settings=lambda: Resource(sendAs=lambda: Resource(list=lambda userId: Request(
+                self, lambda: {"sendAs": [{"sendAsEmail": "me@example.com"}]}))),
+        )
+
+    def _list(self, userId, maxResults=100, q=None, pageToken=None, labelIds=None):
+        ids = list(self.messages)
+        start = int(pageToken or 0)
+        page = ids[start:start + maxResults]
+        body = {"messages": [{"id": mid, "threadId": self.messages[mid]["threadId"]} for mid in page]}
+        if start + maxResults < len(ids):
+            body["nextPageToken"] = str(start + maxResults)
+        return Request(self, lambda: body)
+
+    def _metadata(self, message, headers):
+        return {
+            "id": message["id"], "threadId": message["threadId"],
+            "labelIds": list(message["labelIds"]), "snippet": f"snippet of {message['id']}",
+            "historyId": str(message["historyId"]),
+            "payload": {"headers": [{"name": name, "value": message["headers"][name]}
+                                    for name in headers if name in message["headers"]]},
+        }
+
+    def _get(self, userId, id, format, metadataHeaders):
+        def answer():
+            statuses = self.failures.get(id)
+            if statuses:
+                raise http_error(statuses.pop(0))
+            if id not in self.messages:
+                raise http_error(404)
+            return self._metadata(self.messages[id], metadataHeaders)
+        return Request(self, answer)
+
+    def _get_thread(self, userId, id, format, metadataHeaders):
+        members = [m for m in self.messages.values() if m["threadId"] == id]
+        return Request(self, lambda: {
+            "id": id, "messages": [self._metadata(m, metadataHeaders) for m in members]})
+
+    def _modify(self, userId, id, body):
+        def answer():
+            self.history_id += 1
+            message = self.messages[id]
+            message["historyId"] = self.history_id
+            for label in body.get("removeLabelIds", []):
+                message["labelIds"].remove(label)
+            self.history.append((self.history_id, {"labelsRemoved": [{"message": {"id": id}}]}))
+            return {"id": id}
+        return Request(self, answer)
+
+    def _history(self, userId, startHistoryId, pageToken=None):
+        def answer():
+            if int(startHistoryId) < self.oldest_history:
+                raise http_error(404)
+            return {"history": [record for hid, record in self.history if hid > int(startHistoryId)],
+                    "historyId": str(self.history_id)}
+        return Request(self, answer)
+
+
+@pytest.fixture
+def make_gmail():
+    def make(count):
+        with patch.dict(os.environ, {"GOOGLE_SCOPES": "gmail.readonly gmail.send"}):
+            gmail = Gmail(emails_csv=None, contacts_csv=None)
+        mailbox = FakeGmail(count)
+        gmail._get_service = lambda: mailbox
+        return gmail, mailbox
+    return make
+
+
+def test_reading_fifty_emails_is_two_round_trips(make_gmail):
+    gmail, mailbox = make_gmail(60)
+
+    emails = gmail.list_inbox(last=50)
+
+    assert [e["id"] for e in emails] == [f"m{i}" for i in range(50)]
+    assert emails[0]["subject"] == "Subject 0" and emails[0]["unread"]
+    assert mailbox.round_trips == 2  # the list and one batch; was 51
+    assert mailbox.batches == [50]
+
+
+def test_the_text_listing_is_unchanged(make_gmail):
+    gmail, _ = make_gmail(1)
+
+    assert gmail.read_inbox(last=1) == (
+        "Found 1 email(s):\n"
+        "\n"
+        "1. [UNREAD] From: Person 0 <p0@partner.org>\n"
+        "   Subject: Subject 0\n"
+        "   Date: Sun, 26 Jul 2026 14:30:00 +0000\n"
+        "   Preview: snippet of m0...\n"
+        "   ID: m0\n"
+    )
+
+
+def test_a_second_listing_reuses_what_the_first_fetched(make_gmail):
+    gmail, mailbox = make_gmail(20)
+    gmail.list_inbox(last=20)
+    mailbox.round_trips, mailbox.batches = 0, []
+
+    gmail.list_inbox(last=20)
+
+    assert mailbox.round_trips == 2  # the list and one history check
+    assert mailbox.batches == []
+
+
+def test_a_changed_message_is_fetched_again(make_gmail):
+    gmail, mailbox = make_gmail(20)
+    gmail.list_inbox(last=20)
+
+    gmail.mark_read("m3")
+    emails = gmail.list_inbox(last=20)
+
+    assert mailbox.batches == [20, 1]
+    assert [e["id"] for e in emails if not e["unread"]] == ["m3"]
+
+
+def test_history_gmail_no_longer_has_starts_over(make_gmail):
+    gmail, mailbox = make_gmail(10)
+    gmail.list_inbox(last=10)
+
+    mailbox.oldest_history = 10**6
+    gmail.list_inbox(last=10)
+
+    assert mailbox.batches == [10, 10]
+
+
+def test_the_contact_scan_batches_too(make_gmail):
+    gmail, mailbox = make_gmail(120)
+
+    contacts, records = gmail._scan_contacts(max_emails=120)
+
+    assert len(records) == 120 and "p119@partner.org" in contacts
+    assert mailbox.batches == [50, 50, 20]
+    # profile, send-as, two list pages, three batches -- was 124
+    assert mailbox.round_trips == 7
+
+
+def test_unanswered_threads_are_fetched_in_batches(make_gmail):
+    gmail, mailbox = make_gmail(40)
+
+    result = gmail.get_unanswered_emails(within_days=30, max_results=100)
+
+    assert "Found 20 unanswered" in result
+    # The routed-address scan's 40 messages, then the 20 threads in one batch.
+    assert mailbox.batches == [40, 20]
+
+
+class TestBatchFailures:
+
+    def test_a_rate_limited_part_is_retried(self, make_gmail, monkeypatch):
+        monkeypatch.setattr(gmail_module, "BATCH_RETRY_DELAY", 0)
+        gmail, mailbox = make_gmail(5)
+        mailbox.failures = {"m1": [429], "m2": [503, 429]}
+
+        emails = gmail.list_inbox(last=5)
+
+        assert len(emails) == 5
+        assert mailbox.batches == [5, 2, 1]
+
+    def test_a_deleted_message_is_left_out(self, make_gmail):
+        gmail, mailbox = make_gmail(5)
+        mailbox.failures = {"m2": [404]}
+
+        assert [e["id"] for e in gmail.list_inbox(last=5)] == ["m0", "m1", "m3", "m4"]
+
+    def test_any_other_failure_is_raised(self, make_gmail):
+        gmail, mailbox = make_gmail(5)
+        mailbox.failures = {"m2": [400]}
+
+        with pytest.raises(HttpError):
+            gmail.list_inbox(last=5)
+
+    def test_rate_limiting_that_never_lets_up_is_raised(self, make_gmail, monkeypatch):
+        monkeypatch.setattr(gmail_module, "BATCH_RETRY_DELAY", 0)
+        gmail, mailbox = make_gmail(2)
+        mailbox.failures = {"m1": [429] * 10}
+
+        with pytest.raises(HttpError) as raised:
+            gmail.list_inbox(last=2)
+        assert raised.value.resp.status == 429
@@ -0,0 +1,354 @@
+"""sync_emails() keeps a SQLite index current from Gmail's history, and searches use it.
+
+sync_emails() re-listed the whole window every run, read all of emails.csv to
+learn what it already had, and fetched each new message with its own request.
+search_emails() and the contact scans always went to the API. Now the first
+sync fills a SQLite index (FTS5 over subjects, addresses and bodies), later
+syncs apply only what history.list reports, and while the index is fresh the
+searches and scans it can answer never touch the API.
+
+Everything here runs against FakeGmail, a local mailbox that speaks the
+discovery client's shape and counts round trips.
+"""
+
+import base64
+import os
+import time
+from unittest.mock import patch
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from connectonion.useful_tools.gmail import Gmail
+from connectonion.useful_tools.gmail_store import MailIndex, parse_query
+
+
+def http_error(status):
+    return HttpError(httplib2.Response({"status": status}), b'{"error": "fake"}')
+
+
+class Request:
+    def __init__(self, mailbox, answer):
+        self.mailbox = mailbox
+        self.answer = answer
+
+    def execute(self):
+        self.mailbox.round_trips += 1
+        return self.answer()
+
+
+class Batch:
+    def __init__(self, mailbox):
+        self.mailbox = mailbox
+        self.parts = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.parts.append((request, callback, request_id))
+
+    def execute(self):
+        self.mailbox.round_trips += 1
+        self.mailbox.batches.append(len(self.parts))
+        for request, callback, request_id in self.parts:
+            try:
+                response, error = request.answer(), None
+            except HttpError as e:
+                response, error = None, e
+            callback(request_id, response, error)
+
+
+class Resource:
+    def __init__(self, **methods):
+        self.__dict__.update(methods)
+
+
+class FakeGmail:
+    """A mailbox that records history as it changes, newest message first."""
+
+    def __init__(self, count):
+        self.round_trips = 0
+        self.batches = []
+        self.history_id = 1000
+        self.oldest_history = 1000
+        self.history = []
+        self.messages = {}
+        for i in range(count):
+            self.add(f"Person {i} <p{i}@partner.org>", f"Subject {i}", f"body of message {i}",
+                     age_days=i, record=False)
+
+    def add(self, sender, subject, body, age_days=0.0, record=True):
+        mid = f"m{len(self.messages)}"
+        self.messages[mid] = {
+            "id": mid, "threadId": f"t{mid}", "labelIds": ["INBOX", "UNREAD"],
+            "internalDate": str(int((time.time() - age_days * 86400) * 1000)),
+            "body": body,
+            "headers": {"From": sender, "To": "me@example.com", "Subject": subject,
+                        "Date": "Sun, 26 Jul 2026 14:30:00 +0000"},
+        }
+        if record:
+            self._record({"messagesAdded": [{"message": {"id": mid}}]})
+        return mid
+
+    def delete(self, mid):
+        del self.messages[mid]
+        self._record({"messagesDeleted": [{"message": {"id": mid}}]})
+
+    def relabel(self, mid, labels):
+        self.messages[mid]["labelIds"] = labels
+        self._record({"labelsRemoved": [{"message": {"id": mid, "labelIds": list(labels)}}]})
+
+    def _record(self, record):
+        self.history_id += 1
+        self.history.append((self.history_id, record))
+
+    def newest_first(self):
+        return sorted(self.messages.values(), key=lambda m: -int(m["internalDate"]))
+
+    # -- the discovery client's surface --
+
+    def new_batch_http_request(self, callback=None):
+        return Batch(self)
+
+    def users(self):
+        return Resource(
+            messages=lambda: Resource(list=self._list, get=self._get),
+            history=lambda: Resource(list=self._history),
+            getProfile=lambda userId: Request(self, lambda: {
+                "emailAddress": "me@example.com", "historyId": str(self.history_id)}),
+            settings=lambda: Resource(sendAs=lambda: Resource(list=lambda userId: Request(
+                self, lambda: {"sendAs": [{"sendAsEmail": "me@example.com"}]}))),
+        )
+
+    def _list(self, userId, maxResults=100, q=None, pageToken=None, labelIds=None):
+        ids = [m["id"] for m in self.newest_first()]
+        start = int(pageToken or 0)
+        page = ids[start:start + maxResults]
+        body = {"messages": [{"id": mid, "threadId": self.messages[mid]["threadId"]} for mid in page]}
+        if start + maxResults < len(ids):
+            body["nextPageToken"] = str(start + maxResults)
+        return Request(self, lambda: body)
+
+    def _get(self, userId, id, format, metadataHeaders=None):
+        def answer():
+            if id not in self.messages:
+                raise http_error(404)
+            message = self.messages[id]
+            payload = {"mimeType": "text/plain",
+                       "headers": [{"name": k, "value": v} for k, v in message["headers"].items()]}
+            if format == "full":
+                payload["body"] = {"data": base64.urlsafe_b64encode(message["body"].encode()).decode()}
+            return {"id": id, "threadId": message["threadId"], "labelIds": list(message["labelIds"]),
+                    "internalDate": message["internalDate"], "snippet": message["body"][:20],
+                    "historyId": str(self.history_id), "payload": payload}
+        return Request(self, answer)
+
+    def _history(self, userId, startHistoryId, pageToken=None):
+        def answer():
+            if int(startHistoryId) < self.oldest_history:
+                raise http_error(404)
+            return {"history": [record for hid, record in self.history if hid > int(startHistoryId)],
+                    "historyId": str(self.history_id)}
+        return Request(self, answer)
+
+
+@pytest.fixture
+def make_gmail(tmp_path):
+    def make(count, **kwargs):
+        with patch.dict(os.environ, {"GOOGLE_SCOPES": "gmail.readonly gmail.send"}):
+            gmail = Gmail(emails_csv=None, contacts_csv=None,
+                          emails_db=str(tmp_path / "emails.sqlite3"), **kwargs)
+        mailbox = FakeGmail(count)
+        gmail._get_service = lambda: mailbox
+        return gmail, mailbox
+    return make
+
+
+def reset(mailbox):
+    mailbox.round_trips, mailbox.batches = 0, []
+
+
+def test_the_first_sync_fetches_full_messages_in_batches(make_gmail):
+    gmail, mailbox = make_gmail(120)
+
+    result = gmail.sync_emails(days_back=300)
+
+    assert "Synced 120 new emails" in result
+    assert mailbox.batches == [50, 50, 20]
+    # profile, one list page, three batches -- was one get per message
+    assert mailbox.round_trips == 5
+    assert gmail._index().count() == 120
+
+
+def test_a_later_sync_applies_only_what_history_reports(make_gmail):
+    gmail, mailbox = make_gmail(30)
+    gmail.sync_emails(days_back=300)
+    reset(mailbox)
+
+    new = mailbox.add("Alice <alice@acme.com>", "Invoice 7", "please pay the invoice")
+    mailbox.delete("m3")
+    mailbox.relabel("m5", ["INBOX"])
+    result = gmail.sync_emails(days_back=300)
+
+    assert "Synced 1 new emails, 1 deleted, 1 relabelled" in result
+    assert mailbox.round_trips == 2  # one history page, one batch for the new message
+    index = gmail._index()
+    assert index.known([new, "m3", "m5"]) == {new, "m5"}
+    assert [r["labels"] for r in index.search("subject:\"Subject 5\"", 1)] == ["INBOX"]
+
+
+def test_nothing_changed_is_one_round_trip(make_gmail):
+    gmail, mailbox = make_gmail(30)
+    gmail.sync_emails()
+    reset(mailbox)
+
+    assert "Synced 0 new emails" in gmail.sync_emails()
+    assert mailbox.round_trips == 1
+
+
+def test_history_gmail_no_longer_has_relists_the_window(make_gmail):
+    gmail, mailbox = make_gmail(10)
+    gmail.sync_emails()
+
+    del mailbox.messages["m4"]  # gone without a history record
+    mailbox.oldest_history = 10**6
+    gmail.sync_emails()
+
+    index = gmail._index()
+    assert index.count() == 9 and not index.known(["m4"])
+    assert mailbox.batches == [10, 9]  # everything fetched again for its labels
+
+
+def test_a_wider_window_lists_again_but_fetches_only_what_is_new(make_gmail):
+    gmail, mailbox = make_gmail(10)
+    gmail.sync_emails(days_back=30)
+    reset(mailbox)
+
+    result = gmail.sync_emails(days_back=300)
+
+    assert "Synced 0 new emails (from 10 total in last 300 days)" in result
+    assert mailbox.batches == []
+
+
+class TestSearchFromTheIndex:
+
+    def test_a_fresh_index_answers_without_the_api(self, make_gmail):
+        gmail, mailbox = make_gmail(20)
+        mailbox.add("Alice <alice@acme.com>", "Invoice 7", "please pay the invoice", record=False)
+        gmail.sync_emails()
+        reset(mailbox)
+
+        emails = gmail.list_search("invoice", max_results=1)
+
+        assert mailbox.round_trips == 0
+        assert emails == [{"id": "m20", "from": "Alice <alice@acme.com>", "subject": "Invoice 7",
+                           "date": "Sun, 26 Jul 2026 14:30:00 +0000", "snippet": "please pay the invoi",
+                           "unread": True}]
+
+    def test_bodies_are_searchable(self, make_gmail):
+        gmail, mailbox = make_gmail(5)
+        gmail.sync_emails()
+        reset(mailbox)
+
+        assert [e["id"] for e in gmail.list_search('"message 3"', max_results=1)] == ["m3"]
+        assert mailbox.round_trips == 0
+
+    def test_a_query_the_index_cannot_read_goes_to_gmail(self, make_gmail):
+        gmail, mailbox = make_gmail(5)
+        gmail.sync_emails()
+        reset(mailbox)
+
+        gmail.list_search("is:unread", max_results=5)
+
+        assert mailbox.round_trips > 0
+
+    def test_fewer_matches_than_asked_for_goes_to_gmail(self, make_gmail):
+        # Older mail outside the synced window might match too.
+        gmail, mailbox = make_gmail(5)
+        gmail.sync_emails()
+        reset(mailbox)
+
+        gmail.list_search("from:partner.org", max_results=10)
+
+        assert mailbox.round_trips > 0
+
+    def test_a_stale_index_goes_to_gmail(self, make_gmail):
+        gmail, mailbox = make_gmail(5, index_max_age=0)
+        gmail.sync_emails()
+        reset(mailbox)
+
+        gmail.list_search("from:partner.org", max_results=1)
+
+        assert mailbox.round_trips > 0
+
+    def test_no_index_until_the_first_sync(self, make_gmail, tmp_path):
+        gmail, mailbox = make_gmail(5)
+
+        gmail.list_search("from:partner.org", max_results=1)
+
+        assert mailbox.round_trips > 0
+        assert not (tmp_path / "emails.sqlite3").exists()
+
+
+def test_the_contact_scan_reads_the_index(make_gmail):
+    gmail, mailbox = make_gmail(60)
+    gmail.sync_emails()
+    reset(mailbox)
+
+    contacts, records = gmail._scan_contacts(max_emails=50)
+
+    assert len(records) == 50 and "p0@partner.org" in contacts
+    assert mailbox.batches == []
+    assert mailbox.round_trips == 2  # profile and send-as only
+
+
+def test_sync_without_a_path_says_so(make_gmail):
+    gmail, _ = make_gmail(1)
+    gmail.emails_db = None
+
+    assert gmail.sync_emails().startswith("No emails_db path configured")
+
+
+class TestParseQuery:
+
+    def test_fields_words_and_phrases(self):
+        assert parse_query('from:alice subject:"q3 plan" budget') == [
+            [("from", "alice"), ("subject", "q3 plan"), ("text", "budget")]]
+
+    def test_or_splits_groups(self):
+        assert parse_query("from:a@x.com OR to:a@x.com") == [[("from", "a@x.com")], [("to", "a@x.com")]]
+
+    @pytest.mark.parametrize("query", ["is:unread", "label:work", "-from:bob", "after:2024/01/01",
+                                       "(a b)", "OR a", "", "from:"])
+    def test_anything_else_is_left_to_gmail(self, query):
+        assert parse_query(query) is None
+
+
+class TestMailIndex:
+
+    def record(self, mid, ts, **fields):
+        return {"id": mid, "thread_id": "t", "from_email": "", "to_email": "", "cc": "",
+                "subject": "", "date": "", "ts": ts, "body": "", "snippet": "", "labels": "INBOX",
+                **fields}
+
+    def test_an_update_keeps_the_full_text_index_in_step(self, tmp_path):
+        index = MailIndex(tmp_path / "i.sqlite3")
+        index.put([self.record("a", 1, subject="old words")])
+        index.put([self.record("a", 1, subject="new words")])
+
+        assert index.search("old", 5) == []
+        assert [r["id"] for r in index.search("new", 5)] == ["a"]
+        index.delete(["a"])
+        assert index.search("new", 5) == []
+
+    def test_spam_and_trash_are_not_listed(self, tmp_path):
+        index = MailIndex(tmp_path / "i.sqlite3")
+        index.put([self.record("a", 3, labels="SPAM"), self.record("b", 2, labels="TRASH"),
+                   self.record("c", 1, labels=None)])
+
+        assert [r["id"] for r in index.recent(5)] == ["c"]
+
+    def test_to_matches_cc(self, tmp_path):
+        index = MailIndex(tmp_path / "i.sqlite3")
+        index.put([self.record("a", 1, cc="Bob <bob@x.com>")])
+
+        assert [r["id"] for r in index.search("to:bob@x.com", 5)] == ["a"]
@@ -151,6 +151,86 @@ class TestVerifySignature:
 
         assert result is True
 
+    def test_utf8_and_legacy_ts_forms_are_accepted_without_a_hint(self):
+        """TS clients sign raw UTF-8, and older ones sort only top-level keys."""
+        from nacl.signing import SigningKey
+
+        signing_key = SigningKey.generate()
+        key_hex = signing_key.verify_key.encode().hex()
+        payload = {"prompt": "你好", "meta": {"z": 1, "a": 2}, "timestamp": 1}
+
+        utf8 = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        legacy = json.dumps({k: payload[k] for k in sorted(payload)},
+                            separators=(",", ":"), ensure_ascii=False)
+        for signed in (utf8, legacy):
+            signature = signing_key.sign(signed.encode()).signature.hex()
+            assert verify_signature(payload, signature, key_hex) is True
+
+    def test_hint_checks_only_the_declared_form(self):
+        """A hinted frame is verified against that one form and no other."""
+        from nacl.signing import SigningKey
+
+        signing_key = SigningKey.generate()
+        key_hex = signing_key.verify_key.encode().hex()
+        payload = {"prompt": "你好", "timestamp": 1}
+        utf8 = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        signature = signing_key.sign(utf8.encode()).signature.hex()
+
+        assert verify_signature(payload, signature, key_hex, "utf8") is True
+        assert verify_signature(payload, signature, key_hex, "escaped") is False
+        assert verify_signature(payload, signature, key_hex, "bogus") is False
+        assert verify_signature(payload, signature, key_hex, ["utf8"]) is False
+
+    def test_hinted_and_escaped_payloads_are_serialized_once(self):
+        """A large prompt costs one json.dumps, not one per canonical form."""
+        from nacl.signing import SigningKey
+        from connectonion.network.host import auth
+
+        signing_key = SigningKey.generate()
+        key_hex = signing_key.verify_key.encode().hex()
+        payload = {"prompt": "x" * 100_000, "images": ["ab" * 50_000], "timestamp": 1}
+        escaped = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        signature = signing_key.sign(escaped.encode()).signature.hex()
+
+        for hint in ("escaped", None):
+            with patch.object(auth.json, "dumps", wraps=json.dumps) as dumps:
+                assert verify_signature(payload, signature, key_hex, hint) is True
+            assert dumps.call_count == 1
+
+    def test_verify_key_is_parsed_once_per_address(self):
+        """Repeated frames from one address reuse its parsed key."""
+        from nacl.signing import SigningKey
+        from connectonion.network.host import auth
+
+        signing_key = SigningKey.generate()
+        key_hex = signing_key.verify_key.encode().hex()
+        payload = {"prompt": "hi", "timestamp": 1}
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        signature = signing_key.sign(canonical.encode()).signature.hex()
+
+        auth._verify_key.cache_clear()
+        for key in (key_hex, "0x" + key_hex, key_hex.upper()):
+            assert verify_signature(payload, signature, key) is True
+        info = auth._verify_key.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
+    def test_frame_hint_reaches_the_verifier(self):
+        """The request envelope's `canonical` field picks the form checked."""
+        from nacl.signing import SigningKey
+        from connectonion.network.host.auth import _authenticate_signed
+
+        signing_key = SigningKey.generate()
+        payload = {"prompt": "你好", "timestamp": time.time()}
+        utf8 = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        data = {
+            "payload": payload,
+            "from": signing_key.verify_key.encode().hex(),
+            "signature": signing_key.sign(utf8.encode()).signature.hex(),
+        }
+
+        assert _authenticate_signed({**data, "canonical": "utf8"})[2] is None
+        assert _authenticate_signed({**data, "canonical": "escaped"})[2] == "unauthorized: invalid signature"
+
 
 class TestExtractAndAuthenticate:
     """Test extract_and_authenticate function."""
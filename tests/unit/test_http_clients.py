@@ -0,0 +1,77 @@
+"""Provider clients are shared per endpoint and key, and reuse their connections."""
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+import openai
+import pytest
+
+from connectonion.core.http_clients import http_client_stats, reset_shared_clients, shared_client
+from connectonion.core.llm import AnthropicLLM, OpenAILLM, create_llm
+
+
+class _Models(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        body = json.dumps({"object": "list", "data": []}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Models)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/v1"
+    reset_shared_clients()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_same_provider_endpoint_and_key_share_a_client():
+    assert OpenAILLM(api_key="k1").client is OpenAILLM(api_key="k1").client
+    assert OpenAILLM(api_key="k1").client is not OpenAILLM(api_key="k2").client
+    assert AnthropicLLM(api_key="k1").client is AnthropicLLM(api_key="k1").client
+    # Same key and SDK, different endpoint.
+    assert create_llm("groq/llama-3", api_key="k1").client is not OpenAILLM(api_key="k1").client
+    assert http_client_stats()["clients"] == 4
+
+
+def test_a_patched_factory_is_keyed_apart_from_the_real_one():
+    real = shared_client("openai", openai.OpenAI, api_key="k")
+    fake = Mock()
+    assert shared_client("openai", fake, api_key="k") is fake.return_value
+    assert "http_client" not in fake.call_args.kwargs
+    assert shared_client("openai", openai.OpenAI, api_key="k") is real
+
+
+def test_unhashable_options_still_key_the_client():
+    timeout = openai.Timeout(600.0, connect=20.0)
+    first = shared_client("openonion", openai.OpenAI, api_key="k", timeout=timeout)
+    again = shared_client("openonion", openai.OpenAI, api_key="k",
+                          timeout=openai.Timeout(600.0, connect=20.0))
+    assert first is again
+    assert shared_client("openonion", openai.OpenAI, api_key="k") is not first
+
+
+def test_requests_across_instances_reuse_one_connection(server):
+    for _ in range(3):
+        client = shared_client("local", openai.OpenAI, api_key="k", base_url=server)
+        client.models.list()
+
+    stats = http_client_stats()
+    assert stats["requests"] == 3
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == 2
@@ -4,12 +4,22 @@ import importlib
 import sys
 import threading
 import time
+from unittest.mock import MagicMock
 
 import pytest
 
 from connectonion import Agent, CodexPlugin, before_each_tool
 from connectonion.cli.co_ai.tools.claude_code import claude_code as co_ai_claude_code
-from connectonion.core.interrupt import InterruptibleIO, UserInterrupt, run_interruptible
+from connectonion.core import interrupt as interrupt_module
+from connectonion.core.interrupt import (
+    CancellationToken,
+    InterruptibleIO,
+    UserInterrupt,
+    current_cancellation,
+    on_cancel,
+    run_interruptible,
+)
+from connectonion.core.llm import OpenAILLM
 from connectonion.core.tool_executor import execute_single_tool
 from connectonion.logger import Logger
 from connectonion.network.io.websocket import WebSocketIO
@@ -119,6 +129,157 @@ def test_worker_exception_is_reraised_on_caller_thread():
         run_interruptible(fail, MailboxIO(), poll_seconds=0.01)
 
 
+def _wait_for_idle_worker():
+    deadline = time.monotonic() + 1
+    while interrupt_module.step_worker_stats()["idle"] == 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_consecutive_steps_reuse_a_pooled_worker_thread():
+    first, _ = run_interruptible(threading.get_ident, MailboxIO())
+    _wait_for_idle_worker()
+    second, _ = run_interruptible(threading.get_ident, MailboxIO())
+
+    assert first == second != threading.get_ident()
+
+
+def test_busy_pool_overflows_to_a_one_off_thread_instead_of_queueing():
+    workers = interrupt_module._StepWorkers(max_workers=1, idle_seconds=0.05)
+    release = threading.Event()
+    ran = threading.Event()
+    workers.submit(lambda: release.wait(timeout=2))
+    workers.submit(ran.set)
+
+    assert ran.wait(timeout=1)
+    assert workers.stats()["overflow"] == 1
+    release.set()
+
+
+def test_idle_pooled_worker_exits_after_its_idle_timeout():
+    workers = interrupt_module._StepWorkers(max_workers=2, idle_seconds=0.02)
+    done = threading.Event()
+    workers.submit(done.set)
+    assert done.wait(timeout=1)
+
+    deadline = time.monotonic() + 1
+    while workers.stats()["workers"]:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+    assert workers.stats()["idle"] == 0
+
+
+def test_step_sees_the_callers_context_and_its_own_token():
+    import contextvars
+
+    marker = contextvars.ContextVar("marker")
+    marker.set("caller")
+
+    (value, token), _ = run_interruptible(
+        lambda: (marker.get(), current_cancellation()), MailboxIO()
+    )
+
+    assert value == "caller"
+    assert isinstance(token, CancellationToken) and not token.cancelled
+    assert current_cancellation() is None
+
+
+def test_interrupt_cancels_the_token_and_runs_its_callbacks():
+    io = WebSocketIO()
+    registered = threading.Event()
+    closed = threading.Event()
+
+    def step():
+        token = current_cancellation()
+        on_cancel(closed.set)
+        registered.set()
+        token.wait(timeout=2)
+        token.raise_if_cancelled()
+
+    def interrupt():
+        assert registered.wait(timeout=1)
+        io.request_interrupt()
+
+    threading.Thread(target=interrupt, daemon=True).start()
+    result, interrupted = run_interruptible(step, io, poll_seconds=10)
+
+    assert interrupted is True and result is None
+    assert closed.wait(timeout=1)
+
+
+def test_watched_mailbox_wakes_the_wait_without_polling():
+    io = WebSocketIO()
+    started = threading.Event()
+    release = threading.Event()
+
+    def step():
+        started.set()
+        release.wait(timeout=5)
+
+    def interrupt():
+        assert started.wait(timeout=1)
+        io.send_to_agent({"type": "INTERRUPT"})
+
+    threading.Thread(target=interrupt, daemon=True).start()
+    before = time.monotonic()
+    _, interrupted = run_interruptible(step, io, poll_seconds=10)
+    elapsed = time.monotonic() - before
+    release.set()
+
+    assert interrupted is True
+    assert elapsed < 0.5
+    assert io._mailbox_watchers == set()
+
+
+def test_cancelled_token_runs_late_callbacks_immediately_and_once():
+    token = CancellationToken()
+    calls = []
+    remove = token.on_cancel(lambda: calls.append("early"))
+    token.on_cancel(lambda: calls.append("removed"))()
+    token.cancel()
+    token.cancel()
+    token.on_cancel(lambda: calls.append("late"))
+
+    assert calls == ["early", "late"]
+    remove()
+    assert on_cancel(lambda: calls.append("outside"))() is None
+    assert calls == ["early", "late"]
+
+
+def test_interrupt_closes_a_streaming_llm_response():
+    class BlockingStream:
+        def __init__(self):
+            self.closed = threading.Event()
+            self.reading = threading.Event()
+
+        def __iter__(self):
+            self.reading.set()
+            self.closed.wait(timeout=5)
+            raise ConnectionError("response closed")
+
+        def close(self):
+            self.closed.set()
+
+    stream = BlockingStream()
+    llm = OpenAILLM.__new__(OpenAILLM)
+    llm.client = MagicMock()
+    llm.client.chat.completions.create.return_value = stream
+    io = WebSocketIO()
+
+    def step():
+        return list(llm._stream_chat_completions({}, lambda send: send(), None))
+
+    def interrupt():
+        assert stream.reading.wait(timeout=1)
+        io.request_interrupt()
+
+    threading.Thread(target=interrupt, daemon=True).start()
+    _, interrupted = run_interruptible(step, io, poll_seconds=10)
+
+    assert interrupted is True
+    assert stream.closed.wait(timeout=1)
+
+
 def test_abandoned_agent_tool_cannot_commit_session_or_registry_changes():
     started = threading.Event()
     release = threading.Event()
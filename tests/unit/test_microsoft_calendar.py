@@ -144,7 +144,7 @@ class TestMicrosoftCalendarDateTimeParsing:
 class TestMicrosoftCalendarReadOperations:
     """Test MicrosoftCalendar read operations with mocked API."""
 
-    @patch('connectonion.useful_tools.microsoft_calendar.httpx')
+    @patch('connectonion.useful_tools.microsoft_calendar.graph_client')
     def test_list_events(self, mock_httpx):
         """Test listing calendar events."""
         mock_response = MagicMock()
@@ -163,7 +163,7 @@ class TestMicrosoftCalendarReadOperations:
                 }
             ]
         }
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Calendars.Read,Calendars.ReadWrite",
@@ -178,13 +178,13 @@ class TestMicrosoftCalendarReadOperations:
             assert "Team Meeting" in result
             assert "alice@example.com" in result
 
-    @patch('connectonion.useful_tools.microsoft_calendar.httpx')
+    @patch('connectonion.useful_tools.microsoft_calendar.graph_client')
     def test_get_today_events_empty(self, mock_httpx):
         """Test getting today's events when none exist."""
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {'value': []}
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Calendars.Read,Calendars.ReadWrite",
@@ -202,7 +202,7 @@ class TestMicrosoftCalendarReadOperations:
 class TestMicrosoftCalendarCreateOperations:
     """Test MicrosoftCalendar create operations with mocked API."""
 
-    @patch('connectonion.useful_tools.microsoft_calendar.httpx')
+    @patch('connectonion.useful_tools.microsoft_calendar.graph_client')
     def test_create_event(self, mock_httpx):
         """Test creating a calendar event."""
         mock_response = MagicMock()
@@ -212,7 +212,7 @@ class TestMicrosoftCalendarCreateOperations:
             'subject': 'New Meeting',
             'webLink': 'https://outlook.office.com/calendar/...'
         }
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Calendars.Read,Calendars.ReadWrite",
@@ -231,7 +231,7 @@ class TestMicrosoftCalendarCreateOperations:
             assert "Event created" in result
             assert "New Meeting" in result
 
-    @patch('connectonion.useful_tools.microsoft_calendar.httpx')
+    @patch('connectonion.useful_tools.microsoft_calendar.graph_client')
     def test_create_teams_meeting(self, mock_httpx):
         """Test creating a Teams meeting."""
         mock_response = MagicMock()
@@ -241,7 +241,7 @@ class TestMicrosoftCalendarCreateOperations:
             'subject': 'Teams Sync',
             'onlineMeetingUrl': 'https://teams.microsoft.com/l/meetup-join/...'
         }
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Calendars.Read,Calendars.ReadWrite",
@@ -265,7 +265,7 @@ class TestMicrosoftCalendarCreateOperations:
 class TestMicrosoftCalendarUpdateDeleteOperations:
     """Test MicrosoftCalendar update and delete operations."""
 
-    @patch('connectonion.useful_tools.microsoft_calendar.httpx')
+    @patch('connectonion.useful_tools.microsoft_calendar.graph_client')
     def test_update_event(self, mock_httpx):
         """Test updating a calendar event."""
         mock_response = MagicMock()
@@ -274,7 +274,7 @@ class TestMicrosoftCalendarUpdateDeleteOperations:
             'id': 'event-123',
             'subject': 'Updated Meeting'
         }
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Calendars.Read,Calendars.ReadWrite",
@@ -291,12 +291,12 @@ class TestMicrosoftCalendarUpdateDeleteOperations:
 
             assert "Event updated" in result
 
-    @patch('connectonion.useful_tools.microsoft_calendar.httpx')
+    @patch('connectonion.useful_tools.microsoft_calendar.graph_client')
     def test_delete_event(self, mock_httpx):
         """Test deleting a calendar event."""
         mock_response = MagicMock()
         mock_response.status_code = 204
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Calendars.Read,Calendars.ReadWrite",
@@ -315,13 +315,13 @@ class TestMicrosoftCalendarUpdateDeleteOperations:
 class TestMicrosoftCalendarAvailability:
     """Test MicrosoftCalendar availability checking."""
 
-    @patch('connectonion.useful_tools.microsoft_calendar.httpx')
+    @patch('connectonion.useful_tools.microsoft_calendar.graph_client')
     def test_check_availability_free(self, mock_httpx):
         """Test checking availability when time is free."""
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {'value': []}
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Calendars.Read,Calendars.ReadWrite",
@@ -335,7 +335,7 @@ class TestMicrosoftCalendarAvailability:
 
             assert "FREE" in result
 
-    @patch('connectonion.useful_tools.microsoft_calendar.httpx')
+    @patch('connectonion.useful_tools.microsoft_calendar.graph_client')
     def test_check_availability_busy(self, mock_httpx):
         """Test checking availability when time is busy."""
         mock_response = MagicMock()
@@ -348,7 +348,7 @@ class TestMicrosoftCalendarAvailability:
                 }
             ]
         }
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Calendars.Read,Calendars.ReadWrite",
@@ -76,6 +76,49 @@ class TestOpenOnionLLM:
                 assert result.content == "Test response"
                 assert result.tool_calls == []
 
+    def test_stream_assembles_deltas_into_response(self):
+        """stream() yields text and tool-call fragments, then the joined response."""
+        from types import SimpleNamespace
+
+        def chunk(content=None, tool_calls=None, usage=None):
+            delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+            choices = [SimpleNamespace(delta=delta)] if content or tool_calls else []
+            return SimpleNamespace(choices=choices, usage=usage)
+
+        def fragment(arguments, id=None, name=None):
+            return SimpleNamespace(
+                index=0, id=id, function=SimpleNamespace(name=name, arguments=arguments),
+            )
+
+        chunks = [
+            chunk(content="Check"),
+            chunk(content="ing"),
+            chunk(tool_calls=[fragment('{"city": ', id="call_1", name="weather")]),
+            chunk(tool_calls=[fragment('"Paris"}')]),
+            chunk(usage=SimpleNamespace(
+                prompt_tokens=10, completion_tokens=5, prompt_tokens_details=None,
+                total_tokens=15, cost_usd=0.002,
+            )),
+        ]
+        with patch.dict(os.environ, {'OPENONION_API_KEY': 'mock-jwt-token'}, clear=True):
+            llm = OpenOnionLLM(model="co/o4-mini")
+
+            with patch.object(llm.client.chat.completions, 'create', return_value=iter(chunks)) as mock_create:
+                streamed = list(llm.stream([{"role": "user", "content": "test"}]))
+
+            call_kwargs = mock_create.call_args[1]
+            assert call_kwargs['stream'] is True
+            assert call_kwargs['stream_options'] == {"include_usage": True}
+
+        assert [c.text for c in streamed if c.kind == "text"] == ["Check", "ing"]
+        assert [c.arguments for c in streamed if c.kind == "tool_call"] == ['{"city": ', '"Paris"}']
+        response = streamed[-1].response
+        assert response.content == "Checking"
+        assert response.tool_calls[0].name == "weather"
+        assert response.tool_calls[0].id == "call_1"
+        assert response.tool_calls[0].arguments == {"city": "Paris"}
+        assert response.usage.cost == 0.002
+
     def test_complete_o4mini(self):
         """Test complete method with co/o4-mini model."""
         with patch.dict(os.environ, {'OPENONION_API_KEY': 'mock-jwt-token'}, clear=True):
@@ -255,7 +255,7 @@ class TestOutlookEmailFormatting:
 class TestOutlookReadOperations:
     """Test Outlook read operations with mocked API."""
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_read_inbox(self, mock_httpx):
         """Test reading inbox."""
         mock_response = MagicMock()
@@ -272,7 +272,7 @@ class TestOutlookReadOperations:
                 }
             ]
         }
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Mail.Read,Mail.Send",
@@ -287,7 +287,7 @@ class TestOutlookReadOperations:
             assert "test@example.com" in result
             assert "Hello" in result
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_search_emails(self, mock_httpx):
         """Test searching emails."""
         mock_response = MagicMock()
@@ -304,7 +304,7 @@ class TestOutlookReadOperations:
                 }
             ]
         }
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Mail.Read,Mail.Send",
@@ -323,7 +323,7 @@ class TestOutlookReadOperations:
 class TestOutlookListInbox:
     """Test structured inbox listing (used by the CLI)."""
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_list_inbox_returns_dicts(self, mock_httpx):
         """Test list_inbox returns plain email dicts."""
         mock_response = MagicMock()
@@ -340,7 +340,7 @@ class TestOutlookListInbox:
                 }
             ]
         }
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Mail.Read,Mail.Send",
@@ -366,13 +366,13 @@ class TestOutlookListInbox:
 class TestOutlookSendOperations:
     """Test Outlook send operations with mocked API."""
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_send_email(self, mock_httpx):
         """Test sending email."""
         mock_response = MagicMock()
         mock_response.status_code = 202
         mock_response.text = ""  # Graph sendMail returns 202 with an empty body
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Mail.Read,Mail.Send",
@@ -391,13 +391,13 @@ class TestOutlookSendOperations:
             assert "sent successfully" in result
             assert "recipient@example.com" in result
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_send_email_with_attachment(self, mock_httpx, tmp_path):
         """Test sending email with a file attachment."""
         mock_response = MagicMock()
         mock_response.status_code = 202
         mock_response.text = ""  # Graph sendMail returns 202 with an empty body
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         screenshot = tmp_path / "screenshot.png"
         screenshot.write_bytes(b"\x89PNG fake image data")
@@ -420,7 +420,7 @@ class TestOutlookSendOperations:
             assert "sent successfully" in result
             assert "screenshot.png" in result
 
-            sent_message = mock_httpx.request.call_args.kwargs["json"]["message"]
+            sent_message = mock_httpx.return_value.request.call_args.kwargs["json"]["message"]
             attachment = sent_message["attachments"][0]
             assert attachment["@odata.type"] == "#microsoft.graph.fileAttachment"
             assert attachment["name"] == "screenshot.png"
@@ -526,13 +526,13 @@ class TestOutlookSendOperations:
 
         outlook._request.assert_not_called()
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_send_email_scheduled(self, mock_httpx):
         """Test scheduled send sets the deferred-send extended property."""
         mock_response = MagicMock()
         mock_response.status_code = 202
         mock_response.text = ""  # Graph sendMail returns 202 with an empty body
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Mail.Read,Mail.Send",
@@ -553,11 +553,11 @@ class TestOutlookSendOperations:
             assert "2026-07-06T15:30:00Z" in result
             assert "recipient@example.com" in result
 
-            method, url = mock_httpx.request.call_args.args[:2]
+            method, url = mock_httpx.return_value.request.call_args.args[:2]
             assert method == "POST"
             assert url.endswith("/me/sendMail")
 
-            sent_message = mock_httpx.request.call_args.kwargs["json"]["message"]
+            sent_message = mock_httpx.return_value.request.call_args.kwargs["json"]["message"]
             assert sent_message["singleValueExtendedProperties"] == [
                 {"id": "SystemTime 0x3FEF", "value": "2026-07-06T15:30:00Z"}
             ]
@@ -586,13 +586,13 @@ class TestOutlookSendOperations:
 class TestOutlookReply:
     """Test reply operations with mocked API."""
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_reply_scheduled(self, mock_httpx):
         """Test scheduled reply carries the deferred-send property."""
         mock_response = MagicMock()
         mock_response.status_code = 202
         mock_response.text = ""
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Mail.Read,Mail.Send",
@@ -605,18 +605,18 @@ class TestOutlookReply:
             result = outlook.reply("msg-1", "See you then", send_at="2026-07-06T15:30:00Z")
 
             assert "scheduled" in result.lower()
-            payload = mock_httpx.request.call_args.kwargs["json"]
+            payload = mock_httpx.return_value.request.call_args.kwargs["json"]
             assert payload["comment"] == "<p>See you then</p>"
             prop = payload["message"]["singleValueExtendedProperties"][0]
             assert prop == {"id": "SystemTime 0x3FEF", "value": "2026-07-06T15:30:00Z"}
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_reply_immediate_has_no_message_block(self, mock_httpx):
         """Test immediate reply payload stays a bare comment."""
         mock_response = MagicMock()
         mock_response.status_code = 202
         mock_response.text = ""
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Mail.Read,Mail.Send",
@@ -629,15 +629,15 @@ class TestOutlookReply:
             result = outlook.reply("msg-1", "Thanks!")
 
             assert "sent" in result.lower()
-            assert mock_httpx.request.call_args.kwargs["json"] == {"comment": "<p>Thanks!</p>"}
+            assert mock_httpx.return_value.request.call_args.kwargs["json"] == {"comment": "<p>Thanks!</p>"}
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_reply_plain_text_paragraphs_become_html(self, mock_httpx):
         """Plain-text paragraphs convert to <p> blocks so Graph keeps line breaks."""
         mock_response = MagicMock()
         mock_response.status_code = 202
         mock_response.text = ""
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Mail.Read,Mail.Send",
@@ -649,16 +649,16 @@ class TestOutlookReply:
             outlook = Outlook()
             outlook.reply("msg-1", "Hi Tamara,\n\nFirst line\nsecond line\n\nBye")
 
-            comment = mock_httpx.request.call_args.kwargs["json"]["comment"]
+            comment = mock_httpx.return_value.request.call_args.kwargs["json"]["comment"]
             assert comment == "<p>Hi Tamara,</p><p>First line<br>second line</p><p>Bye</p>"
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_reply_escapes_html_characters(self, mock_httpx):
         """User text is escaped so '<' and '&' can't inject markup or vanish."""
         mock_response = MagicMock()
         mock_response.status_code = 202
         mock_response.text = ""
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Mail.Read,Mail.Send",
@@ -670,7 +670,7 @@ class TestOutlookReply:
             outlook = Outlook()
             outlook.reply("msg-1", "cost < $10 & rising")
 
-            comment = mock_httpx.request.call_args.kwargs["json"]["comment"]
+            comment = mock_httpx.return_value.request.call_args.kwargs["json"]["comment"]
             assert comment == "<p>cost &lt; $10 &amp; rising</p>"
 
 
@@ -687,10 +687,10 @@ class TestOutlookReplyAttachments:
         from connectonion.useful_tools.outlook import Outlook
         return Outlook(allow_external_attachments=allow_external_attachments)
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_reply_with_one_attachment_still_replies_to_the_thread(self, mock_httpx, tmp_path):
         """The file rides on the reply action, so the thread is kept."""
-        mock_httpx.request.return_value = MagicMock(status_code=202, text="")
+        mock_httpx.return_value.request.return_value = MagicMock(status_code=202, text="")
         signed = tmp_path / "signed.pdf"
         signed.write_bytes(b"%PDF-1.4 fake")
 
@@ -700,12 +700,12 @@ class TestOutlookReplyAttachments:
         assert "sent" in result.lower()
         assert "signed.pdf" in result
 
-        method, url = mock_httpx.request.call_args.args[:2]
+        method, url = mock_httpx.return_value.request.call_args.args[:2]
         assert method == "POST"
         # A reply must not degrade into a fresh sendMail — that loses threading.
         assert url.endswith("/me/messages/msg-1/reply")
 
-        payload = mock_httpx.request.call_args.kwargs["json"]
+        payload = mock_httpx.return_value.request.call_args.kwargs["json"]
         assert payload["comment"] == "<p>Signed copy attached</p>"
         attachment = payload["message"]["attachments"][0]
         assert attachment["@odata.type"] == "#microsoft.graph.fileAttachment"
@@ -713,10 +713,10 @@ class TestOutlookReplyAttachments:
         assert attachment["contentType"] == "application/pdf"
         assert base64.b64decode(attachment["contentBytes"]) == b"%PDF-1.4 fake"
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_reply_attaches_every_file_in_order(self, mock_httpx, tmp_path):
         """Several attachments all reach Graph, each with its own MIME type."""
-        mock_httpx.request.return_value = MagicMock(status_code=202, text="")
+        mock_httpx.return_value.request.return_value = MagicMock(status_code=202, text="")
         report = tmp_path / "report.pdf"
         report.write_bytes(b"%PDF report")
         chart = tmp_path / "chart.png"
@@ -725,7 +725,7 @@ class TestOutlookReplyAttachments:
         result = self._outlook().reply("msg-1", "Both attached",
                                       attachments=[str(report), str(chart)])
 
-        attachments = mock_httpx.request.call_args.kwargs["json"]["message"]["attachments"]
+        attachments = mock_httpx.return_value.request.call_args.kwargs["json"]["message"]["attachments"]
         assert [(a["name"], a["contentType"]) for a in attachments] == [
             ("report.pdf", "application/pdf"),
             ("chart.png", "image/png"),
@@ -735,10 +735,10 @@ class TestOutlookReplyAttachments:
         ]
         assert "report.pdf, chart.png" in result
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_scheduled_reply_keeps_both_attachments_and_deferred_send(self, mock_httpx, tmp_path):
         """--attach and --at are not a choice: one message carries both."""
-        mock_httpx.request.return_value = MagicMock(status_code=202, text="")
+        mock_httpx.return_value.request.return_value = MagicMock(status_code=202, text="")
         signed = tmp_path / "signed.pdf"
         signed.write_bytes(b"%PDF-1.4 fake")
 
@@ -748,7 +748,7 @@ class TestOutlookReplyAttachments:
         assert "scheduled" in result.lower()
         assert "signed.pdf" in result
 
-        message = mock_httpx.request.call_args.kwargs["json"]["message"]
+        message = mock_httpx.return_value.request.call_args.kwargs["json"]["message"]
         assert message["attachments"][0]["name"] == "signed.pdf"
         assert message["singleValueExtendedProperties"] == [
             {"id": "SystemTime 0x3FEF", "value": "2026-07-06T15:30:00Z"}
@@ -794,10 +794,10 @@ class TestOutlookReplyAttachments:
 
         outlook._request.assert_not_called()
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_graph_rejection_is_not_reported_as_a_sent_reply(self, mock_httpx, tmp_path):
         """A Graph error on the upload must raise, not return 'Reply sent'."""
-        mock_httpx.request.return_value = MagicMock(
+        mock_httpx.return_value.request.return_value = MagicMock(
             status_code=413, text="attachment too large"
         )
         signed = tmp_path / "signed.pdf"
@@ -820,15 +820,15 @@ class TestOutlookReplyPositionalCompatibility:
         from connectonion.useful_tools.outlook import Outlook
         return Outlook(allow_external_attachments=True)
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_legacy_third_positional_argument_still_schedules(self, mock_httpx):
         """A caller written before attachments existed still schedules, not attaches."""
-        mock_httpx.request.return_value = MagicMock(status_code=202, text="")
+        mock_httpx.return_value.request.return_value = MagicMock(status_code=202, text="")
 
         result = self._outlook().reply("msg-1", "See you then", "2026-07-06T15:30:00Z")
 
         assert "scheduled" in result.lower()
-        payload = mock_httpx.request.call_args.kwargs["json"]
+        payload = mock_httpx.return_value.request.call_args.kwargs["json"]
         assert payload["message"]["singleValueExtendedProperties"] == [
             {"id": "SystemTime 0x3FEF", "value": "2026-07-06T15:30:00Z"}
         ]
@@ -861,13 +861,13 @@ class TestOutlookReplyPositionalCompatibility:
 class TestOutlookActions:
     """Test Outlook action operations with mocked API."""
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_mark_read(self, mock_httpx):
         """Test marking email as read."""
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {}
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Mail.Read,Mail.Send",
@@ -882,13 +882,13 @@ class TestOutlookActions:
             assert "Marked email as read" in result
             assert "msg-123" in result
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_count_unread(self, mock_httpx):
         """Test counting unread emails."""
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {'unreadItemCount': 5}
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, {
             "MICROSOFT_SCOPES": "Mail.Read,Mail.Send",
@@ -913,7 +913,7 @@ class TestOutlookScheduled:
         "MICROSOFT_TOKEN_EXPIRES_AT": "2099-12-31T23:59:59Z",
     }
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_get_scheduled_filters_ordinary_drafts(self, mock_httpx):
         """Only drafts carrying the deferred-send property count as scheduled."""
         mock_response = MagicMock()
@@ -934,7 +934,7 @@ class TestOutlookScheduled:
                 "toRecipients": [],
             },
         ]}
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, self.ENV, clear=False):
             from connectonion.useful_tools.outlook import Outlook
@@ -949,11 +949,11 @@ class TestOutlookScheduled:
 
         # The request must target the drafts folder and expand the
         # deferred-send property — a broken query would silently return [].
-        url = mock_httpx.request.call_args.args[1]
+        url = mock_httpx.return_value.request.call_args.args[1]
         assert "/me/mailFolders/drafts/messages" in url
         assert "SystemTime 0x3FEF" in url
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_get_scheduled_follows_next_link(self, mock_httpx):
         """Scheduled drafts beyond the first page are still found."""
         def make_draft(i, scheduled):
@@ -971,7 +971,7 @@ class TestOutlookScheduled:
         }
         page2 = MagicMock(status_code=200, text="ok")
         page2.json.return_value = {"value": [make_draft(99, scheduled=True)]}
-        mock_httpx.request.side_effect = [page1, page2]
+        mock_httpx.return_value.request.side_effect = [page1, page2]
 
         with patch.dict(os.environ, self.ENV, clear=False):
             from connectonion.useful_tools.outlook import Outlook
@@ -979,20 +979,20 @@ class TestOutlookScheduled:
 
         assert [e["id"] for e in scheduled] == ["d-99"]
 
-    @patch('connectonion.useful_tools.outlook.httpx')
+    @patch('connectonion.useful_tools.outlook.graph_client')
     def test_cancel_scheduled_deletes_message(self, mock_httpx):
         """cancel_scheduled issues a DELETE for the pending message."""
         mock_response = MagicMock()
         mock_response.status_code = 204
         mock_response.text = ""
-        mock_httpx.request.return_value = mock_response
+        mock_httpx.return_value.request.return_value = mock_response
 
         with patch.dict(os.environ, self.ENV, clear=False):
             from connectonion.useful_tools.outlook import Outlook
             result = Outlook().cancel_scheduled("sched-1")
 
         assert "Canceled" in result
-        method, url = mock_httpx.request.call_args.args[:2]
+        method, url = mock_httpx.return_value.request.call_args.args[:2]
         assert method == "DELETE"
         assert url.endswith("/me/messages/sched-1")
 
@@ -1006,7 +1006,7 @@ class TestOutlookContacts:
         "MICROSOFT_REFRESH_TOKEN": "test-refresh",
     }
 
-    @patch("connectonion.useful_tools.outlook.httpx")
+    @patch("connectonion.useful_tools.outlook.graph_client")
     def test_add_contact_posts_name_and_email(self, mock_httpx):
         response = MagicMock(status_code=201, text="ok")
         response.json.return_value = {
@@ -1017,7 +1017,7 @@ class TestOutlookContacts:
                 "address": "zhou@example.com",
             }],
         }
-        mock_httpx.request.return_value = response
+        mock_httpx.return_value.request.return_value = response
 
         with patch.dict(os.environ, self.ENV, clear=False):
             from connectonion.useful_tools.outlook import Outlook
@@ -1032,10 +1032,10 @@ class TestOutlookContacts:
             "name": "Zhou Yifei",
             "email": "zhou@example.com",
         }
-        method, url = mock_httpx.request.call_args.args[:2]
+        method, url = mock_httpx.return_value.request.call_args.args[:2]
         assert method == "POST"
         assert url.endswith("/me/contacts")
-        assert mock_httpx.request.call_args.kwargs["json"] == {
+        assert mock_httpx.return_value.request.call_args.kwargs["json"] == {
             "displayName": "Zhou Yifei",
             "emailAddresses": [{
                 "name": "Zhou Yifei",
@@ -1043,10 +1043,20 @@ class TestOutlookContacts:
             }],
         }
 
-    @patch("connectonion.useful_tools.outlook.httpx")
+    @staticmethod
+    def _responses(*bodies):
+        responses = []
+        for body in bodies:
+            response = MagicMock(status_code=200, text="ok")
+            response.json.return_value = body
+            responses.append(response)
+        return responses
+
+    @patch("connectonion.useful_tools.outlook.graph_client")
     def test_list_contacts_normalizes_graph_results(self, mock_httpx):
-        response = MagicMock(status_code=200, text="ok")
-        response.json.return_value = {"value": [
+        folders = {"value": []}
+        default = {"value": [{"parentFolderId": "default-folder"}]}
+        delta = {"value": [
             {
                 "id": "contact-1",
                 "displayName": "Zhou Yifei",
@@ -1060,8 +1070,8 @@ class TestOutlookContacts:
                 "displayName": "No Email",
                 "emailAddresses": [],
             },
-        ]}
-        mock_httpx.request.return_value = response
+        ], "@odata.deltaLink": "https://graph.microsoft.com/v1.0/next"}
+        mock_httpx.return_value.request.side_effect = self._responses(folders, default, delta)
 
         with patch.dict(os.environ, self.ENV, clear=False):
             from connectonion.useful_tools.outlook import Outlook
@@ -1069,16 +1079,17 @@ class TestOutlookContacts:
             outlook._access_token = "test-token"
             contacts = outlook.list_contacts(max_results=25)
 
+        # Delta rounds come in no particular order; the list is by name.
         assert contacts == [
+            {"id": "contact-2", "name": "No Email", "email": ""},
             {
                 "id": "contact-1",
                 "name": "Zhou Yifei",
                 "email": "zhou@example.com",
             },
-            {"id": "contact-2", "name": "No Email", "email": ""},
         ]
-        _, url = mock_httpx.request.call_args.args[:2]
-        assert "/me/contacts" in url
+        _, url = mock_httpx.return_value.request.call_args.args[:2]
+        assert "/me/contactFolders/default-folder/contacts/delta" in url
         assert "$select=id,displayName,emailAddresses" in url
 
     def test_search_contacts_matches_name_and_email_case_insensitively(self):
@@ -1112,10 +1123,10 @@ class TestOutlookContacts:
                 "email": "zhou@example.com",
             }]
 
-    @patch("connectonion.useful_tools.outlook.httpx")
+    @patch("connectonion.useful_tools.outlook.graph_client")
     def test_search_contacts_follows_graph_pages(self, mock_httpx):
-        page1 = MagicMock(status_code=200, text="ok")
-        page1.json.return_value = {
+        folders = {"value": [{"id": "sub", "parentFolderId": "default-folder"}]}
+        page1 = {
             "value": [{
                 "id": "contact-1",
                 "displayName": "Alice",
@@ -1125,11 +1136,11 @@ class TestOutlookContacts:
                 }],
             }],
             "@odata.nextLink": (
-                "https://graph.microsoft.com/v1.0/me/contacts?$skip=100"
+                "https://graph.microsoft.com/v1.0/me/contactFolders/default-folder"
+                "/contacts/delta?$skiptoken=2"
             ),
         }
-        page2 = MagicMock(status_code=200, text="ok")
-        page2.json.return_value = {"value": [{
+        page2 = {"value": [{
             "id": "contact-2",
             "displayName": "Zhou Yifei",
             "emailAddresses": [{
@@ -1137,7 +1148,9 @@ class TestOutlookContacts:
                 "address": "zhou@example.com",
             }],
         }]}
-        mock_httpx.request.side_effect = [page1, page2]
+        subfolder = {"value": []}
+        mock_httpx.return_value.request.side_effect = self._responses(
+            folders, page1, page2, subfolder)
 
         with patch.dict(os.environ, self.ENV, clear=False):
             from connectonion.useful_tools.outlook import Outlook
@@ -1146,7 +1159,7 @@ class TestOutlookContacts:
             contacts = outlook.search_contacts("yifei")
 
         assert [contact["id"] for contact in contacts] == ["contact-2"]
-        assert mock_httpx.request.call_count == 2
+        assert mock_httpx.return_value.request.call_count == 4
 
     def test_contact_methods_require_contacts_readwrite(self):
         with patch.dict(os.environ, {
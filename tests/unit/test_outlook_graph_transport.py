@@ -0,0 +1,373 @@
+"""Outlook and MicrosoftCalendar share one pooled Graph connection, batch, and sync by delta.
+
+Every Graph call used module-level httpx.request, so each one opened its own
+TLS connection. Bulk actions cost a request per message, and every read_inbox
+or contact search fetched everything again. Now the tools share one keep-alive
+client (useful_tools/_graph.py), comma-separated ids go through $batch, and
+the inbox window and the contacts are mirrored through delta links so a
+repeated call transfers only what changed.
+
+Everything here runs against StandInGraph, a local HTTP/1.1 server speaking
+enough of Graph for these calls, which counts connections and requests.
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from connectonion.useful_tools import _graph
+from connectonion.useful_tools import outlook as outlook_module
+from connectonion.useful_tools.microsoft_calendar import MicrosoftCalendar
+from connectonion.useful_tools.outlook import Outlook
+
+
+def iso(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class StandInGraph:
+    """An inbox and contacts folder behind Graph's URLs, with a change log for delta."""
+
+    def __init__(self, inbox=30, old=5):
+        now = datetime.now(timezone.utc)
+        self.messages = {}
+        for i in range(inbox + old):
+            age = timedelta(hours=i) if i < inbox else timedelta(days=30 + i)
+            self.messages[f"m{i}"] = {
+                "id": f"m{i}", "subject": f"Subject {i}", "isRead": False, "folder": "inbox",
+                "receivedDateTime": iso(now - age), "bodyPreview": f"preview {i}",
+                "from": {"emailAddress": {"address": f"p{i}@partner.org", "name": f"Person {i}"}},
+                "body": {"contentType": "text", "content": f"body of {i}"},
+            }
+        self.contacts = {
+            f"c{i}": {"id": f"c{i}", "displayName": name, "parentFolderId": "root",
+                      "emailAddresses": [{"address": f"{name.lower()}@example.com"}]}
+            for i, name in enumerate(["Zoe", "alice", "Bob"])
+        }
+        self.contact_folders = []  # subfolders of "root", the default folder
+        self.log = []  # (collection, id, removed)
+        self.oldest_token = 0
+        self.throttle = {}  # message id -> times to answer 429 first
+        self.requests = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    # -- changes made behind the tool's back --
+
+    def change(self, collection, item_id, removed=False):
+        self.log.append((collection, item_id, removed))
+
+    def mark_read(self, mid):
+        self.messages[mid]["isRead"] = True
+        self.change("inbox", mid)
+
+    def add_contact(self, cid, name, folder="root"):
+        self.contacts[cid] = {"id": cid, "displayName": name, "parentFolderId": folder,
+                              "emailAddresses": [{"address": f"{name.lower()}@example.com"}]}
+        self.change(f"contacts/{folder}", cid)
+
+    # -- routing --
+
+    def route(self, method, path, query, body, headers):
+        parts = path.strip("/").split("/")
+        if method == "POST" and parts == ["$batch"]:
+            return 200, {"responses": [self.part(r) for r in body["requests"]]}
+        if method == "GET" and parts == ["me", "mailFolders", "inbox", "messages", "delta"]:
+            return self.delta("inbox", query, headers)
+        if method == "GET" and parts[:2] == ["me", "contactFolders"] and parts[3:] == ["contacts", "delta"]:
+            return self.delta(f"contacts/{parts[2]}", query, headers)
+        if method == "GET" and parts == ["me", "contactFolders"]:
+            return 200, {"value": [{"id": f, "parentFolderId": "root"} for f in self.contact_folders]}
+        if method == "GET" and parts == ["me", "contacts"]:
+            default = [c for c in self.contacts.values() if c["parentFolderId"] == "root"]
+            return 200, {"value": default[:int(query.get("$top", 10))]}
+        if method == "GET" and parts == ["me", "mailFolders", "inbox", "messages"]:
+            top = int(query.get("$top", 10))
+            return 200, {"value": [self.public(m) for m in self.inbox()[:top]]}
+        if method == "GET" and parts == ["me", "mailFolders", "inbox"]:
+            return 200, {"unreadItemCount": sum(not m["isRead"] for m in self.inbox())}
+        if method == "GET" and parts == ["me"]:
+            return 200, {"mail": "me@example.com"}
+        if parts[:2] == ["me", "messages"] and parts[2] in self.messages:
+            message = self.messages[parts[2]]
+            if method == "GET" and len(parts) == 3:
+                return 200, self.public(message)
+            if method == "PATCH" and len(parts) == 3:
+                message.update(body)
+                self.change("inbox", message["id"])
+                return 200, self.public(message)
+            if method == "POST" and parts[3:] == ["move"]:
+                message["folder"] = body["destinationId"]
+                self.change("inbox", message["id"], removed=True)
+                return 201, self.public(message)
+        return 404, {"error": {"code": "ErrorItemNotFound", "message": "not found"}}
+
+    def part(self, request):
+        split = urlsplit(request["url"])
+        mid = split.path.strip("/").split("/")[2] if split.path.startswith("/me/messages/") else None
+        if self.throttle.get(mid):
+            self.throttle[mid] -= 1
+            return {"id": request["id"], "status": 429, "headers": {"Retry-After": "0"},
+                    "body": {"error": {"code": "TooManyRequests"}}}
+        query = {k: v[0] for k, v in parse_qs(split.query).items()}
+        status, answer = self.route(request["method"], split.path, query, request.get("body"), {})
+        return {"id": request["id"], "status": status, "headers": {}, "body": answer}
+
+    def inbox(self):
+        found = [m for m in self.messages.values() if m["folder"] == "inbox"]
+        return sorted(found, key=lambda m: m["receivedDateTime"], reverse=True)
+
+    @staticmethod
+    def public(item):
+        return {k: v for k, v in item.items() if k != "folder"}
+
+    def delta(self, collection, query, headers):
+        page_size = int(headers.get("prefer", "odata.maxpagesize=100").split("=")[1])
+        folder = collection.partition("/")[2]
+        base = f"{self.base}/me/mailFolders/inbox/messages/delta" if collection == "inbox" \
+            else f"{self.base}/me/contactFolders/{folder}/contacts/delta"
+        if "$deltatoken" in query:
+            token = int(query["$deltatoken"])
+            if token < self.oldest_token:
+                return 410, {"error": {"code": "SyncStateNotFound"}}
+            changed = {}
+            for kind, item_id, removed in self.log[token:]:
+                if kind == collection:
+                    changed[item_id] = removed
+            items = []
+            for item_id, removed in changed.items():
+                source = self.messages if collection == "inbox" else self.contacts
+                if removed or item_id not in source:
+                    items.append({"id": item_id, "@removed": {"reason": "deleted"}})
+                else:
+                    items.append(self.public(source[item_id]))
+            return 200, {"value": items, "@odata.deltaLink": f"{base}?$deltatoken={len(self.log)}"}
+
+        # The skip token carries the round's filter, as Graph's opaque one does.
+        start, _, since = query.get("$skiptoken", "0_").partition("_")
+        start = int(start)
+        if collection == "inbox":
+            since = since or query["$filter"].split(" ge ")[1]
+            items = [self.public(m) for m in self.inbox() if m["receivedDateTime"] >= since]
+        else:
+            items = [c for c in self.contacts.values() if c["parentFolderId"] == folder]
+        page = {"value": items[start:start + page_size]}
+        if start + page_size < len(items):
+            page["@odata.nextLink"] = f"{base}?$skiptoken={start + page_size}_{since}"
+        else:
+            page["@odata.deltaLink"] = f"{base}?$deltatoken={len(self.log)}"
+        return 200, page
+
+
+@pytest.fixture
+def graph():
+    stand_in = StandInGraph()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            with stand_in.lock:
+                stand_in.connections += 1
+
+        def log_message(self, *args):
+            pass
+
+        def answer(self):
+            split = urlsplit(self.path)
+            path = split.path[len("/v1.0"):]
+            query = {k: v[0] for k, v in parse_qs(split.query).items()}
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length)) if length else None
+            with stand_in.lock:
+                stand_in.requests.append((self.command, path))
+                status, answer = stand_in.route(self.command, path, query, body,
+                                                {k.lower(): v for k, v in self.headers.items()})
+            payload = json.dumps(answer).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_PATCH = do_DELETE = answer
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    stand_in.base = f"http://127.0.0.1:{server.server_address[1]}/v1.0"
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield stand_in
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def outlook(graph, monkeypatch):
+    monkeypatch.setenv("MICROSOFT_SCOPES", "Mail.ReadWrite Mail.Send Contacts.ReadWrite Calendars.ReadWrite")
+    monkeypatch.setenv("MICROSOFT_ACCESS_TOKEN", "token")
+    monkeypatch.setenv("MICROSOFT_REFRESH_TOKEN", "refresh")
+    # A fresh pool per test, so connections counted are this test's own.
+    monkeypatch.setattr(_graph, "_client", None)
+    tool = Outlook()
+    tool._access_token = "token"
+    tool.GRAPH_API_URL = graph.base
+    return tool
+
+
+def test_calls_from_both_tools_share_one_connection(graph, outlook, monkeypatch):
+    calendar = MicrosoftCalendar()
+    calendar._access_token = "token"
+    calendar.GRAPH_API_URL = graph.base
+    monkeypatch.setenv("MICROSOFT_TOKEN_EXPIRES_AT", "2099-12-31T23:59:59Z")
+
+    outlook.count_unread()
+    outlook.get_email_body("m1")
+    outlook.mark_read("m2")
+    assert calendar._request("GET", "/me") == {"mail": "me@example.com"}
+
+    assert len(graph.requests) == 4
+    assert graph.connections == 1
+
+
+class TestBatch:
+
+    def test_bulk_mark_read_is_one_round_trip_per_twenty(self, graph, outlook):
+        ids = [f"m{i}" for i in range(25)]
+
+        result = outlook.mark_read(", ".join(ids))
+
+        assert graph.requests == [("POST", "/$batch"), ("POST", "/$batch")]
+        assert all(graph.messages[i]["isRead"] for i in ids)
+        assert result.startswith("Marked email as read (25): m0, m1")
+
+    def test_a_throttled_part_is_sent_again(self, graph, outlook):
+        graph.throttle = {"m3": 1}
+
+        result = outlook.archive_email("m1,m2,m3")
+
+        assert graph.requests == [("POST", "/$batch"), ("POST", "/$batch")]
+        assert [graph.messages[m]["folder"] for m in ("m1", "m2", "m3")] == ["archive"] * 3
+        assert "Failed" not in result
+
+    def test_a_failed_part_is_reported_not_raised(self, graph, outlook):
+        result = outlook.mark_unread("m1,nope")
+
+        assert "Marked email as unread (1): m1" in result
+        assert "Failed nope: Microsoft Graph API error: 404 - not found" in result
+
+    def test_several_bodies_come_in_one_request(self, graph, outlook):
+        result = outlook.get_email_body("m1,m2")
+
+        assert graph.requests == [("POST", "/$batch")]
+        assert "body of 1" in result and "body of 2" in result
+
+    def test_one_id_is_still_a_plain_request(self, graph, outlook):
+        assert outlook.mark_read("m4") == "Marked email as read: m4"
+        assert graph.requests == [("PATCH", "/me/messages/m4")]
+
+
+def warm_inbox(outlook):
+    """Two reads start the background walk; wait for it to finish."""
+    outlook.list_inbox(last=5)
+    outlook.list_inbox(last=5)
+    outlook._warming["inbox"].join(timeout=10)
+    assert "inbox" in outlook._mirrors
+
+
+class TestInboxDelta:
+
+    def test_a_cold_read_is_one_top_request(self, graph, outlook):
+        first = outlook.list_inbox(last=5)
+
+        assert graph.requests == [("GET", "/me/mailFolders/inbox/messages")]
+        assert [e["id"] for e in first] == ["m0", "m1", "m2", "m3", "m4"]
+        assert outlook._warming == {}
+
+    def test_a_repeated_read_transfers_only_changes(self, graph, outlook, monkeypatch):
+        monkeypatch.setattr(outlook_module, "DELTA_PAGE_SIZE", 10)
+
+        warm_inbox(outlook)
+        delta = [r for r in graph.requests if r[1].endswith("/delta")]
+        assert len(delta) == 3  # the window's 30 messages, ten a page
+
+        graph.requests.clear()
+        graph.mark_read("m1")
+        second = outlook.list_inbox(last=5)
+
+        assert len(graph.requests) == 1
+        assert [e["id"] for e in second] == ["m0", "m1", "m2", "m3", "m4"]
+        assert [e["unread"] for e in second] == [True, False, True, True, True]
+
+    def test_a_message_moved_out_leaves_the_listing(self, graph, outlook):
+        warm_inbox(outlook)
+        outlook.archive_email("m0")
+
+        assert [e["id"] for e in outlook.list_inbox(last=2)] == ["m1", "m2"]
+
+    def test_unread_only(self, graph, outlook):
+        warm_inbox(outlook)
+        graph.mark_read("m0")
+
+        assert [e["id"] for e in outlook.list_inbox(last=2, unread=True)] == ["m1", "m2"]
+
+    def test_more_than_the_window_holds_asks_graph(self, graph, outlook):
+        warm_inbox(outlook)
+        emails = outlook.list_inbox(last=33)
+
+        assert len(emails) == 33
+        assert graph.requests[-1] == ("GET", "/me/mailFolders/inbox/messages")
+
+    def test_an_expired_delta_link_walks_again(self, graph, outlook):
+        warm_inbox(outlook)
+        graph.mark_read("m0")
+        graph.oldest_token = 10**6
+
+        emails = outlook.list_inbox(last=5)
+
+        assert not emails[0]["unread"]
+        assert [r[1] for r in graph.requests[-2:]] == ["/me/mailFolders/inbox/messages/delta"] * 2
+
+    def test_a_zero_window_always_asks_graph(self, graph, outlook):
+        outlook.inbox_window_days = 0
+
+        outlook.list_inbox(last=5)
+        outlook.list_inbox(last=5)
+
+        assert graph.requests == [("GET", "/me/mailFolders/inbox/messages")] * 2
+
+
+def test_contacts_are_synced_by_delta(graph, outlook):
+    assert [c["name"] for c in outlook.list_contacts()] == ["alice", "Bob", "Zoe"]
+    assert ("GET", "/me/contactFolders/root/contacts/delta") in graph.requests
+    graph.requests.clear()
+
+    graph.add_contact("c9", "Yifei")
+    assert [c["id"] for c in outlook.search_contacts("yifei")] == ["c9"]
+    assert len(graph.requests) == 1
+
+
+def test_contacts_in_subfolders_are_synced_per_folder(graph, outlook):
+    graph.contact_folders = ["work"]
+    graph.add_contact("c7", "Wen", folder="work")
+
+    assert [c["name"] for c in outlook.list_contacts()] == ["alice", "Bob", "Wen", "Zoe"]
+    graph.requests.clear()
+
+    graph.add_contact("c8", "Xu", folder="work")
+    assert [c["id"] for c in outlook.search_contacts("xu")] == ["c8"]
+    assert graph.requests == [("GET", "/me/contactFolders/root/contacts/delta"),
+                              ("GET", "/me/contactFolders/work/contacts/delta")]
+
+
+def test_graph_errors_carry_the_status(graph, outlook):
+    with pytest.raises(_graph.GraphError) as raised:
+        outlook.get_email_body("nope")
+
+    assert raised.value.status_code == 404
+    assert isinstance(raised.value, ValueError)
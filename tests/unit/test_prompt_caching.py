@@ -0,0 +1,182 @@
+"""Prompt caching marks stable prefixes, measured against a fake caching provider."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+from connectonion import Agent
+from connectonion.core.llm import AnthropicLLM
+
+
+class CachingMessages:
+    """A stand-in for client.messages that caches the way the Messages API does.
+
+    The request is flattened to blocks in the order the API hashes them --
+    tools, system, messages. A block marked with cache_control stores the
+    prefix ending there; a later request whose prefix up to one of its own
+    markers was stored reads it. Tokens are characters / 4. Usage is reported
+    as Anthropic reports it: input_tokens is only the part neither read from
+    nor written to the cache.
+    """
+
+    def __init__(self, turns: int):
+        self.turns = turns
+        self.stored: set[str] = set()
+        self.requests: list[dict] = []
+
+    def create(self, **request):
+        self.requests.append(request)
+        blocks = _blocks(request)
+        sizes = [len(json.dumps(_unmarked(b))) // 4 for b in blocks]
+        total = sum(sizes)
+        cached = written = 0
+        for end, block in enumerate(blocks, start=1):
+            if "cache_control" not in block:
+                continue
+            key = json.dumps([_unmarked(b) for b in blocks[:end]])
+            if key in self.stored:
+                cached = sum(sizes[:end])
+            else:
+                self.stored.add(key)
+                written = sum(sizes[:end]) - cached
+
+        calls = len(self.requests)
+        if calls < self.turns:
+            content = [SimpleNamespace(type="tool_use", name="lookup",
+                                       input={"query": f"q{calls}"}, id=f"call_{calls}")]
+        else:
+            content = [SimpleNamespace(type="text", text="done")]
+        return SimpleNamespace(content=content, usage=SimpleNamespace(
+            input_tokens=total - cached - written, output_tokens=5,
+            cache_read_input_tokens=cached, cache_creation_input_tokens=written,
+        ))
+
+
+def _blocks(request: dict) -> list[dict]:
+    blocks = list(request.get("tools", []))
+    system = request.get("system")
+    if isinstance(system, str):
+        blocks.append({"type": "text", "text": system})
+    elif system:
+        blocks.extend(system)
+    for message in request["messages"]:
+        content = message["content"]
+        if isinstance(content, str):
+            blocks.append({"type": "text", "text": content})
+        else:
+            blocks.extend(content)
+    return blocks
+
+
+def _unmarked(block: dict) -> dict:
+    return {k: v for k, v in block.items() if k != "cache_control"}
+
+
+def lookup(query: str) -> str:
+    """Look something up."""
+    return f"result for {query}: " + "lorem ipsum " * 40
+
+
+def run_agent(tmp_path, prompt_caching: bool) -> tuple[Agent, CachingMessages]:
+    llm = AnthropicLLM(api_key="test-key", prompt_caching=prompt_caching)
+    fake = llm.client.messages = CachingMessages(turns=6)
+    agent = Agent(
+        name="cached",
+        llm=llm,
+        tools=[lookup],
+        system_prompt="You are a careful research assistant. " * 30,
+        log=False,
+        quiet=True,
+        co_dir=tmp_path / ".co",
+    )
+    assert agent.input("research this") == "done"
+    return agent, fake
+
+
+def turn_result(agent: Agent) -> dict:
+    return next(e for e in agent.current_session['trace'] if e.get('type') == 'turn_result')
+
+
+def test_cached_agent_reads_most_of_its_prompt_from_cache(tmp_path):
+    cached_agent, fake = run_agent(tmp_path / "on", prompt_caching=True)
+    plain_agent, _ = run_agent(tmp_path / "off", prompt_caching=False)
+
+    on = turn_result(cached_agent)
+    off = turn_result(plain_agent)
+    assert off['cache_hit_ratio'] == 0.0
+    assert on['cache_hit_ratio'] > 0.6
+    # Every iteration after the first reads what the one before it wrote.
+    reads = [e['usage']['cached_tokens'] for e in cached_agent.current_session['trace']
+             if e.get('type') == 'llm_result']
+    assert reads[0] == 0
+    assert all(later > earlier for earlier, later in zip(reads, reads[1:]))
+    assert on['usage']['cache_write_tokens'] < on['usage']['input_tokens']
+    assert len(fake.requests) == 6
+
+
+def test_cache_hit_ratio_counts_anthropic_cache_reads_as_part_of_the_prompt():
+    from connectonion.core.usage import cache_hit_ratio
+
+    usage = AnthropicLLM(api_key="test-key")._usage(200, 5, 10_000, 0)
+
+    assert usage.input_tokens == 10_200
+    assert cache_hit_ratio(usage.model_dump()) == 0.9804
+
+
+def test_anthropic_cost_prices_uncached_input_at_the_full_rate():
+    from connectonion.core.usage import get_pricing
+
+    llm = AnthropicLLM(api_key="test-key")
+    usage = llm._usage(200, 5, 10_000, 300)
+    price = get_pricing(llm.model)
+
+    expected = (200 * price["input"] + 5 * price["output"]
+                + 10_000 * price["cached"] + 300 * price["cache_write"]) / 1_000_000
+    assert usage.input_tokens == 10_500
+    assert abs(usage.cost - expected) < 1e-12
+
+
+def test_breakpoints_mark_tools_system_and_last_two_user_turns(tmp_path):
+    _, fake = run_agent(tmp_path, prompt_caching=True)
+    request = fake.requests[-1]
+
+    assert "cache_control" in request["tools"][-1]
+    assert request["system"][0]["cache_control"] == {"type": "ephemeral"}
+    marked = [i for i, m in enumerate(request["messages"])
+              if isinstance(m["content"], list) and "cache_control" in m["content"][-1]]
+    users = [i for i, m in enumerate(request["messages"]) if m["role"] == "user"]
+    assert marked == users[-2:]
+    assert sum("cache_control" in b for b in _blocks(request)) == 4
+
+
+def test_marking_does_not_touch_shared_conversions(tmp_path):
+    _, fake = run_agent(tmp_path, prompt_caching=True)
+
+    # Earlier requests keep exactly the markers they were sent with: the
+    # conversions cached between iterations were copied, not edited.
+    for request in fake.requests:
+        assert sum("cache_control" in b for b in _blocks(request)) <= 4
+
+
+def test_openai_prompt_cache_key_follows_system_prompt_and_tools():
+    from unittest.mock import Mock
+    from connectonion.core.llm import OpenAILLM
+
+    llm = OpenAILLM(api_key="test-key", model="gpt-4o", prompt_caching=True)
+    message = SimpleNamespace(content="ok", tool_calls=None)
+    llm.client.chat.completions.create = Mock(return_value=SimpleNamespace(
+        choices=[SimpleNamespace(message=message)],
+        usage=SimpleNamespace(prompt_tokens=1, completion_tokens=1, prompt_tokens_details=None),
+    ))
+    tools = [{"name": "lookup", "description": "", "parameters": {"type": "object"}}]
+
+    def key(system, *history, extra_body=None):
+        kwargs = {"extra_body": extra_body} if extra_body else {}
+        llm.complete([{"role": "system", "content": system}, *history], tools=tools, **kwargs)
+        return llm.client.chat.completions.create.call_args.kwargs["extra_body"]
+
+    first = key("Be brief.", {"role": "user", "content": "a"})
+    assert key("Be brief.", {"role": "user", "content": "b"}) == first
+    assert key("Be thorough.") != first
+    assert key("Be brief.", extra_body={"user": "x"}) == {**first, "user": "x"}
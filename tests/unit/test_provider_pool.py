@@ -0,0 +1,122 @@
+"""Unit tests for connectonion/useful_tools/_provider_pool.py (warm provider processes)."""
+
+from connectonion.useful_tools._provider_pool import ProcessPool
+
+
+class Process:
+    def __init__(self, name="p"):
+        self.name = name
+        self.alive = True
+        self.closed = False
+
+    def healthy(self):
+        return self.alive
+
+    def close(self):
+        self.closed = True
+        self.alive = False
+
+
+def _pool(**kwargs):
+    return ProcessPool(**{"idle_ttl": 60.0, **kwargs})
+
+
+def test_released_process_is_handed_to_the_next_acquire():
+    pool = _pool()
+    first = pool.acquire("k", Process)
+    pool.release("k", first)
+
+    assert pool.acquire("k", Process) is first
+    assert pool.stats()["hits"] == 1
+    assert pool.stats()["cold_starts"] == 1
+    pool.close_all()
+
+
+def test_keys_do_not_share_processes():
+    pool = _pool()
+    first = pool.acquire("a", Process)
+    pool.release("a", first)
+
+    assert pool.acquire("b", Process) is not first
+    assert pool.stats()["idle"] == 1
+    pool.close_all()
+
+
+def test_unhealthy_idle_process_is_closed_and_replaced():
+    pool = _pool()
+    first = pool.acquire("k", Process)
+    pool.release("k", first)
+    first.alive = False
+
+    second = pool.acquire("k", Process)
+    assert second is not first and first.closed
+    assert pool.stats()["discarded"] == 1
+    pool.close_all()
+
+
+def test_process_without_a_health_check_is_never_parked():
+    class Plain:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    pool = _pool()
+    process = pool.acquire("k", Plain)
+
+    assert pool.release("k", process) is False
+    assert process.closed and pool.stats()["idle"] == 0
+
+
+def test_process_is_retired_after_max_uses():
+    pool = _pool(max_uses=2)
+    process = pool.acquire("k", Process)
+    assert pool.release("k", process) is True
+    assert pool.acquire("k", Process) is process
+    assert pool.release("k", process) is False
+    assert process.closed
+
+
+def test_idle_bounds_close_the_oldest():
+    pool = _pool(max_idle=2, max_idle_per_key=1)
+    a1, a2, b, c = Process("a1"), Process("a2"), Process("b"), Process("c")
+    for key, process in (("a", a1), ("a", a2), ("b", b), ("c", c)):
+        pool.release(key, process)
+
+    assert a1.closed and a2.closed
+    assert not b.closed and not c.closed
+    assert pool.stats()["evicted"] == 2
+    assert pool.stats()["idle"] == 2
+    pool.close_all()
+
+
+def test_expired_processes_are_closed_on_the_next_acquire():
+    pool = _pool()
+    process = pool.acquire("k", Process)
+    pool.release("k", process)
+
+    pool.close_expired(now=float("inf"))
+    assert process.closed
+    assert pool.stats()["expired"] == 1
+    assert pool.acquire("k", Process) is not process
+
+
+def test_idle_timer_closes_an_unclaimed_process():
+    pool = _pool(idle_ttl=0.2)
+    process = pool.acquire("k", Process)
+    pool.release("k", process)
+    pool._idle["k"][0]["timer"].join(2)
+
+    assert process.closed
+    assert pool.stats()["idle"] == 0
+
+
+def test_close_all_reaps_every_idle_process():
+    pool = _pool()
+    processes = [Process(), Process()]
+    pool.release("a", processes[0])
+    pool.release("b", processes[1])
+
+    pool.close_all()
+    assert all(p.closed for p in processes)
+    assert pool.stats()["idle"] == 0
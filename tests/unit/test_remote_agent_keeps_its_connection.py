@@ -0,0 +1,222 @@
+"""A RemoteAgent keeps one authenticated socket and multiplexes requests over it.
+
+Each input() and call() used to open a socket, CONNECT, sign, and close again;
+for an orchestrator calling the same agent all day that handshake was most of
+the cost. The socket now stays open, calls share it by exec_id alongside the
+turn in flight, and a socket that drops is replaced by a CONNECT naming the
+session -- the host's reattach.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from connectonion.network.connect import RemoteAgent
+
+
+AGENT = "0x" + "c" * 64
+DROP = object()
+
+
+class HostSocket:
+    """Stays open between requests, the way a host's socket does."""
+
+    def __init__(self, host):
+        self.host = host
+        self.sent = []
+        self._inbox = None
+
+    def _queue(self):
+        if self._inbox is None:
+            self._inbox = asyncio.Queue()
+        return self._inbox
+
+    async def send(self, raw):
+        message = json.loads(raw)
+        self.sent.append(message)
+        loop = asyncio.get_running_loop()
+        for delay, reply in self.host.answer(self, message):
+            loop.call_later(delay, self._queue().put_nowait, reply)
+
+    async def recv(self):
+        reply = await self._queue().get()
+        if reply is DROP:
+            raise ConnectionError("connection dropped")
+        return json.dumps(reply)
+
+    def drop(self):
+        self._queue().put_nowait(DROP)
+
+    def __await__(self):
+        async def _self():
+            return self
+        return _self().__await__()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class Host:
+    """Answers CONNECT, INPUT and EXEC; records every socket it was given."""
+
+    def __init__(self):
+        self.sockets = []
+        self.status = "new"
+
+    def open(self, url, *a, **k):
+        socket = HostSocket(self)
+        self.sockets.append(socket)
+        return socket
+
+    def answer(self, socket, message):
+        kind = message.get("type")
+        if kind == "CONNECT":
+            return [(0, {"type": "CONNECTED", "session_id": "s1", "status": self.status})]
+        if kind == "INPUT":
+            return [(0, {"type": "thinking"}),
+                    (0, {"type": "OUTPUT", "result": f"re: {message['prompt']}",
+                         "session": {"session_id": "s1", "messages": []}})]
+        if kind == "EXEC":
+            delay = message["args"].get("delay", 0)
+            return [(delay, {"type": "EXEC_RESULT", "exec_id": message["exec_id"],
+                             "status": "success", "result": message["args"]["say"]})]
+        return []
+
+    def sent(self, kind):
+        return [m for s in self.sockets for m in s.sent if m.get("type") == kind]
+
+
+@pytest.fixture
+def host(monkeypatch):
+    import websockets
+
+    host = Host()
+    monkeypatch.setattr(websockets, "connect", host.open)
+    return host
+
+
+def make_agent():
+    agent = RemoteAgent(AGENT, keys=None, relay_url="wss://relay.test")
+    agent._endpoint_resolved = True
+    return agent
+
+
+def test_sync_calls_share_one_socket(host):
+    agent = make_agent()
+
+    assert agent.input("one").text == "re: one"
+    assert agent.input("two").text == "re: two"
+    assert agent.call("bash", say="three").text == "three"
+
+    assert len(host.sockets) == 1
+    assert len(host.sent("CONNECT")) == 1
+    assert agent.connection_stats() == {
+        "requests": 3, "new_connections": 1, "reused_connections": 2, "reattached": 0,
+    }
+    agent.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_matched_by_exec_id(host):
+    agent = make_agent()
+
+    # The slowest call is sent first, so its result arrives last.
+    results = await asyncio.gather(
+        agent.call_async("bash", say="slow", delay=0.2),
+        agent.call_async("bash", say="medium", delay=0.1),
+        agent.call_async("bash", say="fast"),
+    )
+
+    assert [r.text for r in results] == ["slow", "medium", "fast"]
+    assert len(host.sockets) == 1
+
+
+@pytest.mark.asyncio
+async def test_a_call_does_not_wait_for_the_turn_in_flight(host):
+    agent = make_agent()
+    answer = host.answer
+    host.answer = lambda socket, m: (
+        [(0.5, {"type": "OUTPUT", "result": "late", "session": {}})]
+        if m.get("type") == "INPUT" else answer(socket, m))
+
+    turn = asyncio.create_task(agent.input_async("long job"))
+    call = await asyncio.wait_for(agent.call_async("bash", say="quick"), timeout=0.3)
+
+    assert call.text == "quick"
+    assert not turn.done()
+    assert (await turn).text == "late"
+    assert len(host.sockets) == 1
+
+
+@pytest.mark.asyncio
+async def test_a_dropped_socket_is_replaced_by_a_reattach(host):
+    agent = make_agent()
+    await agent.input_async("one")
+
+    host.sockets[0].drop()
+    await asyncio.sleep(0)
+    response = await agent.input_async("two")
+
+    assert response.text == "re: two"
+    assert len(host.sockets) == 2
+    # The second CONNECT names the session, which is what the host reattaches on.
+    assert host.sockets[1].sent[0]["session_id"] == "s1"
+    assert agent.connection_stats()["reattached"] == 1
+
+
+@pytest.mark.asyncio
+async def test_a_turn_survives_a_drop_while_the_agent_keeps_running(host):
+    agent = make_agent()
+    answer = host.answer
+
+    def answer_once_dropped(socket, message):
+        if message.get("type") == "INPUT":
+            socket.drop()
+            return []
+        if message.get("type") == "CONNECT" and len(host.sockets) == 2:
+            host.status = "running"
+            # The host resumes forwarding the running turn to the new socket.
+            return answer(socket, message) + [
+                (0, {"type": "OUTPUT", "result": "resumed", "session": {}})]
+        return answer(socket, message)
+
+    host.answer = answer_once_dropped
+
+    assert (await agent.input_async("work")).text == "resumed"
+    # The prompt went out once; the reattach did not run it a second time.
+    assert len(host.sent("INPUT")) == 1
+
+
+@pytest.mark.asyncio
+async def test_a_drop_the_host_cannot_resume_is_an_error(host):
+    agent = make_agent()
+    answer = host.answer
+
+    def drop_on_input(socket, message):
+        if message.get("type") == "INPUT":
+            socket.drop()
+            return []
+        return answer(socket, message)
+
+    host.answer = drop_on_input
+
+    with pytest.raises(ConnectionError, match="lost"):
+        await agent.input_async("work")
+    assert len(host.sent("INPUT")) == 1
+    assert agent.status == "idle"
+
+
+@pytest.mark.asyncio
+async def test_reset_starts_a_new_session_on_a_new_socket(host):
+    agent = make_agent()
+    await agent.input_async("one")
+
+    agent.reset()
+    await agent.input_async("two")
+
+    assert len(host.sockets) == 2
+    assert "session_id" not in host.sockets[1].sent[0]
@@ -197,3 +197,184 @@ def test_save_and_atomic_update_fail_closed_when_lock_is_unavailable(
     with pytest.raises(TimeoutError, match="session storage lock"):
         storage.atomic_update("update", lambda _current: _make_session("update"))
     assert not storage.path.exists()
+
+
+# ---------- SQLite backend ----------
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    from connectonion.network.host.session.sqlite_storage import SQLiteSessionStorage
+    return SQLiteSessionStorage(path=tmp_path / "sessions.sqlite3")
+
+
+def test_sqlite_keeps_the_same_read_contract(sqlite_storage):
+    past = time.time() - 100
+    sqlite_storage.save(_make_session(sid="a", result="v1", created=1))
+    sqlite_storage.save(_make_session(sid="a", result="v2", created=2))
+    sqlite_storage.save(_make_session(sid="b", created=3))
+    sqlite_storage.save(_make_session(sid="dead", expires=past, created=4))
+    sqlite_storage.save(_make_session(sid="r", status="running", expires=past, created=5))
+
+    assert sqlite_storage.get("a").result == "v2"
+    assert sqlite_storage.get("dead") is None
+    assert sqlite_storage.get("r") is not None
+    assert [s.session_id for s in sqlite_storage.list()] == ["r", "b", "a"]
+    assert [s.session_id for s in sqlite_storage.list(limit=1)] == ["r"]
+    assert [s.session_id for s in sqlite_storage.list(status="completed")] == ["b", "a"]
+
+
+def test_sqlite_atomic_update_serializes_and_rolls_back(sqlite_storage):
+    sqlite_storage.save(_make_session(sid="counter", result="0"))
+
+    def increment(_):
+        sqlite_storage.atomic_update(
+            "counter",
+            lambda current: current.model_copy(
+                update={"result": str(int(current.result) + 1)}),
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(increment, range(40)))
+    assert sqlite_storage.get("counter").result == "40"
+
+    def fail(_current):
+        raise ValueError("policy rejected")
+
+    with pytest.raises(ValueError, match="policy rejected"):
+        sqlite_storage.atomic_update("counter", fail)
+    assert sqlite_storage.get("counter").result == "40"
+
+
+def test_sqlite_compact_and_reconcile(sqlite_storage):
+    past = time.time() - 100
+    sqlite_storage.save(_make_session(sid="dead", expires=past))
+    sqlite_storage.save(_make_session(sid="run", status="running"))
+    sqlite_storage.checkpoint({"session_id": "ask", "user_prompt": "ok?"})
+
+    sqlite_storage.compact()
+    sqlite_storage.reconcile_interrupted()
+
+    assert {s.session_id for s in sqlite_storage._records()} == {"run", "ask"}
+    assert sqlite_storage.get("run").status == "interrupted"
+    assert sqlite_storage.get("ask").status == "interrupted"
+    assert sqlite_storage.get("ask").prompt == "ok?"
+
+
+def test_sqlite_migrates_the_jsonl_history_once(tmp_path):
+    from connectonion.network.host.session.storage import open_session_storage
+
+    old = SessionStorage(tmp_path / "session_results.jsonl")
+    old.save(_make_session(sid="x", result="first", created=1))
+    old.save(_make_session(sid="x", result="latest", created=1))
+    old.save(_make_session(sid="y", created=2))
+
+    storage = open_session_storage(tmp_path, "sqlite")
+
+    assert storage.get("x").result == "latest"
+    assert [s.session_id for s in storage.list()] == ["y", "x"]
+    assert not (tmp_path / "session_results.jsonl").exists()
+    assert (tmp_path / "session_results.jsonl.migrated").exists()
+    assert len(open_session_storage(tmp_path, "sqlite").list()) == 2
+
+
+def test_sqlite_summaries_read_without_the_write_lock_or_bodies(sqlite_storage):
+    from connectonion.network.host.session.sqlite_storage import recent_summaries
+
+    past = time.time() - 100
+    sqlite_storage.save(Session(session_id="a", status="done", prompt="first",
+                                session=_conversation(3), created=1))
+    sqlite_storage.save(_make_session(sid="b", created=2))
+    sqlite_storage.save(_make_session(sid="dead", expires=past, created=3))
+
+    # A live host mid-write holds the write lock; listing must not wait on it.
+    sqlite_storage._acquire_lock()
+    try:
+        summaries = recent_summaries(sqlite_storage.path, 5)
+    finally:
+        sqlite_storage._release_lock()
+
+    assert [r["session_id"] for r in summaries] == ["b", "a"]
+    assert summaries[1]["prompt"] == "first"
+    assert all("session" not in r for r in summaries)
+    assert recent_summaries(sqlite_storage.path, 1)[0]["session_id"] == "b"
+    assert recent_summaries(sqlite_storage.path.with_name("missing.sqlite3"), 5) == []
+
+
+def test_sessions_handler_asks_the_store_for_a_bounded_page():
+    from unittest.mock import MagicMock
+    from connectonion.network.host.http_router import SESSIONS_LIST_LIMIT, sessions_handler
+
+    storage = MagicMock()
+    storage.list.return_value = []
+    sessions_handler(storage, "0xcaller")
+
+    storage.list.assert_called_once_with(limit=SESSIONS_LIST_LIMIT)
+
+
+def test_open_session_storage_defaults_to_jsonl_and_rejects_unknown(tmp_path):
+    from connectonion.network.host.session.storage import open_session_storage
+
+    assert type(open_session_storage(tmp_path)) is SessionStorage
+    with pytest.raises(ValueError, match="session_store"):
+        open_session_storage(tmp_path, "redis")
+
+
+# ---------- message bodies are stored once ----------
+
+def _conversation(n):
+    return {"session_id": "long", "user_prompt": "go",
+            "messages": [{"role": "user", "content": f"message {i} " + "x" * 500}
+                         for i in range(n)]}
+
+
+def test_a_status_change_does_not_rewrite_the_conversation(storage):
+    storage.save(Session(session_id="long", status="running", prompt="go",
+                         session=_conversation(200), created=time.time()))
+
+    def size():
+        return storage.path.stat().st_size + storage._bodies_path.stat().st_size
+
+    before = size()
+    storage.checkpoint(_conversation(201))
+    grown = size() - before
+
+    assert grown < 20_000, f"a one-message change wrote {grown} bytes"
+    fetched = storage.get("long")
+    assert fetched.status == "waiting_approval"
+    assert fetched.session == _conversation(201)
+
+
+def test_sqlite_stores_each_message_once(sqlite_storage):
+    sqlite_storage.save(Session(session_id="long", status="running", prompt="go",
+                                session=_conversation(200), created=time.time()))
+    sqlite_storage.checkpoint(_conversation(201))
+
+    db = sqlite_storage._db()
+    (record,) = db.execute("SELECT record FROM sessions").fetchone()
+    assert len(record) < 20_000
+    assert db.execute("SELECT COUNT(*) FROM bodies").fetchone() == (201,)
+    assert sqlite_storage.get("long").session == _conversation(201)
+
+
+def test_compaction_keeps_only_bodies_a_record_still_names(storage):
+    past = time.time() - 100
+    storage.save(Session(session_id="gone", status="done", prompt="p",
+                         session={"messages": [{"content": "old"}]}, expires=past))
+    storage.save(Session(session_id="kept", status="done", prompt="p",
+                         session={"messages": [{"content": "new"}]}))
+
+    storage.compact()
+
+    bodies = storage._bodies_path.read_text(encoding="utf-8")
+    assert "new" in bodies and "old" not in bodies
+    assert storage.get("kept").session["messages"] == [{"content": "new"}]
+
+
+def test_a_record_written_inline_is_still_read(storage):
+    import json as _json
+    storage.path.write_text(_json.dumps({
+        "session_id": "legacy", "status": "done", "prompt": "p",
+        "session": {"messages": [{"role": "user", "content": "hi"}]},
+    }) + "\n", encoding="utf-8")
+
+    assert storage.get("legacy").session["messages"] == [{"role": "user", "content": "hi"}]
@@ -0,0 +1,19 @@
+"""Tests for the shared nearest-rank percentile helper."""
+
+from connectonion.core.stats import percentile
+
+
+def test_percentile_is_nearest_rank_on_a_sorted_list():
+    ordered = list(range(1, 21))
+    assert percentile(ordered, 50) == 10
+    assert percentile(ordered, 95) == 19
+    assert percentile(ordered, 100) == 20
+
+
+def test_percentile_of_one_value_is_that_value():
+    assert percentile([7], 50) == 7
+    assert percentile([7], 95) == 7
+
+
+def test_percentile_of_nothing_is_none():
+    assert percentile([], 95) is None
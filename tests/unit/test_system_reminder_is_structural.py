@@ -118,7 +118,9 @@ class TestTheUploadNoticeIsNotPartOfWhatTheUserSaid:
 
         from connectonion.core import agent as agent_module
 
-        source = inspect.getsource(agent_module.Agent.input)
+        # input() and input_async() share the turn's opening, where the
+        # user message and the upload notice are added.
+        source = inspect.getsource(agent_module.Agent._open_turn)
 
         assert "prompt += " not in source, (
             "the upload notice is back on the user's own prompt string"
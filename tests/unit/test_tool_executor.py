@@ -15,9 +15,13 @@ import threading
 
 import pytest
 from unittest.mock import Mock, patch
-from connectonion.core.tool_executor import execute_single_tool, _add_assistant_message
+from connectonion.core.tool_executor import (
+    execute_and_record_tools,
+    execute_single_tool,
+    _add_assistant_message,
+)
 from connectonion.core.tool_registry import ToolRegistry
-from connectonion.core.tool_factory import create_tool_from_function
+from connectonion.core.tool_factory import create_tool_from_function, parallel_safe
 from connectonion.logger import Logger
 from connectonion.core.llm import ToolCall
 
@@ -358,6 +362,146 @@ class TestToolExecutor:
         assert "inner-done" in str(box["trace"]["result"])
 
 
+class EventAgent(FakeAgent):
+    """FakeAgent whose events are real handler lists."""
+
+    def __init__(self, max_parallel_tools=1):
+        super().__init__()
+        self.max_parallel_tools = max_parallel_tools
+        self.events = {}
+
+    def _invoke_events(self, event_type: str):
+        for handler in self.events.get(event_type, []):
+            handler(self)
+
+
+class TestParallelTools:
+    """Parallel-safe calls in one batch run together; everything else does not."""
+
+    def _slow_tools(self, barrier, *, marked=True):
+        def fetch_a(url: str) -> str:
+            barrier.wait()
+            return f"a:{url}"
+
+        def fetch_b(url: str) -> str:
+            barrier.wait()
+            return f"b:{url}"
+
+        tools = ToolRegistry()
+        for func in (fetch_a, fetch_b):
+            tools.add(create_tool_from_function(func, parallel_safe=marked))
+        return tools
+
+    def _calls(self, *names):
+        return [
+            ToolCall(name=name, arguments={"url": f"u{i}"}, id=f"call_{i}")
+            for i, name in enumerate(names)
+        ]
+
+    def test_parallel_safe_calls_overlap_and_results_keep_call_order(self):
+        # Both tools wait on the same barrier: only concurrent execution passes.
+        tools = self._slow_tools(threading.Barrier(2, timeout=5))
+        agent = EventAgent(max_parallel_tools=4)
+
+        execute_and_record_tools(
+            self._calls("fetch_b", "fetch_a"), tools, agent, Logger("t", log=False)
+        )
+
+        results = [m for m in agent.current_session["messages"] if m["role"] == "tool"]
+        assert [(m["tool_call_id"], m["content"]) for m in results] == [
+            ("call_0", "b:u0"),
+            ("call_1", "a:u1"),
+        ]
+
+    def test_the_agent_must_opt_in(self):
+        tools = self._slow_tools(threading.Barrier(2, timeout=0.5))
+        agent = EventAgent(max_parallel_tools=1)
+
+        execute_and_record_tools(
+            self._calls("fetch_a", "fetch_b"), tools, agent, Logger("t", log=False)
+        )
+
+        statuses = [e["status"] for e in agent.current_session["trace"] if e["type"] == "tool_result"]
+        # Sequential: the lone barrier party times out and the tool errors.
+        assert statuses == ["error", "error"]
+
+    def test_the_tool_must_opt_in(self):
+        tools = self._slow_tools(threading.Barrier(2, timeout=0.5), marked=False)
+        agent = EventAgent(max_parallel_tools=4)
+
+        execute_and_record_tools(
+            self._calls("fetch_a", "fetch_b"), tools, agent, Logger("t", log=False)
+        )
+
+        statuses = [e["status"] for e in agent.current_session["trace"] if e["type"] == "tool_result"]
+        assert statuses == ["error", "error"]
+
+    def test_decorator_marker_is_read_by_the_factory(self):
+        @parallel_safe
+        def lookup(key: str) -> str:
+            return key
+
+        assert create_tool_from_function(lookup)._parallel_safe is True
+        assert create_tool_from_function(lookup, parallel_safe=False)._parallel_safe is False
+
+    def test_each_tool_hooks_fire_once_per_call_in_order(self):
+        ran = []
+
+        @parallel_safe
+        def echo(text: str) -> str:
+            ran.append(text)
+            return text
+
+        tools = ToolRegistry()
+        tools.add(create_tool_from_function(echo))
+        agent = EventAgent(max_parallel_tools=3)
+        seen = []
+        agent.events = {
+            "before_each_tool": [lambda a: seen.append(("before", a.current_session["pending_tool"]["id"]))],
+            "after_each_tool": [lambda a: seen.append(("after", a.current_session["messages"][-1]["tool_call_id"]))],
+        }
+        calls = [ToolCall(name="echo", arguments={"text": str(i)}, id=f"c{i}") for i in range(3)]
+
+        execute_and_record_tools(calls, tools, agent, Logger("t", log=False))
+
+        assert sorted(ran) == ["0", "1", "2"]
+        assert seen == [
+            ("before", "c0"), ("before", "c1"), ("before", "c2"),
+            ("after", "c0"), ("after", "c1"), ("after", "c2"),
+        ]
+        assert "pending_tool" not in agent.current_session
+
+    def test_a_rejection_stops_the_group_where_sequential_would(self):
+        ran = []
+
+        @parallel_safe
+        def echo(text: str) -> str:
+            ran.append(text)
+            return text
+
+        def reject_second(agent):
+            if agent.current_session["pending_tool"]["id"] == "c1":
+                agent.current_session["stop_signal"] = "No."
+                raise ValueError("rejected")
+
+        tools = ToolRegistry()
+        tools.add(create_tool_from_function(echo))
+        agent = EventAgent(max_parallel_tools=3)
+        agent.events = {"before_each_tool": [reject_second]}
+        calls = [ToolCall(name="echo", arguments={"text": str(i)}, id=f"c{i}") for i in range(3)]
+
+        execute_and_record_tools(calls, tools, agent, Logger("t", log=False))
+
+        assert ran == ["0"]
+        results = [m for m in agent.current_session["messages"] if m["role"] == "tool"]
+        assert [(m["tool_call_id"], m["content"]) for m in results] == [
+            ("c0", "0"),
+            ("c1", "No."),
+            ("c2", "Rejected by user"),
+        ]
+        assert agent.current_session["stop_signal"] == "No."
+
+
 class TestAddAssistantMessage:
     """Tests for _add_assistant_message null handling (Gemini compatibility)."""
 
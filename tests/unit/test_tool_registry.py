@@ -425,3 +425,63 @@ class TestToolRegistryContains:
         assert "search" in registry
         assert "gmail" in registry
         assert "nonexistent" not in registry
+
+
+class TestToolRegistrySchemas:
+    """schemas() is built once per tool set and rebuilt only on add/remove."""
+
+    def _tool(self, name):
+        tool = Mock()
+        tool.name = name
+        tool.to_function_schema.return_value = {"name": name, "parameters": {}}
+        return tool
+
+    def test_schemas_are_reused_until_the_tool_set_changes(self):
+        registry = ToolRegistry()
+        search = self._tool("search")
+        registry.add(search)
+
+        first = registry.schemas()
+        second = registry.schemas()
+
+        assert first is second
+        assert first == [{"name": "search", "parameters": {}}]
+        assert search.to_function_schema.call_count == 1
+        assert registry.schema_cache_stats()["hits"] == 1
+
+    def test_add_and_remove_invalidate(self):
+        registry = ToolRegistry()
+        registry.add(self._tool("search"))
+        before = registry.schemas()
+
+        registry.add(self._tool("fetch"))
+        added = registry.schemas()
+        registry.remove("search")
+        removed = registry.schemas()
+
+        assert [s["name"] for s in added] == ["search", "fetch"]
+        assert [s["name"] for s in removed] == ["fetch"]
+        assert len({before.version, added.version, removed.version}) == 3
+
+    def test_provider_conversion_is_cached_per_version(self):
+        registry = ToolRegistry()
+        registry.add(self._tool("search"))
+        convert = Mock(side_effect=lambda schemas: [dict(s) for s in schemas])
+
+        first = registry.schemas().converted("anthropic", convert)
+        second = registry.schemas().converted("anthropic", convert)
+        registry.add(self._tool("fetch"))
+        third = registry.schemas().converted("anthropic", convert)
+
+        assert first is second
+        assert convert.call_count == 2
+        assert [s["name"] for s in third] == ["search", "fetch"]
+
+    def test_instances_do_not_invalidate(self):
+        registry = ToolRegistry()
+        registry.add(self._tool("search"))
+        first = registry.schemas()
+
+        registry.add_instance("gmail", Mock())
+
+        assert registry.schemas() is first
@@ -110,3 +110,34 @@ class TestUnchanged:
         listfile("whitelist", "alice")
         assert tools._check_list("whitelist", "alice")
         assert not tools._check_list("whitelist", "alice-2")
+
+
+class TestTheListIsIndexed:
+    """A lookup reads the file only when it changed, and stays O(1) on exact lines."""
+
+    def test_a_list_is_parsed_once_until_it_changes(self, listfile, tmp_path, monkeypatch):
+        listfile("blocklist", *[f"0x{n:040x}" for n in range(10_000)], "bot-*", "*.evil.net")
+        reads = []
+        real = tools._read_list
+        monkeypatch.setattr(tools, "_read_list", lambda p: reads.append(p) or real(p))
+
+        for _ in range(50):
+            assert tools.is_blocked(f"0x{9_999:040x}")
+            assert tools.is_blocked("bot-7")
+            assert tools.is_blocked("a.evil.net")
+            assert not tools.is_blocked("friend")
+        assert len(reads) == 1
+
+    def test_an_edit_is_seen_on_the_next_lookup(self, listfile):
+        listfile("whitelist", "alice")
+        assert not tools.is_whitelisted("bob")
+        listfile("whitelist", "alice", "bob-and-more")
+        assert tools.is_whitelisted("bob-and-more")
+
+    def test_a_promote_is_seen_at_once(self, listfile):
+        listfile("whitelist", "alice")
+        assert not tools.is_whitelisted("carol")
+        tools.promote_to_whitelist("carol")
+        assert tools.is_whitelisted("carol")
+        tools.demote_to_contact("carol")
+        assert not tools.is_whitelisted("carol")
@@ -67,6 +67,7 @@ def test_natural_turn_keeps_string_api_and_records_measured_usage(tmp_path):
                 'total_tokens': 170,
                 'cost': pytest.approx(0.0012),
             },
+            'cache_hit_ratio': pytest.approx(20 / 120, abs=1e-4),
             'id': outcomes(agent)[0]['id'],
             'ts': outcomes(agent)[0]['ts'],
         }
@@ -390,6 +390,72 @@ def test_grep_file_pattern_filter(tmp_path):
     assert "test.txt" not in out
 
 
+def test_grep_honours_gitignore(tmp_path):
+    """Gitignored files and directories are not searched, negations are."""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("generated/\n*.log\n!keep.log\n", encoding="utf-8")
+    (tmp_path / "generated").mkdir()
+    (tmp_path / "generated" / "out.py").write_text("needle\n", encoding="utf-8")
+    (tmp_path / "debug.log").write_text("needle\n", encoding="utf-8")
+    (tmp_path / "keep.log").write_text("needle\n", encoding="utf-8")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("needle\n", encoding="utf-8")
+
+    out = grep_files("needle", path=str(tmp_path))
+    assert "app.py" in out
+    assert "keep.log" in out
+    assert "generated" not in out
+    assert "debug.log" not in out
+
+    # Searching below the repo root still applies the root's .gitignore.
+    (tmp_path / "src" / "trace.log").write_text("needle\n", encoding="utf-8")
+    out = grep_files("needle", path=str(tmp_path / "src"))
+    assert "app.py" in out
+    assert "trace.log" not in out
+
+
+def test_grep_skips_binary_content(tmp_path):
+    """A file with NUL bytes is skipped whatever its extension."""
+    (tmp_path / "blob.txt").write_bytes(b"needle\0\x01\x02")
+    (tmp_path / "text.txt").write_text("needle\n", encoding="utf-8")
+
+    out = grep_files("needle", path=str(tmp_path))
+    assert "text.txt" in out
+    assert "blob.txt" not in out
+
+
+def test_grep_stops_at_max_results(tmp_path):
+    """Output is in path order and cut at max_results."""
+    for i in range(30):
+        (tmp_path / f"f{i:02d}.txt").write_text("needle\n", encoding="utf-8")
+
+    out = grep_files("needle", path=str(tmp_path), max_results=5)
+    assert out.splitlines()[:5] == [f"f{i:02d}.txt" for i in range(5)]
+    assert "f05.txt" not in out
+    assert "results truncated at 5" in out
+
+
+def test_grep_line_anchors_match_per_line(tmp_path):
+    """Anchored patterns match at every line, not only the file's start."""
+    (tmp_path / "a.py").write_text("x = 1\ndef main():\n    pass\n", encoding="utf-8")
+
+    out = grep_files("^def main", path=str(tmp_path), output_mode="content")
+    assert "2: def main():" in out
+    out = grep_files("pass$", path=str(tmp_path), output_mode="count")
+    assert "a.py: 1 matches" in out
+
+
+def test_grep_large_file_is_mapped(tmp_path, monkeypatch):
+    """Files over the mmap threshold are searched the same way."""
+    import importlib
+    grep_module = importlib.import_module("connectonion.useful_tools.file_tools.grep")
+    monkeypatch.setattr(grep_module, "MMAP_THRESHOLD", 16)
+    (tmp_path / "big.txt").write_text("filler line\n" * 50 + "needle here\n", encoding="utf-8")
+
+    out = grep_files("needle", path=str(tmp_path), output_mode="content")
+    assert "51: needle here" in out
+
+
 def test_file_tools_glob_and_grep(tmp_path):
     """Test FileTools.glob() and grep() work correctly."""
     (tmp_path / "a.py").write_text("code\n", encoding="utf-8")
@@ -495,3 +561,81 @@ def test_all_operations_integration(tmp_path):
 
     files = ft.glob("*.py", path=str(tmp_path))
     assert "app.py" in files
+
+
+def test_glob_newest_first_and_gitignore(tmp_path):
+    """glob sorts by mtime and skips gitignored files."""
+    import os
+    (tmp_path / ".gitignore").write_text("*.tmp\n", encoding="utf-8")
+    for name in ["old.py", "new.py", "mid.py"]:
+        (tmp_path / name).write_text("", encoding="utf-8")
+        os.utime(tmp_path / name, (1000, {"old.py": 1000, "mid.py": 2000, "new.py": 3000}[name]))
+    (tmp_path / "scratch.tmp").write_text("", encoding="utf-8")
+
+    out = glob_files("*", path=str(tmp_path))
+    assert [line for line in out.splitlines() if line.endswith(".py")] == ["new.py", "mid.py", "old.py"]
+    assert "scratch.tmp" not in out
+
+
+def test_file_index_reuses_unchanged_directories(tmp_path):
+    """A second listing stats directories but re-lists only changed ones."""
+    from connectonion.useful_tools.file_tools.walk import FileIndex
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / "one.py").write_text("", encoding="utf-8")
+    (tmp_path / "b" / "two.py").write_text("", encoding="utf-8")
+
+    index = FileIndex(tmp_path)
+    assert [f.rel for f in index.files()] == ["a/one.py", "b/two.py"]
+    assert index.rescans == 3
+
+    assert [f.rel for f in index.files()] == ["a/one.py", "b/two.py"]
+    assert index.rescans == 3
+
+    (tmp_path / "b" / "three.py").write_text("", encoding="utf-8")
+    assert [f.rel for f in index.files()] == ["a/one.py", "b/three.py", "b/two.py"]
+    assert index.rescans == 4
+
+    (tmp_path / "a" / ".gitignore").write_text("one.py\n", encoding="utf-8")
+    assert [f.rel for f in index.files()] == ["a/.gitignore", "b/three.py", "b/two.py"]
+
+
+def test_file_index_orders_by_mtime_after_edits_behind_its_back(tmp_path):
+    """An editor, git or a subprocess rewrites a file in place: its directory's
+    mtime stays, so the index keeps its listing -- but glob's order must move."""
+    import os
+    from connectonion.useful_tools.file_tools.glob import glob_files as indexed_glob
+    from connectonion.useful_tools.file_tools.walk import FileIndex
+    for name, mtime in [("a.py", 1000), ("b.py", 2000), ("c.py", 3000)]:
+        (tmp_path / name).write_text("", encoding="utf-8")
+        os.utime(tmp_path / name, (mtime, mtime))
+    index = FileIndex(tmp_path)
+    assert indexed_glob("*.py", path=str(tmp_path), index=index).splitlines() == ["c.py", "b.py", "a.py"]
+
+    directory_mtime = os.stat(tmp_path).st_mtime_ns
+    (tmp_path / "a.py").write_text("edited elsewhere\n", encoding="utf-8")
+    os.utime(tmp_path / "a.py", (4000, 4000))
+    assert os.stat(tmp_path).st_mtime_ns == directory_mtime
+
+    assert indexed_glob("*.py", path=str(tmp_path), index=index).splitlines() == ["a.py", "c.py", "b.py"]
+    assert index.rescans == 1
+
+
+def test_file_tools_index_follows_own_writes(tmp_path):
+    """FileTools reuses its index and sees files it creates or edits."""
+    import os
+    ft = FileTools()
+    (tmp_path / "a.py").write_text("alpha\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text("beta\n", encoding="utf-8")
+    os.utime(tmp_path / "a.py", (1000, 1000))
+    os.utime(tmp_path / "b.py", (2000, 2000))
+
+    assert ft.glob("*.py", path=str(tmp_path)).splitlines() == ["b.py", "a.py"]
+
+    ft.read_file(str(tmp_path / "a.py"))
+    ft.edit(str(tmp_path / "a.py"), "alpha", "gamma")
+    assert ft.glob("*.py", path=str(tmp_path)).splitlines() == ["a.py", "b.py"]
+    assert "a.py" in ft.grep("gamma", path=str(tmp_path))
+
+    ft.write(str(tmp_path / "c.py"), "gamma\n")
+    assert "c.py" in ft.grep("gamma", path=str(tmp_path))